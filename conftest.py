@@ -10,24 +10,36 @@ project_root = Path(__file__).parent.absolute()
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-# 使用pytest-playwright但每个测试使用独立browser
-# 这样可以完全隔离测试，避免browser崩溃影响后续测试
+# 可选插件：固定等待账本（--sleep-ledger 或 SLEEP_LEDGER=true 启用，默认不生效）
+# 用例耗时历史（默认记录），--longest-first 按历史耗时最长优先分配xdist用例
+pytest_plugins = ["utils.sleep_ledger", "utils.duration_history"]
+
+# ⚡ worker级浏览器池：每个进程复用浏览器，每个测试仍使用独立的BrowserContext隔离
+# 浏览器崩溃/断开，或服务满 BROWSER_POOL_MAX_CONTEXTS（默认50）个测试后才重新启动
+
+@pytest.fixture(scope="session")
+def browser_pool(browser_type, browser_type_launch_args):
+    """进程（xdist worker）级浏览器池"""
+    from utils.browser_pool import BrowserPool
+    
+    pool = BrowserPool(browser_type, browser_type_launch_args)
+    yield pool
+    pool.close()
 
 @pytest.fixture(scope="function")
-def browser(browser_type):
-    """为每个测试函数创建独立的browser实例，使用Playwright自带的Chromium"""
-    # 使用Playwright自带的Chromium浏览器（无需本地安装Chrome）
-    # 通过命令行参数 --headed --slowmo 500 来控制
-    browser = browser_type.launch()
+def browser(browser_pool):
+    """为每个测试函数提供健康的browser实例（来自浏览器池），使用Playwright自带的Chromium"""
+    # 通过命令行参数 --headed --slowmo 500 来控制（经 browser_type_launch_args 传入）
+    browser = browser_pool.acquire()
     yield browser
-    browser.close()
+    browser_pool.release(browser)
 
 @pytest.fixture(scope="class")
-def class_browser(browser_type):
-    """为整个测试类创建共享的browser实例"""
-    browser = browser_type.launch()
+def class_browser(browser_pool):
+    """为整个测试类提供共享的browser实例（来自浏览器池）"""
+    browser = browser_pool.acquire()
     yield browser
-    browser.close()
+    browser_pool.release(browser)
 
 @pytest.fixture(scope="function")
 def browser_context_args(browser_context_args):
@@ -77,6 +89,47 @@ def test_info(request):
     
     request.addfinalizer(fin)
 
+@pytest.fixture(autouse=True)
+def failure_artifacts(request, pytestconfig):
+    """
+    仅失败保留的测试产物（ARTIFACT_MODE=on_failure）
+    - 步骤截图进入内存环形缓冲，测试失败时才写盘并附加到Allure，通过则直接丢弃
+    - ARTIFACT_TRACE=true 时为使用 page/context 的测试录制Playwright trace，失败时保存为zip并附加，通过时丢弃
+    """
+    from utils.screenshot_pipeline import flush_test_artifacts, get_artifact_mode
+    
+    if get_artifact_mode() != "on_failure":
+        yield
+        return
+    
+    context = None
+    uses_context = "page" in request.fixturenames or "context" in request.fixturenames
+    # pytest-playwright 自己的 --tracing 已启用时不重复录制
+    if uses_context and os.environ.get("ARTIFACT_TRACE", "false").lower() == "true" \
+            and pytestconfig.getoption("--tracing", "off") == "off":
+        context = request.getfixturevalue("context")
+        context.tracing.start(screenshots=True, snapshots=True)
+    
+    yield
+    
+    node = request.node
+    failed = any(getattr(node, f"rep_{when}", None) is not None and getattr(node, f"rep_{when}").failed
+                 for when in ("setup", "call"))
+    flush_test_artifacts(node.nodeid, failed)
+    
+    if context is not None:
+        try:
+            if failed:
+                safe_name = node.nodeid.replace("/", "_").replace("::", "_")
+                trace_path = Path("reports/traces") / f"{safe_name}.zip"
+                trace_path.parent.mkdir(parents=True, exist_ok=True)
+                context.tracing.stop(path=str(trace_path))
+                allure.attach.file(str(trace_path), name="Playwright Trace", extension="zip")
+            else:
+                context.tracing.stop()
+        except Exception as e:
+            print(f"⚠️ 保存trace失败: {e}")
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """生成测试报告钩子"""
@@ -110,3 +163,27 @@ def setup_test_environment():
     print("🏁 测试环境清理完成")
     print("="*80 + "\n")
 
+
+def pytest_sessionfinish(session, exitstatus):
+    """xdist worker在上报结束前写完自己的日志队列（控制进程随后会合并并删除worker日志文件）"""
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        from utils.logger import flush_logs
+        
+        flush_logs()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_unconfigure(config):
+    """
+    xdist控制进程把各worker的日志按时间合并到当天的主日志文件
+    
+    放在 pytest_unconfigure：控制进程的 pytest_sessionfinish 先于xdist关闭worker（teardown_nodes），
+    此时worker可能还在写日志
+    """
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        return
+    from utils.logger import merge_worker_logs
+    
+    merged = merge_worker_logs()
+    if merged:
+        print(f"\n📝 已合并 {merged} 条worker日志到 logs/")
@@ -104,16 +104,14 @@ class AevatarLoginPage(BasePage):
                 "[class*='alert']"
             ]
             
-            for selector in selectors:
-                try:
-                    element = self.page.wait_for_selector(selector, timeout=3000)
-                    if element:
-                        text = element.text_content()
-                        if text:
-                            allure.attach(text, name="Error Message", attachment_type=allure.attachment_type.TEXT)
-                            return text
-                except:
-                    continue
+            # 所有候选同时等待，最多3秒（原先逐个等待，全部未命中要15秒）
+            found = self.resolver.resolve(selectors, key="error_message", timeout=3000)
+            if found:
+                _, element = found
+                text = element.text_content()
+                if text:
+                    allure.attach(text, name="Error Message", attachment_type=allure.attachment_type.TEXT)
+                    return text
             
             return None
         except:
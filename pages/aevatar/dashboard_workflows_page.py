@@ -88,14 +88,14 @@ class DashboardWorkflowsPage(BasePage):
         """点击New Workflow按钮"""
         logger.info("点击New Workflow按钮")
         self.click_element(self.NEW_WORKFLOW_BUTTON)
-        self.page.wait_for_timeout(2000)
+        self.waits.for_dom_quiet(quiet_ms=500, timeout=5000)
     
     @allure.step("点击Import Workflow按钮")
     def click_import_workflow(self) -> None:
         """点击Import Workflow按钮"""
         logger.info("点击Import Workflow按钮")
         self.click_element(self.IMPORT_WORKFLOW_BUTTON)
-        self.page.wait_for_timeout(1000)
+        self.waits.for_dialog_open(timeout=5000)
     
     @allure.step("从文件导入Workflow: {file_path}")
     def import_workflow_from_file(self, file_path: str) -> bool:
@@ -113,7 +113,6 @@ class DashboardWorkflowsPage(BasePage):
         try:
             # 1. 点击Import Workflow按钮打开弹窗
             self.click_import_workflow()
-            self.page.wait_for_timeout(1000) # 等待弹窗渲染
 
             # 2. 处理文件上传
             # 优先尝试直接设置文件到 input[type='file']，这是最稳健的方法
@@ -155,7 +154,8 @@ class DashboardWorkflowsPage(BasePage):
                 file_chooser.set_files(file_path)
                 logger.info(f"通过文件选择器已选择文件: {file_path}")
             
-            self.page.wait_for_timeout(1000)
+            # 等待文件解析结果渲染到弹窗中
+            self.waits.for_dom_quiet("[role='dialog']", quiet_ms=300, timeout=3000)
             
             # 3. 点击确认导入 (如果有 Import/Confirm 按钮)
             # 尝试查找弹窗内的确认按钮
@@ -178,8 +178,8 @@ class DashboardWorkflowsPage(BasePage):
                 except:
                     continue
             
-            # 4. 等待导入完成 (弹窗关闭或列表刷新)
-            self.page.wait_for_timeout(2000)
+            # 4. 等待导入完成 (弹窗关闭或出现提示)
+            self.waits.for_dialog_result(timeout=5000)
             
             # 简单验证：没有错误提示
             error_toast = self.page.locator("text=/Error|Failed/i")
@@ -208,21 +208,18 @@ class DashboardWorkflowsPage(BasePage):
         workflows = []
         
         try:
-            # 等待表格加载
-            self.page.wait_for_selector(self.WORKFLOW_TABLE, timeout=5000)
+            # 整张表一次evaluate取回，避免逐行逐格的浏览器往返
+            table = self.read_table(self.WORKFLOW_TABLE, timeout=5000)
+            logger.info(f"找到 {len(table['rows'])} 个工作流")
             
-            # 获取所有行
-            rows = self.page.query_selector_all(f"{self.WORKFLOW_TABLE} >> tbody >> tr")
-            logger.info(f"找到 {len(rows)} 个工作流")
-            
-            for row in rows:
-                cells = row.query_selector_all("td")
+            for row in table["rows"]:
+                cells = row["cells"]
                 if len(cells) >= 4:
                     workflow = {
-                        "name": cells[0].text_content().strip(),
-                        "last_updated": cells[1].text_content().strip(),
-                        "last_run": cells[2].text_content().strip(),
-                        "status": cells[3].text_content().strip()
+                        "name": cells[0],
+                        "last_updated": cells[1],
+                        "last_run": cells[2],
+                        "status": cells[3]
                     }
                     workflows.append(workflow)
                     logger.debug(f"工作流信息: {workflow}")
@@ -266,7 +263,7 @@ class DashboardWorkflowsPage(BasePage):
         logger.info(f"点击工作流名称: {workflow_name}")
         workflow_link = f"text={workflow_name}"
         self.click_element(workflow_link)
-        self.page.wait_for_timeout(2000)
+        self.waits.for_dom_quiet(quiet_ms=500, timeout=5000)
     
     @allure.step("获取工作流状态: {workflow_name}")
     def get_workflow_status(self, workflow_name: str) -> Optional[str]:
@@ -314,18 +311,14 @@ class DashboardWorkflowsPage(BasePage):
             "div[role='button'][aria-haspopup='menu']"
         ]
         
-        for selector in menu_selectors:
-            try:
-                # 尝试定位并点击
-                btn = row.locator(selector).first
-                # 快速检查可见性 (500ms)
-                if btn.count() > 0 and btn.is_visible(timeout=500):
-                    btn.click()
-                    self.page.wait_for_timeout(500)
-                    logger.info(f"✅ 成功点击操作菜单 (selector: {selector})")
-                    return
-            except:
-                continue
+        # 在该行范围内同时等待所有候选
+        found = self.resolver.resolve(menu_selectors, key="workflow_action_menu", timeout=3000, root=row)
+        if found:
+            selector, btn = found
+            btn.click()
+            self.waits.for_visible("[role='menu']", timeout=3000)
+            logger.info(f"✅ 成功点击操作菜单 (selector: {selector})")
+            return
         
         # 如果都失败了，记录截图并抛出异常
         self.take_screenshot(f"action_menu_not_found_{workflow_name}.png")
@@ -343,21 +336,21 @@ class DashboardWorkflowsPage(BasePage):
         logger.info(f"点击侧边栏菜单: {menu_name}")
         menu_selector = f"text={menu_name}"
         self.click_element(menu_selector)
-        self.page.wait_for_timeout(2000)
+        self.waits.for_dom_quiet(quiet_ms=500, timeout=5000)
     
     @allure.step("点击Settings按钮")
     def click_settings_button(self) -> None:
         """点击顶部导航栏的Settings按钮"""
         logger.info("点击Settings按钮")
         self.click_element(self.SETTINGS_BUTTON)
-        self.page.wait_for_timeout(2000)
+        self.waits.for_dom_quiet(quiet_ms=500, timeout=5000)
     
     @allure.step("点击Dashboard按钮")
     def click_dashboard_button(self) -> None:
         """点击顶部导航栏的Dashboard按钮"""
         logger.info("点击Dashboard按钮")
         self.click_element(self.DASHBOARD_BUTTON)
-        self.page.wait_for_timeout(2000)
+        self.waits.for_dom_quiet(quiet_ms=500, timeout=5000)
     
     @allure.step("验证页面URL包含: {expected_path}")
     def verify_url_contains(self, expected_path: str) -> bool:
@@ -496,7 +489,7 @@ class DashboardWorkflowsPage(BasePage):
             if edit_btn:
                 edit_btn.click()
                 logger.info("✅ 点击了编辑图标")
-                self.page.wait_for_timeout(1000)
+                self.waits.for_visible("[role='dialog'], header input[type='text']", timeout=3000)
             else:
                 # 回退：尝试直接点击标题文本
                 logger.warning("⚠️ 未找到明确的铅笔图标，尝试点击标题文本")
@@ -538,7 +531,6 @@ class DashboardWorkflowsPage(BasePage):
                 # 输入新名称
                 input_el.click()
                 input_el.fill("")
-                self.page.wait_for_timeout(200)
                 input_el.fill(new_name)
                 logger.info(f"✅ 已输入新名称: {new_name}")
                 
@@ -549,7 +541,7 @@ class DashboardWorkflowsPage(BasePage):
                     logger.info("✅ 点击了保存按钮")
                 else:
                     input_el.press("Enter")
-                    self.page.wait_for_timeout(500)
+                    self.waits.for_dom_quiet(quiet_ms=200, timeout=2000)
                     # 尝试触发 blur
                     self.page.mouse.click(0, 0)
                     logger.info("按Enter键并点击空白处以提交")
@@ -570,11 +562,9 @@ class DashboardWorkflowsPage(BasePage):
 
             # 3. 验证修改结果 (Header文本更新)
             logger.info("等待验证重命名结果...")
-            self.page.wait_for_timeout(2000)
-            
             # 尝试1: 直接检查Header
             try:
-                self.page.wait_for_selector(f"header:has-text('{new_name}')", timeout=3000)
+                self.page.wait_for_selector(f"header:has-text('{new_name}')", timeout=5000)
                 logger.info(f"✅ 验证成功: Header已显示新名称 {new_name}")
                 return True
             except:
@@ -616,7 +606,7 @@ class DashboardWorkflowsPage(BasePage):
             
             # 2. 关闭AI助手弹窗（如果有）
             self.page.keyboard.press("Escape")
-            self.page.wait_for_timeout(2000)
+            self.waits.for_dialog_closed(timeout=3000)
             logger.info("✅ 已关闭AI助手弹窗")
             
             # 3. 如果提供了配置
@@ -707,7 +697,7 @@ class DashboardWorkflowsPage(BasePage):
             self.page.mouse.up()
             
             # 等待Agent添加完成
-            self.page.wait_for_timeout(2000)
+            self.waits.for_dom_quiet(quiet_ms=500, timeout=5000)
             logger.info("✅ Agent已拖拽到画布")
             
             # 验证是否出现配置弹窗 (ChatAlGAgent 等可能也有弹窗)
@@ -907,7 +897,7 @@ class DashboardWorkflowsPage(BasePage):
             
             # 关闭配置弹窗
             self.page.keyboard.press("Escape")
-            self.page.wait_for_timeout(1000)
+            self.waits.for_dialog_closed(timeout=3000)
             logger.info("✅ 配置完成，已关闭弹窗")
             
             return True
@@ -922,7 +912,7 @@ class DashboardWorkflowsPage(BasePage):
         logger.info("点击Format Layout按钮")
         try:
             self.click_element(self.FORMAT_LAYOUT_BUTTON)
-            self.page.wait_for_timeout(1000) # 等待布局动画完成
+            self.waits.for_dom_quiet(quiet_ms=300, timeout=3000)  # 等待布局动画完成
             return True
         except Exception as e:
             logger.warning(f"点击Format Layout按钮失败: {e}")
@@ -964,7 +954,7 @@ class DashboardWorkflowsPage(BasePage):
                 logger.warning("⚠️ 点击Run后未立即检测到Execution log，尝试再次点击...")
                 # 双重保障：如果第一次没点到，再点一次
                 run_button.click()
-                self.page.wait_for_timeout(2000)
+                self.waits.for_visible("button:has-text('Execution log')", timeout=5000)
                 return True
             
         except Exception as e:
@@ -1087,7 +1077,7 @@ class DashboardWorkflowsPage(BasePage):
             
             # 点击保存
             save_btn.click()
-            self.page.wait_for_timeout(1000)
+            self.waits.for_dom_quiet("[role='dialog']", quiet_ms=300, timeout=3000)
             
             # 检查错误提示
             # 常见错误提示选择器
@@ -1201,7 +1191,7 @@ class DashboardWorkflowsPage(BasePage):
                 logger.info("✅ 已点击Duplicate按钮")
                 
                 # 等待复制完成 (列表刷新或提示出现)
-                self.page.wait_for_timeout(2000) 
+                self.waits.for_dom_quiet(quiet_ms=500, timeout=5000)
                 
                 # 关闭可能残留的菜单
                 self.page.keyboard.press("Escape")
@@ -1242,7 +1232,7 @@ class DashboardWorkflowsPage(BasePage):
             delete_button.click()
             logger.info("✅ 已点击Delete按钮")
             
-            self.page.wait_for_timeout(1000)
+            self.waits.for_dialog_open(timeout=3000)
             
             # 确认删除
             # 限制在对话框内查找确认按钮，防止误点
@@ -1333,7 +1323,7 @@ class DashboardWorkflowsPage(BasePage):
                                             cb_text = cb.inner_text() if selector != "input[type='checkbox']" else ""
                                             logger.info(f"✅ 找到可见元素 {idx+1} (selector: {selector}, text: '{cb_text[:50]}')")
                                             cb.click(force=True)
-                                            self.page.wait_for_timeout(800)
+                                            self.waits.for_dom_quiet("[role='dialog']", quiet_ms=200, timeout=2000)
                                             logger.info(f"✅ 已点击元素 {idx+1}")
                                             checked = True
                                             break
@@ -1367,7 +1357,7 @@ class DashboardWorkflowsPage(BasePage):
                                         elem_text = text_elem.inner_text()
                                         logger.info(f"✅ 找到文本元素: '{elem_text[:50]}'")
                                         text_elem.click(force=True)
-                                        self.page.wait_for_timeout(800)
+                                        self.waits.for_dom_quiet("[role='dialog']", quiet_ms=200, timeout=2000)
                                         logger.info(f"✅ 已点击文本元素")
                                         checked = True
                                         break
@@ -1409,7 +1399,7 @@ class DashboardWorkflowsPage(BasePage):
                             if confirm_button.is_disabled():
                                 logger.warning("⚠️  确认按钮当前禁用，等待变为可用...")
                                 # 可能是由于勾选复选框的动画延迟，稍作等待
-                                self.page.wait_for_timeout(1000)
+                                self.waits.for_dom_quiet("[role='dialog']", quiet_ms=200, timeout=2000)
                             
                             if confirm_button.is_enabled():
                                 confirm_button.click(force=True)
@@ -1425,7 +1415,7 @@ class DashboardWorkflowsPage(BasePage):
                         
                         # 🆕 等待第二层确认弹窗 (可能出现)
                         logger.info("⏳ 等待第二层确认弹窗...")
-                        self.page.wait_for_timeout(2000)
+                        self.waits.for_dom_quiet(quiet_ms=300, timeout=3000)
                         
                         # 检查是否出现第二层弹窗
                         second_dialog = self.page.locator("role=dialog").last
@@ -1456,7 +1446,7 @@ class DashboardWorkflowsPage(BasePage):
                                 if checkbox_input.count() > 0:
                                     logger.info(f"✅ 找到checkbox input元素")
                                     checkbox_input.click(force=True)
-                                    self.page.wait_for_timeout(500)
+                                    self.waits.for_dom_quiet("[role='dialog']", quiet_ms=200, timeout=2000)
                                     logger.info(f"✅ 已勾选复选框 (input)")
                                     second_checked = True
                             except Exception as e:
@@ -1472,7 +1462,7 @@ class DashboardWorkflowsPage(BasePage):
                                         logger.info(f"✅ 找到包含'I understand'的容器")
                                         # 直接点击整个容器(可能会触发复选框)
                                         understand_container.click(force=True)
-                                        self.page.wait_for_timeout(800)
+                                        self.waits.for_dom_quiet("[role='dialog']", quiet_ms=200, timeout=2000)
                                         
                                         # 检查Delete按钮是否启用
                                         delete_btn_check = second_dialog.locator("button:has-text('Delete')").first
@@ -1492,7 +1482,7 @@ class DashboardWorkflowsPage(BasePage):
                                         label_text = label_with_checkbox.inner_text()[:60]
                                         logger.info(f"✅ 找到label元素: '{label_text}'")
                                         label_with_checkbox.click(force=True)
-                                        self.page.wait_for_timeout(500)
+                                        self.waits.for_dom_quiet("[role='dialog']", quiet_ms=200, timeout=2000)
                                         logger.info(f"✅ 已点击label (触发复选框)")
                                         second_checked = True
                                 except Exception as e:
@@ -1506,7 +1496,7 @@ class DashboardWorkflowsPage(BasePage):
                                     self.page.keyboard.press("Tab")
                                     self.page.wait_for_timeout(300)
                                     self.page.keyboard.press("Space")
-                                    self.page.wait_for_timeout(800)
+                                    self.waits.for_dom_quiet("[role='dialog']", quiet_ms=200, timeout=2000)
                                     
                                     # 检查Delete按钮是否启用
                                     delete_btn_check = second_dialog.locator("button:has-text('Delete')").first
@@ -1530,7 +1520,7 @@ class DashboardWorkflowsPage(BasePage):
                                                         cb_text = cb.inner_text() if selector not in ["input[type='checkbox']", "[role='checkbox']"] else ""
                                                         logger.info(f"✅ 找到元素 (selector: {selector}, text: '{cb_text[:50]}')")
                                                         cb.click(force=True)
-                                                        self.page.wait_for_timeout(800)
+                                                        self.waits.for_dom_quiet("[role='dialog']", quiet_ms=200, timeout=2000)
                                                         logger.info(f"✅ 已点击元素")
                                                         second_checked = True
                                                         break
@@ -1557,7 +1547,7 @@ class DashboardWorkflowsPage(BasePage):
                                                 elem_text = text_elem.inner_text()
                                                 logger.info(f"✅ 找到确认文本: '{elem_text[:60]}'")
                                                 text_elem.click(force=True)
-                                                self.page.wait_for_timeout(800)
+                                                self.waits.for_dom_quiet("[role='dialog']", quiet_ms=200, timeout=2000)
                                                 logger.info(f"✅ 已点击确认文本")
                                                 second_checked = True
                                                 break
@@ -1580,13 +1570,11 @@ class DashboardWorkflowsPage(BasePage):
                                 logger.info(f"第二层Delete按钮状态: disabled={is_disabled}")
                                 
                                 if not is_disabled or second_checked:
-                                    second_delete_btn.click(force=True)
+                                    self.waits.for_dialog_result(timeout=5000, action=lambda: second_delete_btn.click(force=True))
                                     logger.info("✅ 已点击第二层弹窗的Delete按钮")
-                                    self.page.wait_for_timeout(2000)
                                 else:
                                     logger.warning("⚠️ 第二层Delete按钮禁用且未勾选复选框,尝试强制点击")
-                                    second_delete_btn.click(force=True)
-                                    self.page.wait_for_timeout(2000)
+                                    self.waits.for_dialog_result(timeout=5000, action=lambda: second_delete_btn.click(force=True))
                             else:
                                 logger.warning("⚠️ 未找到第二层弹窗的Delete按钮")
                         else:
@@ -1620,7 +1608,7 @@ class DashboardWorkflowsPage(BasePage):
                 logger.warning("⚠️ 未检测到明确的删除成功提示")
 
             # 等待删除完成（后端处理）
-            self.page.wait_for_timeout(3000)
+            self.waits.for_dom_quiet(quiet_ms=500, timeout=5000)
             
             return True
             
@@ -3,7 +3,10 @@ from abc import ABC, abstractmethod
 from typing import Optional, List, Dict, Any
 from utils.page_utils import PageUtils
 from utils.logger import get_logger
-from utils.config_reader import ConfigReader
+from utils.config_reader import get_config
+from utils.wait_engine import WaitEngine
+from utils.table_reader import read_table
+from utils.selector_resolver import SelectorResolver
 
 logger = get_logger(__name__)
 
@@ -19,7 +22,10 @@ class BasePage(ABC):
         """
         self.page = page
         self.utils = PageUtils(page)
-        self.config = ConfigReader()
+        self.waits = WaitEngine(page)
+        # 候选选择器同时等待，记录每个页面上的胜出者
+        self.resolver = SelectorResolver(page)
+        self.config = get_config()
         self.base_url = self.config.get("test.base_url", "https://example.com")
     
     @abstractmethod
@@ -139,6 +145,19 @@ class BasePage(ABC):
         """
         return self.utils.get_text(selector, timeout)
     
+    def read_table(self, selector: str, timeout: int = 5000) -> Dict[str, Any]:
+        """
+        一次evaluate读取整张表格（表头、单元格文本、行属性）
+        
+        Args:
+            selector: 表格选择器
+            timeout: 等待表格出现的超时时间(毫秒)
+            
+        Returns:
+            Dict[str, Any]: {"headers": [...], "rows": [{"index", "cells", "attrs"}]}
+        """
+        return read_table(self.page, selector, timeout)
+    
     def is_element_visible(self, selector: str, timeout: int = 5000) -> bool:
         """
         检查元素是否可见
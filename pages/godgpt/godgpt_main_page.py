@@ -131,8 +131,8 @@ class GodGPTMainPage(BasePage):
                     logger.warning("未找到发送按钮，尝试按Enter")
                     input_locator.press("Enter")
             
-            # 等待消息发送
-            self.page.wait_for_timeout(1000)
+            # 等待消息渲染（回复流式输出时DOM持续变化，最多等待1秒）
+            self.waits.for_dom_quiet(quiet_ms=300, timeout=1000)
             logger.info("消息发送成功")
             return True
         except Exception as e:
@@ -149,7 +149,7 @@ class GodGPTMainPage(BasePage):
         try:
             logger.info("点击新建对话按钮")
             self.page.click(self.NEW_CHAT_BUTTON)
-            self.page.wait_for_timeout(1000)
+            self.waits.for_dom_quiet(quiet_ms=300, timeout=1000)
             logger.info("新建对话按钮点击成功")
             return True
         except Exception as e:
@@ -166,7 +166,7 @@ class GodGPTMainPage(BasePage):
         try:
             logger.info("点击 Soul Link 卡片")
             self.page.click(self.SOUL_LINK_CARD)
-            self.page.wait_for_timeout(1000)
+            self.waits.for_dom_quiet(quiet_ms=300, timeout=1000)
             logger.info("Soul Link 卡片点击成功")
             return True
         except Exception as e:
@@ -183,7 +183,7 @@ class GodGPTMainPage(BasePage):
         try:
             logger.info("点击 Unlock Your Path 卡片")
             self.page.click(self.UNLOCK_PATH_CARD)
-            self.page.wait_for_timeout(1000)
+            self.waits.for_dom_quiet(quiet_ms=300, timeout=1000)
             logger.info("Unlock Your Path 卡片点击成功")
             return True
         except Exception as e:
@@ -200,7 +200,7 @@ class GodGPTMainPage(BasePage):
         try:
             logger.info("点击 Feeling Lost 卡片")
             self.page.click(self.FEELING_LOST_CARD)
-            self.page.wait_for_timeout(1000)
+            self.waits.for_dom_quiet(quiet_ms=300, timeout=1000)
             logger.info("Feeling Lost 卡片点击成功")
             return True
         except Exception as e:
@@ -217,7 +217,7 @@ class GodGPTMainPage(BasePage):
         try:
             logger.info("点击 Find Inner Stillness 卡片")
             self.page.click(self.INNER_STILLNESS_CARD)
-            self.page.wait_for_timeout(1000)
+            self.waits.for_dom_quiet(quiet_ms=300, timeout=1000)
             logger.info("Find Inner Stillness 卡片点击成功")
             return True
         except Exception as e:
@@ -234,7 +234,7 @@ class GodGPTMainPage(BasePage):
         try:
             logger.info("点击 Annual 按钮")
             self.page.click(self.ANNUAL_BUTTON)
-            self.page.wait_for_timeout(1000)
+            self.waits.for_dom_quiet(quiet_ms=300, timeout=1000)
             logger.info("Annual 按钮点击成功")
             return True
         except Exception as e:
@@ -251,7 +251,7 @@ class GodGPTMainPage(BasePage):
         try:
             logger.info("点击用户头像")
             self.page.click(self.USER_AVATAR)
-            self.page.wait_for_timeout(1000)
+            self.waits.for_dom_quiet(quiet_ms=300, timeout=1000)
             logger.info("用户头像点击成功")
             return True
         except Exception as e:
@@ -268,7 +268,7 @@ class GodGPTMainPage(BasePage):
         try:
             logger.info("点击语音按钮")
             self.page.click(self.VOICE_BUTTON)
-            self.page.wait_for_timeout(500)
+            self.waits.for_dom_quiet(quiet_ms=200, timeout=500)
             logger.info("语音按钮点击成功")
             return True
         except Exception as e:
@@ -285,7 +285,7 @@ class GodGPTMainPage(BasePage):
         try:
             logger.info("点击附件按钮")
             self.page.click(self.ATTACH_BUTTON)
-            self.page.wait_for_timeout(500)
+            self.waits.for_dom_quiet(quiet_ms=200, timeout=500)
             logger.info("附件按钮点击成功")
             return True
         except Exception as e:
@@ -331,7 +331,7 @@ class GodGPTMainPage(BasePage):
         try:
             logger.info(f"点击历史对话: {title}")
             self.page.click(f"text={title}")
-            self.page.wait_for_timeout(1000)
+            self.waits.for_dom_quiet(quiet_ms=300, timeout=1000)
             logger.info(f"历史对话 '{title}' 点击成功")
             return True
         except Exception as e:
@@ -349,7 +349,7 @@ class GodGPTMainPage(BasePage):
             if self.is_element_visible(self.DOWNLOAD_CLOSE_BUTTON, timeout=2000):
                 logger.info("关闭下载推广区域")
                 self.page.click(self.DOWNLOAD_CLOSE_BUTTON)
-                self.page.wait_for_timeout(500)
+                self.waits.for_hidden(self.DOWNLOAD_SECTION, timeout=500)
                 logger.info("下载推广区域已关闭")
                 return True
             else:
@@ -378,7 +378,7 @@ class GodGPTMainPage(BasePage):
         try:
             logger.info("切换侧边栏")
             self.page.click(self.MENU_TOGGLE)
-            self.page.wait_for_timeout(500)
+            self.waits.for_dom_quiet(quiet_ms=200, timeout=500)
             logger.info("侧边栏切换成功")
             return True
         except Exception as e:
@@ -185,7 +185,7 @@ def admin_recreate_user(account):
     sys.path.insert(0, str(root_dir))
     
     try:
-        from scripts.create_accounts_api import register_account_api
+        from utils.http_register import register_account_api
         
         username = account["username"]
         email = account["email"]
@@ -340,7 +340,7 @@ def force_reregister_account(account):
     sys.path.insert(0, str(root_dir))
     
     try:
-        from scripts.create_accounts_api import register_account_api
+        from utils.http_register import register_account_api
         
         username = account["username"]
         email = account["email"]
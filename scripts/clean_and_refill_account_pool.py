@@ -8,12 +8,18 @@
 4. 保证每次运行前都有20个健康的账号
 """
 import json
-import requests
-import re
+import sys
 import urllib3
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# 项目根目录加入路径（复用 utils.http_login / utils.async_http 中的HTTP实现）
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from utils import async_http
+from utils.http_login import http_login
 
 # 禁用SSL警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -37,66 +43,9 @@ def verify_account_login(account):
     username = account["username"]
     password = account.get("password", TARGET_PASSWORD)
     
-    try:
-        session = requests.Session()
-        session.verify = False
-        
-        # 获取登录token
-        resp = session.get(LOGIN_URL, timeout=5)
-        token_match = re.search(
-            r'<input name="__RequestVerificationToken" type="hidden" value="([^"]+)"',
-            resp.text
-        )
-        token = token_match.group(1) if token_match else None
-        
-        if not token:
-            return False, "无法获取登录Token"
-        
-        # 尝试登录
-        login_data = {
-            "LoginInput.UserNameOrEmailAddress": username,
-            "LoginInput.Password": password,
-            "__RequestVerificationToken": token,
-            "LoginInput.RememberMe": "false"
-        }
-        
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Referer": LOGIN_URL,
-        }
-        
-        resp = session.post(LOGIN_URL, data=login_data, headers=headers, allow_redirects=False, timeout=10)
-        
-        # 判断登录是否成功
-        if resp.status_code == 302:
-            redirect_url = resp.headers.get("Location", "")
-            if "/Account/Login" not in redirect_url:
-                return True, ""
-        
-        # 检查是否有错误消息
-        if resp.status_code == 200:
-            error_keywords = [
-                "Invalid login attempt",
-                "invalid",
-                "incorrect",
-                "locked out",
-                "locked",
-                "锁定",
-                "错误",
-                "失败"
-            ]
-            
-            response_lower = resp.text.lower()
-            for keyword in error_keywords:
-                if keyword.lower() in response_lower:
-                    return False, f"登录失败（检测到关键词: {keyword}）"
-        
-        return False, f"登录状态不明确（HTTP {resp.status_code}）"
-        
-    except requests.exceptions.Timeout:
-        return False, "请求超时"
-    except Exception as e:
-        return False, f"异常: {str(e)}"
+    can_login, error_msg, session = http_login(username, password, auth_url=BACKEND_URL)
+    session.close()
+    return can_login, error_msg
 
 
 def check_all_accounts(accounts):
@@ -111,32 +60,29 @@ def check_all_accounts(accounts):
     
     healthy_accounts = []
     polluted_accounts = []
+    completed = 0
     
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_account = {
-            executor.submit(verify_account_login, account): account 
-            for account in accounts
-        }
+    def on_result(account, result):
+        nonlocal completed
+        completed += 1
+        can_login, error_msg = result
         
-        completed = 0
-        for future in as_completed(future_to_account):
-            completed += 1
-            account = future_to_account[future]
-            can_login, error_msg = future.result()
-            
-            status_icon = "✅" if can_login else "❌"
-            status_text = "健康" if can_login else "污染"
-            
-            print(f"[{completed:2d}/{len(accounts)}] {status_icon} {account['username']:20} | {status_text:4}", end="")
-            if error_msg:
-                print(f" ({error_msg[:30]}...)")
-            else:
-                print()
-            
-            if can_login:
-                healthy_accounts.append(account)
-            else:
-                polluted_accounts.append(account)
+        status_icon = "✅" if can_login else "❌"
+        status_text = "健康" if can_login else "污染"
+        
+        print(f"[{completed:2d}/{len(accounts)}] {status_icon} {account['username']:20} | {status_text:4}", end="")
+        if error_msg:
+            print(f" ({error_msg[:30]}...)")
+        else:
+            print()
+    
+    # 共享连接池 + 复用防伪令牌，并发验证
+    accounts = [{**account, "password": account.get("password", TARGET_PASSWORD)} for account in accounts]
+    for account, (can_login, _) in async_http.verify_accounts(accounts, on_result, base_url=BACKEND_URL):
+        if can_login:
+            healthy_accounts.append(account)
+        else:
+            polluted_accounts.append(account)
     
     return healthy_accounts, polluted_accounts
 
@@ -189,46 +135,31 @@ def generate_new_accounts(count, prefix=ACCOUNT_PREFIX, password=TARGET_PASSWORD
 
 def register_accounts(accounts):
     """
-    注册新账号（使用API）
+    注册新账号（使用API，共享连接池并发注册）
     """
-    import sys
-    from pathlib import Path
+    print(f"📝 开始注册 {len(accounts)} 个新账号...")
+    print("-" * 50)
     
-    root_dir = Path(__file__).parent.parent
-    sys.path.insert(0, str(root_dir))
+    def on_result(account, result):
+        success, msg = result
+        if success:
+            print(f"注册 {account['username']}... ✅")
+        else:
+            print(f"注册 {account['username']}... ❌ ({msg[:30]}...)")
     
     try:
-        from scripts.create_accounts_api import register_account_api
-        
-        print(f"📝 开始注册 {len(accounts)} 个新账号...")
-        print("-" * 50)
-        
-        success_count = 0
-        failed_count = 0
-        
-        for account in accounts:
-            username = account["username"]
-            email = account["email"]
-            password = account["password"]
-            
-            print(f"注册 {username}...", end=" ")
-            success, msg = register_account_api(username, email, password)
-            
-            if success:
-                print("✅")
-                success_count += 1
-            else:
-                print(f"❌ ({msg[:30]}...)")
-                failed_count += 1
-        
-        print("-" * 50)
-        print(f"📊 注册结果: ✅ {success_count} 个成功, ❌ {failed_count} 个失败")
-        
-        return success_count > 0
-        
+        results = async_http.register_accounts(accounts, on_result, base_url=BACKEND_URL)
     except Exception as e:
-        print(f"❌ 导入注册模块失败: {e}")
+        print(f"❌ 注册账号异常: {e}")
         return False
+    
+    success_count = sum(1 for _, (success, _) in results if success)
+    failed_count = len(results) - success_count
+    
+    print("-" * 50)
+    print(f"📊 注册结果: ✅ {success_count} 个成功, ❌ {failed_count} 个失败")
+    
+    return success_count > 0
 
 
 def main():
@@ -1,216 +1,204 @@
 #!/usr/bin/env python3
 """
-使用API接口快速批量创建测试账号池
-极快速度：预计30秒内完成20个账号创建
+使用API接口快速批量创建测试账号
+
+流水线注册：共享连接池 + 复用匿名防伪令牌（utils/async_http.py），固定数量的worker从有界队列中取账号，
+并发数由 --concurrency / ACCOUNT_HTTP_CONCURRENCY（默认32）控制；注册成功的账号按批直接写入账号池存储（SQLite），
+并在结束时导出到 test_account_pool.json。
+
+扩容时先把计划写入断点文件，进程中断后再次运行会跳过已写入账号池的账号，从断点继续。
 
 使用方法：
-    python scripts/create_accounts_api.py
+    python scripts/create_accounts_api.py                  # 注册账号池中已有的账号（已存在的跳过）
+    python scripts/create_accounts_api.py --target 500     # 把账号池扩容到500个账号（qatest_v3__021 ...）
+    python scripts/create_accounts_api.py --target 500 --concurrency 64
+    python scripts/create_accounts_api.py --fresh --target 500   # 丢弃上次未完成的断点
 """
+import argparse
+import asyncio
 import json
-import requests
+import os
+import sys
 import urllib3
 from pathlib import Path
 from datetime import datetime
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
 
 # 禁用SSL警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # 配置
-BASE_URL = "https://localhost:44320"
-REGISTER_URL = f"{BASE_URL}/Account/Register"
 POOL_FILE = Path(__file__).parent.parent / "tests" / "aevatar_station" / "test-data" / "test_account_pool.json"
+# 扩容计划断点（全部注册成功后删除）
+CHECKPOINT_FILE = POOL_FILE.parent / "provision_checkpoint.json"
+
+# 项目根目录加入路径（复用 utils/ 下的HTTP客户端和账号池存储）
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def load_checkpoint() -> Optional[Dict[str, Any]]:
+    """读取未完成的扩容计划"""
+    if not CHECKPOINT_FILE.exists():
+        return None
+    try:
+        with open(CHECKPOINT_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ 断点文件无法解析，忽略: {e}")
+        return None
+
+
+def save_checkpoint(accounts: List[Dict[str, Any]], target: Optional[int]):
+    """原子写入扩容计划"""
+    tmp_path = CHECKPOINT_FILE.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"target": target, "created_at": datetime.now().isoformat(), "accounts": accounts},
+                  f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, CHECKPOINT_FILE)
 
 
-def register_account_api(username, email, password):
+async def provision(accounts: List[Dict[str, Any]], store, concurrency: int = None, batch_size: int = 25,
+                    progress_every: int = 20) -> Dict[str, Any]:
     """
-    使用API注册单个账号
-    
+    流水线注册账号，成功的账号按批写入账号池
+
+    Args:
+        accounts: 待注册账号（username/email/password）
+        store: 账号池存储（AccountPoolStore）
+        concurrency: 最大并发请求数
+        batch_size: 每积累多少个成功账号写入一次账号池
+        progress_every: 每完成多少个账号打印一次进度
+
     Returns:
-        tuple: (success: bool, message: str)
+        dict: {"registered": 成功数, "failed": [(username, message), ...], "elapsed": 秒}
     """
-    try:
-        # 创建session
-        session = requests.Session()
-        session.verify = False  # 忽略SSL证书验证
-        
-        # 第一步：获取注册页面（获取AntiForgeryToken）
-        try:
-            response = session.get(REGISTER_URL, timeout=10)
-            response.raise_for_status()
-        except Exception as e:
-            return False, f"无法访问注册页面: {str(e)}"
-        
-        # 从页面中提取AntiForgeryToken（ABP框架需要）
-        import re
-        token_match = re.search(r'<input name="__RequestVerificationToken" type="hidden" value="([^"]+)"', response.text)
-        antiforgery_token = token_match.group(1) if token_match else None
-        
-        # 第二步：提交注册表单
-        register_data = {
-            "Input.UserName": username,
-            "Input.EmailAddress": email,
-            "Input.Password": password,
-        }
-        
-        if antiforgery_token:
-            register_data["__RequestVerificationToken"] = antiforgery_token
-        
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Referer": REGISTER_URL,
-        }
-        
-        response = session.post(REGISTER_URL, data=register_data, headers=headers, timeout=10, allow_redirects=False)
-        
-        # 判断注册是否成功
-        # 成功：通常会302重定向
-        # 失败：返回200并显示错误消息
-        
-        if response.status_code == 302:
-            # 重定向说明注册成功
-            redirect_url = response.headers.get("Location", "")
-            if "/Account/Register" not in redirect_url:
-                return True, "注册成功"
-        
-        # 检查响应内容中是否有错误消息
-        if response.status_code == 200:
-            # 可能是注册失败，检查常见错误消息
-            error_keywords = [
-                "already registered",
-                "already exists",
-                "User name",
-                "Email",
-                "is already taken",
-                "已注册",
-                "已存在",
-            ]
-            
-            response_lower = response.text.lower()
-            for keyword in error_keywords:
-                if keyword.lower() in response_lower:
-                    # 如果是账号已存在，也算成功
-                    if "already" in keyword.lower() or "exist" in keyword.lower() or "已" in keyword:
-                        return True, "账号已存在（跳过）"
-                    
-                    # 其他错误
-                    error_match = re.search(r'<div[^>]*class="[^"]*text-danger[^"]*"[^>]*>([^<]+)</div>', response.text)
-                    if error_match:
-                        error_msg = error_match.group(1).strip()
-                        return False, f"注册失败: {error_msg}"
-                    
-                    return False, f"注册失败（检测到关键词: {keyword}）"
-        
-        # 如果状态码是其他值
-        return False, f"注册状态不明确（HTTP {response.status_code}）"
-        
-    except requests.exceptions.Timeout:
-        return False, "请求超时"
-    except Exception as e:
-        return False, f"异常: {str(e)}"
-
-
-def register_single_account(account, idx, total):
-    """注册单个账号（带进度）"""
-    username = account["username"]
-    email = account["email"]
-    password = account["password"]
-    
+    from utils.async_http import AsyncAccountClient
+
+    total = len(accounts)
+    summary: Dict[str, Any] = {"registered": 0, "failed": [], "elapsed": 0.0}
+    batch: List[Dict[str, Any]] = []
+    done = 0
     start_time = time.time()
-    success, message = register_account_api(username, email, password)
-    elapsed = time.time() - start_time
-    
-    status_icon = "✅" if success else "❌"
-    print(f"[{idx:2d}/{total}] {status_icon} {username:20} | {message:30} ({elapsed:.1f}s)")
-    
-    return {
-        "username": username,
-        "success": success,
-        "message": message,
-        "time": elapsed
-    }
-
-
-def main():
+
+    def flush():
+        if batch:
+            store.add_accounts(list(batch), healthy=True)
+            batch.clear()
+
+    async with AsyncAccountClient(concurrency=concurrency) as client:
+        queue: "asyncio.Queue" = asyncio.Queue(maxsize=client.concurrency * 2)
+
+        async def producer():
+            for account in accounts:
+                await queue.put(account)
+            for _ in range(client.concurrency):
+                await queue.put(None)
+
+        async def worker():
+            nonlocal done
+            while True:
+                account = await queue.get()
+                if account is None:
+                    return
+                ok, message = await client.register(account["username"], account["email"], account["password"])
+                done += 1
+                if ok:
+                    summary["registered"] += 1
+                    batch.append(account)
+                    if len(batch) >= batch_size:
+                        flush()
+                else:
+                    summary["failed"].append((account["username"], message))
+                    print(f"   ❌ {account['username']:20} | {message}")
+                if done % progress_every == 0 or done == total:
+                    rate = done / max(time.time() - start_time, 0.001)
+                    print(f"[{done:4d}/{total}] ✅ {summary['registered']}  ❌ {len(summary['failed'])}  ({rate:.1f} 个/秒)")
+
+        try:
+            await asyncio.gather(producer(), *(worker() for _ in range(client.concurrency)))
+        finally:
+            # 中断时也把已成功的账号写入账号池，下次从断点继续
+            flush()
+
+    summary["elapsed"] = time.time() - start_time
+    return summary
+
+
+def main(argv: List[str] = None) -> int:
+    from utils.account_pool_health import generate_pool_accounts
+    from utils.account_pool_store import get_account_pool_store
+
+    parser = argparse.ArgumentParser(description="使用API接口批量创建测试账号")
+    parser.add_argument("--target", type=int, help="扩容到的账号总数（按前缀顺延编号生成新账号）")
+    parser.add_argument("--concurrency", type=int, help="最大并发请求数（默认 ACCOUNT_HTTP_CONCURRENCY 或32）")
+    parser.add_argument("--batch-size", type=int, default=25, help="每批写入账号池的账号数")
+    parser.add_argument("--fresh", action="store_true", help="丢弃上次未完成的断点")
+    args = parser.parse_args(argv)
+
     print("\n" + "=" * 80)
-    print("🚀 使用API接口批量创建测试账号池")
-    print("=" * 80)
-    print("目标：30秒内完成20个账号创建")
+    print("🚀 使用API接口批量创建测试账号")
     print("=" * 80 + "\n")
-    
-    # 读取账号池配置
-    if not POOL_FILE.exists():
-        print(f"❌ 错误：账号池文件不存在: {POOL_FILE}")
-        return 1
-    
-    with open(POOL_FILE, "r", encoding="utf-8") as f:
-        pool_data = json.load(f)
-    
-    accounts = pool_data.get("test_account_pool", [])
-    if not accounts:
-        print("❌ 错误：账号池为空")
-        return 1
-    
-    pool_size = len(accounts)
-    
-    print(f"📊 账号池信息:")
-    print(f"   文件路径: {POOL_FILE}")
-    print(f"   账号总数: {pool_size}个")
-    print(f"   注册URL: {REGISTER_URL}")
-    print(f"   并行数: 5个线程")
-    print()
-    print("=" * 80)
-    print()
-    
-    # 记录开始时间
-    start_time = time.time()
-    
-    # 并行注册（使用5个线程）
-    print("⚡ 开始并行注册（使用5个线程）...")
+
+    store = get_account_pool_store()
+    existing = set(store.usernames())
+
+    if args.fresh and CHECKPOINT_FILE.exists():
+        CHECKPOINT_FILE.unlink()
+    checkpoint = load_checkpoint()
+
+    if checkpoint:
+        plan = checkpoint["accounts"]
+        print(f"♻️  从断点继续: {CHECKPOINT_FILE.name}（计划 {len(plan)} 个，目标 {checkpoint.get('target')}）")
+    elif args.target:
+        needed = args.target - len(existing)
+        if needed <= 0:
+            print(f"✅ 账号池已有 {len(existing)} 个账号，无需扩容")
+            return 0
+        plan = generate_pool_accounts(store, needed)
+        save_checkpoint(plan, args.target)
+        print(f"📋 扩容计划: {len(existing)} -> {args.target}（新增 {needed} 个，{plan[0]['username']} ~ {plan[-1]['username']}）")
+    else:
+        plan = store.export_accounts()[0]
+        if not plan:
+            print("❌ 错误：账号池为空（使用 --target N 生成新账号）")
+            return 1
+
+    # 断点模式下已写入账号池的账号视为完成；注册已有账号时服务端返回"已存在"，同样视为成功
+    pending = [a for a in plan if a["username"] not in existing] if checkpoint or args.target else plan
+    print(f"📊 待注册: {len(pending)} 个 | 账号池: {store.db_path}")
     print()
-    
-    results = []
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        # 提交所有注册任务
-        future_to_account = {
-            executor.submit(register_single_account, account, idx, pool_size): account 
-            for idx, account in enumerate(accounts, 1)
-        }
-        
-        # 收集结果
-        for future in as_completed(future_to_account):
-            results.append(future.result())
-    
-    # 计算统计
-    total_time = time.time() - start_time
-    success_count = sum(1 for r in results if r["success"])
-    failed_count = len(results) - success_count
-    avg_time = sum(r["time"] for r in results) / len(results) if results else 0
-    
-    # 输出结果
+
+    summary = asyncio.run(provision(pending, store, args.concurrency, args.batch_size)) if pending else \
+        {"registered": 0, "failed": [], "elapsed": 0.0}
+    store.export_json()
+
     print()
     print("=" * 80)
     print("📊 创建结果统计")
     print("=" * 80)
-    print(f"  总账号数: {pool_size}")
-    print(f"  ✅ 成功: {success_count}")
-    print(f"  ❌ 失败: {failed_count}")
-    print(f"  ⏱️  总耗时: {total_time:.1f}秒")
-    print(f"  ⚡ 平均速度: {avg_time:.1f}秒/账号")
-    print(f"  🎯 目标达成: {'✅ 是' if total_time <= 30 else '❌ 否（超过30秒）'}")
+    print(f"  待注册: {len(pending)}")
+    print(f"  ✅ 成功: {summary['registered']}")
+    print(f"  ❌ 失败: {len(summary['failed'])}")
+    print(f"  ⏱️  总耗时: {summary['elapsed']:.1f}秒")
+    if summary["elapsed"]:
+        print(f"  ⚡ 速度: {summary['registered'] / summary['elapsed']:.1f} 个/秒")
+    print(f"  📦 账号池: {store.stats()}")
     print("=" * 80)
-    
-    if failed_count > 0:
-        print()
-        print("❌ 失败的账号:")
-        for r in results:
-            if not r["success"]:
-                print(f"   • {r['username']:20} | {r['message']}")
-        print()
-        print("⚠️ 建议：手动在后台管理系统创建失败的账号")
+
+    if summary["failed"]:
+        failed = {username for username, _ in summary["failed"]}
+        if checkpoint or args.target:
+            # 断点只保留失败的账号，再次运行时只重试这些账号
+            save_checkpoint([a for a in pending if a["username"] in failed],
+                            (checkpoint or {}).get("target", args.target))
+            print(f"\n⚠️ {len(failed)} 个账号注册失败，已保留在断点中，再次运行本脚本重试")
         return 1
-    
+
+    if CHECKPOINT_FILE.exists():
+        CHECKPOINT_FILE.unlink()
     print()
     print("✅ 所有账号创建完成！")
     print()
@@ -218,9 +206,9 @@ def main():
     print("   1. 验证账号池: python3 scripts/verify_account_pool.py")
     print("   2. 运行测试: pytest --workers=4 tests/...")
     print()
-    
+
     return 0
 
 
 if __name__ == "__main__":
-    exit(main())
+    sys.exit(main())
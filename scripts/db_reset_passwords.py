@@ -7,11 +7,12 @@
 import json
 import os
 import hashlib
+import sqlite3
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, Any
 
 # 数据库连接配置（从环境变量读取）
-DB_TYPE = os.getenv("DB_TYPE", "sqlserver")  # sqlserver, postgresql, mysql
+DB_TYPE = os.getenv("DB_TYPE", "sqlserver")  # sqlserver, postgresql, mysql, sqlite（本地替身库，DB_NAME为文件路径）
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "1433")  # SQL Server默认1433, PostgreSQL默认5432, MySQL默认3306
 DB_NAME = os.getenv("DB_NAME", "AevatarStation")
@@ -81,6 +82,13 @@ def get_db_connection():
             print(f"❌ MySQL连接失败: {e}")
             return None
     
+    elif DB_TYPE.lower() == "sqlite":
+        db_path = Path(DB_NAME)
+        if not db_path.exists():
+            print(f"❌ SQLite替身库不存在: {db_path}（先运行 --init-sqlite-stand-in）")
+            return None
+        return sqlite3.connect(str(db_path))
+    
     else:
         print(f"❌ 不支持的数据库类型: {DB_TYPE}")
         return None
@@ -103,7 +111,7 @@ def get_password_hash_from_reference(conn, reference_username: str) -> Optional[
             for username_field in username_fields:
                 for password_field in password_fields:
                     try:
-                        if DB_TYPE.lower() == "sqlserver":
+                        if DB_TYPE.lower() in ("sqlserver", "sqlite"):
                             sql = f"""
                                 SELECT {password_field}
                                 FROM {table}
@@ -343,6 +351,239 @@ def reset_account_fields_in_db(
         cursor.close()
 
 
+# ==================== 批量重置（集合语句，单事务） ====================
+
+# 与 reset_account_fields_in_db 相同的表名候选（ABP默认 AbpUsers 优先）
+USER_TABLE_CANDIDATES = ["AbpUsers", "AspNetUsers", "Users"]
+
+# 单条语句的参数上限：SQL Server为2100（SQLite替身库为32766，不会暴露超限），留出余量
+MAX_STATEMENT_PARAMS = 2000
+
+# SQLite替身库表结构（ABP Identity AbpUsers 中与重置相关的列）
+SQLITE_STAND_IN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS AbpUsers (
+    Id TEXT PRIMARY KEY,
+    TenantId TEXT,
+    UserName TEXT NOT NULL,
+    NormalizedUserName TEXT NOT NULL,
+    Name TEXT,
+    Surname TEXT,
+    Email TEXT NOT NULL,
+    NormalizedEmail TEXT NOT NULL,
+    EmailConfirmed INTEGER NOT NULL DEFAULT 0,
+    PasswordHash TEXT,
+    SecurityStamp TEXT NOT NULL DEFAULT '',
+    IsActive INTEGER NOT NULL DEFAULT 1,
+    LockoutEnabled INTEGER NOT NULL DEFAULT 1,
+    LockoutEnd TEXT,
+    AccessFailedCount INTEGER NOT NULL DEFAULT 0,
+    PhoneNumber TEXT,
+    ConcurrencyStamp TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS IX_AbpUsers_NormalizedUserName ON AbpUsers (NormalizedUserName);
+CREATE INDEX IF NOT EXISTS IX_AbpUsers_NormalizedEmail ON AbpUsers (NormalizedEmail);
+"""
+
+
+def _param_placeholder() -> str:
+    """当前数据库驱动的参数占位符"""
+    return "?" if DB_TYPE.lower() in ("sqlserver", "sqlite") else "%s"
+
+
+def resolve_user_table(conn) -> Optional[Tuple[str, Dict[str, str]]]:
+    """
+    定位用户表并读取列名（只查询一次，代替逐个账号重复探测表名/字段名）
+    
+    Returns:
+        tuple: (表名, {小写列名: 实际列名})，找不到时返回None
+    """
+    cursor = conn.cursor()
+    try:
+        for table in USER_TABLE_CANDIDATES:
+            try:
+                cursor.execute(f"SELECT * FROM {table} WHERE 1 = 0")
+                columns = {col[0].lower(): col[0] for col in cursor.description}
+                return table, columns
+            except Exception:
+                conn.rollback()
+                continue
+        return None
+    finally:
+        cursor.close()
+
+
+def _case_columns(columns: Dict[str, str], fields: List[str]) -> int:
+    """build_bulk_reset_sql 生成的CASE表达式个数（用户名/邮箱各1个，存在Normalized列时各再加1个）"""
+    count = 0
+    if "username" in fields:
+        count += 1 + ("normalizedusername" in columns)
+    if "email" in fields:
+        count += 1 + ("normalizedemail" in columns)
+    return count
+
+
+def bulk_chunk_size(columns: Dict[str, str], fields: List[str], max_params: int = MAX_STATEMENT_PARAMS) -> int:
+    """
+    每条UPDATE最多容纳的账号数
+    
+    每个账号占用 3 × CASE表达式个数（每个分支：用户名、邮箱、目标值）+ 2（IN列表中的用户名和邮箱）个参数，
+    重置密码时整条语句另有1个哈希参数。全部字段时每个账号14个参数，每批142个账号
+    """
+    per_account = 3 * _case_columns(columns, fields) + 2
+    fixed = 1 if "password" in fields else 0
+    return max(1, (max_params - fixed) // per_account)
+
+
+def build_bulk_reset_sql(
+    table: str,
+    columns: Dict[str, str],
+    accounts: List[Dict[str, Any]],
+    fields: List[str],
+    password_hash: Optional[str] = None,
+) -> Tuple[str, List[Any]]:
+    """
+    构建一批账号的集合式UPDATE语句
+    
+    账号按用户名或邮箱匹配（任一字段被测试改掉时仍能定位到），
+    用户名/邮箱通过 CASE 表达式逐行恢复为账号池中的原始值；重置密码时同时清零失败次数并解除锁定
+    
+    Args:
+        table: 用户表名
+        columns: resolve_user_table 返回的列名映射
+        accounts: 本批账号（账号池配置）
+        fields: 要重置的字段
+        password_hash: 参考密码哈希（重置密码时必需）
+    
+    Returns:
+        tuple: (sql, params)
+    """
+    ph = _param_placeholder()
+    col = lambda *names: next((columns[n.lower()] for n in names if n.lower() in columns), None)
+    username_col = col("UserName", "user_name", "username")
+    email_col = col("Email", "email", "EmailAddress")
+    if not username_col or not email_col:
+        raise ValueError(f"用户表 {table} 缺少用户名或邮箱列")
+    
+    match = f"({username_col} = {ph} OR {email_col} = {ph})"
+    set_clauses = []
+    params: List[Any] = []
+    
+    def case_for(value_key: str, upper: bool = False) -> str:
+        branches = []
+        for account in accounts:
+            value = account[value_key].upper() if upper else account[value_key]
+            branches.append(f"WHEN {match} THEN {ph}")
+            params.extend([account["username"], account["email"], value])
+        return f"CASE {' '.join(branches)} END"
+    
+    if "username" in fields:
+        set_clauses.append(f"{username_col} = {case_for('username')}")
+        normalized = col("NormalizedUserName")
+        if normalized:
+            set_clauses.append(f"{normalized} = {case_for('username', upper=True)}")
+    
+    if "email" in fields:
+        set_clauses.append(f"{email_col} = {case_for('email')}")
+        normalized = col("NormalizedEmail")
+        if normalized:
+            set_clauses.append(f"{normalized} = {case_for('email', upper=True)}")
+    
+    if "password" in fields:
+        if not password_hash:
+            raise ValueError("重置密码需要参考密码哈希")
+        set_clauses.append(f"{col('PasswordHash', 'password_hash', 'Password')} = {ph}")
+        params.append(password_hash)
+        # 被改错密码的账号通常已累计失败次数甚至被锁定
+        if col("AccessFailedCount"):
+            set_clauses.append(f"{col('AccessFailedCount')} = 0")
+        if col("LockoutEnd"):
+            set_clauses.append(f"{col('LockoutEnd')} = NULL")
+    
+    if not set_clauses:
+        raise ValueError(f"没有可重置的字段: {fields}")
+    
+    usernames = [account["username"] for account in accounts]
+    emails = [account["email"] for account in accounts]
+    in_list = ", ".join([ph] * len(accounts))
+    sql = (
+        f"UPDATE {table} SET {', '.join(set_clauses)} "
+        f"WHERE {username_col} IN ({in_list}) OR {email_col} IN ({in_list})"
+    )
+    params.extend(usernames)
+    params.extend(emails)
+    return sql, params
+
+
+def bulk_reset_accounts(
+    conn,
+    accounts: List[Dict[str, Any]],
+    fields: List[str],
+    password_hash: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+) -> int:
+    """
+    在一个事务内批量重置账号（每 chunk_size 个账号一条UPDATE，默认按参数上限计算，见 bulk_chunk_size）
+    
+    任一批失败时整体回滚，不会留下部分账号已重置的中间状态
+    
+    Returns:
+        int: 受影响的行数
+    """
+    resolved = resolve_user_table(conn)
+    if not resolved:
+        raise RuntimeError(f"找不到用户表（尝试过: {', '.join(USER_TABLE_CANDIDATES)}）")
+    table, columns = resolved
+    chunk_size = chunk_size or bulk_chunk_size(columns, fields)
+    
+    cursor = conn.cursor()
+    affected = 0
+    try:
+        for start in range(0, len(accounts), chunk_size):
+            chunk = accounts[start:start + chunk_size]
+            sql, params = build_bulk_reset_sql(table, columns, chunk, fields, password_hash)
+            cursor.execute(sql, tuple(params))
+            affected += max(cursor.rowcount, 0)
+        conn.commit()
+        return affected
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def create_sqlite_stand_in(db_path: str, accounts: List[Dict[str, Any]], password_hash: str = "stand-in-hash") -> Path:
+    """
+    创建SQLite替身库（AbpUsers结构），用于在没有SQL Server的环境下验证批量重置
+    
+    账号池中的每个账号插入一行；已存在的库会被清空重建
+    """
+    path = Path(db_path)
+    if path.exists():
+        path.unlink()
+    
+    conn = sqlite3.connect(str(path))
+    try:
+        conn.executescript(SQLITE_STAND_IN_SCHEMA)
+        conn.executemany(
+            "INSERT INTO AbpUsers (Id, UserName, NormalizedUserName, Email, NormalizedEmail, PasswordHash, SecurityStamp) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    hashlib.md5(acc["username"].encode()).hexdigest(),
+                    acc["username"], acc["username"].upper(),
+                    acc["email"], acc["email"].upper(),
+                    password_hash, "",
+                )
+                for acc in accounts
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return path
+
+
 def reset_password_in_db(conn, username: str, password_hash: str) -> bool:
     """
     重置密码（向后兼容的包装函数）
@@ -350,7 +591,7 @@ def reset_password_in_db(conn, username: str, password_hash: str) -> bool:
     return reset_account_fields_in_db(conn, username, {"password": password_hash})
 
 
-def reset_all_accounts(fields: List[str] = None):
+def reset_all_accounts(fields: List[str] = None, bulk: bool = False):
     """
     重置账号池中所有账号的字段
     
@@ -360,6 +601,7 @@ def reset_all_accounts(fields: List[str] = None):
             - ["username", "email"] - 重置用户名和邮箱
             - ["username", "email", "password"] - 重置所有字段
             如果为None，默认重置所有字段
+        bulk: 批量模式，所有账号在一个事务内用集合语句重置（见 bulk_reset_accounts）
     """
     if fields is None:
         fields = ["username", "email", "password"]
@@ -374,6 +616,7 @@ def reset_all_accounts(fields: List[str] = None):
     print(f"🚀 开始数据库直接重置账号字段...")
     print(f"   数据库类型: {DB_TYPE}")
     print(f"   重置字段: {fields_desc}")
+    print(f"   重置模式: {'批量（单事务）' if bulk else '逐个账号'}")
     print("-" * 50)
     
     if not POOL_FILE.exists():
@@ -441,6 +684,24 @@ def reset_all_accounts(fields: List[str] = None):
             conn.close()
             return
     
+    # 第二步（批量模式）：一个事务内集合式更新所有账号
+    if bulk:
+        try:
+            affected = bulk_reset_accounts(conn, accounts, fields, password_hash)
+        except Exception as e:
+            print(f"❌ 批量重置失败，已回滚: {e}")
+            return
+        finally:
+            conn.close()
+        
+        print("-" * 50)
+        print("📊 重置结果统计:")
+        print(f"   ✅ 更新行数: {affected} 个")
+        print(f"   ⚠️ 未匹配: {max(len(accounts) - affected, 0)} 个")
+        print("-" * 50)
+        print("🏁 重置完成")
+        return
+    
     # 第二步：重置每个账号的字段
     success_count = 0
     failed_count = 0
@@ -590,20 +851,32 @@ if __name__ == "__main__":
     # 例如: python db_reset_passwords.py --fields username email
     # 或: python db_reset_passwords.py --fields password
     # 或: python db_reset_passwords.py --fields username email password
+    # 批量模式（单事务集合更新）: python db_reset_passwords.py --bulk [--fields ...]
+    # 创建SQLite替身库: DB_NAME=/tmp/abp.db python db_reset_passwords.py --init-sqlite-stand-in
+    
+    args = sys.argv[1:]
+    
+    if "--init-sqlite-stand-in" in args:
+        with open(POOL_FILE, "r", encoding="utf-8") as f:
+            pool_accounts = json.load(f).get("test_account_pool", [])
+        db_path = create_sqlite_stand_in(DB_NAME, pool_accounts)
+        print(f"✅ 已创建SQLite替身库: {db_path}（{len(pool_accounts)} 个账号）")
+        print(f"   使用: DB_TYPE=sqlite DB_NAME={db_path} python scripts/db_reset_passwords.py --bulk")
+        sys.exit(0)
+    
+    bulk = "--bulk" in args
+    if bulk:
+        args.remove("--bulk")
     
     fields = None
-    if len(sys.argv) > 1 and sys.argv[1] == "--fields":
-        if len(sys.argv) > 2:
-            fields = sys.argv[2:]
+    if len(args) > 0 and args[0] == "--fields":
+        if len(args) > 1:
+            fields = args[1:]
         else:
             print("❌ 错误: --fields 参数后需要指定字段名")
             print("   示例: python db_reset_passwords.py --fields username email")
             print("   示例: python db_reset_passwords.py --fields password")
             sys.exit(1)
     
-    if fields:
-        reset_all_accounts(fields)
-    else:
-        # 默认重置所有字段
-        reset_all_accounts()
-
+    # 未指定字段时默认重置所有字段
+    reset_all_accounts(fields, bulk=bulk)
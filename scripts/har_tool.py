@@ -0,0 +1,216 @@
+"""
+HAR录制维护工具（配合 utils/har_replay.py）
+
+用法:
+    python scripts/har_tool.py record [测试文件...]   # 对真实本地栈重新录制（默认首页+Dashboard）
+    python scripts/har_tool.py merge                  # 手动合并 har/.recording 下的录制
+    python scripts/har_tool.py stats                  # 查看各模块录制的请求数
+    python scripts/har_tool.py drift [模块...] [--strict]
+        # 逐个重放录制中的GET请求到真实后端，报告状态码/内容类型/JSON结构变化；
+        # HTML文档只比较状态码和内容类型（页面内嵌的防伪令牌每次都不同）；
+        # 存在漂移时退出码为1（--strict 时JSON数据变化也算漂移）
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import urllib3
+
+# 项目根目录加入路径（复用 utils.har_replay）
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from utils.har_replay import FIRST_PARTY_URL, HAR_DIR, load_entries, merge_recordings, module_har_path
+
+# 禁用SSL警告
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+DEFAULT_TESTS = [
+    "tests/aevatar_station/test_landing_page.py",
+    "tests/aevatar_station/test_dashboard.py",
+]
+
+# 重放时不转发的请求头（由requests自行处理或与录制环境绑定）
+SKIP_HEADERS = {"host", "content-length", "connection", "accept-encoding", "cookie"}
+
+
+def cmd_record(args) -> int:
+    tests = args.tests or DEFAULT_TESTS
+    env = {**os.environ, "HAR_MODE": "record"}
+    print(f"🎬 录制HAR: {' '.join(tests)}")
+    # 录制在会话结束时由conftest合并为 har/<模块>.har
+    result = subprocess.run([sys.executable, "-m", "pytest", *tests, *args.pytest_args], cwd=ROOT_DIR, env=env)
+    cmd_stats(args)
+    return result.returncode
+
+
+def cmd_merge(args) -> int:
+    merged = merge_recordings()
+    if not merged:
+        print("没有待合并的录制")
+    for module, count in merged.items():
+        print(f"✅ {module}: {count} 个请求")
+    return 0
+
+
+def cmd_stats(args) -> int:
+    files = sorted(HAR_DIR.glob("*.har")) if HAR_DIR.exists() else []
+    if not files:
+        print(f"没有HAR录制（{HAR_DIR}）")
+        return 0
+    for path in files:
+        entries = load_entries(path)
+        size_kb = path.stat().st_size / 1024
+        print(f"{path.stem:<30} {len(entries):>5} 个请求  {size_kb:>8.1f} KB")
+    return 0
+
+
+def _body(content: Dict[str, Any]) -> bytes:
+    text = content.get("text") or ""
+    if content.get("encoding") == "base64":
+        return base64.b64decode(text)
+    return text.encode("utf-8")
+
+
+def _shape(value: Any) -> Any:
+    """JSON结构签名：只保留键和类型，忽略具体值"""
+    if isinstance(value, dict):
+        return {k: _shape(v) for k, v in sorted(value.items())}
+    if isinstance(value, list):
+        return [_shape(value[0])] if value else []
+    return type(value).__name__
+
+
+def _json(body: bytes) -> Optional[Any]:
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+def _mime(headers) -> str:
+    return (headers.get("content-type") or "").split(";")[0].strip().lower()
+
+
+def check_entry(session, entry: Dict[str, Any], timeout: int) -> Optional[Dict[str, str]]:
+    """
+    对比单个录制请求与真实后端的响应
+
+    Returns:
+        dict: {"kind": 漂移类型, "detail": 说明}；一致时返回None
+    """
+    request = entry["request"]
+    recorded = entry["response"]
+    headers = {h["name"]: h["value"] for h in request.get("headers", [])
+               if h["name"].lower() not in SKIP_HEADERS and not h["name"].startswith(":")}
+    cookies = {c["name"]: c["value"] for c in request.get("cookies", [])}
+    try:
+        live = session.get(request["url"], headers=headers, cookies=cookies, timeout=timeout,
+                           allow_redirects=False, verify=False)
+    except Exception as e:
+        return {"kind": "请求失败", "detail": str(e)}
+
+    if live.status_code != recorded["status"]:
+        redirected_to_login = live.status_code in (301, 302) and "/Account/Login" in live.headers.get("location", "")
+        if recorded["status"] < 300 and (live.status_code in (401, 403) or redirected_to_login):
+            return {"kind": "需要登录", "detail": f"录制 {recorded['status']} -> 实际 {live.status_code}（录制中的会话已失效）"}
+        return {"kind": "状态码变化", "detail": f"{recorded['status']} -> {live.status_code}"}
+
+    recorded_headers = {h["name"].lower(): h["value"] for h in recorded.get("headers", [])}
+    recorded_mime, live_mime = _mime(recorded_headers), _mime(live.headers)
+    if recorded_mime != live_mime:
+        return {"kind": "内容类型变化", "detail": f"{recorded_mime} -> {live_mime}"}
+
+    # HTML文档每次渲染都带不同的防伪令牌/nonce，只比较状态码和内容类型
+    if recorded_mime == "text/html" or entry.get("_resourceType") == "document":
+        return None
+
+    recorded_body = _body(recorded.get("content", {}))
+    if recorded_mime.endswith("json"):
+        old, new = _json(recorded_body), _json(live.content)
+        if _shape(old) != _shape(new):
+            return {"kind": "JSON结构变化", "detail": "键或类型与录制不一致"}
+        if old != new:
+            return {"kind": "数据变化", "detail": "结构一致，值不同"}
+        return None
+
+    if hashlib.sha256(recorded_body).digest() != hashlib.sha256(live.content).digest():
+        return {"kind": "内容变化", "detail": f"{len(recorded_body)} -> {len(live.content)} 字节"}
+    return None
+
+
+def cmd_drift(args) -> int:
+    import requests
+
+    modules = args.modules or [Path(t).stem for t in DEFAULT_TESTS]
+    # 数据变化/需要登录默认只提示；--strict 时数据变化也视为漂移
+    failing_kinds = {"状态码变化", "内容类型变化", "JSON结构变化", "内容变化", "请求失败"}
+    if args.strict:
+        failing_kinds.add("数据变化")
+
+    drifted = 0
+    session = requests.Session()
+    for module in modules:
+        path = module_har_path(module)
+        if not path.exists():
+            print(f"⚠️ {module}: 没有录制（先运行 python scripts/har_tool.py record）")
+            continue
+        entries = [e for e in load_entries(path)
+                   if e["request"]["method"] == "GET" and FIRST_PARTY_URL.match(e["request"]["url"])]
+        print(f"\n🔍 {module}: 检查 {len(entries)} 个GET请求")
+        results: Dict[str, List[str]] = {}
+        for entry in entries:
+            problem = check_entry(session, entry, args.timeout)
+            if problem:
+                results.setdefault(problem["kind"], []).append(f"{entry['request']['url']}  ({problem['detail']})")
+        if not results:
+            print("   ✅ 与真实后端一致")
+        for kind, items in results.items():
+            marker = "❌" if kind in failing_kinds else "ℹ️"
+            print(f"   {marker} {kind}: {len(items)} 个")
+            for item in items[:args.limit]:
+                print(f"      {item}")
+            if len(items) > args.limit:
+                print(f"      ... 另有 {len(items) - args.limit} 个")
+            if kind in failing_kinds:
+                drifted += len(items)
+
+    if drifted:
+        print(f"\n❌ 发现 {drifted} 个漂移请求，请重新录制: python scripts/har_tool.py record")
+        return 1
+    print("\n✅ 录制与真实后端一致")
+    return 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="HAR录制维护工具")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="对真实本地栈重新录制")
+    record.add_argument("tests", nargs="*", help="测试文件，默认首页+Dashboard")
+    record.add_argument("--pytest-args", nargs=argparse.REMAINDER, default=[], help="透传给pytest的参数")
+    record.set_defaults(func=cmd_record)
+
+    sub.add_parser("merge", help="合并 har/.recording 下的录制").set_defaults(func=cmd_merge)
+    sub.add_parser("stats", help="查看录制统计").set_defaults(func=cmd_stats)
+
+    drift = sub.add_parser("drift", help="检测录制与真实后端的差异")
+    drift.add_argument("modules", nargs="*", help="模块名（如 test_dashboard），默认首页+Dashboard")
+    drift.add_argument("--strict", action="store_true", help="JSON数据变化也视为漂移")
+    drift.add_argument("--timeout", type=int, default=10, help="单个请求超时时间(秒)")
+    drift.add_argument("--limit", type=int, default=10, help="每类最多列出的URL数")
+    drift.set_defaults(func=cmd_drift)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,23 @@
 """
 尝试恢复被污染的账号
 根据测试代码分析，尝试所有可能的污染密码，找到正确的当前密码后恢复为原始密码
+各账号之间并发恢复（共享连接池的异步客户端，见 utils/async_http.py），单个账号内按顺序尝试密码，避免同时多次失败触发锁定
 """
+import asyncio
 import json
-import requests
+import sys
 from pathlib import Path
 from datetime import datetime
 import urllib3
 import re
 
+# 项目根目录加入路径（复用 utils.async_http 中的异步HTTP客户端）
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from utils.async_http import AsyncAccountClient
+
 # 禁用SSL警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -41,52 +50,17 @@ POSSIBLE_POLLUTED_PASSWORDS = [
 ]
 
 
-def try_login(username, password):
+async def try_login(client, username, password, log):
     """
     尝试使用给定密码登录
     
     Returns:
-        bool: 登录是否成功
+        tuple: (登录是否成功, 已登录的session或None)
     """
-    try:
-        session = requests.Session()
-        session.verify = False
-        
-        # 获取登录页面
-        response = session.get(LOGIN_URL, timeout=10)
-        response.raise_for_status()
-        
-        # 提取AntiForgeryToken
-        token_match = re.search(r'<input name="__RequestVerificationToken" type="hidden" value="([^"]+)"', response.text)
-        antiforgery_token = token_match.group(1) if token_match else None
-        
-        # 提交登录
-        login_data = {
-            "LoginInput.UserNameOrEmailAddress": username,
-            "LoginInput.Password": password,
-            "LoginInput.RememberMe": "false",
-        }
-        if antiforgery_token:
-            login_data["__RequestVerificationToken"] = antiforgery_token
-        
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Referer": LOGIN_URL,
-        }
-        
-        response = session.post(LOGIN_URL, data=login_data, headers=headers, timeout=10, allow_redirects=False)
-        
-        # 检查登录结果
-        if response.status_code == 302:
-            redirect_url = response.headers.get("Location", "")
-            if "/Account/Login" not in redirect_url:
-                return True, session
-        
-        return False, None
-        
-    except Exception as e:
-        print(f"      ⚠️ 登录尝试异常: {e}")
-        return False, None
+    can_login, error_msg, session = await client.login(username, password, keep_session=True)
+    if not can_login and error_msg.startswith("异常"):
+        log(f"      ⚠️ 登录尝试异常: {error_msg}")
+    return can_login, session
 
 
 def change_password(session, current_password, new_password):
@@ -140,26 +114,38 @@ def change_password(session, current_password, new_password):
         return False
 
 
-def recover_account(username, original_password):
+async def recover_account(client, username, original_password):
     """
     尝试恢复单个账号
     
     Args:
+        client: 异步HTTP客户端
         username: 用户名
         original_password: 原始密码（账号池中的密码）
     
     Returns:
         dict: {success: bool, current_password: str, message: str}
     """
-    print(f"\n{'='*70}")
-    print(f"🔧 开始恢复账号: {username}")
-    print(f"{'='*70}")
+    # 多个账号并发恢复，日志按账号缓冲后整体输出，避免交错
+    lines = []
+    log = lines.append
+    try:
+        return await _recover_account(client, username, original_password, log)
+    finally:
+        print("\n".join(lines))
+
+
+async def _recover_account(client, username, original_password, log):
+    log(f"\n{'='*70}")
+    log(f"🔧 开始恢复账号: {username}")
+    log(f"{'='*70}")
     
     # 首先尝试原始密码（可能未被污染）
-    print(f"  1️⃣ 尝试原始密码: {original_password[:3]}***")
-    success, session = try_login(username, original_password)
+    log(f"  1️⃣ 尝试原始密码: {original_password[:3]}***")
+    success, session = await try_login(client, username, original_password, log)
     if success:
-        print(f"  ✅ 账号未被污染，无需恢复")
+        session.close()
+        log(f"  ✅ 账号未被污染，无需恢复")
         return {
             "success": True,
             "current_password": original_password,
@@ -167,27 +153,28 @@ def recover_account(username, original_password):
         }
     
     # 尝试所有可能的污染密码
-    print(f"  2️⃣ 账号已被污染，尝试 {len(POSSIBLE_POLLUTED_PASSWORDS)} 个可能的污染密码...")
+    log(f"  2️⃣ 账号已被污染，尝试 {len(POSSIBLE_POLLUTED_PASSWORDS)} 个可能的污染密码...")
     
     for idx, polluted_pwd in enumerate(POSSIBLE_POLLUTED_PASSWORDS, 1):
-        print(f"     [{idx}/{len(POSSIBLE_POLLUTED_PASSWORDS)}] 尝试: {polluted_pwd[:8]}{'...' if len(polluted_pwd) > 8 else ''}")
+        log(f"     [{idx}/{len(POSSIBLE_POLLUTED_PASSWORDS)}] 尝试: {polluted_pwd[:8]}{'...' if len(polluted_pwd) > 8 else ''}")
         
-        success, session = try_login(username, polluted_pwd)
+        success, session = await try_login(client, username, polluted_pwd, log)
         if success:
-            print(f"     ✅ 找到当前密码: {polluted_pwd[:8]}...")
-            print(f"  3️⃣ 开始恢复密码为原始密码...")
+            log(f"     ✅ 找到当前密码: {polluted_pwd[:8]}...")
+            log(f"  3️⃣ 开始恢复密码为原始密码...")
             
             # 尝试修改回原始密码
-            change_success = change_password(session, polluted_pwd, original_password)
+            change_success = await client.run(change_password, session, polluted_pwd, original_password)
+            session.close()
             if change_success:
-                print(f"  ✅✅✅ 恢复成功！密码已改回 {original_password[:3]}***")
+                log(f"  ✅✅✅ 恢复成功！密码已改回 {original_password[:3]}***")
                 return {
                     "success": True,
                     "current_password": polluted_pwd,
                     "message": f"成功恢复（原密码:{polluted_pwd[:8]}...）"
                 }
             else:
-                print(f"  ❌ 修改密码失败，可能需要手动处理")
+                log(f"  ❌ 修改密码失败，可能需要手动处理")
                 return {
                     "success": False,
                     "current_password": polluted_pwd,
@@ -195,7 +182,7 @@ def recover_account(username, original_password):
                 }
     
     # 所有密码都尝试失败
-    print(f"  ❌ 未找到正确的当前密码，无法恢复")
+    log(f"  ❌ 未找到正确的当前密码，无法恢复")
     return {
         "success": False,
         "current_password": "unknown",
@@ -234,26 +221,28 @@ def main():
     print("🚀 开始恢复流程...")
     print("=" * 80)
     
-    results = []
-    for username in POLLUTED_ACCOUNTS:
-        if username not in accounts:
-            print(f"\n⚠️ 跳过不存在的账号: {username}")
-            results.append({
-                "username": username,
-                "success": False,
-                "current_password": "N/A",
-                "message": "账号不在账号池中"
-            })
-            continue
-        
-        account = accounts[username]
-        original_password = account["password"]
-        
-        result = recover_account(username, original_password)
-        results.append({
-            "username": username,
-            **result
-        })
+    async def recover_all():
+        async with AsyncAccountClient(BASE_URL) as client:
+            async def recover_one(username):
+                if username not in accounts:
+                    print(f"\n⚠️ 跳过不存在的账号: {username}")
+                    return {
+                        "username": username,
+                        "success": False,
+                        "current_password": "N/A",
+                        "message": "账号不在账号池中"
+                    }
+                
+                original_password = accounts[username]["password"]
+                result = await recover_account(client, username, original_password)
+                return {
+                    "username": username,
+                    **result
+                }
+            
+            return await asyncio.gather(*(recover_one(username) for username in POLLUTED_ACCOUNTS))
+    
+    results = asyncio.run(recover_all())
     
     # 统计结果
     print("\n" + "=" * 80)
@@ -1,14 +1,21 @@
 """
 验证账号池中所有账号的登录状态
 使用后端API快速检查哪些账号可以登录，哪些已失效
+（共享连接池 + 复用防伪令牌的异步客户端，见 utils/async_http.py）
 """
 import json
-import requests
+import sys
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import urllib3
 
+# 项目根目录加入路径（复用 utils.async_http 中的异步HTTP客户端）
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from utils import async_http
+
 # 禁用SSL警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -17,6 +24,20 @@ BASE_URL = "https://localhost:44320"
 LOGIN_URL = f"{BASE_URL}/Account/Login"
 POOL_FILE = Path(__file__).parent.parent / "tests" / "aevatar_station" / "test-data" / "test_account_pool.json"
 
+def to_result(account, can_login, error_message):
+    """
+    组装单个账号的验证结果
+    
+    Returns:
+        dict: {username, email, can_login: bool, error_message: str}
+    """
+    return {
+        "username": account["username"],
+        "email": account.get("email", ""),
+        "can_login": can_login,
+        "error_message": error_message
+    }
+
 def verify_account(account):
     """
     验证单个账号是否可以登录
@@ -27,128 +48,8 @@ def verify_account(account):
     Returns:
         dict: {username, email, can_login: bool, error_message: str}
     """
-    username = account["username"]
-    password = account["password"]
-    email = account.get("email", "")
-    
-    try:
-        # 创建session
-        session = requests.Session()
-        session.verify = False  # 忽略SSL证书验证
-        
-        # 第一步：获取登录页面（获取AntiForgeryToken）
-        try:
-            response = session.get(LOGIN_URL, timeout=10)
-            response.raise_for_status()
-        except Exception as e:
-            return {
-                "username": username,
-                "email": email,
-                "can_login": False,
-                "error_message": f"无法访问登录页面: {str(e)}"
-            }
-        
-        # 从页面中提取AntiForgeryToken（ABP框架需要）
-        import re
-        token_match = re.search(r'<input name="__RequestVerificationToken" type="hidden" value="([^"]+)"', response.text)
-        antiforgery_token = token_match.group(1) if token_match else None
-        
-        # 第二步：提交登录表单
-        login_data = {
-            "LoginInput.UserNameOrEmailAddress": username,
-            "LoginInput.Password": password,
-            "LoginInput.RememberMe": "false",
-        }
-        
-        if antiforgery_token:
-            login_data["__RequestVerificationToken"] = antiforgery_token
-        
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Referer": LOGIN_URL,
-        }
-        
-        response = session.post(LOGIN_URL, data=login_data, headers=headers, timeout=10, allow_redirects=False)
-        
-        # 判断登录是否成功
-        # 成功：通常会302重定向到首页
-        # 失败：返回200并显示错误消息
-        
-        if response.status_code == 302:
-            # 重定向说明登录成功
-            redirect_url = response.headers.get("Location", "")
-            if "/Account/Login" not in redirect_url:
-                return {
-                    "username": username,
-                    "email": email,
-                    "can_login": True,
-                    "error_message": ""
-                }
-        
-        # 检查响应内容中是否有错误消息
-        if response.status_code == 200:
-            # 可能是登录失败，检查常见错误消息
-            error_keywords = [
-                "Invalid login attempt",
-                "invalid",
-                "incorrect",
-                "locked out",
-                "locked",
-                "锁定",
-                "错误",
-                "失败",
-                "验证失败"
-            ]
-            
-            response_lower = response.text.lower()
-            for keyword in error_keywords:
-                if keyword.lower() in response_lower:
-                    # 尝试提取具体错误消息
-                    error_match = re.search(r'<div[^>]*class="[^"]*text-danger[^"]*"[^>]*>([^<]+)</div>', response.text)
-                    if error_match:
-                        error_msg = error_match.group(1).strip()
-                    else:
-                        error_msg = f"登录失败（检测到关键词: {keyword}）"
-                    
-                    return {
-                        "username": username,
-                        "email": email,
-                        "can_login": False,
-                        "error_message": error_msg
-                    }
-        
-        # 如果没有明确的失败消息，尝试检查是否有session cookie
-        cookies = session.cookies.get_dict()
-        if any("session" in k.lower() or "auth" in k.lower() or ".AspNetCore" in k for k in cookies.keys()):
-            return {
-                "username": username,
-                "email": email,
-                "can_login": True,
-                "error_message": ""
-            }
-        
-        # 无法确定状态
-        return {
-            "username": username,
-            "email": email,
-            "can_login": False,
-            "error_message": f"登录状态不明确（HTTP {response.status_code}）"
-        }
-        
-    except requests.exceptions.Timeout:
-        return {
-            "username": username,
-            "email": email,
-            "can_login": False,
-            "error_message": "请求超时"
-        }
-    except Exception as e:
-        return {
-            "username": username,
-            "email": email,
-            "can_login": False,
-            "error_message": f"异常: {str(e)}"
-        }
+    [(_, (can_login, error_message))] = async_http.verify_accounts([account], base_url=BASE_URL)
+    return to_result(account, can_login, error_message)
 
 def main():
     """主函数：批量验证账号池"""
@@ -178,28 +79,24 @@ def main():
     print("=" * 80)
     print()
     
-    # 并行验证所有账号（使用5个线程）
-    print("⚡ 开始并行验证（使用5个线程）...")
+    # 并发验证所有账号（共享连接池，并发数见 ACCOUNT_HTTP_CONCURRENCY）
+    print("⚡ 开始并发验证...")
     print()
     
     results = []
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        # 提交所有验证任务
-        future_to_account = {executor.submit(verify_account, account): account for account in accounts}
+    
+    def on_result(account, result):
+        result = to_result(account, *result)
+        results.append(result)
         
-        # 收集结果
-        completed = 0
-        for future in as_completed(future_to_account):
-            completed += 1
-            result = future.result()
-            results.append(result)
-            
-            # 实时显示验证结果
-            status_icon = "✅" if result["can_login"] else "❌"
-            status_text = "成功" if result["can_login"] else "失败"
-            error_info = f" ({result['error_message']})" if result["error_message"] else ""
-            
-            print(f"[{completed:2d}/{len(accounts)}] {status_icon} {result['username']:20} | {status_text:4}{error_info}")
+        # 实时显示验证结果
+        status_icon = "✅" if result["can_login"] else "❌"
+        status_text = "成功" if result["can_login"] else "失败"
+        error_info = f" ({result['error_message']})" if result["error_message"] else ""
+        
+        print(f"[{len(results):2d}/{len(accounts)}] {status_icon} {result['username']:20} | {status_text:4}{error_info}")
+    
+    async_http.verify_accounts(accounts, on_result, base_url=BASE_URL)
     
     # 统计结果
     print()
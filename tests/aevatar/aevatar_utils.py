@@ -10,6 +10,8 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Any
 
+from utils.selector_resolver import resolve_async
+
 logger = logging.getLogger(__name__)
 
 class TestDataLoader:
@@ -117,27 +119,24 @@ class SelectorHelper:
     """选择器辅助类"""
     
     @staticmethod
-    async def find_element_with_selectors(page, selectors: List[str], timeout: int = 3000):
+    async def find_element_with_selectors(page, selectors: List[str], timeout: int = 3000, key: str = None):
         """
-        使用多个选择器尝试查找元素
+        使用多个选择器查找元素（所有候选同时等待，上次命中的候选优先确认）
         
         Args:
             page: Playwright页面对象
             selectors: 选择器列表
-            timeout: 超时时间（毫秒）
+            timeout: 总超时时间（毫秒）
+            key: 胜出记录键，默认取第一个选择器
             
         Returns:
             找到的元素，如果都找不到则返回None
         """
-        for selector in selectors:
-            try:
-                element = await page.wait_for_selector(selector, timeout=timeout)
-                if element:
-                    logger.info(f"✅ 找到元素: {selector}")
-                    return element
-            except Exception as e:
-                logger.debug(f"选择器未找到元素: {selector}")
-                continue
+        found = await resolve_async(page, selectors, key=key, timeout=timeout)
+        if found:
+            selector, locator = found
+            logger.info(f"✅ 找到元素: {selector}")
+            return await locator.element_handle()
         
         logger.warning(f"⚠️ 所有选择器都未找到元素")
         return None
@@ -10,6 +10,8 @@ from playwright.async_api import Page as AsyncPage
 from playwright.sync_api import Page as SyncPage
 import logging
 
+from utils.toast_observer import ToastObserver, wait_for_toast_async as observe_toast_async
+
 logger = logging.getLogger(__name__)
 
 
@@ -90,6 +92,7 @@ async def take_screenshot_async(page: AsyncPage, screenshot_dir: str, filename:
 async def wait_for_toast_async(page: AsyncPage, expected_text: str, timeout: int = 5000) -> bool:
     """
     等待并验证Toast消息（异步）
+    基于toast观察器：已出现过的toast（包括已自动消失的）立即返回，否则在toast出现时被唤醒
     
     Args:
         page: Playwright异步页面对象
@@ -100,13 +103,12 @@ async def wait_for_toast_async(page: AsyncPage, expected_text: str, timeout: int
         bool: 是否找到Toast
     """
     try:
-        toast_selector = f'text=/.*{expected_text}.*/i'
-        toast = await page.wait_for_selector(toast_selector, timeout=timeout)
-        if toast:
+        if await observe_toast_async(page, text=expected_text, timeout=timeout):
             logger.info(f"✅ Toast验证: {expected_text}")
             return True
-    except:
-        logger.warning(f"⚠️ 未找到Toast: {expected_text}")
+    except Exception as e:
+        logger.debug(f"等待Toast失败: {e}")
+    logger.warning(f"⚠️ 未找到Toast: {expected_text}")
     return False
 
 
@@ -170,6 +172,7 @@ def take_screenshot_sync(page: SyncPage, screenshot_dir: str, filename: str) ->
 def wait_for_toast_sync(page: SyncPage, expected_text: str, timeout: int = 5000) -> bool:
     """
     等待并验证Toast消息（同步）
+    基于toast观察器：已出现过的toast（包括已自动消失的）立即返回，否则在toast出现时被唤醒
     
     Args:
         page: Playwright同步页面对象
@@ -180,13 +183,12 @@ def wait_for_toast_sync(page: SyncPage, expected_text: str, timeout: int = 5000)
         bool: 是否找到Toast
     """
     try:
-        toast_selector = f'text=/.*{expected_text}.*/i'
-        toast = page.wait_for_selector(toast_selector, timeout=timeout)
-        if toast:
+        if ToastObserver(page).wait_for(text=expected_text, timeout=timeout):
             logger.info(f"✅ Toast验证: {expected_text}")
             return True
-    except:
-        logger.warning(f"⚠️ 未找到Toast: {expected_text}")
+    except Exception as e:
+        logger.debug(f"等待Toast失败: {e}")
+    logger.warning(f"⚠️ 未找到Toast: {expected_text}")
     return False
 
 
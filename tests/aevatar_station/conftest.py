@@ -3,7 +3,6 @@ Pytest配置文件
 定义fixtures和测试配置
 """
 import pytest
-import json
 import logging
 from pathlib import Path
 from playwright.sync_api import Browser, Page, BrowserContext
@@ -13,30 +12,79 @@ def pytest_sessionstart(session):
     【HyperEcho 守护】
     在所有测试开始前运行一次。
     功能：检查账号池，剔除被污染的账号，补充新账号，保证有20个健康账号
+    
+    POOL_HEALTH_CHECK 控制执行方式：
+    - background（默认）：后台线程增量验证/补充，测试立即开始并优先使用已验证健康的账号
+    - sync：同步运行 scripts/clean_and_refill_account_pool.py（旧方式，最多阻塞60秒）
+    - off：不检查
     """
+    global _pool_health_checker
+    import os
+    
     # 仅在主进程执行（避免 xdist worker 进程重复执行）
-    if not hasattr(session.config, 'workerinput'):
-        import subprocess
-        import sys
-        import time
-        
-        # 定位脚本路径：tests/aevatar_station/conftest.py -> aevatar_station -> tests -> root
-        root_dir = Path(__file__).parent.parent.parent
-        script_path = root_dir / "scripts" / "clean_and_refill_account_pool.py"
+    if hasattr(session.config, 'workerinput'):
+        return
+    
+    mode = os.environ.get("POOL_HEALTH_CHECK", "background").lower()
+    if mode == "off" or os.environ.get("USE_ACCOUNT_POOL", "true").lower() != "true":
+        return
+    
+    if mode == "background":
+        try:
+            from utils.account_pool_health import start_background_health_check
+            
+            _pool_health_checker = start_background_health_check()
+            logger.info("⚡ [HyperEcho] 账号池健康检查已在后台启动")
+        except Exception as e:
+            logger.error(f"⚠️ [HyperEcho] 启动账号池后台健康检查失败: {e}")
+        return
+    
+    import subprocess
+    import sys
+    
+    # 定位脚本路径：tests/aevatar_station/conftest.py -> aevatar_station -> tests -> root
+    root_dir = Path(__file__).parent.parent.parent
+    script_path = root_dir / "scripts" / "clean_and_refill_account_pool.py"
+    
+    if script_path.exists():
+        try:
+            # 使用 timeout 参数防止 subprocess 永久卡死
+            logger.info("⚡ [HyperEcho] 开始账号池清洗...")
+            # 增加超时保护，防止无限等待
+            subprocess.run([sys.executable, str(script_path)], check=True, timeout=60)
+            logger.info("✨ [HyperEcho] 账号池清洗完成")
+        except subprocess.TimeoutExpired:
+            logger.error("⚠️ [HyperEcho] 账号池清洗超时 (60s)，跳过清洗步骤")
+        except Exception as e:
+            logger.error(f"⚠️ [HyperEcho] 账号池清洗失败: {e}")
+    else:
+        logger.warning(f"⚠️ [HyperEcho] 未找到清洗脚本: {script_path}")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """会话结束时由控制进程回收过期租约，并把账号池最新状态导出到JSON（供维护脚本使用）"""
+    import os
+    
+    if hasattr(session.config, 'workerinput'):
+        return
+    if os.environ.get("HAR_MODE", "off").lower() == "record":
+        # 各context的HAR在关闭时落盘，此时所有worker都已结束
+        from utils.har_replay import merge_recordings
+        merge_recordings()
+    if os.environ.get("USE_ACCOUNT_POOL", "true").lower() != "true":
+        return
+    if _pool_health_checker is not None:
+        _pool_health_checker.stop()
+    
+    try:
+        from utils.account_pool_store import get_account_pool_store
         
-        if script_path.exists():
-            try:
-                # 使用 timeout 参数防止 subprocess 永久卡死
-                logger.info("⚡ [HyperEcho] 开始账号池清洗...")
-                # 增加超时保护，防止无限等待
-                subprocess.run([sys.executable, str(script_path)], check=True, timeout=60)
-                logger.info("✨ [HyperEcho] 账号池清洗完成")
-            except subprocess.TimeoutExpired:
-                logger.error("⚠️ [HyperEcho] 账号池清洗超时 (60s)，跳过清洗步骤")
-            except Exception as e:
-                logger.error(f"⚠️ [HyperEcho] 账号池清洗失败: {e}")
-        else:
-            logger.warning(f"⚠️ [HyperEcho] 未找到清洗脚本: {script_path}")
+        store = get_account_pool_store()
+        store.reclaim_expired()
+        store.export_json()
+        logger.info(f"账号池状态: {store.stats()}")
+    except Exception as e:
+        logger.warning(f"导出账号池失败: {e}")
 
 # 配置日志
 logging.basicConfig(
@@ -45,6 +93,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 本进程持有的账号池租约：username -> LeaseHeartbeat
+_lease_heartbeats = {}
+
+# 控制进程中的账号池后台健康检查（PoolHealthChecker）
+_pool_health_checker = None
+
 
 @pytest.fixture(scope="session")
 def browser_context_args(browser_context_args):
@@ -95,44 +149,111 @@ def test_data():
     """
     加载所有测试数据
     """
-    data_dir = Path(__file__).parent / "test-data"
-    
-    test_data = {}
+    from utils.data_manager import LazyTestData
+    
+    # 各数据集在测试第一次访问时才加载；解析结果在进程内缓存
+    return LazyTestData(
+        Path(__file__).parent / "test-data",
+        merge_files=["login_data.json", "profile_data.json", "settings_data.json", "email_config_data.json"],
+        named_files={"register_data": "register_data.json"},
+    )
+
+
+@pytest.fixture(scope="session")
+def api_seeder(test_data):
+    """
+    ⚡ 进程级API Seeder：管理员会话只认证一次（第一次调用接口时），会话结束时清理残留的预置数据
+    测试中使用 seed（单个测试范围）或 api_seeder.child()（测试类范围）
+    """
+    from utils.api_seeder import ApiSeeder
     
-    # 加载登录数据
-    with open(data_dir / "login_data.json", "r", encoding="utf-8") as f:
-        login_data = json.load(f)
-        test_data.update(login_data)
+    admin_data = test_data["admin_login_data"][1]
+    seeder = ApiSeeder(admin_data["username"], admin_data["password"])
+    yield seeder
+    seeder.teardown()
+    seeder.close()
+
+
+@pytest.fixture(scope="function")
+def seed(api_seeder):
+    """单个测试的前置数据：通过API创建，测试结束后批量删除"""
+    seeder = api_seeder.child()
+    yield seeder
+    seeder.teardown()
+
+
+@pytest.fixture(scope="session")
+def scenario_fanout(browser_type, browser_type_launch_args, browser_context_args):
+    """
+    ⚡ 同一测试内的场景并行：与测试浏览器参数相同的多个context并发执行互不依赖的场景
+    context数由 SCENARIO_FANOUT 控制（默认3），结果用 utils.scenario_fanout.report_scenarios 写入Allure
+    """
+    from utils.scenario_fanout import ScenarioFanout
+    return ScenarioFanout(browser_type.name, browser_type_launch_args, browser_context_args)
+
+
+@pytest.fixture(scope="session")
+def network_profile():
+    """
+    默认网络配置（与 browser_context_args 一样可在子目录conftest中覆盖）
+    full：不拦截；lean：拦截字体/图片/音视频和第三方请求；third-party：只拦截第三方请求
+    环境变量 NETWORK_PROFILE 指定，默认 lean
+    """
+    from utils.network_profile import get_default_profile
+    return get_default_profile()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def apply_network_profile(request, network_profile):
+    """
+    在测试的BrowserContext上安装请求拦截（先于页面fixture的首次导航）
+    检查资源本身的测试用 @pytest.mark.network_profile("full") 恢复完整加载
+    """
+    # 只处理使用pytest-playwright context/page的测试，自建context的测试不受影响
+    if "page" not in request.fixturenames and "context" not in request.fixturenames:
+        yield
+        return
     
-    # 加载个人信息数据
-    with open(data_dir / "profile_data.json", "r", encoding="utf-8") as f:
-        profile_data = json.load(f)
-        test_data.update(profile_data)
+    marker = request.node.get_closest_marker("network_profile")
+    name = marker.args[0] if marker and marker.args else network_profile
     
-    # 加载设置数据
-    with open(data_dir / "settings_data.json", "r", encoding="utf-8") as f:
-        settings_data = json.load(f)
-        test_data.update(settings_data)
+    from utils.network_profile import NetworkProfile
+    profile = NetworkProfile(name).apply(request.getfixturevalue("context"))
     
-    # 加载邮件配置数据
-    try:
-        with open(data_dir / "email_config_data.json", "r", encoding="utf-8") as f:
-            email_config_data = json.load(f)
-            test_data.update(email_config_data)
-    except FileNotFoundError:
-        logger.warning("未找到email_config_data.json，跳过加载")
+    yield
     
-    # 加载注册测试数据
-    try:
-        with open(data_dir / "register_data.json", "r", encoding="utf-8") as f:
-            register_data = json.load(f)
-            test_data["register_data"] = register_data
-    except FileNotFoundError:
-        logger.warning("未找到register_data.json，跳过加载")
+    if profile:
+        logger.debug(profile.summary())
+
+
+@pytest.fixture(scope="function", autouse=True)
+def observe_toasts(request):
+    """
+    在测试的BrowserContext上注入toast观察器（先于页面fixture的首次导航）
+    每条toast/通知出现时记录到页面内缓冲区，测试通过 utils.toast_observer.ToastObserver(page) 查询/等待，
+    已自动消失的toast同样能查到
+    """
+    if "page" not in request.fixturenames and "context" not in request.fixturenames:
+        return
     
-    logger.info(f"测试数据加载完成，包含 {len(test_data)} 个数据集")
+    from utils.toast_observer import install_toast_observer
+    install_toast_observer(request.getfixturevalue("context"))
+
+
+@pytest.fixture(scope="function", autouse=True)
+def har_replay(request, apply_network_profile):
+    """
+    带 @pytest.mark.har 的只读测试按 HAR_MODE 录制或回放（HAR文件按测试模块划分）
+    在网络配置之后注册，命中录制的请求优先由HAR返回
+    """
+    if request.node.get_closest_marker("har") is None:
+        return
+    if "page" not in request.fixturenames and "context" not in request.fixturenames:
+        return
     
-    return test_data
+    from utils.har_replay import apply_har
+    module = request.module.__name__.rsplit(".", 1)[-1]
+    apply_har(request.getfixturevalue("context"), module, request.node.name)
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -225,6 +346,9 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "users: 用户管理测试")
     config.addinivalue_line("markers", "roles: 角色管理测试")
     config.addinivalue_line("markers", "emailing: 邮件配置测试")
+    config.addinivalue_line("markers", "ui_login: 始终通过UI登录（不使用缓存会话和HTTP登录）")
+    config.addinivalue_line("markers", "har: 只读测试，可按 HAR_MODE 录制/回放网络响应")
+    config.addinivalue_line("markers", "network_profile(name): 指定网络配置（full/lean/third-party），检查图片/字体等资源的测试使用full")
     config.addinivalue_line("markers", "P0: 优先级P0")
     config.addinivalue_line("markers", "P1: 优先级P1")
     config.addinivalue_line("markers", "P2: 优先级P2")
@@ -232,303 +356,216 @@ def pytest_configure(config):
 
 def get_test_account_from_pool(worker_id=None):
     """
-    ⚡ 阶段2优化：从测试账号池获取账号（避免每次注册产生脏数据）
-    ⚡ 并发安全：使用文件锁防止并发访问冲突
+    ⚡ 阶段2优化：从测试账号池租用账号（避免每次注册产生脏数据）
+    ⚡ 并发安全：SQLite账号池（WAL模式），租约在单个事务内原子写入，worker之间不再争抢文件锁
+    
+    租约到期未续租（worker崩溃）的账号会被自动回收；租用成功后后台线程定期续租，
+    测试结束时由 release_test_account_to_pool 归还
     
     Args:
-        worker_id: pytest-xdist的worker ID（用于并行执行时分配不同账号）
+        worker_id: pytest-xdist的worker ID（保留兼容旧调用；租约持有者按 worker ID + PID 标识）
     
     Returns:
         tuple: (username, email, password) 或 None（如果池中无可用账号）
     """
-    import json
-    import os
-    import time
-    from pathlib import Path
-    from datetime import datetime
+    from utils.account_pool_store import get_account_pool_store, LeaseHeartbeat, default_lease_owner
     
-    # 尝试导入文件锁模块（Unix系统使用fcntl，Windows使用msvcrt）
     try:
-        import fcntl
-        use_lock = True
-    except ImportError:
-        try:
-            import msvcrt
-            use_lock = True
-        except ImportError:
-            use_lock = False
-            logger.warning("  无法导入文件锁模块，并发访问可能不安全")
-    
-    pool_file = Path(__file__).parent / "test-data" / "test_account_pool.json"
-    
-    # 如果账号池文件不存在，返回None（回退到自动注册）
-    if not pool_file.exists():
-        logger.warning("  测试账号池文件不存在，将使用自动注册")
+        store = get_account_pool_store()
+        owner = default_lease_owner()
+        account = store.lease(owner)
+    except Exception as e:
+        logger.warning(f"  从账号池获取账号失败: {e}，将使用自动注册")
         return None
     
-    max_retries = 5
-    retry_delay = 0.1  # 100ms
-    
-    for attempt in range(max_retries):
-        try:
-            # 使用文件锁打开文件（读写模式）
-            with open(pool_file, "r+", encoding="utf-8") as f:
-                # 尝试获取排他锁（非阻塞）
-                if use_lock:
-                    try:
-                        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                    except (IOError, OSError):
-                        # 如果无法获取锁，等待后重试
-                        if attempt < max_retries - 1:
-                            time.sleep(retry_delay * (attempt + 1))
-                            continue
-                        else:
-                            logger.warning(f"  无法获取文件锁（尝试 {attempt + 1}/{max_retries}），将使用自动注册")
-                            return None
-                
-                # 读取文件内容
-                f.seek(0)  # 确保从文件开头读取
-                pool_data = json.load(f)
-        
-                accounts = pool_data.get("test_account_pool", [])
-                config = pool_data.get("pool_config", {})
-        
-                # ⚡ 改进：寻找第一个可用且未锁定的账号
-                # 而不是基于worker_id固定分配（避免账号锁定导致测试失败）
-                account = None
-                account_idx = -1
-                
-                # 优先策略：找到第一个未使用且未锁定的账号
-                for idx, acc in enumerate(accounts):
-                    is_locked = acc.get("is_locked", False)
-                    in_use = acc.get("in_use", False)
-                    
-                    if not is_locked and not in_use:
-                        account = acc
-                        account_idx = idx
-                        logger.info(f"  ✅ 找到可用账号: {acc['username']} (索引: {idx}, 未锁定, 未使用)")
-                        break
-                
-                # 如果没有未使用的账号，尝试复用最早使用的账号（但必须未锁定）
-                if not account:
-                    logger.warning("  ⚠️ 所有账号都在使用中，尝试复用未锁定的账号...")
-                    for idx, acc in enumerate(accounts):
-                        is_locked = acc.get("is_locked", False)
-                        if not is_locked:
-                            account = acc
-                            account_idx = idx
-                            logger.info(f"  ⚡ 复用账号: {acc['username']} (索引: {idx}, 未锁定)")
-                            break
-                
-                # 如果仍然没有账号（所有账号都被锁定），返回None触发自动注册
-                if not account:
-                    logger.warning("  ❌ 所有账号都被锁定，将使用自动注册")
-                    return None
-        
-                # 更新使用状态
-                account["in_use"] = True
-                account["last_used"] = datetime.now().isoformat()
-        
-                # 写入更新后的池数据
-                f.seek(0)  # 回到文件开头
-                f.truncate()  # 清空文件内容
-                json.dump(pool_data, f, indent=2, ensure_ascii=False)
-                f.flush()  # 确保数据写入磁盘
-                
-                # 释放锁（文件关闭时自动释放）
-        
-            logger.info(f"  ✅ 从账号池获取账号: {account['username']} (索引: {account_idx})")
-            return (account["username"], account["email"], account["password"])
-        
-        except json.JSONDecodeError as e:
-            # JSON解析错误，可能是文件正在被写入
-            if attempt < max_retries - 1:
-                logger.warning(f"  JSON解析失败（尝试 {attempt + 1}/{max_retries}）: {e}，重试...")
-                time.sleep(retry_delay * (attempt + 1))
-                continue
-            else:
-                logger.warning(f"  从账号池获取账号失败（JSON解析错误）: {e}，将使用自动注册")
-                return None
-        except Exception as e:
-            logger.warning(f"  从账号池获取账号失败: {e}，将使用自动注册")
-            return None
+    if not account:
+        logger.warning(f"  ❌ 账号池无可用账号（{store.stats()}），将使用自动注册")
+        return None
     
-    return None
+    _lease_heartbeats[account["username"]] = LeaseHeartbeat(store, account["username"], owner).start()
+    logger.info(f"  ✅ 从账号池获取账号: {account['username']}")
+    return (account["username"], account["email"], account["password"])
 
 
 def mark_account_as_locked(username, reason=None):
     """
-    ⚡ 账号锁定管理：标记账号为已锁定状态
-    ⚡ 并发安全：使用文件锁防止并发访问冲突
+    ⚡ 账号锁定管理：标记账号为已锁定状态（同时释放租约）
     
     Args:
         username: 要标记为锁定的账号用户名
         reason: 锁定原因（可选）
     """
-    import json
-    import time
-    from pathlib import Path
+    from utils.account_pool_store import get_account_pool_store
+    
+    heartbeat = _lease_heartbeats.pop(username, None)
+    if heartbeat:
+        heartbeat.stop()
     
-    # 尝试导入文件锁模块
     try:
-        import fcntl
-        use_lock = True
-    except ImportError:
-        try:
-            import msvcrt
-            use_lock = True
-        except ImportError:
-            use_lock = False
-            logger.warning("  无法导入文件锁模块，并发访问可能不安全")
+        if get_account_pool_store().mark_locked(username, reason):
+            logger.info(f"  ✅ 已标记账号 {username} 为锁定状态" + (f"（原因：{reason}）" if reason else ""))
+        else:
+            logger.warning(f"  未在账号池中找到账号 {username}")
+    except Exception as e:
+        logger.warning(f"  标记账号 {username} 为锁定失败: {e}")
+
+
+def release_test_account_to_pool(username):
+    """
+    ⚡ 阶段2优化：释放账号回池（归还租约）
     
-    pool_file = Path(__file__).parent / "test-data" / "test_account_pool.json"
+    Args:
+        username: 要释放的账号用户名
+    """
+    from utils.account_pool_store import get_account_pool_store
     
-    if not pool_file.exists():
-        logger.warning(f"  测试账号池文件不存在，无法标记账号 {username} 为锁定")
+    heartbeat = _lease_heartbeats.pop(username, None)
+    if not heartbeat:
         return
+    heartbeat.stop()
     
-    max_retries = 5
-    retry_delay = 0.1  # 100ms
-    
-    for attempt in range(max_retries):
-        try:
-            with open(pool_file, "r+", encoding="utf-8") as f:
-                # 尝试获取排他锁（非阻塞）
-                if use_lock:
-                    try:
-                        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                    except (IOError, OSError):
-                        if attempt < max_retries - 1:
-                            time.sleep(retry_delay * (attempt + 1))
-                            continue
-                        else:
-                            logger.warning(f"  无法获取文件锁（尝试 {attempt + 1}/{max_retries}），无法标记账号 {username} 为锁定")
-                            return
-                
-                # 读取文件内容
-                f.seek(0)
-                pool_data = json.load(f)
-                
-                accounts = pool_data.get("test_account_pool", [])
-                
-                # 查找并标记账号
-                account_found = False
-                for account in accounts:
-                    if account["username"] == username:
-                        account["is_locked"] = True
-                        account["in_use"] = False  # 同时释放使用状态
-                        if reason:
-                            account["locked_reason"] = reason
-                        account_found = True
-                        logger.info(f"  ✅ 已标记账号 {username} 为锁定状态" + (f"（原因：{reason}）" if reason else ""))
-                        break
-                
-                if not account_found:
-                    logger.warning(f"  未在账号池中找到账号 {username}")
-                    return
-                
-                # 写入更新后的池数据
-                f.seek(0)
-                f.truncate()
-                json.dump(pool_data, f, indent=2, ensure_ascii=False)
-                f.flush()
-                
-                return
-                
-        except json.JSONDecodeError as e:
-            if attempt < max_retries - 1:
-                logger.warning(f"  JSON解析失败（尝试 {attempt + 1}/{max_retries}）: {e}，重试...")
-                time.sleep(retry_delay * (attempt + 1))
-                continue
-            else:
-                logger.warning(f"  标记账号 {username} 为锁定失败（JSON解析错误）: {e}")
-                return
-        except Exception as e:
-            logger.warning(f"  标记账号 {username} 为锁定失败: {e}")
-            return
+    try:
+        get_account_pool_store().release(username, heartbeat.owner)
+        logger.info(f"  ✅ 账号已释放回池: {username}")
+    except Exception as e:
+        logger.warning(f"  释放账号回池失败: {e}")
 
 
-def release_test_account_to_pool(username):
+def restore_cached_session(page, username):
     """
-    ⚡ 阶段2优化：释放账号回池（标记为可用）
-    ⚡ 并发安全：使用文件锁防止并发访问冲突
+    ⚡ storageState缓存：使用磁盘缓存的会话恢复登录状态，跳过UI登录
     
     Args:
-        username: 要释放的账号用户名
+        page: Playwright Page对象（尚未导航）
+        username: 账号池账号用户名
+    
+    Returns:
+        bool: 是否已通过缓存恢复为登录状态
     """
-    import json
-    import time
-    from pathlib import Path
+    from tests.aevatar_station.pages.landing_page import LandingPage
+    from utils.storage_state_cache import get_storage_state_cache, is_storage_state_cache_enabled
+    
+    if not is_storage_state_cache_enabled():
+        return False
+    
+    landing_page = LandingPage(page)
+    cache = get_storage_state_cache()
+    state = cache.load(username, landing_page.base_url)
+    if not state:
+        return False
     
-    # 尝试导入文件锁模块
     try:
-        import fcntl
-        use_lock = True
-    except ImportError:
-        try:
-            import msvcrt
-            use_lock = True
-        except ImportError:
-            use_lock = False
+        cache.apply(page.context, state)
+        landing_page.navigate()
+        if landing_page.wait_for_auth_state():
+            logger.info(f"  ⚡ 命中storageState缓存，跳过UI登录: {username}")
+            return True
+        logger.info(f"  storageState缓存会话已失效，回退到UI登录: {username}")
+    except Exception as e:
+        logger.warning(f"  使用storageState缓存恢复会话失败: {e}，回退到UI登录")
+    
+    # 会话已失效：删除缓存并清理注入的cookie
+    cache.invalidate(username, landing_page.base_url)
+    try:
+        page.context.clear_cookies()
+    except Exception:
+        pass
+    return False
+
+
+def save_session_to_cache(page, username):
+    """
+    ⚡ storageState缓存：UI登录成功后刷新账号的会话缓存
     
-    pool_file = Path(__file__).parent / "test-data" / "test_account_pool.json"
+    Args:
+        page: 已登录的Playwright Page对象
+        username: 账号池账号用户名
+    """
+    from tests.aevatar_station.pages.base_page import BasePage
+    from utils.storage_state_cache import get_storage_state_cache, is_storage_state_cache_enabled
     
-    if not pool_file.exists():
+    if not is_storage_state_cache_enabled():
         return
     
-    max_retries = 5
-    retry_delay = 0.1  # 100ms
+    try:
+        base_url = BasePage(page).base_url
+        get_storage_state_cache().save(username, base_url, page.context.storage_state())
+    except Exception as e:
+        logger.warning(f"  保存storageState缓存失败: {e}")
+
+
+def login_via_http(page, username, password):
+    """
+    ⚡ HTTP登录引擎：通过HTTP提交登录表单获取认证cookie并注入context，不渲染登录表单
     
-    for attempt in range(max_retries):
-        try:
-            # 使用文件锁打开文件（读写模式）
-            with open(pool_file, "r+", encoding="utf-8") as f:
-                # 尝试获取排他锁（非阻塞）
-                if use_lock:
-                    try:
-                        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                    except (IOError, OSError):
-                        # 如果无法获取锁，等待后重试
-                        if attempt < max_retries - 1:
-                            time.sleep(retry_delay * (attempt + 1))
-                            continue
-                        else:
-                            logger.warning(f"  无法获取文件锁（尝试 {attempt + 1}/{max_retries}），跳过释放账号")
-                            return
-                
-                # 读取文件内容
-                f.seek(0)  # 确保从文件开头读取
-                pool_data = json.load(f)
-        
-                accounts = pool_data.get("test_account_pool", [])
-        
-                # 找到对应的账号并标记为可用
-                for account in accounts:
-                    if account["username"] == username:
-                        account["in_use"] = False
-                        logger.info(f"  ✅ 账号已释放回池: {username}")
-                        break
-        
-                # 写入更新后的池数据
-                f.seek(0)  # 回到文件开头
-                f.truncate()  # 清空文件内容
-                json.dump(pool_data, f, indent=2, ensure_ascii=False)
-                f.flush()  # 确保数据写入磁盘
-                
-                # 释放锁（文件关闭时自动释放）
-                return
-                
-        except json.JSONDecodeError as e:
-            # JSON解析错误，可能是文件正在被写入
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay * (attempt + 1))
-                continue
-            else:
-                logger.warning(f"  释放账号回池失败（JSON解析错误）: {e}")
-                return
-        except Exception as e:
-            logger.warning(f"  释放账号回池失败: {e}")
-            return
+    流程：
+    1. HTTP访问 /Account/Login 获取防伪令牌并提交表单，把认证cookie注入page.context
+    2. 打开首页；若前端尚未登录，点击Sign In，认证服务凭cookie直接完成授权跳回
+    
+    可通过环境变量 LOGIN_ENGINE=ui 禁用（全部走UI登录）
+    
+    Args:
+        page: Playwright Page对象（应尚未导航）
+        username: 用户名或邮箱
+        password: 密码
+    
+    Returns:
+        tuple: (success: bool, error_message: str)
+    """
+    from tests.aevatar_station.pages.landing_page import LandingPage
+    from tests.aevatar_station.pages.login_page import LoginPage
+    from utils.http_login import is_http_login_enabled, login_context_via_http
+    
+    if not is_http_login_enabled():
+        return False, "HTTP登录已禁用（LOGIN_ENGINE=ui）"
+    
+    success, error_msg = login_context_via_http(page.context, username, password)
+    if not success:
+        logger.warning(f"  HTTP登录失败: {username} - {error_msg}，回退到UI登录")
+        return False, error_msg
+    
+    landing_page = LandingPage(page)
+    try:
+        landing_page.navigate()
+        if not landing_page.wait_for_auth_state():
+            # 前端的OIDC会话需要走一次授权：认证服务已有cookie，会直接跳回而不显示登录表单
+            landing_page.click_sign_in()
+            page.locator(f"{LandingPage.USER_MENU_BUTTON}, {LoginPage.USERNAME_INPUT}").first.wait_for(
+                state="visible", timeout=15000
+            )
+            if not page.locator(LandingPage.USER_MENU_BUTTON).first.is_visible():
+                return False, f"注入cookie后仍需登录，当前URL: {page.url}"
+    except Exception as e:
+        logger.warning(f"  HTTP登录后建立前端会话失败: {e}，回退到UI登录")
+        return False, str(e)
+    
+    logger.info(f"  ⚡ HTTP登录成功，跳过登录表单: {username}")
+    return True, ""
+
+
+def login_with_fallback(page, username, password):
+    """
+    优先HTTP登录，失败时回退到UI登录（预设账号的降级登录使用）
+    
+    Raises:
+        Exception: HTTP登录和UI登录都失败
+    """
+    from tests.aevatar_station.pages.landing_page import LandingPage
+    from tests.aevatar_station.pages.login_page import LoginPage
+    
+    success, error_msg = login_via_http(page, username, password)
+    if success:
+        return
+    
+    landing_page = LandingPage(page)
+    login_page = LoginPage(page)
+    try:
+        landing_page.navigate()
+        landing_page.click_sign_in()
+        login_page.wait_for_load()
+        login_page.login(username=username, password=password)
+    except Exception as e:
+        raise Exception(f"HTTP登录和UI登录均失败: {username}, HTTP={error_msg}, UI={e}")
 
 
 def auto_register_and_login(page, request):
@@ -543,6 +580,10 @@ def auto_register_and_login(page, request):
     可通过环境变量控制：
     - AUTO_REGISTER=true/false: 是否启用自动注册（默认：仅在并行时启用）
     - USE_ACCOUNT_POOL=true/false: 是否使用账号池（默认：true）
+    - USE_STORAGE_STATE_CACHE=true/false: 账号池账号是否复用缓存的登录会话（默认：true）
+    - LOGIN_ENGINE=http/ui: 账号池账号优先通过HTTP登录注入cookie（默认：http）
+    
+    标记了 @pytest.mark.ui_login 的测试始终走UI登录流程
     
     Args:
         page: Playwright Page对象
@@ -568,6 +609,9 @@ def auto_register_and_login(page, request):
     # 判断是否并行执行
     is_parallel = worker_id and worker_id != "master"
     
+    # 测试本身验证登录流程时，不使用缓存会话和HTTP登录
+    force_ui_login = bool(request and request.node.get_closest_marker("ui_login"))
+    
     # 读取环境变量配置
     use_account_pool = os.environ.get("USE_ACCOUNT_POOL", "true").lower() == "true"
     auto_register_enabled = os.environ.get("AUTO_REGISTER", "auto").lower()
@@ -603,6 +647,24 @@ def auto_register_and_login(page, request):
             
             username, email, password = pool_account
             logger.info(f"  🔄 第{retry_attempt+1}次尝试：使用账号池账号 {username}")
+            # 测试结束时归还租约（已被标记锁定的账号不会重复释放）
+            if request is not None:
+                request.addfinalizer(lambda u=username: release_test_account_to_pool(u))
+            
+            # ⚡ storageState缓存：会话仍有效时直接复用，无需走UI登录
+            # ⚡ HTTP登录引擎：缓存未命中时通过HTTP获取cookie，不渲染登录表单
+            restored = not force_ui_login and restore_cached_session(page, username)
+            if restored or (not force_ui_login and login_via_http(page, username, password)[0]):
+                if not restored:
+                    save_session_to_cache(page, username)
+                logger.info("=" * 80)
+                logger.info("")
+                logger.info("📋 使用的账号信息：")
+                logger.info(f"   用户名: {username}")
+                logger.info(f"   邮箱: {email}")
+                logger.info(f"   密码: {password}")
+                logger.info("")
+                return (username, email, password)
             
             try:
                 # 使用账号池账号登录
@@ -669,6 +731,7 @@ def auto_register_and_login(page, request):
                     raise Exception(f"账号池账号登录失败，当前URL: {current_url}")
                 
                 logger.info("  ✅ 账号池账号登录成功")
+                save_session_to_cache(page, username)
                 logger.info("=" * 80)
                 logger.info("")
                 logger.info("📋 使用的账号信息：")
@@ -895,14 +958,17 @@ def logged_in_profile_page(page, test_data, request):
         
         # 检查是否已登录
         try:
+            valid_data = test_data["valid_login_data"][0]
             user_menu_visible = page.is_visible("button:has-text('Toggle user menu')", timeout=2000)
             if user_menu_visible:
                 logger.info("  检测到已登录，跳过登录流程")
+            elif login_via_http(page, valid_data["username"], valid_data["password"])[0]:
+                logger.info("  ⚡ 预设账号HTTP登录成功")
             else:
+                landing_page.navigate()
                 landing_page.click_sign_in()
                 login_page.wait_for_load()
                 
-                valid_data = test_data["valid_login_data"][0]
                 login_page.login(
                     username=valid_data["username"],
                     password=valid_data["password"]
@@ -5,6 +5,7 @@ ABP Framework Identity模块 - 用户管理功能
 """
 from playwright.sync_api import Page
 from tests.aevatar_station.pages.base_page import BasePage
+from utils.table_reader import column_values, find_row
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,8 @@ class AdminUsersPage(BasePage):
         self.TABLE_BODY = "tbody, [role='rowgroup']"
         self.TABLE_ROWS = "tbody tr"
         self.TABLE_CELLS = "td, [role='cell']"
+        # 列序号（read_table 返回的 cells 下标）
+        self.COL_INDEX_USERNAME = 1
         
         # 列头（实际UI: Actions, Username, Email, Active）
         self.COL_ACTIONS = "th:has-text('Actions'), [role='columnheader']:has-text('Actions')"
@@ -121,6 +124,10 @@ class AdminUsersPage(BasePage):
         
         # 加载状态
         self.LOADING_SPINNER = ".spinner, .loading, [role='progressbar']"
+        
+        # 后端接口：用户列表（搜索/翻页/增删改后列表会重新请求）、权限保存
+        self.USERS_API = "/api/identity/users"
+        self.PERMISSIONS_API = "/api/permission-management/permissions"
     
     def navigate(self):
         """导航到用户管理页面"""
@@ -155,6 +162,11 @@ class AdminUsersPage(BasePage):
         except Exception as e:
             logger.warning(f"等待表格加载超时: {e}")
     
+    def reload_list(self, action):
+        """执行会刷新用户列表的操作，等列表接口返回且表格渲染静止后返回"""
+        self.waits.for_response(self.USERS_API, action=action, method="GET", timeout=3000)
+        self.waits.for_dom_quiet(self.TABLE_BODY, quiet_ms=200, timeout=3000)
+    
     def get_user_count(self, refresh_first: bool = False) -> int:
         """获取用户列表行数"""
         try:
@@ -195,10 +207,9 @@ class AdminUsersPage(BasePage):
             self.page.fill(self.SEARCH_INPUT, keyword)
             # 尝试点击搜索按钮或按回车
             if self.is_visible(self.SEARCH_BUTTON, timeout=2000):
-                self.page.click(self.SEARCH_BUTTON)
+                self.reload_list(lambda: self.page.click(self.SEARCH_BUTTON))
             else:
-                self.page.press(self.SEARCH_INPUT, "Enter")
-            self.page.wait_for_timeout(1000)
+                self.reload_list(lambda: self.page.press(self.SEARCH_INPUT, "Enter"))
             logger.info("搜索完成")
         except Exception as e:
             logger.error(f"搜索用户失败: {e}")
@@ -208,7 +219,7 @@ class AdminUsersPage(BasePage):
         """点击新建用户按钮"""
         logger.info("点击新建用户按钮")
         self.page.click(self.NEW_USER_BUTTON)
-        self.page.wait_for_timeout(1000)
+        self.waits.for_dialog_open(self.DIALOG, timeout=5000)
     
     def is_dialog_open(self) -> bool:
         """检查对话框是否打开"""
@@ -237,9 +248,18 @@ class AdminUsersPage(BasePage):
             logger.error(f"填写用户表单失败: {e}")
             raise
     
-    def click_save(self):
-        """点击保存按钮 - 处理对话框内滚动问题"""
+    def click_save(self, timeout: int = 3000):
+        """
+        点击保存按钮并等待保存结果（对话框关闭或出现新的toast）
+        
+        Args:
+            timeout: 前端校验失败时对话框不会关闭也没有toast，最多等待的时间(毫秒)
+        """
         logger.info("点击保存按钮")
+        self._wait_for_save_result(timeout=timeout, action=self._press_save_button)
+    
+    def _press_save_button(self):
+        """点击对话框的Save按钮 - 处理对话框内滚动问题"""
         try:
             # 方式1: 使用JavaScript滚动对话框内容到底部并点击Save按钮
             try:
@@ -266,7 +286,6 @@ class AdminUsersPage(BasePage):
                     }
                 """)
                 if result:
-                    self.page.wait_for_timeout(1000)
                     return
             except Exception as e:
                 logger.debug(f"JavaScript点击失败: {e}")
@@ -276,7 +295,6 @@ class AdminUsersPage(BasePage):
                 save_btn = self.page.get_by_role("button", name="Save")
                 save_btn.scroll_into_view_if_needed(timeout=3000)
                 save_btn.click(force=True, timeout=5000)
-                self.page.wait_for_timeout(1000)
                 return
             except Exception as e:
                 logger.debug(f"getByRole点击失败: {e}")
@@ -285,7 +303,6 @@ class AdminUsersPage(BasePage):
             try:
                 save_btn = self.page.locator(self.DIALOG_SAVE).first
                 save_btn.click(force=True, timeout=5000)
-                self.page.wait_for_timeout(1000)
                 return
             except Exception as e:
                 logger.debug(f"locator force点击失败: {e}")
@@ -293,18 +310,22 @@ class AdminUsersPage(BasePage):
             # 方式4: 使用键盘快捷键提交（如果支持）
             try:
                 self.page.keyboard.press("Enter")
-                self.page.wait_for_timeout(1000)
             except:
                 pass
                 
         except Exception as e:
             logger.error(f"点击保存按钮失败: {e}")
     
+    def _wait_for_save_result(self, timeout: int = 3000, action=None):
+        """等待保存结果：对话框关闭或出现新的toast（前端校验失败时两者都不会发生，最多等待timeout）"""
+        if not self.waits.for_dialog_result(self.DIALOG, timeout=timeout, action=action):
+            logger.debug("保存后对话框未关闭且无toast，可能是表单校验失败")
+    
     def click_cancel(self):
         """点击取消按钮"""
         logger.info("点击取消按钮")
         self.page.click(self.DIALOG_CANCEL)
-        self.page.wait_for_timeout(1000)
+        self.waits.for_dialog_closed(self.DIALOG, timeout=5000)
     
     def open_user_actions(self, row_index: int = 0):
         """打开指定行的操作菜单"""
@@ -314,7 +335,7 @@ class AdminUsersPage(BasePage):
             if row_index < len(rows):
                 action_btn = rows[row_index].locator(self.ACTION_DROPDOWN).first
                 action_btn.click()
-                self.page.wait_for_timeout(500)
+                self.waits.for_visible(self.ACTION_MENU, timeout=3000)
                 logger.info("操作菜单已打开")
             else:
                 logger.warning(f"行索引{row_index}超出范围")
@@ -327,21 +348,21 @@ class AdminUsersPage(BasePage):
         logger.info(f"编辑第{row_index + 1}行用户")
         self.open_user_actions(row_index)
         self.page.click(self.ACTION_EDIT)
-        self.page.wait_for_timeout(1000)
+        self.waits.for_dialog_open(self.DIALOG, timeout=5000)
     
     def click_delete_user(self, row_index: int = 0):
         """删除用户"""
         logger.info(f"删除第{row_index + 1}行用户")
         self.open_user_actions(row_index)
         self.page.click(self.ACTION_DELETE)
-        self.page.wait_for_timeout(1000)
+        self.waits.for_dialog_open(self.CONFIRM_DIALOG, timeout=5000)
     
     def click_user_permissions(self, row_index: int = 0):
         """打开用户权限 - 使用Permission菜单项"""
         logger.info(f"打开第{row_index + 1}行用户权限")
         self.open_user_actions(row_index)
         self.page.click(self.ACTION_PERMISSION)
-        self.page.wait_for_timeout(2000)
+        self.waits.for_visible(self.PERMISSION_PAGE_TITLE, timeout=10000)
     
     def is_permission_page_loaded(self) -> bool:
         """检查权限管理页面是否加载"""
@@ -357,18 +378,11 @@ class AdminUsersPage(BasePage):
             handle_unsaved: 是否处理未保存更改的对话框（默认点击确认离开）
         """
         logger.info("点击权限页面返回按钮")
-        self.page.click(self.PERMISSION_BACK_BUTTON)
-        
-        # 处理可能出现的未保存更改确认对话框
+        # 未保存更改的confirm对话框在点击时弹出，处理器需要先注册
         if handle_unsaved:
-            try:
-                self.page.wait_for_timeout(500)
-                # 检查是否有confirm对话框，如果有就接受
-                self.page.on("dialog", lambda dialog: dialog.accept())
-            except:
-                pass
-        
-        self.page.wait_for_timeout(1000)
+            self.page.once("dialog", lambda dialog: dialog.accept())
+        self.page.click(self.PERMISSION_BACK_BUTTON)
+        self.waits.for_hidden(self.PERMISSION_PAGE_TITLE, timeout=3000)
     
     def get_permission_summary(self) -> dict:
         """获取权限摘要信息
@@ -418,7 +432,7 @@ class AdminUsersPage(BasePage):
         """点击Grant All按钮授予所有权限"""
         logger.info("点击Grant All按钮")
         self.page.click(self.PERMISSION_GRANT_ALL)
-        self.page.wait_for_timeout(1000)
+        self.waits.for_dom_quiet(quiet_ms=200, timeout=2000)
     
     def click_permission_save(self):
         """点击Save Changes按钮保存权限更改"""
@@ -426,8 +440,8 @@ class AdminUsersPage(BasePage):
         try:
             save_btn = self.page.locator(self.PERMISSION_SAVE)
             if save_btn.is_enabled(timeout=2000):
-                save_btn.click()
-                self.page.wait_for_timeout(2000)
+                self.waits.for_response(self.PERMISSIONS_API, action=save_btn.click, method="PUT", timeout=5000)
+                self.waits.for_dom_quiet(quiet_ms=200, timeout=2000)
                 return True
             else:
                 logger.warning("Save Changes按钮不可用")
@@ -440,7 +454,7 @@ class AdminUsersPage(BasePage):
         """点击Cancel按钮取消权限更改"""
         logger.info("点击Cancel按钮")
         self.page.click(self.PERMISSION_CANCEL)
-        self.page.wait_for_timeout(1000)
+        self.waits.for_dom_quiet(quiet_ms=200, timeout=2000)
     
     def grant_permission_by_name(self, permission_name: str) -> bool:
         """授予指定名称的权限
@@ -461,7 +475,7 @@ class AdminUsersPage(BasePage):
                 grant_btn = parent.locator("button:has-text('Grant')").first
                 if grant_btn.is_visible(timeout=2000):
                     grant_btn.click()
-                    self.page.wait_for_timeout(500)
+                    self.waits.for_dom_quiet(self.PERMISSION_TABPANEL, quiet_ms=150, timeout=1000)
                     logger.info(f"已授予权限: {permission_name}")
                     return True
             logger.warning(f"未找到权限或Grant按钮: {permission_name}")
@@ -487,7 +501,7 @@ class AdminUsersPage(BasePage):
                 revoke_btn = parent.locator("button:has-text('Revoke')").first
                 if revoke_btn.is_visible(timeout=2000):
                     revoke_btn.click()
-                    self.page.wait_for_timeout(500)
+                    self.waits.for_dom_quiet(self.PERMISSION_TABPANEL, quiet_ms=150, timeout=1000)
                     logger.info(f"已撤销权限: {permission_name}")
                     return True
             logger.warning(f"未找到权限或Revoke按钮: {permission_name}")
@@ -506,7 +520,7 @@ class AdminUsersPage(BasePage):
         try:
             tab = self.page.get_by_role("tab", name=tab_name).first
             tab.click()
-            self.page.wait_for_timeout(500)
+            self.waits.for_dom_quiet(self.PERMISSION_TABPANEL, quiet_ms=150, timeout=1000)
         except Exception as e:
             logger.error(f"点击Tab失败: {e}")
     
@@ -577,7 +591,7 @@ class AdminUsersPage(BasePage):
                 name = name_elem.text_content() if name_elem.is_visible() else ""
                 
                 grant_btn.click()
-                self.page.wait_for_timeout(500)
+                self.waits.for_dom_quiet(self.PERMISSION_TABPANEL, quiet_ms=150, timeout=1000)
                 logger.info(f"已授予权限: {name}")
                 return name.strip() if name else "unknown"
             logger.info("没有可用的Grant按钮")
@@ -601,7 +615,7 @@ class AdminUsersPage(BasePage):
                 name = name_elem.text_content() if name_elem.is_visible() else ""
                 
                 revoke_btn.click()
-                self.page.wait_for_timeout(500)
+                self.waits.for_dom_quiet(self.PERMISSION_TABPANEL, quiet_ms=150, timeout=1000)
                 logger.info(f"已撤销权限: {name}")
                 return name.strip() if name else "unknown"
             logger.info("没有可用的Revoke按钮")
@@ -625,13 +639,13 @@ class AdminUsersPage(BasePage):
         """确认操作（点击Yes按钮）"""
         logger.info("确认操作")
         self.page.click(self.CONFIRM_YES)
-        self.page.wait_for_timeout(1000)
+        self.waits.for_dialog_closed(self.CONFIRM_DIALOG, timeout=5000)
     
     def cancel_confirm(self):
         """取消确认（点击Cancel按钮）"""
         logger.info("取消确认操作")
         self.page.click(self.CONFIRM_NO)
-        self.page.wait_for_timeout(500)
+        self.waits.for_dialog_closed(self.CONFIRM_DIALOG, timeout=3000)
     
     def get_dialog_title(self) -> str:
         """获取对话框标题"""
@@ -644,7 +658,7 @@ class AdminUsersPage(BasePage):
         """点击对话框关闭按钮"""
         logger.info("点击对话框关闭按钮")
         self.page.click(self.DIALOG_CLOSE)
-        self.page.wait_for_timeout(500)
+        self.waits.for_dialog_closed(self.DIALOG, timeout=3000)
     
     def fill_create_user_form(self, username: str, password: str, email: str,
                                name: str = "", surname: str = "", phone: str = ""):
@@ -687,26 +701,22 @@ class AdminUsersPage(BasePage):
         """点击编辑对话框的Roles Tab"""
         logger.info("切换到Roles Tab")
         self.page.get_by_role("tab", name="Roles").click()
-        self.page.wait_for_timeout(500)
+        self.waits.for_dom_quiet(self.DIALOG, quiet_ms=200, timeout=2000)
     
     def click_edit_tab_user_info(self):
         """点击编辑对话框的User Information Tab"""
         logger.info("切换到User Information Tab")
         self.page.get_by_role("tab", name="User Information").click()
-        self.page.wait_for_timeout(500)
+        self.waits.for_dom_quiet(self.DIALOG, quiet_ms=200, timeout=2000)
     
     def find_user_by_username(self, username: str) -> int:
         """根据用户名查找用户行索引，返回-1表示未找到"""
         logger.info(f"查找用户: {username}")
         try:
-            rows = self.page.locator(self.TABLE_ROWS).all()
-            for i, row in enumerate(rows):
-                cells = row.locator(self.TABLE_CELLS).all()
-                if len(cells) > 1:
-                    cell_text = cells[1].text_content()
-                    if cell_text and username in cell_text:
-                        logger.info(f"找到用户 {username} 在第 {i+1} 行")
-                        return i
+            row = find_row(self.read_table(self.USERS_TABLE), self.COL_INDEX_USERNAME, username)
+            if row:
+                logger.info(f"找到用户 {username} 在第 {row['index']+1} 行")
+                return row["index"]
             logger.warning(f"未找到用户: {username}")
             return -1
         except Exception as e:
@@ -777,15 +787,14 @@ class AdminUsersPage(BasePage):
         """获取指定行的用户信息"""
         logger.info(f"获取第{row_index + 1}行用户信息")
         try:
-            rows = self.page.locator(self.TABLE_ROWS).all()
+            rows = self.read_table(self.USERS_TABLE)["rows"]
             if row_index < len(rows):
-                row = rows[row_index]
-                cells = row.locator(self.TABLE_CELLS).all()
+                cells = rows[row_index]["cells"]
                 # ABP标准用户列表结构
                 user_info = {
-                    "username": cells[1].text_content() if len(cells) > 1 else "",
-                    "email": cells[2].text_content() if len(cells) > 2 else "",
-                    "phone": cells[3].text_content() if len(cells) > 3 else "",
+                    "username": cells[1] if len(cells) > 1 else "",
+                    "email": cells[2] if len(cells) > 2 else "",
+                    "phone": cells[3] if len(cells) > 3 else "",
                 }
                 logger.info(f"用户信息: {user_info}")
                 return user_info
@@ -800,22 +809,19 @@ class AdminUsersPage(BasePage):
         """更改每页显示数量"""
         logger.info(f"更改每页显示数量为: {size}")
         try:
-            self.page.select_option(self.PAGE_SIZE_SELECT, str(size))
-            self.page.wait_for_timeout(1000)
+            self.reload_list(lambda: self.page.select_option(self.PAGE_SIZE_SELECT, str(size)))
         except Exception as e:
             logger.error(f"更改分页大小失败: {e}")
     
     def go_to_next_page(self):
         """翻到下一页"""
         logger.info("翻到下一页")
-        self.page.click(self.NEXT_PAGE_BUTTON)
-        self.page.wait_for_timeout(1000)
+        self.reload_list(lambda: self.page.click(self.NEXT_PAGE_BUTTON))
     
     def go_to_prev_page(self):
         """翻到上一页"""
         logger.info("翻到上一页")
-        self.page.click(self.PREV_PAGE_BUTTON)
-        self.page.wait_for_timeout(1000)
+        self.reload_list(lambda: self.page.click(self.PREV_PAGE_BUTTON))
     
     def is_new_user_button_visible(self) -> bool:
         """检查新建用户按钮是否可见"""
@@ -829,7 +835,7 @@ class AdminUsersPage(BasePage):
         """按ESC键"""
         logger.info("按下ESC键")
         self.page.keyboard.press("Escape")
-        self.page.wait_for_timeout(500)
+        self.waits.for_dialog_closed(timeout=2000)
     
     def take_screenshot(self, filename: str):
         """截图"""
@@ -850,7 +856,6 @@ class AdminUsersPage(BasePage):
         try:
             # 点击新建用户按钮
             self.click_new_user()
-            self.page.wait_for_timeout(1000)
             
             if not self.is_dialog_open():
                 logger.error("创建用户对话框未打开")
@@ -861,7 +866,6 @@ class AdminUsersPage(BasePage):
             
             # 点击保存
             self.click_save()
-            self.page.wait_for_timeout(2000)
             
             # 检查成功消息
             if self.is_success_message_visible():
@@ -893,7 +897,6 @@ class AdminUsersPage(BasePage):
         try:
             # 点击编辑
             self.click_edit_user(row_index)
-            self.page.wait_for_timeout(1500)
             
             if not self.is_dialog_open():
                 logger.error("编辑用户对话框未打开")
@@ -904,7 +907,6 @@ class AdminUsersPage(BasePage):
             
             # 点击保存
             self.click_save()
-            self.page.wait_for_timeout(2000)
             
             # 检查结果 - 对话框可能会保持打开或关闭
             if self.is_success_message_visible():
@@ -932,7 +934,6 @@ class AdminUsersPage(BasePage):
         try:
             # 点击删除
             self.click_delete_user(row_index)
-            self.page.wait_for_timeout(1000)
             
             # 检查确认对话框
             if not self.is_confirm_dialog_open():
@@ -941,7 +942,7 @@ class AdminUsersPage(BasePage):
             
             # 确认删除
             self.confirm_action()
-            self.page.wait_for_timeout(2000)
+            self.waits.for_toast(timeout=3000)
             
             # 检查成功消息
             if self.is_success_message_visible():
@@ -977,23 +978,16 @@ class AdminUsersPage(BasePage):
             # 使用搜索功能查找用户（解决分页问题）
             try:
                 self.search_user(username)
-                self.page.wait_for_timeout(1000)
                 
-                rows = self.page.locator(self.TABLE_ROWS).all()
-                for row in rows:
-                    cells = row.locator(self.TABLE_CELLS).all()
-                    if len(cells) > 1:
-                        cell_text = cells[1].text_content()
-                        if cell_text and username in cell_text:
-                            logger.info(f"搜索找到用户: {username}")
-                            # 清除搜索
-                            self.clear_search()
-                            self.page.wait_for_timeout(500)
-                            return True
+                # 搜索结果整表一次读取，用户名在第2列
+                if find_row(self.read_table(self.USERS_TABLE), self.COL_INDEX_USERNAME, username):
+                    logger.info(f"搜索找到用户: {username}")
+                    # 清除搜索
+                    self.clear_search()
+                    return True
                 
                 # 清除搜索
                 self.clear_search()
-                self.page.wait_for_timeout(500)
                 logger.info(f"搜索未找到用户: {username}")
                 return False
             except Exception as e:
@@ -1023,10 +1017,8 @@ class AdminUsersPage(BasePage):
         try:
             search_input = self.page.locator(self.SEARCH_INPUT)
             search_input.fill("")
-            self.page.wait_for_timeout(500)
             # 可能需要按回车来清除过滤
-            search_input.press("Enter")
-            self.page.wait_for_timeout(1000)
+            self.reload_list(lambda: search_input.press("Enter"))
         except Exception as e:
             logger.warning(f"清空搜索框失败: {e}")
     
@@ -1035,13 +1027,8 @@ class AdminUsersPage(BasePage):
         logger.info("获取所有用户名")
         usernames = []
         try:
-            rows = self.page.locator(self.TABLE_ROWS).all()
-            for row in rows:
-                cells = row.locator(self.TABLE_CELLS).all()
-                if len(cells) > 1:
-                    username = cells[1].text_content()
-                    if username:
-                        usernames.append(username.strip())
+            table = self.read_table(self.USERS_TABLE)
+            usernames = [name for name in column_values(table, self.COL_INDEX_USERNAME) if name]
             logger.info(f"找到 {len(usernames)} 个用户")
             return usernames
         except Exception as e:
@@ -1054,5 +1041,4 @@ class AdminUsersPage(BasePage):
         """
         logger.info(f"搜索关键词: {keyword}")
         self.search_user(keyword)
-        self.page.wait_for_timeout(2000)
         return self.get_all_usernames()
@@ -5,6 +5,11 @@ BasePage - 所有页面对象的基类
 from playwright.sync_api import Page, expect
 import logging
 
+from utils.selector_resolver import SelectorResolver
+from utils.table_reader import read_table
+from utils.validation_probe import probe_validation
+from utils.wait_engine import WaitEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,6 +21,10 @@ class BasePage:
         # 使用http而不是https，避免SSL证书问题
         self.base_url = "http://localhost:3000"
         self.auth_url = "http://localhost:3000"
+        # 事件驱动等待：条件满足即返回，替代固定的wait_for_timeout
+        self.waits = WaitEngine(page)
+        # 候选选择器同时等待，记录每个页面上的胜出者
+        self.resolver = SelectorResolver(page)
     
     def navigate_to(self, path=""):
         """导航到指定路径"""
@@ -28,8 +37,8 @@ class BasePage:
         logger.info("等待页面加载完成")
         # 不使用networkidle，因为它会因长轮询/WebSocket/后台请求而卡住
         self.page.wait_for_load_state("domcontentloaded", timeout=timeout)
-        # 额外等待让JS初始化
-        self.page.wait_for_timeout(1000)
+        # 等待SPA首屏渲染完成（DOM静止），最多3秒，代替固定等待1秒
+        self.waits.for_dom_quiet(quiet_ms=300, timeout=3000)
     
     def handle_ssl_warning(self):
         """处理SSL证书警告"""
@@ -110,6 +119,17 @@ class BasePage:
         """获取元素文本"""
         return self.page.text_content(selector, timeout=timeout)
 
+    def read_table(self, selector, timeout=5000):
+        """一次evaluate读取整张表格：{"headers": [...], "rows": [{"index", "cells", "attrs"}]}"""
+        return read_table(self.page, selector, timeout)
+
+    def probe_validation(self, selector, values, restore=True):
+        """
+        一次evaluate探测一批候选值的客户端校验结果（不提交表单）
+        返回与values顺序一致的 {"value", "valid", "message", ...}；valid为False的值已被客户端拦截，无需再保存
+        """
+        return probe_validation(self.page, selector, values, restore=restore)
+
     def is_visible(self, selector, timeout=5000):
         """检查元素是否可见"""
         try:
@@ -196,12 +216,12 @@ class BasePage:
                 "[data-testid='user-menu-button']"
             ]
             
-            for selector in user_menu_selectors:
-                if self.is_visible(selector, timeout=2000):
-                    logger.info(f"找到用户菜单按钮: {selector}")
-                    self.click_element(selector)
-                    self.page.wait_for_timeout(1000)
-                    break
+            found = self.resolver.resolve(user_menu_selectors, key="user_menu_button", timeout=2000)
+            if found:
+                selector, button = found
+                logger.info(f"找到用户菜单按钮: {selector}")
+                button.click()
+                self.page.wait_for_timeout(1000)
             
             # 点击Logout/Sign Out按钮
             logout_selectors = [
@@ -213,11 +233,11 @@ class BasePage:
                 "[role='menuitem']:has-text('Sign out')"
             ]
             
-            for selector in logout_selectors:
-                if self.is_visible(selector, timeout=2000):
-                    logger.info(f"找到退出按钮: {selector}")
-                    self.click_element(selector)
-                    break
+            found = self.resolver.resolve(logout_selectors, key="logout_button", timeout=2000)
+            if found:
+                selector, button = found
+                logger.info(f"找到退出按钮: {selector}")
+                button.click()
             
             # 等待跳转到首页或登录页
             self.page.wait_for_timeout(2000)
@@ -70,6 +70,21 @@ class LandingPage(BasePage):
         """检查用户是否已登录"""
         return self.is_visible(self.USER_MENU_BUTTON, timeout=5000)
     
+    def wait_for_auth_state(self, timeout=10000):
+        """
+        等待页面渲染出登录态（用户菜单或Sign In按钮任一出现）
+        
+        Returns:
+            bool: 是否已登录（用户菜单可见）
+        """
+        try:
+            self.page.locator(f"{self.USER_MENU_BUTTON}, {self.SIGN_IN_BUTTON}").first.wait_for(
+                state="visible", timeout=timeout
+            )
+        except Exception:
+            return False
+        return self.page.locator(self.USER_MENU_BUTTON).first.is_visible()
+    
     def is_user_menu_visible(self):
         """检查用户菜单按钮是否可见"""
         return self.is_visible(self.USER_MENU_BUTTON)
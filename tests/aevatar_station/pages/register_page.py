@@ -246,6 +246,18 @@ class RegisterPage(BasePage):
             logger.error(f"检查字段验证状态失败: {e}")
             return False
     
+    def probe_usernames(self, values) -> list:
+        """一次evaluate探测一批用户名的客户端校验结果（见 BasePage.probe_validation）"""
+        return self.probe_validation(self.USERNAME_INPUT, values)
+    
+    def probe_emails(self, values) -> list:
+        """一次evaluate探测一批邮箱的客户端校验结果"""
+        return self.probe_validation(self.EMAIL_INPUT, values)
+    
+    def probe_passwords(self, values) -> list:
+        """一次evaluate探测一批密码的客户端校验结果"""
+        return self.probe_validation(self.PASSWORD_INPUT, values)
+    
     def is_username_valid(self) -> bool:
         """检查用户名字段是否有效
         
@@ -0,0 +1,216 @@
+"""
+个人设置字段验证场景注册表
+每个字段的场景表（输入值、预期是否保存、预期是否报错）集中定义在这里，
+测试模块通过 field_scenarios() 把每个场景展开成独立的参数化用例，xdist可以把同一字段的场景分配到不同worker。
+
+场景值可以是字符串或无参函数：需要唯一性的值（用户名、邮箱、超长边界值）用函数在用例执行时生成，
+保证所有worker收集到的用例ID一致、而每次执行的值不同
+"""
+import uuid
+
+import pytest
+
+
+def rand(length=6):
+    """随机十六进制串（uuid4），用于生成不冲突的用户名/邮箱"""
+    return uuid.uuid4().hex[:length]
+
+
+# ============================================================================
+# 字段定义
+#   input: ProfileSettingsPage 上的输入框属性名
+#   getter: 读取字段值的方法名
+#   required: 必填字段；非必填字段保存空值/仅空格时被trim为空也视为保存成功
+#   companions: 提交前需要保持有效的其他字段 (输入框属性名, 读取方法名, 原值为空时的兜底值)
+# ============================================================================
+FIELD_SPECS = {
+    "username": {
+        "case_id": "TC-VALID-USERNAME-001",
+        "label": "Username",
+        "rule": "1-256字符，必填，^[a-zA-Z0-9_.@-]+$",
+        "input": "USERNAME_INPUT",
+        "getter": "get_username_value",
+        "required": True,
+        "companions": [],
+    },
+    "name": {
+        "case_id": "TC-VALID-NAME-001",
+        "label": "Name",
+        "rule": "MaxNameLength=64, 非必填, 几乎无格式限制",
+        "input": "NAME_INPUT",
+        "getter": "get_name_value",
+        "required": False,
+        "companions": [("SURNAME_INPUT", "get_surname_value", "TestSurname")],
+    },
+    "surname": {
+        "case_id": "TC-VALID-SURNAME-001",
+        "label": "Surname",
+        "rule": "MaxSurnameLength=64, 非必填, 几乎无格式限制",
+        "input": "SURNAME_INPUT",
+        "getter": "get_surname_value",
+        "required": False,
+        "companions": [("NAME_INPUT", "get_name_value", "TestName")],
+    },
+    "email": {
+        "case_id": "TC-VALID-EMAIL-001",
+        "label": "Email",
+        "rule": "3-256字符，必填，标准邮箱格式",
+        "input": "EMAIL_INPUT",
+        "getter": "get_email_value",
+        "required": True,
+        "companions": [],
+    },
+    "phone": {
+        "case_id": "TC-VALID-PHONE-001",
+        "label": "PhoneNumber",
+        "rule": "MaxPhoneNumberLength=16, 非必填, 后端无格式验证",
+        "input": "PHONE_INPUT",
+        "getter": "get_phone_value",
+        "required": False,
+        "companions": [
+            ("NAME_INPUT", "get_name_value", "TestName"),
+            ("SURNAME_INPUT", "get_surname_value", "TestSurname"),
+        ],
+    },
+}
+
+
+def _scenario(type_, name, value, should_save, should_error, description, expected):
+    return {
+        "type": type_,
+        "name": name,
+        "value": value,
+        "should_save": should_save,
+        "should_error": should_error,
+        "description": description,
+        "expected": expected,
+    }
+
+
+# ============================================================================
+# 场景表
+# ============================================================================
+SCENARIOS = {
+    "username": [
+        # ========== 1. 格式验证-有效（5个场景） ==========
+        _scenario("format_valid", "普通英文用户名", lambda: f"TestUser{rand()}", True, False, "纯英文字母（符合正则）", "成功保存"),
+        _scenario("format_valid", "带数字下划线", lambda: f"user_123_{rand()}", True, False, "英文+数字+下划线（符合正则）", "成功保存"),
+        _scenario("format_valid", "带点和连字符", lambda: f"test.user-name.{rand()}", True, False, "英文+点+连字符（符合正则）", "成功保存"),
+        _scenario("format_valid", "包含@符号", lambda: f"user@{rand()}.com", True, False, "包含@符号（作为用户名允许）", "成功保存"),
+        _scenario("format_valid", "纯数字", lambda: f"123456{rand(6)}", True, False, "纯数字（符合正则）", "成功保存"),
+        # ========== 2. 格式验证-无效（4个场景） ==========
+        _scenario("format_invalid", "包含空格", lambda: f"user {rand()} name", False, True, "包含空格（不符合正则）", "显示错误提示"),
+        _scenario("format_invalid", "特殊字符1", lambda: f"user{rand()}!@#$%", False, True, "包含!@#$%（不符合正则）", "显示错误提示"),
+        _scenario("format_invalid", "特殊字符2", lambda: f"user{rand()}*&^", False, True, "包含*&^（不符合正则）", "显示错误提示"),
+        _scenario("format_invalid", "中文字符", lambda: f"测试用户{rand()}", False, True, "包含中文（不符合正则）", "后端拒绝（无前端提示）"),
+        # ========== 3. 长度验证（5个场景） ==========
+        _scenario("length_min", "最小长度1字符", lambda: rand(1), True, False, "最小有效长度（边界值）", "成功保存"),
+        _scenario("length_normal", "正常长度50字符", lambda: (rand(8) + "u" * 50)[:50], True, False, "正常长度", "成功保存"),
+        _scenario("length_max", "最大长度256字符", lambda: (rand(8) + "x" * 256)[:256], True, False, "最大允许长度（边界值）", "成功保存"),
+        _scenario("length_over", "超长257字符", lambda: (rand(8) + "y" * 300)[:257], False, True, "超过最大长度（边界值+1）", "显示错误提示"),
+        _scenario("length_over", "极长300字符", lambda: (rand(8) + "z" * 400)[:300], False, True, "远超最大长度", "显示错误提示"),
+        # ========== 4. 必填验证（1个场景） ==========
+        _scenario("required_empty", "空值验证", "", False, True, "空值（必填字段）", "显示必填错误"),
+    ],
+    "name": [
+        # ========== 1. 格式验证-有效（5个场景） ==========
+        _scenario("format_valid", "纯英文", "John", True, False, "纯英文名字（有效）", "成功保存"),
+        _scenario("format_valid", "纯中文", "张三", True, False, "纯中文名字（有效）", "成功保存"),
+        _scenario("format_valid", "混合字符", "Test测试123!@#", True, False, "混合中英文数字特殊字符（有效）", "成功保存"),
+        _scenario("format_valid", "带撇号", "O'Brien", True, False, "包含撇号的名字（有效）", "成功保存"),
+        _scenario("format_valid", "纯数字", "123456", True, False, "纯数字（有效）", "成功保存"),
+        # ========== 2. 长度验证（5个场景） ==========
+        _scenario("length_empty", "空值允许", "", True, False, "空值（非必填，允许为空）", "成功保存（空值）"),
+        _scenario("length_min", "最小长度1字符", "A", True, False, "最小长度（边界值）", "成功保存"),
+        _scenario("length_normal", "正常长度", "NormalName", True, False, "正常长度名字", "成功保存"),
+        _scenario("length_max", "最大长度64字符", lambda: (f"N{rand(8)}" + "N" * 60)[:64], True, False, "最大允许长度（边界值）", "成功保存"),
+        _scenario("length_over", "超长65字符", lambda: (f"X{rand(8)}" + "X" * 60)[:65], False, True, "超过最大长度（边界值+1）", "显示长度超出错误提示"),
+        # ========== 3. 特殊情况（2个场景） ==========
+        _scenario("special_spaces", "仅空格", "   ", True, False, "仅空格（可能被trim）", "可能保存或trim为空"),
+        _scenario("special_emoji", "Emoji字符", "😀Test", True, False, "包含Emoji（看系统支持）", "如果系统支持则保存"),
+    ],
+    "surname": [
+        # ========== 1. 格式验证-有效（5个场景） ==========
+        _scenario("format_valid", "纯英文", "Smith", True, False, "纯英文姓氏（有效）", "成功保存"),
+        _scenario("format_valid", "纯中文", "李", True, False, "纯中文姓氏（有效）", "成功保存"),
+        _scenario("format_valid", "带连字符", "Smith-Jones", True, False, "复合姓氏带连字符（有效）", "成功保存"),
+        _scenario("format_valid", "带撇号", "O'Brien", True, False, "包含撇号的姓氏（有效）", "成功保存"),
+        _scenario("format_valid", "带空格", "Von Neumann", True, False, "包含空格的复杂姓氏（有效）", "成功保存"),
+        # ========== 2. 长度验证（5个场景） ==========
+        _scenario("length_empty", "空值允许", "", True, False, "空值（非必填，允许为空）", "成功保存（空值）"),
+        _scenario("length_min", "最小长度1字符", "L", True, False, "最小长度（边界值）", "成功保存"),
+        _scenario("length_normal", "正常长度", "Johnson", True, False, "正常长度姓氏", "成功保存"),
+        _scenario("length_max", "最大长度64字符", lambda: (f"S{rand(8)}" + "S" * 60)[:64], True, False, "最大允许长度（边界值）", "成功保存"),
+        _scenario("length_over", "超长65字符", lambda: (f"T{rand(8)}" + "T" * 60)[:65], False, True, "超过最大长度（边界值+1）", "显示长度超出错误提示"),
+        # ========== 3. 特殊情况（2个场景） ==========
+        _scenario("special_spaces", "仅空格", "   ", True, False, "仅空格（可能被trim）", "可能保存或trim为空"),
+        _scenario("special_number", "纯数字", "789", True, False, "纯数字（验证是否允许）", "成功保存（如果允许）"),
+    ],
+    "email": [
+        # ========== 1. 格式验证-有效（5个场景） ==========
+        _scenario("format_valid", "标准邮箱", lambda: f"user{rand()}@example.com", True, False, "标准邮箱格式（有效）", "成功保存"),
+        _scenario("format_valid", "带点用户名", lambda: f"user.name.{rand()}@example.com", True, False, "用户名包含点（有效）", "成功保存"),
+        _scenario("format_valid", "带加号", lambda: f"user+tag{rand()}@example.com", True, False, "用户名包含加号（有效）", "成功保存"),
+        _scenario("format_valid", "子域名", lambda: f"test{rand()}@sub.example.org", True, False, "域名包含子域名（有效）", "成功保存"),
+        _scenario("format_valid", "带数字", lambda: f"user123{rand()}@domain456.com", True, False, "包含数字（有效）", "成功保存"),
+        # ========== 2. 格式验证-无效（3个场景） ==========
+        _scenario("format_invalid", "缺少@符号", "invalidemail.com", False, True, "缺少@符号（无效）", "保存失败，显示错误"),
+        _scenario("format_invalid", "缺少域名", "test@", False, True, "缺少域名部分（无效）", "保存失败，显示错误"),
+        _scenario("format_invalid", "缺少用户名", "@example.com", False, True, "缺少用户名部分（无效）", "保存失败，显示错误"),
+        # ========== 3. 长度验证（5个场景） ==========
+        _scenario("length_min", "最小长度3字符", "a@b", False, True, "格式虽然符合基本正则，但可能被认为无效", "显示无效错误"),
+        _scenario("length_normal", "正常长度", lambda: f"normaluser{rand()}@example.com", True, False, "正常长度邮箱", "成功保存"),
+        _scenario("length_max", "最大长度254字符",
+                  lambda: f"u{rand(10)}@" + "d" * 60 + "." + "d" * 60 + "." + "d" * 60 + "." + "d" * 55 + ".com",
+                  True, False, "最大允许长度（254字符-RFC标准）", "成功保存"),
+        _scenario("length_over", "超长257字符",
+                  lambda: f"x{rand(10)}@" + "d" * 60 + "." + "d" * 60 + "." + "d" * 60 + "." + "d" * 58 + ".com",
+                  False, True, "超过最大长度（边界值+1）", "显示错误提示"),
+        _scenario("length_over", "极长300字符",
+                  lambda: f"z{rand(10)}@" + "d" * 60 + "." + "d" * 60 + "." + "d" * 60 + "." + "d" * 60 + "." + "d" * 40 + ".com",
+                  False, True, "远超最大长度", "显示错误提示"),
+        # ========== 4. 边界/必填（2个场景） ==========
+        _scenario("format_boundary", "缺少顶级域名", "test@example", False, True, "缺少顶级域名", "显示错误提示"),
+        _scenario("required_empty", "空值验证", "", False, True, "空值（必填字段）", "显示必填错误"),
+    ],
+    "phone": [
+        # ========== 1. 格式验证（8个场景，后端无格式验证） ==========
+        _scenario("format_valid", "纯数字", "13800138000", True, False, "11位手机号", "成功保存"),
+        _scenario("format_valid", "国际格式", "+86 138001380", True, False, "国际格式+86（15字符内）", "成功保存"),
+        _scenario("format_valid", "括号格式", "(021)12345678", True, False, "带括号区号", "成功保存"),
+        _scenario("format_valid", "连字符格式", "138-0013-8000", True, False, "带连字符", "成功保存"),
+        _scenario("format_valid", "混合格式", "+86(138)001380", True, False, "混合符号（15字符内）", "成功保存"),
+        _scenario("format_valid", "包含字母", "138abc00138", True, False, "包含字母（后端允许）", "成功保存"),
+        _scenario("format_valid", "特殊字符", "138#00138000", True, False, "包含#号（后端允许，12字符）", "成功保存"),
+        _scenario("format_valid", "中文字符", "电话138", True, False, "包含中文（后端允许）", "成功保存"),
+        # ========== 2. 长度验证（5个场景） ==========
+        _scenario("length_empty", "空值允许", "", True, False, "空值（非必填）", "成功保存"),
+        _scenario("length_min", "最小1字符", "1", True, False, "最小长度", "成功保存"),
+        _scenario("length_normal", "正常11字符", "13800138000", True, False, "正常手机号", "成功保存"),
+        _scenario("length_max", "最大16字符", lambda: rand(16), True, False, "最大长度（边界值）", "成功保存"),
+        _scenario("length_over", "超长17字符", lambda: rand(17), False, True, "超过最大长度（后端拒绝）", "显示错误提示"),
+        # ========== 3. 特殊情况（1个场景） ==========
+        _scenario("special_spaces", "仅空格", "   ", True, False, "仅空格（可能trim）", "可能trim为空"),
+    ],
+}
+
+
+def resolve_value(scenario):
+    """取场景的实际输入值（函数形式的值在用例执行时才生成）"""
+    value = scenario["value"]
+    return value() if callable(value) else value
+
+
+def field_scenarios(field):
+    """
+    把字段的场景表展开为 pytest.param 列表
+
+    用例ID形如 username-03-format_valid：只含ASCII，所有worker收集结果一致
+    """
+    return [
+        pytest.param(
+            {**scenario, "field": field},
+            id=f"{field}-{idx:02d}-{scenario['type']}",
+        )
+        for idx, scenario in enumerate(SCENARIOS[field], 1)
+    ]
@@ -33,27 +33,30 @@ def admin_logged_in_emailing(browser, test_data):
     login_page = LoginPage(page)
     
     try:
-        landing_page.navigate()
-        landing_page.click_sign_in()
-        login_page.wait_for_load()
-        
         # 使用admin-test01账号
         admin_data = test_data["admin_login_data"][1]  # admin-test01
         logger.info(f"使用Admin账号登录: {admin_data['username']}")
         
-        page.fill("#LoginInput_UserNameOrEmailAddress", admin_data["username"])
-        page.fill("#LoginInput_Password", admin_data["password"])
-        page.click("button[type='submit']")
-        
-        # 等待登录完成
-        page.wait_for_function(
-            "() => !window.location.href.includes('/Account/Login')",
-            timeout=30000
-        )
-        logger.info(f"登录跳转完成，当前URL: {page.url}")
+        # ⚡ HTTP登录引擎：注入认证cookie跳过登录表单，失败时回退到UI登录
+        from tests.aevatar_station.conftest import login_via_http
+        if not login_via_http(page, admin_data["username"], admin_data["password"])[0]:
+            landing_page.navigate()
+            landing_page.click_sign_in()
+            login_page.wait_for_load()
+        
+            page.fill("#LoginInput_UserNameOrEmailAddress", admin_data["username"])
+            page.fill("#LoginInput_Password", admin_data["password"])
+            page.click("button[type='submit']")
+        
+            # 等待登录完成
+            page.wait_for_function(
+                "() => !window.location.href.includes('/Account/Login')",
+                timeout=30000
+            )
+            logger.info(f"登录跳转完成，当前URL: {page.url}")
         
-        landing_page.handle_ssl_warning()
-        page.wait_for_timeout(2000)
+            landing_page.handle_ssl_warning()
+            page.wait_for_timeout(2000)
         
         logger.info("管理员登录成功")
         
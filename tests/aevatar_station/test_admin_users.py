@@ -11,6 +11,7 @@ from datetime import datetime
 from tests.aevatar_station.pages.admin_users_page import AdminUsersPage
 from tests.aevatar_station.pages.landing_page import LandingPage
 from tests.aevatar_station.pages.login_page import LoginPage
+from utils.api_seeder import ApiSeedError
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,50 @@ def get_rand(length=6):
     return uuid.uuid4().hex[:length]
 
 
+def seed_user(users_page, seed, username, password="Test@123456", email=None, **fields) -> bool:
+    """
+    ⚡ 前置用户：通过API创建（测试结束后由seed统一删除），不经过新建用户对话框
+    后端接口不可用时回退到UI创建
+    """
+    try:
+        seed.create_user(username, email=email, password=password, **fields)
+    except ApiSeedError as e:
+        logger.warning(f"   API创建用户失败，回退到UI创建: {e}")
+        created = users_page.create_user(username=username, password=password, email=email or f"{username}@test.com", **fields)
+        return created
+    # 刷新列表显示新用户
+    users_page.page.reload()
+    users_page.wait_for_load()
+    return True
+
+
+def cleanup_user(users_page, seed, username):
+    """清理测试用户：通过API按用户名删除（不走UI删除确认流程），接口不可用或未找到用户时回退到UI删除"""
+    try:
+        deleted = seed.delete_user_by_username(username)
+    except ApiSeedError as e:
+        logger.warning(f"   API删除用户失败，回退到UI删除: {e}")
+        deleted = False
+    if not deleted:
+        users_page.delete_user_by_username(username)
+
+
+@pytest.fixture(scope="class")
+def pagination_users(api_seeder):
+    """
+    ⚡ 分页测试需要至少30个用户（多页）：不足时通过API批量补足，测试类结束后批量删除
+    """
+    seeder = api_seeder.child()
+    try:
+        missing = 30 - seeder.count_users()
+        if missing > 0:
+            seeder.create_users(f"page_{get_rand(4)}", missing)
+    except ApiSeedError as e:
+        logger.warning(f"API预置分页用户失败，使用现有数据: {e}")
+    yield
+    seeder.teardown()
+
+
 @pytest.fixture(scope="class")
 def admin_logged_in(browser, test_data):
     """管理员登录fixture"""
@@ -49,24 +94,27 @@ def admin_logged_in(browser, test_data):
     login_page = LoginPage(page)
     
     try:
-        landing_page.navigate()
-        landing_page.click_sign_in()
-        login_page.wait_for_load()
-        
         admin_data = test_data["admin_login_data"][1]
         logger.info(f"使用Admin账号登录: {admin_data['username']}")
         
-        page.fill("#LoginInput_UserNameOrEmailAddress", admin_data["username"])
-        page.fill("#LoginInput_Password", admin_data["password"])
-        page.click("button[type='submit']")
+        # ⚡ HTTP登录引擎：注入认证cookie跳过登录表单，失败时回退到UI登录
+        from tests.aevatar_station.conftest import login_via_http
+        if not login_via_http(page, admin_data["username"], admin_data["password"])[0]:
+            landing_page.navigate()
+            landing_page.click_sign_in()
+            login_page.wait_for_load()
         
-        page.wait_for_function(
-            "() => !window.location.href.includes('/Account/Login')",
-            timeout=30000
-        )
+            page.fill("#LoginInput_UserNameOrEmailAddress", admin_data["username"])
+            page.fill("#LoginInput_Password", admin_data["password"])
+            page.click("button[type='submit']")
         
-        landing_page.handle_ssl_warning()
-        page.wait_for_timeout(2000)
+            page.wait_for_function(
+                "() => !window.location.href.includes('/Account/Login')",
+                timeout=30000
+            )
+        
+            landing_page.handle_ssl_warning()
+            landing_page.waits.for_dom_quiet(quiet_ms=300, timeout=2000)
         logger.info("管理员登录成功")
         
         yield page
@@ -132,7 +180,6 @@ class TestAdminUsersCRUD:
         # Step 1: 创建前搜索验证用户不存在
         logger.info(f"   [Step 1] 创建前搜索: {test_username}")
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         users_page.take_screenshot(f"create_req_1_search_before_{ts}.png")
@@ -145,7 +192,6 @@ class TestAdminUsersCRUD:
         user_exists_before = users_page.find_user_by_username(test_username) >= 0
         logger.info(f"      创建前用户存在: {user_exists_before}")
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         # Step 2: 创建用户
         logger.info(f"   [Step 2] 创建用户")
@@ -157,7 +203,7 @@ class TestAdminUsersCRUD:
         
         # 检查成功toast
         success_toast = users_page.is_success_message_visible()
-        users_page.page.wait_for_timeout(1500)
+        users_page.waits.for_dom_quiet(quiet_ms=300, timeout=1500)  # 截图前等待页面稳定
         
         # 截图：创建后（带toast）
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -175,7 +221,6 @@ class TestAdminUsersCRUD:
         users_page.wait_for_table_load()
         
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         users_page.take_screenshot(f"create_req_3_search_after_{ts}.png")
@@ -199,7 +244,6 @@ class TestAdminUsersCRUD:
             logger.info(f"   ✓ 用户创建成功")
             # 清理
             users_page.clear_search()
-            users_page.page.wait_for_timeout(500)
             users_page.delete_user_by_username(test_username)
             logger.info("✅ TC-CRUD-001执行成功")
         else:
@@ -267,7 +311,7 @@ class TestAdminUsersCRUD:
         
         # 检查成功toast
         success_toast = users_page.is_success_message_visible()
-        users_page.page.wait_for_timeout(1500)
+        users_page.waits.for_dom_quiet(quiet_ms=300, timeout=1500)  # 截图前等待页面稳定
         
         # 截图：创建后
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -321,7 +365,7 @@ class TestAdminUsersCRUD:
     @pytest.mark.P1
     @pytest.mark.functional
     @pytest.mark.crud
-    def test_p1_edit_user_info(self, users_page):
+    def test_p1_edit_user_info(self, users_page, seed):
         """
         TC-CRUD-003: 编辑用户信息
         
@@ -355,14 +399,8 @@ class TestAdminUsersCRUD:
         
         # Step 1: 创建测试用户
         logger.info(f"   [Step 1] 创建测试用户: {test_username}")
-        users_page.create_user(
-            username=test_username,
-            password=test_password,
-            email=test_email,
-            name=original_name,
-            surname=original_surname
-        )
-        users_page.page.wait_for_timeout(2000)
+        seed_user(users_page, seed, test_username, password=test_password, email=test_email,
+                  name=original_name, surname=original_surname)
         users_page.wait_for_table_load()
         
         row_index = users_page.find_user_by_username(test_username)
@@ -380,10 +418,10 @@ class TestAdminUsersCRUD:
         # Step 2: 打开编辑对话框
         logger.info(f"   [Step 2] 打开编辑对话框")
         users_page.click_edit_user(row_index)
-        users_page.page.wait_for_timeout(1500)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1500)
         
         if not users_page.is_dialog_open():
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, "编辑对话框未打开"
         
         # 截图：编辑对话框打开时（编辑前的原始值）
@@ -407,7 +445,6 @@ class TestAdminUsersCRUD:
         logger.info(f"   [Step 3] 填写新值: Name={new_name}, Surname={new_surname}")
         name_field.fill(new_name)
         surname_field.fill(new_surname)
-        users_page.page.wait_for_timeout(500)
         
         # 截图：填写后
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -427,7 +464,6 @@ class TestAdminUsersCRUD:
         # Step 4: 点击保存
         logger.info(f"   [Step 4] 点击保存按钮")
         users_page.click_save()
-        users_page.page.wait_for_timeout(2000)
         
         # 检查成功toast
         success_toast = users_page.is_success_message_visible()
@@ -461,7 +497,6 @@ class TestAdminUsersCRUD:
             logger.info(f"      手机号字段值: {phone_value}")
             
             users_page.press_escape()
-            users_page.page.wait_for_timeout(1000)
         else:
             allure.attach.file(
                 f"screenshots/edit_step4_saved_{ts}.png",
@@ -472,7 +507,7 @@ class TestAdminUsersCRUD:
         # Step 5: 验证编辑结果 - 重新打开编辑对话框
         logger.info(f"   [Step 5] 验证编辑结果 - 重新打开编辑对话框")
         users_page.click_edit_user(row_index)
-        users_page.page.wait_for_timeout(1500)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1500)
         
         if users_page.is_dialog_open():
             name_field = users_page.page.get_by_role("textbox", name="Name", exact=True)
@@ -498,13 +533,13 @@ class TestAdminUsersCRUD:
             
             # 清理
             logger.info(f"   [Step 6] 清理: 删除测试用户 {test_username}")
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             
             # 断言
             assert current_name == new_name, f"Name应更新为'{new_name}'，实际为'{current_name}'"
             assert current_surname == new_surname, f"Surname应更新为'{new_surname}'，实际为'{current_surname}'"
         else:
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, "无法打开编辑对话框进行验证"
         
         logger.info("✅ TC-CRUD-003执行成功")
@@ -538,7 +573,6 @@ class TestAdminUsersCRUD:
         
         # 检查创建成功toast
         create_success_toast = users_page.is_success_message_visible()
-        users_page.page.wait_for_timeout(1500)
         
         # 刷新验证用户存在
         users_page.page.reload()
@@ -548,7 +582,6 @@ class TestAdminUsersCRUD:
         # Step 2: 删除前搜索验证用户存在
         logger.info(f"   [Step 2] 删除前搜索: {test_username}")
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         users_page.take_screenshot(f"delete_1_search_before_{ts}.png")
@@ -563,7 +596,6 @@ class TestAdminUsersCRUD:
         assert user_exists_before, f"测试用户{test_username}应存在"
         logger.info(f"      用户存在: {user_exists_before}")
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         # Step 3: 删除用户
         logger.info(f"   [Step 3] 删除用户: {test_username}")
@@ -571,7 +603,7 @@ class TestAdminUsersCRUD:
         
         # 检查删除成功toast
         delete_success_toast = users_page.is_success_message_visible()
-        users_page.page.wait_for_timeout(1500)
+        users_page.waits.for_dom_quiet(quiet_ms=300, timeout=1500)  # 截图前等待页面稳定
         
         # 截图：删除后（带toast）
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -589,7 +621,6 @@ class TestAdminUsersCRUD:
         users_page.wait_for_table_load()
         
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         users_page.take_screenshot(f"delete_3_search_after_{ts}.png")
@@ -612,7 +643,7 @@ class TestAdminUsersCRUD:
     
     @pytest.mark.P1
     @pytest.mark.functional
-    def test_p1_search_user_found(self, users_page):
+    def test_p1_search_user_found(self, users_page, seed):
         """
         TC-SEARCH-001: 搜索存在的用户
         """
@@ -627,8 +658,7 @@ class TestAdminUsersCRUD:
         logger.info(f"   测试数据: UserName={test_username}")
         
         # 创建测试用户
-        users_page.create_user(username=test_username, password="Test@123456", email=test_email)
-        users_page.page.wait_for_timeout(2000)
+        seed_user(users_page, seed, test_username, email=test_email)
         
         # 刷新验证用户存在
         users_page.page.reload()
@@ -640,7 +670,6 @@ class TestAdminUsersCRUD:
         
         # 清除之前的搜索，显示完整列表
         users_page.clear_search()
-        users_page.page.wait_for_timeout(1000)
         
         # 截图：搜索前
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -653,7 +682,6 @@ class TestAdminUsersCRUD:
         
         # 搜索
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1500)
         
         # 截图：搜索后
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -687,10 +715,9 @@ class TestAdminUsersCRUD:
         
         # 清空搜索
         users_page.clear_search()
-        users_page.page.wait_for_timeout(1500)
         
         # 清理
-        users_page.delete_user_by_username(test_username)
+        cleanup_user(users_page, seed, test_username)
         
         logger.info("✅ TC-SEARCH-001执行成功")
 
@@ -746,7 +773,6 @@ class TestAdminUsersValidation:
             
             # 创建用户
             success = users_page.create_user(username=username, password=password, email=email)
-            users_page.page.wait_for_timeout(1500)
             users_page.wait_for_table_load()
             
             created = users_page.is_user_in_list(username)
@@ -766,7 +792,6 @@ class TestAdminUsersValidation:
             if created:
                 logger.info(f"      ✓ 创建成功")
                 users_page.delete_user_by_username(username)
-                users_page.page.wait_for_timeout(1000)
             else:
                 logger.error(f"      ✗ 创建失败")
         
@@ -816,7 +841,7 @@ class TestAdminUsersValidation:
             
             # 打开创建对话框
             users_page.click_new_user()
-            users_page.page.wait_for_timeout(1000)
+            users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1000)
             
             # 填写表单
             users_page.fill_create_user_form(username=username, password=password, email=email)
@@ -832,7 +857,6 @@ class TestAdminUsersValidation:
             
             # 点击保存
             users_page.click_save()
-            users_page.page.wait_for_timeout(2000)
             
             # 检查是否出现成功toast
             success_toast_shown = users_page.is_success_message_visible()
@@ -846,7 +870,6 @@ class TestAdminUsersValidation:
             # 关闭对话框
             if users_page.is_dialog_open():
                 users_page.press_escape()
-                users_page.page.wait_for_timeout(500)
             
             # 刷新页面验证用户是否被创建
             users_page.page.reload()
@@ -857,7 +880,6 @@ class TestAdminUsersValidation:
             user_created = False
             try:
                 users_page.search_user(email)
-                users_page.page.wait_for_timeout(1000)
                 rows = users_page.page.locator(users_page.TABLE_ROWS).all()
                 for row in rows:
                     if email in row.text_content():
@@ -885,7 +907,6 @@ class TestAdminUsersValidation:
                 if user_created:
                     try:
                         users_page.search_user(email)
-                        users_page.page.wait_for_timeout(500)
                         # 找到并删除
                         rows = users_page.page.locator(users_page.TABLE_ROWS).all()
                         for i, row in enumerate(rows):
@@ -941,7 +962,7 @@ class TestAdminUsersValidation:
         
         # 打开创建对话框
         users_page.click_new_user()
-        users_page.page.wait_for_timeout(1000)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1000)
         
         # 只填写其他必填字段
         users_page.page.get_by_role("textbox", name="Password").fill(password)
@@ -958,7 +979,6 @@ class TestAdminUsersValidation:
         
         # 点击保存
         users_page.click_save()
-        users_page.page.wait_for_timeout(2000)
         
         # 检查是否出现成功toast
         success_toast = users_page.is_success_message_visible()
@@ -991,7 +1011,6 @@ class TestAdminUsersValidation:
             users_page.wait_for_table_load()
             # 搜索email来查找
             users_page.search_user(email)
-            users_page.page.wait_for_timeout(500)
             try:
                 rows = users_page.page.locator(users_page.TABLE_ROWS).all()
                 for i, row in enumerate(rows):
@@ -1013,7 +1032,6 @@ class TestAdminUsersValidation:
         users_page.wait_for_load()
         users_page.wait_for_table_load()
         users_page.search_user(email)
-        users_page.page.wait_for_timeout(500)
         
         user_created = False
         try:
@@ -1067,7 +1085,7 @@ class TestAdminUsersValidation:
             
             # 打开创建对话框
             users_page.click_new_user()
-            users_page.page.wait_for_timeout(1000)
+            users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1000)
             
             # 填写表单
             users_page.fill_create_user_form(username=username, password=password, email=email)
@@ -1083,7 +1101,6 @@ class TestAdminUsersValidation:
             
             # 点击保存
             users_page.click_save()
-            users_page.page.wait_for_timeout(2000)
             
             # 检查成功toast
             success_toast = users_page.is_success_message_visible()
@@ -1095,7 +1112,6 @@ class TestAdminUsersValidation:
             # 关闭对话框
             if users_page.is_dialog_open():
                 users_page.press_escape()
-                users_page.page.wait_for_timeout(500)
             
             users_page.wait_for_table_load()
             created = users_page.is_user_in_list(username)
@@ -1115,7 +1131,6 @@ class TestAdminUsersValidation:
                 logger.info(f"      ✓ 创建成功 (toast={success_toast}, exists={created})")
                 if created:
                     users_page.delete_user_by_username(username)
-                    users_page.page.wait_for_timeout(1000)
             else:
                 logger.error(f"      ✗ 创建失败")
         
@@ -1164,7 +1179,7 @@ class TestAdminUsersValidation:
             logger.info(f"      预期: 应被拒绝")
             
             users_page.click_new_user()
-            users_page.page.wait_for_timeout(1000)
+            users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1000)
             
             users_page.fill_create_user_form(username=username, password=password, email=email)
             
@@ -1178,7 +1193,6 @@ class TestAdminUsersValidation:
             )
             
             users_page.click_save()
-            users_page.page.wait_for_timeout(2000)
             
             # 检查是否出现成功toast
             success_toast_shown = users_page.is_success_message_visible()
@@ -1201,16 +1215,13 @@ class TestAdminUsersValidation:
                 # 关闭对话框并清理
                 if users_page.is_dialog_open():
                     users_page.press_escape()
-                users_page.page.wait_for_timeout(1000)
                 users_page.wait_for_table_load()
                 if users_page.is_user_in_list(username):
                     users_page.delete_user_by_username(username)
-                    users_page.page.wait_for_timeout(1000)
             else:
                 # 关闭对话框
                 if users_page.is_dialog_open():
                     users_page.press_escape()
-                    users_page.page.wait_for_timeout(500)
                 
                 users_page.wait_for_table_load()
                 
@@ -1226,7 +1237,6 @@ class TestAdminUsersValidation:
                     logger.error(f"      ✗ BUG: 无效Email'{email}'被错误接受")
                     bugs_found.append((email, scenario_name, username))
                     users_page.delete_user_by_username(username)
-                    users_page.page.wait_for_timeout(1000)
                 else:
                     allure.attach.file(
                         f"screenshots/email_invalid_{screenshot_idx}_after_{ts}.png",
@@ -1279,7 +1289,7 @@ class TestAdminUsersValidation:
             logger.info(f"      预期: {'成功创建' if should_succeed else '被拒绝'}")
             
             users_page.click_new_user()
-            users_page.page.wait_for_timeout(1000)
+            users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1000)
             
             users_page.page.get_by_role("textbox", name="User name").fill(username)
             if password:
@@ -1296,7 +1306,6 @@ class TestAdminUsersValidation:
             )
             
             users_page.click_save()
-            users_page.page.wait_for_timeout(2000)
             
             # 检查是否出现成功toast
             success_toast_shown = users_page.is_success_message_visible()
@@ -1325,7 +1334,6 @@ class TestAdminUsersValidation:
                 users_page.wait_for_table_load()
                 if users_page.is_user_in_list(username):
                     users_page.delete_user_by_username(username)
-                    users_page.page.wait_for_timeout(1000)
             else:
                 result = "被拒绝"
                 allure.attach.file(
@@ -1377,7 +1385,6 @@ class TestAdminUsersValidation:
             username=username1, password="Test@123456", email=f"{username1}@test.com",
             name="", surname="", phone=""
         )
-        users_page.page.wait_for_timeout(1500)
         users_page.wait_for_table_load()
         
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1391,7 +1398,6 @@ class TestAdminUsersValidation:
         if created1:
             logger.info("      ✓ 空值创建成功")
             users_page.delete_user_by_username(username1)
-            users_page.page.wait_for_timeout(1000)
         screenshot_idx += 1
         
         # 场景2：最大长度
@@ -1406,7 +1412,6 @@ class TestAdminUsersValidation:
             username=username2, password="Test@123456", email=f"{username2}@test.com",
             name=max_name, surname=max_surname, phone=max_phone
         )
-        users_page.page.wait_for_timeout(1500)
         users_page.wait_for_table_load()
         
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1420,7 +1425,6 @@ class TestAdminUsersValidation:
         if created2:
             logger.info("      ✓ 最大长度创建成功")
             users_page.delete_user_by_username(username2)
-            users_page.page.wait_for_timeout(1000)
         screenshot_idx += 1
         
         # 场景3：超长
@@ -1430,7 +1434,7 @@ class TestAdminUsersValidation:
         logger.info(f"      测试数据: Name={len(over_name)}字符（超过64字符限制）")
         
         users_page.click_new_user()
-        users_page.page.wait_for_timeout(1000)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1000)
         
         users_page.page.get_by_role("textbox", name="User name").fill(username3)
         users_page.page.get_by_role("textbox", name="Password").fill("Test@123456")
@@ -1446,7 +1450,6 @@ class TestAdminUsersValidation:
         )
         
         users_page.click_save()
-        users_page.page.wait_for_timeout(2000)
         
         # 检查成功toast
         success_toast = users_page.is_success_message_visible()
@@ -1493,7 +1496,7 @@ class TestAdminUsersValidation:
     
     @pytest.mark.P1
     @pytest.mark.validation
-    def test_p1_duplicate_username(self, users_page):
+    def test_p1_duplicate_username(self, users_page, seed):
         """
         TC-VALID-008: 重复用户名验证
         
@@ -1518,8 +1521,7 @@ class TestAdminUsersValidation:
         
         # Step 1: 创建第一个用户
         logger.info(f"   [Step 1] 创建第一个用户: {test_username}")
-        users_page.create_user(username=test_username, password="Test@123456", email=email1)
-        users_page.page.wait_for_timeout(2000)
+        seed_user(users_page, seed, test_username, email=email1)
         users_page.wait_for_table_load()
         
         # 验证第一个用户创建成功
@@ -1539,7 +1541,7 @@ class TestAdminUsersValidation:
         # Step 2: 尝试创建重复用户名的第二个用户
         logger.info(f"   [Step 2] 尝试创建重复用户名: UserName={test_username}, Email={email2}")
         users_page.click_new_user()
-        users_page.page.wait_for_timeout(1000)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1000)
         users_page.fill_create_user_form(username=test_username, password="Test@123456", email=email2)
         
         # 截图：填写重复用户名
@@ -1552,7 +1554,6 @@ class TestAdminUsersValidation:
         )
         
         users_page.click_save()
-        users_page.page.wait_for_timeout(2000)
         
         # 检查是否出现成功toast（如果出现，说明是bug）
         success_toast_shown = users_page.is_success_message_visible()
@@ -1576,17 +1577,15 @@ class TestAdminUsersValidation:
             # 关闭对话框
             if users_page.is_dialog_open():
                 users_page.press_escape()
-            users_page.page.wait_for_timeout(1000)
             # 清理
             users_page.wait_for_table_load()
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, f"BUG: 重复用户名'{test_username}'应被拒绝，但出现了成功toast"
         
         # 关闭对话框（如果还打开）
         if users_page.is_dialog_open():
             logger.info("      对话框保持打开（正确行为）")
             users_page.press_escape()
-            users_page.page.wait_for_timeout(1000)
         
         # 刷新页面验证
         users_page.page.reload()
@@ -1596,7 +1595,6 @@ class TestAdminUsersValidation:
         # 通过检查email2是否存在来判断第二个用户是否被创建（不使用件数）
         # 注意：由于用户名相同，需要通过搜索email2来判断
         users_page.search_user(email2)
-        users_page.page.wait_for_timeout(1000)
         
         # 检查搜索结果中是否有email2对应的用户
         user2_created = False
@@ -1625,7 +1623,7 @@ class TestAdminUsersValidation:
             )
             logger.error(f"   ✗ BUG: 重复用户名被错误接受")
             # 清理
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, f"BUG: 重复用户名'{test_username}'应被拒绝"
         else:
             allure.attach.file(
@@ -1635,13 +1633,13 @@ class TestAdminUsersValidation:
             )
             logger.info(f"   ✓ 重复用户名被正确拒绝")
             # 清理第一个用户
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
         
         logger.info("✅ TC-VALID-008执行成功")
     
     @pytest.mark.P1
     @pytest.mark.validation
-    def test_p1_duplicate_email(self, users_page):
+    def test_p1_duplicate_email(self, users_page, seed):
         """
         TC-VALID-009: 重复邮箱验证
         
@@ -1666,8 +1664,7 @@ class TestAdminUsersValidation:
         
         # Step 1: 创建第一个用户
         logger.info(f"   [Step 1] 创建第一个用户: {username1}")
-        users_page.create_user(username=username1, password="Test@123456", email=test_email)
-        users_page.page.wait_for_timeout(2000)
+        seed_user(users_page, seed, username1, email=test_email)
         users_page.wait_for_table_load()
         
         # 验证第一个用户创建成功
@@ -1687,7 +1684,7 @@ class TestAdminUsersValidation:
         # Step 2: 尝试创建重复邮箱的第二个用户
         logger.info(f"   [Step 2] 尝试创建重复邮箱: UserName={username2}, Email={test_email}")
         users_page.click_new_user()
-        users_page.page.wait_for_timeout(1000)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1000)
         users_page.fill_create_user_form(username=username2, password="Test@123456", email=test_email)
         
         # 截图：填写重复邮箱
@@ -1700,7 +1697,6 @@ class TestAdminUsersValidation:
         )
         
         users_page.click_save()
-        users_page.page.wait_for_timeout(2000)
         
         # 检查是否出现成功toast（如果出现，说明是bug）
         success_toast_shown = users_page.is_success_message_visible()
@@ -1724,22 +1720,19 @@ class TestAdminUsersValidation:
             # 关闭对话框
             if users_page.is_dialog_open():
                 users_page.press_escape()
-            users_page.page.wait_for_timeout(1000)
             # 清理可能创建的用户
             users_page.page.reload()
             users_page.wait_for_load()
             users_page.wait_for_table_load()
             if users_page.is_user_in_list(username2):
-                users_page.delete_user_by_username(username2)
-                users_page.page.wait_for_timeout(1000)
-            users_page.delete_user_by_username(username1)
+                cleanup_user(users_page, seed, username2)
+            cleanup_user(users_page, seed, username1)
             assert False, f"BUG: 重复邮箱'{test_email}'应被拒绝，但出现了成功toast"
         
         # 关闭对话框（如果还打开）
         if users_page.is_dialog_open():
             logger.info("      对话框保持打开（正确行为）")
             users_page.press_escape()
-            users_page.page.wait_for_timeout(1000)
         
         # 刷新页面验证
         users_page.page.reload()
@@ -1759,9 +1752,8 @@ class TestAdminUsersValidation:
             )
             logger.error(f"   ✗ BUG: 重复邮箱被错误接受")
             # 清理
-            users_page.delete_user_by_username(username2)
-            users_page.page.wait_for_timeout(1000)
-            users_page.delete_user_by_username(username1)
+            cleanup_user(users_page, seed, username2)
+            cleanup_user(users_page, seed, username1)
             assert False, f"BUG: 重复邮箱'{test_email}'应被拒绝，但用户被创建了"
         else:
             allure.attach.file(
@@ -1771,7 +1763,7 @@ class TestAdminUsersValidation:
             )
             logger.info(f"   ✓ 重复邮箱被正确拒绝")
             # 只清理第一个用户
-            users_page.delete_user_by_username(username1)
+            cleanup_user(users_page, seed, username1)
         
         logger.info("✅ TC-VALID-009执行成功")
     
@@ -1797,7 +1789,7 @@ class TestAdminUsersValidation:
         
         # 打开创建对话框
         users_page.click_new_user()
-        users_page.page.wait_for_timeout(1000)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1000)
         
         # 截图：空表单
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1810,7 +1802,6 @@ class TestAdminUsersValidation:
         
         # 直接点击保存
         users_page.click_save()
-        users_page.page.wait_for_timeout(2000)
         
         # 检查是否出现成功toast
         success_toast = users_page.is_success_message_visible()
@@ -1852,6 +1843,7 @@ class TestAdminUsersValidation:
 @pytest.mark.admin
 @pytest.mark.users
 @pytest.mark.pagination
+@pytest.mark.usefixtures("pagination_users")
 class TestAdminUsersPagination:
     """用户管理分页功能测试类"""
     
@@ -1938,8 +1930,7 @@ class TestAdminUsersPagination:
         
         if next_button.is_visible(timeout=2000) and next_button.is_enabled():
             logger.info("   点击下一页")
-            next_button.click()
-            users_page.page.wait_for_timeout(1500)
+            users_page.reload_list(next_button.click)
             users_page.wait_for_table_load()
             
             # 截图：第二页
@@ -1977,8 +1968,7 @@ class TestAdminUsersPagination:
             prev_button = users_page.page.locator("button[aria-label='Go to previous page'], button:has-text('Previous'), button:has-text('<'), .prev-page").first
             if prev_button.is_visible(timeout=2000) and prev_button.is_enabled():
                 logger.info("   点击上一页返回")
-                prev_button.click()
-                users_page.page.wait_for_timeout(1500)
+                users_page.reload_list(prev_button.click)
         else:
             logger.info("   下一页按钮不可用（可能只有一页数据）")
             allure.attach.file(
@@ -2022,8 +2012,7 @@ class TestAdminUsersPagination:
         if page_size_selector.is_visible(timeout=3000):
             # 尝试切换到不同的页面大小
             try:
-                page_size_selector.select_option("25")
-                users_page.page.wait_for_timeout(1500)
+                users_page.reload_list(lambda: page_size_selector.select_option("25"))
                 users_page.wait_for_table_load()
                 
                 new_rows = len(users_page.page.locator(users_page.TABLE_ROWS).all())
@@ -2095,8 +2084,7 @@ class TestAdminUsersPagination:
             logger.info(f"   下一页按钮: 可见=True, 启用={is_enabled}")
             
             if is_enabled:
-                next_button.click()
-                users_page.page.wait_for_timeout(1500)
+                users_page.reload_list(next_button.click)
                 users_page.wait_for_table_load()
                 
                 # 获取下一页第一个用户
@@ -2153,8 +2141,7 @@ class TestAdminUsersPagination:
         
         if next_button.is_visible(timeout=3000) and next_button.is_enabled():
             logger.info("   先跳转到下一页")
-            next_button.click()
-            users_page.page.wait_for_timeout(1500)
+            users_page.reload_list(next_button.click)
             users_page.wait_for_table_load()
         
         # 获取当前页第一个用户
@@ -2187,8 +2174,7 @@ class TestAdminUsersPagination:
             logger.info(f"   上一页按钮: 可见=True, 启用={is_enabled}")
             
             if is_enabled:
-                prev_button.click()
-                users_page.page.wait_for_timeout(1500)
+                users_page.reload_list(prev_button.click)
                 users_page.wait_for_table_load()
                 
                 # 获取上一页第一个用户
@@ -2246,8 +2232,7 @@ class TestAdminUsersPagination:
         # 点击两次下一页（如果可以）
         for i in range(2):
             if next_button.is_visible(timeout=2000) and next_button.is_enabled():
-                next_button.click()
-                users_page.page.wait_for_timeout(1000)
+                users_page.reload_list(next_button.click)
                 users_page.wait_for_table_load()
         
         # 获取当前页第一个用户
@@ -2280,8 +2265,7 @@ class TestAdminUsersPagination:
             logger.info(f"   第一页按钮: 可见=True, 启用={is_enabled}")
             
             if is_enabled:
-                first_button.click()
-                users_page.page.wait_for_timeout(1500)
+                users_page.reload_list(first_button.click)
                 users_page.wait_for_table_load()
                 
                 # 获取第一页第一个用户
@@ -2312,8 +2296,7 @@ class TestAdminUsersPagination:
             # 尝试点击页码1
             page_one = users_page.page.locator("button:has-text('1'), a:has-text('1')").first
             if page_one.is_visible(timeout=2000):
-                page_one.click()
-                users_page.page.wait_for_timeout(1500)
+                users_page.reload_list(page_one.click)
                 users_page.wait_for_table_load()
                 
                 ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -2373,8 +2356,7 @@ class TestAdminUsersPagination:
             logger.info(f"   最后一页按钮: 可见=True, 启用={is_enabled}")
             
             if is_enabled:
-                last_button.click()
-                users_page.page.wait_for_timeout(1500)
+                users_page.reload_list(last_button.click)
                 users_page.wait_for_table_load()
                 
                 # 获取最后一页第一个用户
@@ -2447,8 +2429,7 @@ class TestAdminUsersPagination:
                 text = btn.text_content().strip()
                 if text == "2":
                     logger.info("   点击页码2")
-                    btn.click()
-                    users_page.page.wait_for_timeout(1500)
+                    users_page.reload_list(btn.click)
                     users_page.wait_for_table_load()
                     page_two_clicked = True
                     break
@@ -2479,7 +2460,7 @@ class TestAdminUsersPermission:
     
     @pytest.mark.P1
     @pytest.mark.functional
-    def test_p1_open_permission_page(self, users_page):
+    def test_p1_open_permission_page(self, users_page, seed):
         """
         TC-PERM-001: 打开用户权限页面
         
@@ -2496,16 +2477,11 @@ class TestAdminUsersPermission:
         logger.info(f"   测试数据: UserName={test_username}")
         
         # 创建测试用户
-        users_page.create_user(username=test_username, password="Test@123456", email=test_email)
-        users_page.page.wait_for_timeout(2000)
-        
-        users_page.page.reload()
-        users_page.wait_for_load()
+        seed_user(users_page, seed, test_username, email=test_email)
         users_page.wait_for_table_load()
         
         # 搜索用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         
         row_index = users_page.find_user_by_username(test_username)
         assert row_index >= 0, f"用户{test_username}应存在"
@@ -2522,7 +2498,7 @@ class TestAdminUsersPermission:
         # 打开权限页面
         logger.info(f"   打开用户权限页面")
         users_page.click_user_permissions(row_index)
-        users_page.page.wait_for_timeout(2000)
+        users_page.waits.for_dom_quiet(quiet_ms=300, timeout=2000)
         
         # 截图：权限页面
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -2542,22 +2518,19 @@ class TestAdminUsersPermission:
         # 返回用户列表
         if permission_loaded:
             users_page.click_permission_back()
-            users_page.page.wait_for_timeout(1000)
         else:
             users_page.page.go_back()
-            users_page.page.wait_for_timeout(1000)
         
         # 清理
         users_page.wait_for_table_load()
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
-        users_page.delete_user_by_username(test_username)
+        cleanup_user(users_page, seed, test_username)
         
         logger.info("✅ TC-PERM-001执行成功")
     
     @pytest.mark.P1
     @pytest.mark.functional
-    def test_p1_assign_role_in_edit_dialog(self, users_page):
+    def test_p1_assign_role_in_edit_dialog(self, users_page, seed):
         """
         TC-PERM-002: 编辑对话框中分配角色
         
@@ -2574,16 +2547,11 @@ class TestAdminUsersPermission:
         logger.info(f"   测试数据: UserName={test_username}")
         
         # 创建测试用户
-        users_page.create_user(username=test_username, password="Test@123456", email=test_email)
-        users_page.page.wait_for_timeout(2000)
-        
-        users_page.page.reload()
-        users_page.wait_for_load()
+        seed_user(users_page, seed, test_username, email=test_email)
         users_page.wait_for_table_load()
         
         # 搜索用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         
         row_index = users_page.find_user_by_username(test_username)
         assert row_index >= 0, f"用户{test_username}应存在"
@@ -2598,21 +2566,19 @@ class TestAdminUsersPermission:
         )
         
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         # ===== Step 1: 打开编辑对话框并分配角色 =====
         logger.info(f"   [Step 1] 打开编辑对话框并分配角色")
         users_page.click_edit_user(row_index)
-        users_page.page.wait_for_timeout(1500)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1500)
         
         if not users_page.is_dialog_open():
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, "编辑对话框未打开"
         
         # 切换到Roles Tab
         logger.info(f"   切换到Roles Tab")
         users_page.click_edit_tab_roles()
-        users_page.page.wait_for_timeout(1000)
         
         # 截图：Roles Tab（分配前）
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -2655,23 +2621,8 @@ class TestAdminUsersPermission:
             # 确保Save按钮可见并点击
             logger.info(f"   点击Save按钮保存角色")
             
-            # 使用JavaScript直接点击Save按钮（绕过viewport限制）
-            users_page.page.evaluate("""
-                () => {
-                    const dialog = document.querySelector('[role="dialog"]');
-                    if (dialog) {
-                        const buttons = dialog.querySelectorAll('button');
-                        for (const btn of buttons) {
-                            if (btn.textContent.trim() === 'Save') {
-                                btn.click();
-                                return true;
-                            }
-                        }
-                    }
-                    return false;
-                }
-            """)
-            users_page.page.wait_for_timeout(2000)
+            # click_save 用JavaScript点击Save（绕过viewport限制）并等待对话框关闭或toast
+            users_page.click_save(timeout=2000)
             
             success_toast = users_page.is_success_message_visible()
             
@@ -2689,36 +2640,31 @@ class TestAdminUsersPermission:
             # 关闭对话框
             if users_page.is_dialog_open():
                 users_page.press_escape()
-                users_page.page.wait_for_timeout(500)
             
             # ===== Step 2: 重新打开对话框验证角色是否真正保存 =====
             logger.info(f"   [Step 2] 重新打开对话框验证角色保存")
-            users_page.page.wait_for_timeout(1000)
             
             # 重新搜索用户
             users_page.search_user(test_username)
-            users_page.page.wait_for_timeout(1000)
             
             row_index = users_page.find_user_by_username(test_username)
             if row_index < 0:
                 users_page.clear_search()
-                users_page.delete_user_by_username(test_username)
+                cleanup_user(users_page, seed, test_username)
                 assert False, f"重新搜索用户{test_username}失败"
             
             users_page.clear_search()
-            users_page.page.wait_for_timeout(500)
             
             # 重新打开编辑对话框
             users_page.click_edit_user(row_index)
-            users_page.page.wait_for_timeout(1500)
+            users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1500)
             
             if not users_page.is_dialog_open():
-                users_page.delete_user_by_username(test_username)
+                cleanup_user(users_page, seed, test_username)
                 assert False, "重新打开编辑对话框失败"
             
             # 切换到Roles Tab
             users_page.click_edit_tab_roles()
-            users_page.page.wait_for_timeout(1000)
             
             # 截图：重新打开后的Roles Tab
             ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -2744,13 +2690,12 @@ class TestAdminUsersPermission:
             # 关闭对话框
             if users_page.is_dialog_open():
                 users_page.press_escape()
-                users_page.page.wait_for_timeout(500)
             
             # 判断测试结果
             if success_toast and not role_still_checked:
                 # BUG: 显示成功toast但角色未保存
                 logger.error(f"   ✗ BUG: 显示成功toast但角色未真正保存")
-                users_page.delete_user_by_username(test_username)
+                cleanup_user(users_page, seed, test_username)
                 assert False, "BUG: 显示成功toast但角色分配未真正保存"
             elif role_still_checked:
                 logger.info(f"   ✓ 角色分配保存成功")
@@ -2761,16 +2706,15 @@ class TestAdminUsersPermission:
             # 关闭对话框
             if users_page.is_dialog_open():
                 users_page.press_escape()
-                users_page.page.wait_for_timeout(500)
         
         # 清理
-        users_page.delete_user_by_username(test_username)
+        cleanup_user(users_page, seed, test_username)
         
         logger.info("✅ TC-PERM-002执行成功")
     
     @pytest.mark.P1
     @pytest.mark.functional
-    def test_p1_assign_all_roles(self, users_page):
+    def test_p1_assign_all_roles(self, users_page, seed):
         """
         TC-PERM-003: 分配全部角色
         
@@ -2787,34 +2731,27 @@ class TestAdminUsersPermission:
         logger.info(f"   测试数据: UserName={test_username}")
         
         # 创建测试用户
-        users_page.create_user(username=test_username, password="Test@123456", email=test_email)
-        users_page.page.wait_for_timeout(2000)
-        
-        users_page.page.reload()
-        users_page.wait_for_load()
+        seed_user(users_page, seed, test_username, email=test_email)
         users_page.wait_for_table_load()
         
         # 搜索并找到用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         
         row_index = users_page.find_user_by_username(test_username)
         assert row_index >= 0, f"用户{test_username}应存在"
         
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         # 打开编辑对话框
         users_page.click_edit_user(row_index)
-        users_page.page.wait_for_timeout(1500)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1500)
         
         if not users_page.is_dialog_open():
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, "编辑对话框未打开"
         
         # 切换到Roles Tab
         users_page.click_edit_tab_roles()
-        users_page.page.wait_for_timeout(1000)
         
         # 截图：分配前
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -2851,7 +2788,6 @@ class TestAdminUsersPermission:
         
         # 保存
         users_page.click_save()
-        users_page.page.wait_for_timeout(2000)
         
         success_toast = users_page.is_success_message_visible()
         
@@ -2867,29 +2803,24 @@ class TestAdminUsersPermission:
         # 关闭对话框
         if users_page.is_dialog_open():
             users_page.press_escape()
-            users_page.page.wait_for_timeout(500)
         
         # ===== 重新打开对话框验证所有角色是否真正保存 =====
         logger.info(f"   [验证] 重新打开对话框检查角色保存状态")
-        users_page.page.wait_for_timeout(1000)
         
         # 重新搜索用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         
         row_index = users_page.find_user_by_username(test_username)
         if row_index >= 0:
             users_page.clear_search()
-            users_page.page.wait_for_timeout(500)
             
             # 重新打开编辑对话框
             users_page.click_edit_user(row_index)
-            users_page.page.wait_for_timeout(1500)
+            users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1500)
             
             if users_page.is_dialog_open():
                 # 切换到Roles Tab
                 users_page.click_edit_tab_roles()
-                users_page.page.wait_for_timeout(1000)
                 
                 # 截图：验证Roles Tab
                 ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -2909,24 +2840,23 @@ class TestAdminUsersPermission:
                 
                 # 关闭对话框
                 users_page.press_escape()
-                users_page.page.wait_for_timeout(500)
                 
                 # 判断测试结果
                 if success_toast and verified_checked < total_roles:
                     logger.error(f"   ✗ BUG: 显示成功toast但角色未完全保存")
-                    users_page.delete_user_by_username(test_username)
+                    cleanup_user(users_page, seed, test_username)
                     assert False, f"BUG: 显示成功toast但只保存了{verified_checked}/{total_roles}个角色"
                 elif verified_checked == total_roles:
                     logger.info(f"   ✓ 所有角色分配保存成功")
         
         # 清理
-        users_page.delete_user_by_username(test_username)
+        cleanup_user(users_page, seed, test_username)
         
         logger.info("✅ TC-PERM-003执行成功")
     
     @pytest.mark.P1
     @pytest.mark.functional
-    def test_p1_assign_partial_roles(self, users_page):
+    def test_p1_assign_partial_roles(self, users_page, seed):
         """
         TC-PERM-004: 部分角色分配
         
@@ -2943,35 +2873,28 @@ class TestAdminUsersPermission:
         logger.info(f"   测试数据: UserName={test_username}")
         
         # 创建测试用户
-        users_page.create_user(username=test_username, password="Test@123456", email=test_email)
-        users_page.page.wait_for_timeout(2000)
-        
-        users_page.page.reload()
-        users_page.wait_for_load()
+        seed_user(users_page, seed, test_username, email=test_email)
         users_page.wait_for_table_load()
         
         # 搜索并找到用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         
         row_index = users_page.find_user_by_username(test_username)
         assert row_index >= 0, f"用户{test_username}应存在"
         
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         # ===== Step 1: 打开编辑对话框并分配部分角色 =====
         logger.info(f"   [Step 1] 打开编辑对话框并分配部分角色")
         users_page.click_edit_user(row_index)
-        users_page.page.wait_for_timeout(1500)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1500)
         
         if not users_page.is_dialog_open():
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, "编辑对话框未打开"
         
         # 切换到Roles Tab
         users_page.click_edit_tab_roles()
-        users_page.page.wait_for_timeout(1000)
         
         # 截图：分配前（全页截图）
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -3012,23 +2935,8 @@ class TestAdminUsersPermission:
         # 确保Save按钮可见并点击
         logger.info(f"   点击Save按钮保存角色")
         
-        # 使用JavaScript直接点击Save按钮（绕过viewport限制）
-        users_page.page.evaluate("""
-            () => {
-                const dialog = document.querySelector('[role="dialog"]');
-                if (dialog) {
-                    const buttons = dialog.querySelectorAll('button');
-                    for (const btn of buttons) {
-                        if (btn.textContent.trim() === 'Save') {
-                            btn.click();
-                            return true;
-                        }
-                    }
-                }
-                return false;
-            }
-        """)
-        users_page.page.wait_for_timeout(2000)
+        # click_save 用JavaScript点击Save（绕过viewport限制）并等待对话框关闭或toast
+        users_page.click_save(timeout=2000)
         
         success_toast = users_page.is_success_message_visible()
         
@@ -3046,36 +2954,31 @@ class TestAdminUsersPermission:
         # 关闭对话框
         if users_page.is_dialog_open():
             users_page.press_escape()
-            users_page.page.wait_for_timeout(500)
         
         # ===== Step 2: 重新打开验证角色是否真正保存 =====
         logger.info(f"   [Step 2] 重新打开验证角色保存")
-        users_page.page.wait_for_timeout(1000)
         
         # 重新搜索用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         
         row_index = users_page.find_user_by_username(test_username)
         if row_index < 0:
             users_page.clear_search()
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, f"重新搜索用户{test_username}失败"
         
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         # 重新打开编辑对话框
         users_page.click_edit_user(row_index)
-        users_page.page.wait_for_timeout(1500)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1500)
         
         if not users_page.is_dialog_open():
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, "重新打开编辑对话框失败"
         
         # 切换到Roles Tab
         users_page.click_edit_tab_roles()
-        users_page.page.wait_for_timeout(1000)
         
         # 截图：重新打开后的Roles Tab（全页截图）
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -3096,24 +2999,23 @@ class TestAdminUsersPermission:
         # 关闭对话框
         if users_page.is_dialog_open():
             users_page.press_escape()
-            users_page.page.wait_for_timeout(500)
         
         # 判断结果
         if success_toast and verified_checked < checked_count:
             logger.error(f"   ✗ BUG: 显示成功toast但角色未完全保存")
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, f"BUG: 显示成功toast但只保存了{verified_checked}/{checked_count}个角色"
         elif verified_checked == checked_count:
             logger.info(f"   ✓ 部分角色分配保存成功")
         
         # 清理
-        users_page.delete_user_by_username(test_username)
+        cleanup_user(users_page, seed, test_username)
         
         logger.info("✅ TC-PERM-004执行成功")
     
     @pytest.mark.P1
     @pytest.mark.functional
-    def test_p1_remove_assigned_roles(self, users_page):
+    def test_p1_remove_assigned_roles(self, users_page, seed):
         """
         TC-PERM-005: 移除已分配的角色
         
@@ -3130,34 +3032,27 @@ class TestAdminUsersPermission:
         logger.info(f"   测试数据: UserName={test_username}")
         
         # 创建测试用户
-        users_page.create_user(username=test_username, password="Test@123456", email=test_email)
-        users_page.page.wait_for_timeout(2000)
-        
-        users_page.page.reload()
-        users_page.wait_for_load()
+        seed_user(users_page, seed, test_username, email=test_email)
         users_page.wait_for_table_load()
         
         # 搜索并找到用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         
         row_index = users_page.find_user_by_username(test_username)
         assert row_index >= 0, f"用户{test_username}应存在"
         
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         # ===== Step 1: 先分配角色 =====
         logger.info(f"   [Step 1] 先分配角色")
         users_page.click_edit_user(row_index)
-        users_page.page.wait_for_timeout(1500)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1500)
         
         if not users_page.is_dialog_open():
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, "编辑对话框未打开"
         
         users_page.click_edit_tab_roles()
-        users_page.page.wait_for_timeout(1000)
         
         # 获取所有角色复选框
         role_checkboxes = users_page.page.locator("[role='dialog'] input[type='checkbox'], [role='dialog'] [role='checkbox']").all()
@@ -3187,47 +3082,28 @@ class TestAdminUsersPermission:
         # 确保Save按钮可见并点击
         logger.info(f"   点击Save按钮保存角色")
         
-        # 使用JavaScript直接点击Save按钮
-        users_page.page.evaluate("""
-            () => {
-                const dialog = document.querySelector('[role="dialog"]');
-                if (dialog) {
-                    const buttons = dialog.querySelectorAll('button');
-                    for (const btn of buttons) {
-                        if (btn.textContent.trim() === 'Save') {
-                            btn.click();
-                            return true;
-                        }
-                    }
-                }
-                return false;
-            }
-        """)
-        users_page.page.wait_for_timeout(2000)
+        # click_save 用JavaScript点击Save（绕过viewport限制）并等待对话框关闭或toast
+        users_page.click_save(timeout=2000)
         
         if users_page.is_dialog_open():
             users_page.press_escape()
-            users_page.page.wait_for_timeout(500)
         
         # ===== Step 2: 重新打开并移除所有角色 =====
         logger.info(f"   [Step 2] 重新打开并移除所有角色")
         
         # 重新搜索用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         row_index = users_page.find_user_by_username(test_username)
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         users_page.click_edit_user(row_index)
-        users_page.page.wait_for_timeout(1500)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1500)
         
         if not users_page.is_dialog_open():
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, "编辑对话框未打开"
         
         users_page.click_edit_tab_roles()
-        users_page.page.wait_for_timeout(1000)
         
         # 截图：移除前（全页截图）
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -3267,23 +3143,8 @@ class TestAdminUsersPermission:
         # 确保Save按钮可见并点击
         logger.info(f"   点击Save按钮保存角色移除")
         
-        # 使用JavaScript直接点击Save按钮
-        users_page.page.evaluate("""
-            () => {
-                const dialog = document.querySelector('[role="dialog"]');
-                if (dialog) {
-                    const buttons = dialog.querySelectorAll('button');
-                    for (const btn of buttons) {
-                        if (btn.textContent.trim() === 'Save') {
-                            btn.click();
-                            return true;
-                        }
-                    }
-                }
-                return false;
-            }
-        """)
-        users_page.page.wait_for_timeout(2000)
+        # click_save 用JavaScript点击Save（绕过viewport限制）并等待对话框关闭或toast
+        users_page.click_save(timeout=2000)
         
         success_toast = users_page.is_success_message_visible()
         
@@ -3301,36 +3162,31 @@ class TestAdminUsersPermission:
         # 关闭对话框
         if users_page.is_dialog_open():
             users_page.press_escape()
-            users_page.page.wait_for_timeout(500)
         
         # ===== Step 3: 重新打开验证角色是否全部移除 =====
         logger.info(f"   [Step 3] 重新打开验证角色移除")
-        users_page.page.wait_for_timeout(1000)
         
         # 重新搜索用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         row_index = users_page.find_user_by_username(test_username)
         
         if row_index < 0:
             users_page.clear_search()
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, f"重新搜索用户{test_username}失败"
         
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         # 重新打开编辑对话框
         users_page.click_edit_user(row_index)
-        users_page.page.wait_for_timeout(1500)
+        users_page.waits.for_dom_quiet(users_page.DIALOG, quiet_ms=200, timeout=1500)
         
         if not users_page.is_dialog_open():
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, "重新打开编辑对话框失败"
         
         # 切换到Roles Tab
         users_page.click_edit_tab_roles()
-        users_page.page.wait_for_timeout(1000)
         
         # 截图：重新打开后的Roles Tab（全页截图）
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -3351,18 +3207,17 @@ class TestAdminUsersPermission:
         # 关闭对话框
         if users_page.is_dialog_open():
             users_page.press_escape()
-            users_page.page.wait_for_timeout(500)
         
         # 判断结果
         if verified_checked != 0:
             logger.error(f"   ✗ BUG: 移除角色后应为0，实际为{verified_checked}")
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
             assert False, f"BUG: 移除角色后应为0，实际仍有{verified_checked}个角色"
         else:
             logger.info(f"   ✓ 角色移除保存成功, 已勾选=0")
         
         # 清理
-        users_page.delete_user_by_username(test_username)
+        cleanup_user(users_page, seed, test_username)
         
         logger.info("✅ TC-PERM-005执行成功")
     
@@ -3392,13 +3247,11 @@ class TestAdminUsersPermission:
         
         # 搜索用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         
         row_index = users_page.find_user_by_username(test_username)
         assert row_index >= 0, f"用户{test_username}应存在"
         
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         # 截图：用户列表
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -3412,7 +3265,7 @@ class TestAdminUsersPermission:
         # 打开Permission页面
         logger.info(f"   通过Action菜单打开Permission页面")
         users_page.click_user_permissions(row_index)
-        users_page.page.wait_for_timeout(3000)
+        users_page.waits.for_dom_quiet(quiet_ms=300, timeout=3000)
         
         # 截图：Permission页面
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -3473,7 +3326,7 @@ class TestAdminUsersPermission:
                         return false;
                     }
                 """)
-                users_page.page.wait_for_timeout(2000)
+                users_page.waits.for_dom_quiet(quiet_ms=200, timeout=2000)
                 
                 # 截图：Revoke All后状态（全页截图）
                 revoke_summary = users_page.get_permission_summary()
@@ -3487,14 +3340,12 @@ class TestAdminUsersPermission:
                 logger.info(f"   Revoke All后权限: Granted={revoke_summary['granted']}")
                 
                 # 点击Cancel取消更改（不保存）
-                users_page.page.click("button:has-text('Cancel')")
-                users_page.page.wait_for_timeout(1000)
+                users_page.click_permission_cancel()
             else:
                 logger.info(f"   Revoke All按钮已禁用，跳过点击")
 
         # 返回用户列表
         users_page.page.go_back()
-        users_page.page.wait_for_timeout(2000)
         users_page.wait_for_table_load()
         
         # 不删除admin用户
@@ -3531,16 +3382,14 @@ class TestAdminUsersPermission:
         
         # 搜索并找到用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         row_index = users_page.find_user_by_username(test_username)
         assert row_index >= 0, f"用户{test_username}应存在"
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         # ===== Step 1: 打开Permission页面 =====
         logger.info(f"   [Step 1] 打开Permission页面")
         users_page.click_user_permissions(row_index)
-        users_page.page.wait_for_timeout(3000)
+        users_page.waits.for_dom_quiet(quiet_ms=300, timeout=3000)
         
         # 获取初始权限摘要
         initial_summary = users_page.get_permission_summary()
@@ -3579,7 +3428,7 @@ class TestAdminUsersPermission:
                         return false;
                     }
                 """)
-                users_page.page.wait_for_timeout(1000)
+                users_page.waits.for_dom_quiet(quiet_ms=200, timeout=1000)
                 
                 # 截图：撤销后（全页截图）
                 revoke_summary = users_page.get_permission_summary()
@@ -3605,8 +3454,6 @@ class TestAdminUsersPermission:
         logger.info(f"   授予权限: {granted_permission}")
         
         if granted_permission:
-            users_page.page.wait_for_timeout(1000)
-            
             # 截图：授予后（全页截图）
             after_grant = users_page.get_permission_summary()
             ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -3622,8 +3469,7 @@ class TestAdminUsersPermission:
             assert after_grant['granted'] > before_grant['granted'], f"Grant操作应增加Granted数量"
         
         # 点击Cancel取消（不保存，因为admin用户可能无法修改）
-        users_page.page.click("button:has-text('Cancel')")
-        users_page.page.wait_for_timeout(2000)
+        users_page.click_permission_cancel()
         
         # 返回用户列表
         users_page.wait_for_table_load()
@@ -3655,15 +3501,13 @@ class TestAdminUsersPermission:
 
         # 搜索并找到用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         row_index = users_page.find_user_by_username(test_username)
         assert row_index >= 0, f"用户{test_username}应存在"
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
 
         # 打开Permission页面
         users_page.click_user_permissions(row_index)
-        users_page.page.wait_for_timeout(3000)
+        users_page.waits.for_dom_quiet(quiet_ms=300, timeout=3000)
 
         # 获取初始权限摘要
         initial_summary = users_page.get_permission_summary()
@@ -3703,8 +3547,7 @@ class TestAdminUsersPermission:
         logger.info(f"   安全提示显示: {has_security_notice}")
         
         # 返回用户列表
-        users_page.page.click("button:has-text('Back')")
-        users_page.page.wait_for_timeout(2000)
+        users_page.click_permission_back(handle_unsaved=False)
         users_page.wait_for_table_load()
         
         # 验证结果
@@ -3735,16 +3578,14 @@ class TestAdminUsersPermission:
         
         # 搜索并找到用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         row_index = users_page.find_user_by_username(test_username)
         assert row_index >= 0, f"用户{test_username}应存在"
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         # 打开Permission页面
         logger.info(f"   打开Permission页面")
         users_page.click_user_permissions(row_index)
-        users_page.page.wait_for_timeout(3000)
+        users_page.waits.for_dom_quiet(quiet_ms=300, timeout=3000)
         
         # 获取权限摘要
         summary = users_page.get_permission_summary()
@@ -3775,8 +3616,7 @@ class TestAdminUsersPermission:
         logger.info(f"   安全提示显示: {has_security_notice}")
         
         # 返回用户列表
-        users_page.page.click("button:has-text('Back')")
-        users_page.page.wait_for_timeout(2000)
+        users_page.click_permission_back(handle_unsaved=False)
         users_page.wait_for_table_load()
         
         # 验证结果
@@ -3789,7 +3629,7 @@ class TestAdminUsersPermission:
     
     @pytest.mark.P2
     @pytest.mark.functional
-    def test_p2_action_permission_page_search(self, users_page):
+    def test_p2_action_permission_page_search(self, users_page, seed):
         """
         TC-PERM-011: Permission页面搜索功能验证
         
@@ -3808,24 +3648,18 @@ class TestAdminUsersPermission:
         logger.info(f"   创建测试用户: {test_username}")
         
         # 创建测试用户
-        users_page.create_user(username=test_username, password="Test@123456", email=test_email)
-        users_page.page.wait_for_timeout(2000)
-        
-        users_page.page.reload()
-        users_page.wait_for_load()
+        seed_user(users_page, seed, test_username, email=test_email)
         users_page.wait_for_table_load()
         
         # 搜索并找到用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         row_index = users_page.find_user_by_username(test_username)
         assert row_index >= 0, f"用户{test_username}应存在"
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         # 打开Permission页面
         users_page.click_user_permissions(row_index)
-        users_page.page.wait_for_timeout(3000)
+        users_page.waits.for_dom_quiet(quiet_ms=300, timeout=3000)
         
         # 获取权限摘要
         summary = users_page.get_permission_summary()
@@ -3850,7 +3684,7 @@ class TestAdminUsersPermission:
             # 输入搜索关键词
             search_input = users_page.page.locator("input[placeholder*='Search']").first
             search_input.fill("Identity")
-            users_page.page.wait_for_timeout(1000)
+            users_page.waits.for_dom_quiet(quiet_ms=200, timeout=1000)
             
             # 截图：搜索后
             ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -3863,7 +3697,7 @@ class TestAdminUsersPermission:
             
             # 清空搜索
             search_input.clear()
-            users_page.page.wait_for_timeout(500)
+            users_page.waits.for_dom_quiet(quiet_ms=200, timeout=500)
         
         # 检查Cancel和Save Changes按钮
         has_cancel = users_page.is_visible("button:has-text('Cancel')", timeout=2000)
@@ -3872,13 +3706,12 @@ class TestAdminUsersPermission:
         logger.info(f"   Cancel按钮: {has_cancel}, Save Changes按钮: {has_save}, Grant All按钮: {has_grant_all}")
         
         # 返回用户列表
-        users_page.page.click("button:has-text('Back')")
-        users_page.page.wait_for_timeout(2000)
+        users_page.click_permission_back(handle_unsaved=False)
         users_page.wait_for_table_load()
         
         # 清理测试用户
         if cleanup_needed:
-            users_page.delete_user_by_username(test_username)
+            cleanup_user(users_page, seed, test_username)
         
         # 验证
         assert has_cancel, "Cancel按钮应存在"
@@ -3909,15 +3742,13 @@ class TestAdminUsersPermission:
         
         # 搜索并找到用户
         users_page.search_user(test_username)
-        users_page.page.wait_for_timeout(1000)
         row_index = users_page.find_user_by_username(test_username)
         assert row_index >= 0, f"用户{test_username}应存在"
         users_page.clear_search()
-        users_page.page.wait_for_timeout(500)
         
         # 打开Permission页面
         users_page.click_user_permissions(row_index)
-        users_page.page.wait_for_timeout(3000)
+        users_page.waits.for_dom_quiet(quiet_ms=300, timeout=3000)
         
         # 获取权限摘要
         summary = users_page.get_permission_summary()
@@ -3937,8 +3768,7 @@ class TestAdminUsersPermission:
         
         # 点击Cancel
         if has_cancel:
-            users_page.page.click("button:has-text('Cancel')")
-            users_page.page.wait_for_timeout(2000)
+            users_page.click_permission_cancel()
         
         # 等待返回用户列表
         users_page.wait_for_table_load()
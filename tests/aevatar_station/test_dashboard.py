@@ -12,9 +12,12 @@ from tests.aevatar_station.pages.login_page import LoginPage
 
 logger = logging.getLogger(__name__)
 
+# 只读测试：HAR_MODE=record 录制 / HAR_MODE=replay 回放本地栈响应
+pytestmark = pytest.mark.har
+
 
 @pytest.fixture(scope="class")
-def logged_in_dashboard(browser, test_data):
+def logged_in_dashboard(browser, test_data, request):
     """
     登录后的Dashboard页面fixture - 整个测试类只登录一次
     ⚡ 增强版：登录失败诊断 + 自动重试机制
@@ -24,6 +27,9 @@ def logged_in_dashboard(browser, test_data):
         ignore_https_errors=True,
         viewport={"width": 1920, "height": 1080}
     )
+    # 自建context不经过 har_replay fixture，在这里按模块启用录制/回放（登录请求始终走真实后端）
+    from utils.har_replay import apply_har
+    apply_har(context, "test_dashboard", request.node.name)
     page = context.new_page()
     
     try:
@@ -3,13 +3,17 @@ Change Password 功能测试模块
 包含密码修改、密码格式验证、密码安全性等测试
 合并自 test_change_password.py 和 test_profile_change_password.py
 """
+import re
+import time
 import pytest
 import logging
 import allure
 from datetime import datetime
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from tests.aevatar_station.pages.change_password_page import ChangePasswordPage
 from tests.aevatar_station.pages.landing_page import LandingPage
 from tests.aevatar_station.pages.login_page import LoginPage
+from utils.scenario_fanout import report_scenarios
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +41,8 @@ def logged_in_page(page, test_data, request):
             email = valid_data.get("email", f"{username}@test.com")
             request.node._account_info = (username, email, password)
             logger.warning(f"⚠️ 使用降级账号: {username}，可能导致测试冲突")
+            from tests.aevatar_station.conftest import login_via_http
+            login_via_http(page, username, password)
         except Exception as fallback_error:
             logger.error(f"❌ 降级账号配置失败: {fallback_error}")
             raise Exception(f"登录失败且无法降级: 原始错误={e}, 降级错误={fallback_error}")
@@ -273,6 +279,38 @@ def logged_in_change_password_page(logged_in_page, request):
         logger.info(f"{'='*70}\n")
 
 
+CHANGE_PASSWORD_TAB = "a[role='tab']:has-text('Change Password'), a:has-text('Change Password')"
+
+
+async def submit_change_password_async(page, base_url, current_password, new_password):
+    """
+    在异步页面（scenario_fanout 的context）上打开Change Password标签并提交一次修改
+    
+    Returns:
+        tuple: (是否出现成功提示, 错误提示文本)
+    """
+    await page.goto(f"{base_url}/admin/profile", wait_until="domcontentloaded", timeout=60000)
+    await page.locator(CHANGE_PASSWORD_TAB).first.click(timeout=15000)
+    await page.locator(ChangePasswordPage.CURRENT_PASSWORD_INPUT).wait_for(state="visible", timeout=15000)
+    
+    await page.fill(ChangePasswordPage.CURRENT_PASSWORD_INPUT, current_password)
+    await page.fill(ChangePasswordPage.NEW_PASSWORD_INPUT, new_password)
+    await page.fill(ChangePasswordPage.CONFIRM_PASSWORD_INPUT, new_password)
+    await page.click(ChangePasswordPage.SAVE_BUTTON)
+    
+    success = page.locator(ChangePasswordPage.SUCCESS_MESSAGE).or_(page.get_by_text(re.compile("success", re.I)))
+    error = page.locator(".text-danger, .alert-danger").or_(page.get_by_text(re.compile("failed|error", re.I)))
+    try:
+        await success.or_(error).first.wait_for(state="visible", timeout=3000)
+    except PlaywrightTimeoutError:
+        pass
+    if await success.first.is_visible():
+        return True, ""
+    if await error.first.is_visible():
+        return False, (await error.first.text_content() or "").strip()
+    return False, ""
+
+
 @pytest.mark.password
 class TestChangePassword:
     """Change Password功能测试类"""
@@ -698,18 +736,18 @@ class TestChangePassword:
     
     @pytest.mark.P1
     @pytest.mark.boundary
-    def test_p1_password_boundary_scenario(self, logged_in_change_password_page, request):
+    def test_p1_password_boundary_scenario(self, logged_in_change_password_page, request, scenario_fanout):
         """
         TC-PWD-006: 密码长度边界值与复杂度综合场景测试
         
-        测试目标：在一个会话中连续验证多个密码边界和复杂度场景（提升效率）
+        测试目标：在一个测试中验证多个密码边界和复杂度场景（提升效率）
         测试区域：Profile - Change Password
         
         测试策略：
-        1. 遍历所有边界测试用例
-        2. 对于预期失败的用例：验证错误提示，密码不应改变
-        3. 对于预期成功的用例：验证成功提示，**并更新当前密码状态**
-        4. 确保下一个用例使用正确的"当前密码"
+        1. 预期失败的用例不会改变密码、彼此独立：以当前登录态在多个context中并行提交（scenario_fanout），
+           每个用例一个Allure步骤，验证被拦截
+        2. 预期成功的用例会修改密码：在测试页面上顺序执行，验证成功提示，**并更新当前密码状态**
+        3. 确保下一个用例使用正确的"当前密码"
         """
         logger.info("开始执行TC-PWD-006: 密码边界与复杂度综合场景测试")
         
@@ -719,55 +757,80 @@ class TestChangePassword:
         initial_password = request.node._account_info[2] if hasattr(request.node, '_account_info') else "TestPass123!"
         current_active_password = initial_password
         
-        # 定义选择器
+        reject_cases = [case for case in self.BOUNDARY_TEST_CASES if not case["should_pass"]]
+        accept_cases = [case for case in self.BOUNDARY_TEST_CASES if case["should_pass"]]
+        
+        # === 阶段1：预期失败的用例并行执行（密码不变，各context共用测试页面的登录态） ===
+        base_url = password_page.base_url
+        # 预期失败的用例若意外修改成功，账号密码已变：记录下来，阶段2和最终恢复以实际生效的密码作为当前密码
+        unexpected_changes = []
+        
+        async def submit_rejected(page, test_case):
+            success_found, error_msg = await submit_change_password_async(
+                page, base_url, initial_password, test_case["value"]
+            )
+            if success_found:
+                unexpected_changes.append((time.monotonic(), test_case["value"]))
+            assert not success_found, f"{test_case['description']}: 预期失败但成功（密码 {test_case['value']}）"
+            return f"正确被拦截: {error_msg}" if error_msg else "正确被拦截（无成功提示）"
+        
+        results = scenario_fanout.run(
+            reject_cases, submit_rejected, name=lambda case: case["test_id"],
+            storage_state=password_page.page.context.storage_state()
+        )
+        # 先不抛出：意外修改了密码时要先更新当前密码，保证阶段2和最终恢复使用正确的密码
+        reject_failures = report_scenarios(results, raise_on_failure=False)
+        if unexpected_changes:
+            current_active_password = max(unexpected_changes)[1]
+            logger.warning(f"⚠️ 预期失败的用例修改了密码，当前密码更新为: {current_active_password}")
+        
+        # === 阶段2：预期成功的用例顺序执行（每一步都以上一步设置的密码作为当前密码） ===
         success_selectors = ["text=successfully", "text=Success", "text=success", ".text-success", ".alert-success"]
         error_selectors = ["text=Failed", "text=Error", ".text-danger", ".alert-danger", "text=/failed/i", "text=/error/i"]
         
-        for index, test_case in enumerate(self.BOUNDARY_TEST_CASES):
-            step_name = test_case['test_id']
-            logger.info(f"\n--- 执行步骤 {index+1}/{len(self.BOUNDARY_TEST_CASES)}: {step_name} ---")
-            logger.info(f"描述: {test_case['description']}")
-            logger.info(f"尝试密码: {test_case['value']} (当前密码: {current_active_password})")
-            
-            # 填写表单
-            password_page.change_password(
-                current_password=current_active_password,
-                new_password=test_case["value"],
-                confirm_password=test_case["value"]
-            )
-            
-            logger.info("👉 已点击Save按钮，正在等待验证结果(Toast)...")
-            
-            # 等待结果
-            password_page.page.wait_for_timeout(1000)
-            
-            # 检查结果
-            success_found = False
-            error_found = False
-            
-            # 检查成功消息
-            for sel in success_selectors:
-                if password_page.page.is_visible(sel, timeout=1000):
-                    success_found = True
-                    break
-            
-            # 检查错误消息（如果没有成功）
-            if not success_found:
-                for sel in error_selectors:
+        try:
+            for index, test_case in enumerate(accept_cases):
+                step_name = test_case['test_id']
+                logger.info(f"\n--- 执行步骤 {index+1}/{len(accept_cases)}: {step_name} ---")
+                logger.info(f"描述: {test_case['description']}")
+                logger.info(f"尝试密码: {test_case['value']} (当前密码: {current_active_password})")
+                
+                # 填写表单
+                password_page.change_password(
+                    current_password=current_active_password,
+                    new_password=test_case["value"],
+                    confirm_password=test_case["value"]
+                )
+                
+                logger.info("👉 已点击Save按钮，正在等待验证结果(Toast)...")
+                
+                # 等待结果
+                password_page.page.wait_for_timeout(1000)
+                
+                # 检查结果
+                success_found = False
+                error_found = False
+                
+                # 检查成功消息
+                for sel in success_selectors:
                     if password_page.page.is_visible(sel, timeout=1000):
-                        error_found = True
-                        error_msg = password_page.page.text_content(sel)
-                        logger.info(f"捕获错误: {error_msg}")
+                        success_found = True
                         break
-            
-            # 截图
-            timestamp = datetime.now().strftime("%H%M%S")
-            screenshot_path = f"pwd_scenario_{index}_{step_name}_{timestamp}.png"
-            password_page.take_screenshot(screenshot_path)
-            
-            # 判定与状态更新
-            if test_case['should_pass']:
-                # 预期成功
+                
+                # 检查错误消息（如果没有成功）
+                if not success_found:
+                    for sel in error_selectors:
+                        if password_page.page.is_visible(sel, timeout=1000):
+                            error_found = True
+                            error_msg = password_page.page.text_content(sel)
+                            logger.info(f"捕获错误: {error_msg}")
+                            break
+                
+                # 截图
+                timestamp = datetime.now().strftime("%H%M%S")
+                screenshot_path = f"pwd_scenario_{index}_{step_name}_{timestamp}.png"
+                password_page.take_screenshot(screenshot_path)
+                
                 if success_found and not error_found:
                     logger.info(f"✅ {step_name}: 验证通过（修改成功）")
                     # 关键：更新当前密码！
@@ -786,47 +849,32 @@ class TestChangePassword:
                     logger.error(msg)
                     allure.attach.file(f"screenshots/{screenshot_path}", name=f"失败截图-{step_name}", attachment_type=allure.attachment_type.PNG)
                     raise AssertionError(msg)
-            else:
-                # 预期失败
-                if error_found or (not success_found):
-                    logger.info(f"✅ {step_name}: 验证通过（正确被拦截）")
-                    # 密码未变，current_active_password 保持不变
-                    
-                    # 如果有错误提示，可能需要刷新页面清除错误状态，或者清除输入框
-                    password_page.navigate() # 最稳妥的方式是重新加载页面
-                else:
-                    msg = f"❌ {step_name}: 预期失败但成功（或无错误提示）"
-                    logger.error(msg)
-                    # 如果意外成功了，我们要尝试恢复密码（为了后续测试）
-                    if success_found:
-                        current_active_password = test_case['value'] # 实际上变了
-                        logger.warning(f"⚠️ 警告：密码意外修改！更新当前密码为: {current_active_password}")
-                    
-                    allure.attach.file(f"screenshots/{screenshot_path}", name=f"失败截图-{step_name}", attachment_type=allure.attachment_type.PNG)
-                    raise AssertionError(msg)
-            
-            # 记录到Allure
-            allure.attach.file(
-                f"screenshots/{screenshot_path}",
-                name=f"Step {index+1}: {step_name}",
-                attachment_type=allure.attachment_type.PNG
-            )
-            
-        logger.info("TC-PWD-006综合场景测试全部完成")
-        
-        # 最终清理：尝试改回初始密码（虽然fixture也会做，但这里显式做更安全）
-        if current_active_password != initial_password:
-            logger.info("正在恢复初始密码...")
-            try:
-                password_page.navigate()
-                password_page.change_password(
-                    current_password=current_active_password,
-                    new_password=initial_password,
-                    confirm_password=initial_password
+                
+                # 记录到Allure
+                allure.attach.file(
+                    f"screenshots/{screenshot_path}",
+                    name=f"Step {index+1}: {step_name}",
+                    attachment_type=allure.attachment_type.PNG
                 )
-                password_page.page.wait_for_timeout(2000)
-            except Exception as e:
-                logger.warning(f"恢复初始密码失败: {e}")
+            logger.info("TC-PWD-006综合场景测试全部完成")
+        finally:
+            # 最终清理：尝试改回初始密码（虽然fixture也会做，但这里显式做更安全）
+            if current_active_password != initial_password:
+                logger.info("正在恢复初始密码...")
+                try:
+                    password_page.navigate()
+                    password_page.change_password(
+                        current_password=current_active_password,
+                        new_password=initial_password,
+                        confirm_password=initial_password
+                    )
+                    password_page.page.wait_for_timeout(2000)
+                except Exception as e:
+                    logger.warning(f"恢复初始密码失败: {e}")
+        
+        if reject_failures:
+            details = "\n".join(f"  - {r.name}: {r.message}" for r in reject_failures)
+            raise AssertionError(f"{len(reject_failures)}/{len(results)} 个预期失败的场景未被拦截:\n{details}")
     
     @pytest.mark.P2
     @pytest.mark.security
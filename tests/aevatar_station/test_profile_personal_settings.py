@@ -9,6 +9,9 @@ from datetime import datetime
 from tests.aevatar_station.pages.profile_settings_page import ProfileSettingsPage
 from tests.aevatar_station.pages.landing_page import LandingPage
 from tests.aevatar_station.pages.login_page import LoginPage
+from tests.aevatar_station.profile_field_scenarios import FIELD_SPECS, field_scenarios, resolve_value
+from utils.screenshot_pipeline import get_screenshot_pipeline
+from utils.toast_observer import ToastObserver
 
 logger = logging.getLogger(__name__)
 
@@ -78,38 +81,325 @@ def remove_validation_error_display(page):
         pass
 
 
-def check_success_toast(profile_page, logger):
+# 行内成功提示；成功toast由toast观察器记录
+INLINE_SUCCESS_SELECTORS = [
+    "text=successfully",
+    ".text-success",
+    ".alert-success",
+]
+
+
+def check_success_toast(profile_page, logger, since=None, timeout=2000):
     """
-    检测成功toast提示
+    检测成功toast提示（toast观察器记录的缓冲区，已自动消失的toast同样能查到）
     
     Args:
         profile_page: ProfileSettingsPage对象
         logger: logger对象
+        since: 只检测该时间戳（ToastObserver.mark()）之后出现的toast
+        timeout: 尚未出现时最多等待的时间（毫秒）
         
     Returns:
         bool: 是否检测到成功toast
     """
-    success_selectors = [
-        "text=successfully",
-        "text=Success", 
-        "text=success",
-        ".text-success",
-        ".alert-success",
-        ".toast-success",
-        ".Toastify__toast--success",
-        "[class*='toast'][class*='success']",
-        "[class*='Toast'][class*='success']"
-    ]
+    toast = ToastObserver(profile_page.page).wait_for(type="success", since=since, timeout=timeout)
+    if toast:
+        logger.info(f"  ✓ 检测到成功toast: {toast['text']}")
+        return True
+    
+    # 非toast的行内成功提示（观察器不记录），只检查当前页面
+    for selector in INLINE_SUCCESS_SELECTORS:
+        if profile_page.is_visible(selector, timeout=0):
+            logger.info(f"  ✓ 检测到成功提示: {selector}")
+            return True
+    return False
+
+
+# ============================================================================
+# 字段验证场景执行器：每个场景是一个独立用例（场景表见 profile_field_scenarios.py）
+# ============================================================================
+# 行内错误提示；错误toast由toast观察器记录（见 detect_field_error 的 since 参数）
+FIELD_ERROR_SELECTORS = [
+    ".invalid-feedback",
+    ".text-danger",
+    "[role='alert'].text-danger",
+    "[role='alert']"
+]
+
+FIELD_ERROR_TEXTS = ["must be less than", "required", "invalid", "must be between"]
+
+
+def remove_success_toasts(page):
+    """截图前清理 Success Toast（防止保存成功的toast污染错误截图）"""
+    try:
+        page.evaluate("""
+            document.querySelectorAll('div').forEach(el => {
+                try {
+                    if (el.innerText && (el.innerText.includes('Success') || el.innerText.includes('successfully'))) {
+                        el.remove();
+                    }
+                } catch(e) {}
+            });
+        """)
+    except:
+        pass
+
+
+def detect_field_error(profile_page, input_selector, since=None):
+    """
+    检测字段错误提示：HTML5验证 -> 页面错误元素 -> 错误toast -> 错误文本兜底
+    
+    Args:
+        since: 点击保存前的 ToastObserver.mark()，只统计此后出现的错误toast（包括已自动消失的）
+    
+    Returns:
+        tuple: (has_error: bool, error_message: str)
+    """
+    has_error = False
+    error_message = ""
+    try:
+        validation_info = profile_page.page.evaluate(
+            """(selector) => {
+                const el = document.querySelector(selector);
+                return {valid: el ? el.validity.valid : null, message: el ? el.validationMessage : ''};
+            }""",
+            input_selector,
+        )
+        if validation_info and validation_info['valid'] is False:
+            has_error = True
+            error_message = validation_info['message']
+            logger.info(f"  ✓ 检测到HTML5验证错误: {error_message}")
+        
+        for selector in FIELD_ERROR_SELECTORS:
+            if profile_page.is_visible(selector, timeout=500):
+                error_text = profile_page.get_text(selector)
+                if error_text and error_text.strip():
+                    has_error = True
+                    error_message = f"{error_message} | {error_text}" if error_message else error_text
+                    logger.info(f"  ✓ 检测到页面错误提示: {error_text}")
+        
+        if since is not None:
+            for toast in ToastObserver(profile_page.page).toasts(type="error", since=since):
+                has_error = True
+                error_message = f"{error_message} | {toast['text']}" if error_message else toast['text']
+                logger.info(f"  ✓ 检测到错误toast: {toast['text']}")
+    except Exception as e:
+        logger.warning(f"  检查错误时出现异常: {e}")
     
-    for selector in success_selectors:
+    if not has_error:
         try:
-            if profile_page.is_visible(selector, timeout=2000):
-                logger.info(f"  ✓ 检测到成功toast: {selector}")
-                return True
+            for txt in FIELD_ERROR_TEXTS:
+                found_el = profile_page.page.locator(f"text=/{txt}/i").first
+                if found_el.is_visible():
+                    found_text = found_el.text_content().strip()
+                    if found_text:
+                        logger.info(f"  ✓ 通过文本内容检测到错误提示: {found_text}")
+                        return True, found_text
         except:
-            continue
+            pass
     
-    return False
+    return has_error, error_message
+
+
+def attach_field_screenshot(profile_page, field, scenario_name, stage, description):
+    """截图并附加到allure报告（编码/去重/写盘在后台截图流水线中完成，不阻塞场景执行）"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    safe_name = scenario_name.replace(' ', '_').replace('/', '_').replace('@', 'at')
+    screenshot_path = f"screenshots/{field}_{safe_name}_{stage}_{timestamp}.png"
+    get_screenshot_pipeline().capture(profile_page.page, name=description, file_path=screenshot_path)
+
+
+def run_field_validation_scenario(profile_page, scenario):
+    """
+    执行单个字段验证场景：输入 -> 保存 -> 判断是否保存/是否报错 -> 还原原值
+    客户端校验已拦截的输入（探测一次即可确定）直接判定，不走保存往返
+    
+    每个场景使用独立的账号和页面（logged_in_profile_page），场景之间互不影响，可以分布到所有xdist worker
+    
+    Args:
+        profile_page: 已打开个人设置页的 ProfileSettingsPage
+        scenario: field_scenarios() 展开的场景字典
+    """
+    field = scenario["field"]
+    spec = FIELD_SPECS[field]
+    label = spec["label"]
+    input_selector = getattr(profile_page, spec["input"])
+    read_value = getattr(profile_page, spec["getter"])
+    value = resolve_value(scenario)
+    
+    logger.info("=" * 70)
+    logger.info(f"{spec['case_id']} [{label}] {scenario['name']}")
+    logger.info(f"后端规则：{spec['rule']}")
+    logger.info("=" * 70)
+    logger.info(f"  输入值: '{value[:50]}{'...' if len(value) > 50 else ''}'")
+    logger.info(f"  长度: {len(value)} 字符")
+    logger.info(f"  描述: {scenario['description']}")
+    logger.info(f"  预期: {scenario['expected']}")
+    
+    original_value = read_value()
+    # 同表单中需要保持有效的其他字段（如测试Name时Surname不能为空）
+    companions = [
+        (getattr(profile_page, attr), getattr(profile_page, getter)() or fallback)
+        for attr, getter, fallback in spec["companions"]
+    ]
+    
+    # ⚡ 快速路径：一次evaluate探测客户端校验，已被拦截的输入不再点击保存、等待toast和刷新还原
+    # （超过maxlength的值真实输入时会被截断，探测结果不可信，仍走真实提交）
+    probe = profile_page.probe_validation(input_selector, [value], restore=False)[0]
+    if not probe["valid"] and not probe["too_long"]:
+        judge_client_rejection(profile_page, scenario, probe)
+        return
+    
+    try:
+        profile_page.fill_input(input_selector, "")
+        for companion_selector, companion_value in companions:
+            profile_page.fill_input(companion_selector, companion_value)
+        profile_page.fill_input(input_selector, value)
+        attach_field_screenshot(profile_page, field, scenario['name'], "input", f"{scenario['name']}_输入后")
+        
+        # 只统计本次保存之后出现的toast（之前残留的toast不影响判定，无需手工清除）
+        since = ToastObserver.mark()
+        profile_page.click_element(profile_page.SAVE_BUTTON)
+        profile_page.waits.for_dom_quiet(quiet_ms=300, timeout=2000)
+        
+        has_error, error_message = detect_field_error(profile_page, input_selector, since)
+        
+        if has_error:
+            # 前端验证阻止了提交，或者页面显示错误，数据未保存
+            remove_success_toasts(profile_page.page)
+            is_saved = False
+            saved_value = profile_page.page.input_value(input_selector)
+        elif scenario['should_save']:
+            # ⚡ 优先检测成功toast提示（观察器已记录，toast消失后也能查到）
+            has_success_toast = check_success_toast(profile_page, logger, since)
+            if has_success_toast:
+                is_saved = True
+                saved_value = value
+                logger.info("  ✅ 检测到成功toast，判断为保存成功")
+            else:
+                saved_value = profile_page.page.input_value(input_selector)
+                is_saved = saved_value == value
+                if is_saved:
+                    logger.info(f"  ✅ 未检测到toast，但输入框值匹配 '{saved_value}'，判断为保存成功")
+                else:
+                    logger.warning(f"  ⚠️ 未检测到toast，且输入框值不匹配 (预期='{value}', 实际='{saved_value}')，判断为保存失败")
+        else:
+            # 无前端错误但预期失败：可能被input限制或后端拒绝
+            try:
+                profile_page.page.wait_for_load_state("networkidle", timeout=3000)
+            except:
+                pass
+            
+            # ⭐ 重要：再次检测错误（toast可能延迟显示）
+            has_error, error_message = detect_field_error(profile_page, input_selector, since)
+            
+            # ⚡ 检查是否意外出现了 Success Toast（Silent Truncation）
+            has_success_toast = check_success_toast(profile_page, logger, since, timeout=0)
+            if has_success_toast:
+                logger.warning("  ⚠️ 警告：检测到 Success Toast，尽管预期应该是失败。可能是后端执行了截断保存。")
+                is_saved = True
+                saved_value = profile_page.page.input_value(input_selector)
+            else:
+                # 刷新验证是否真的保存了
+                profile_page.page.reload()
+                profile_page.page.wait_for_load_state("domcontentloaded")
+                profile_page.waits.for_visible(input_selector, timeout=5000)
+                saved_value = read_value()
+                is_saved = saved_value == value
+            remove_success_toasts(profile_page.page)
+        
+        # 非必填字段：空值/仅空格被trim为空也视为保存成功
+        if not spec["required"] and not is_saved and not value.strip() and not has_error:
+            is_saved = (saved_value or "") == ""
+        
+        save_match = is_saved == scenario['should_save']
+        error_match = has_error == scenario['should_error']
+        overall_match = save_match and error_match
+        
+        attach_field_screenshot(
+            profile_page, field, scenario['name'], "after_save",
+            f"{scenario['name']}_保存后（预期:{'成功' if scenario['should_save'] else '失败'}/{'有错误' if scenario['should_error'] else '无错误'}, "
+            f"实际:{'成功' if is_saved else '失败'}/{'有错误' if has_error else '无错误'}）"
+        )
+        
+        # 1. 前端体验问题：后端拒绝了(save_match=True)，但前端没提示(error_match=False)
+        is_frontend_bug = scenario['should_error'] and not has_error and save_match
+        # 2. 截断保存问题：不该保存却保存了（后端截断或宽松策略）
+        is_truncation_issue = not save_match and is_saved
+        # 3. 状态冲突问题：既有Success Toast又有错误提示（Double State Bug）
+        is_double_state_bug = is_saved and has_error and not scenario['should_save'] and scenario['should_error']
+        
+        # ⚡ 以上三类问题暂不视为测试失败，记录为Warning
+        if is_frontend_bug:
+            overall_match = True
+            logger.warning(f"  ⚠️ 前端体验问题：无效输入未显示错误提示，但数据正确未被保存。标记为通过。")
+        if is_truncation_issue:
+            overall_match = True
+            logger.warning(f"  ⚠️ 后端行为预警：超长输入未被完全拒绝，而是可能被截断保存或部分接受（出现了Success Toast）。标记为通过。")
+        if is_double_state_bug:
+            overall_match = True
+            logger.warning(f"  ⚠️ 状态冲突预警：同时检测到 Success Toast 和 错误提示。这通常是一个Bug，但在测试中暂且容忍并标记为 Warning。")
+        
+        logger.info(f"  实际结果:")
+        logger.info(f"    - 保存状态: {'成功保存' if is_saved else '未保存/被修改'}")
+        logger.info(f"    - 保存值: '{saved_value[:50] if saved_value else '(空)'}{'...' if saved_value and len(saved_value) > 50 else ''}'")
+        logger.info(f"    - 错误提示: {'有' if has_error else '无'} {f'({error_message})' if error_message else ''}")
+        logger.info(f"    - 保存预期: {scenario['should_save']}，实际: {is_saved}，{'✅匹配' if save_match else '❌不匹配'}")
+        logger.info(f"    - 错误预期: {scenario['should_error']}，实际: {has_error}，{'✅匹配' if error_match else '❌不匹配'}")
+        logger.info(f"    - 综合结果: {'✅ 通过' if overall_match else '❌ 失败'}")
+        
+        assert overall_match, (
+            f"{label}字段验证失败 - {scenario['name']}: "
+            f"预期保存={scenario['should_save']}/错误={scenario['should_error']}, "
+            f"实际保存={is_saved}/错误={has_error} {error_message}"
+        )
+    finally:
+        # 场景可能已改掉字段值（账号会归还账号池），刷新后与原值不同时还原
+        restore_field_value(profile_page, input_selector, original_value, companions, label)
+
+
+def judge_client_rejection(profile_page, scenario, probe):
+    """
+    客户端校验已拦截的场景：表单未提交，数据不会保存，也不需要还原
+    判定与保存路径一致：实际结果为 未保存/有错误
+    """
+    label = FIELD_SPECS[scenario["field"]]["label"]
+    error_message = probe["message"]
+    logger.info(f"  ⚡ 客户端校验已拦截（未提交）: {error_message or '(无提示文本)'}")
+    attach_field_screenshot(
+        profile_page, scenario["field"], scenario['name'], "client_check",
+        f"{scenario['name']}_客户端校验拦截（预期:{'成功' if scenario['should_save'] else '失败'}/"
+        f"{'有错误' if scenario['should_error'] else '无错误'}）"
+    )
+    
+    save_match = not scenario['should_save']
+    error_match = scenario['should_error']
+    logger.info(f"    - 保存预期: {scenario['should_save']}，实际: False，{'✅匹配' if save_match else '❌不匹配'}")
+    logger.info(f"    - 错误预期: {scenario['should_error']}，实际: True，{'✅匹配' if error_match else '❌不匹配'}")
+    
+    assert save_match and error_match, (
+        f"{label}字段验证失败 - {scenario['name']}: "
+        f"预期保存={scenario['should_save']}/错误={scenario['should_error']}, "
+        f"实际被客户端校验拦截: {error_message}"
+    )
+
+
+def restore_field_value(profile_page, input_selector, original_value, companions, label):
+    """还原字段原值（companions 同时回填，保证表单可提交）"""
+    logger.info(f"恢复原始{label}: '{original_value if original_value else '(空)'}'")
+    try:
+        profile_page.page.reload()
+        profile_page.page.wait_for_load_state("domcontentloaded")
+        profile_page.waits.for_visible(input_selector, timeout=5000)
+        if profile_page.page.input_value(input_selector) == original_value:
+            return
+        for companion_selector, companion_value in companions:
+            profile_page.fill_input(companion_selector, companion_value)
+        profile_page.fill_input(input_selector, original_value or "")
+        profile_page.click_element(profile_page.SAVE_BUTTON)
+        profile_page.page.wait_for_load_state("networkidle")
+    except Exception as e:
+        logger.warning(f"  ⚠️ 恢复原始{label}失败: {e}")
 
 
 # ============================================================================
@@ -213,6 +503,8 @@ def logged_in_page(page, test_data, request):
             email = valid_data.get("email", f"{username}@test.com")
             request.node._account_info = (username, email, password)
             logger.warning(f"⚠️ 使用降级账号: {username}，可能导致测试冲突")
+            from tests.aevatar_station.conftest import login_with_fallback
+            login_with_fallback(page, username, password)
         except Exception as fallback_error:
             logger.error(f"❌ 降级账号配置失败: {fallback_error}")
             raise Exception(f"登录失败且无法降级: 原始错误={e}, 降级错误={fallback_error}")
@@ -613,557 +905,21 @@ class TestProfile:
         logger.info("")
         logger.info("✅ 所有字段已成功还原为原始值")
         logger.info("TC-FUNC-005执行成功")
+    
     @pytest.mark.P1
     @pytest.mark.validation
-    def test_p1_username_field_validation(self, logged_in_profile_page):
+    @pytest.mark.parametrize("scenario", field_scenarios("username"))
+    def test_p1_username_field_validation(self, logged_in_profile_page, scenario):
         """
         TC-VALID-USERNAME-001: Username字段完整验证测试
         ...
         """
-        logger.info("=" * 80)
-        logger.info("TC-VALID-USERNAME-001: Username字段完整验证（格式+长度+必填）")
-        logger.info("=" * 80)
-        
-        # ⚡ 预处理：清除页面上残留的 Toast/Alert
-        try:
-            logged_in_profile_page.page.evaluate("document.querySelectorAll('.alert, .toast, .notification, .ant-message').forEach(e => e.remove())")
-        except:
-            pass
-            
-        logger.info("后端规则：1-256字符，必填，^[a-zA-Z0-9_.@-]+$")
-        logger.info("=" * 80)
-        
-        profile_page = logged_in_profile_page
-        screenshot_idx = 1
-        
-        # 获取原始用户名
-        original_username = profile_page.get_username_value()
-        logger.info(f"原始Username: '{original_username}'")
-        
-        # 截图：初始状态
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        screenshot_path = f"username_init_{timestamp}.png"
-        profile_page.take_screenshot(screenshot_path)
-        allure.attach.file(
-            f"screenshots/{screenshot_path}",
-            name=f"{screenshot_idx}-Username字段初始状态",
-            attachment_type=allure.attachment_type.PNG
-        )
-        screenshot_idx += 1
-        
-        # 引入随机数生成
-        import uuid
-        def get_rand(length=6): return uuid.uuid4().hex[:length]
-        
-        # 定义完整测试场景
-        test_scenarios = [
-            # ========== 1. 格式验证-有效（5个场景） ==========
-            {
-                "type": "format_valid",
-                "name": "普通英文用户名",
-                "value": f"TestUser{get_rand()}",
-                "should_save": True,
-                "should_error": False,
-                "description": "纯英文字母（符合正则）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "带数字下划线",
-                "value": f"user_123_{get_rand()}",
-                "should_save": True,
-                "should_error": False,
-                "description": "英文+数字+下划线（符合正则）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "带点和连字符", # 修正描述
-                "value": f"test.user-name.{get_rand()}", # 确保唯一性
-                "should_save": True,
-                "should_error": False,
-                "description": "英文+点+连字符（符合正则）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "包含@符号",
-                "value": f"user@{get_rand()}.com",
-                "should_save": True,
-                "should_error": False,
-                "description": "包含@符号（作为用户名允许）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "纯数字",
-                "value": f"123456{get_rand(6)}", # 纯数字也随机化
-                "should_save": True,
-                "should_error": False,
-                "description": "纯数字（符合正则）",
-                "expected": "成功保存",
-            },
-            
-            # ========== 2. 格式验证-无效（4个场景） ==========
-            {
-                "type": "format_invalid",
-                "name": "包含空格",
-                "value": f"user {get_rand()} name", # 随机化防止意外匹配
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正
-                "description": "包含空格（不符合正则）",
-                "expected": "显示错误提示",
-            },
-            {
-                "type": "format_invalid",
-                "name": "特殊字符1",
-                "value": f"user{get_rand()}!@#$%",
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正
-                "description": "包含!@#$%（不符合正则）",
-                "expected": "显示错误提示",
-            },
-            {
-                "type": "format_invalid",
-                "name": "特殊字符2",
-                "value": f"user{get_rand()}*&^",
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正
-                "description": "包含*&^（不符合正则）",
-                "expected": "显示错误提示",
-            },
-            {
-                "type": "format_invalid",
-                "name": "中文字符",
-                "value": f"测试用户{get_rand()}",
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正
-                "description": "包含中文（不符合正则）",
-                "expected": "后端拒绝（无前端提示）",
-            },
-            
-            # ========== 3. 长度验证（5个场景） ==========
-            {
-                "type": "length_min",
-                "name": "最小长度1字符",
-                "value": "a", # 1字符很难保证唯一，但如果是测试长度，通常可以重试或者忽略唯一性检查（如果后端先查长度再查唯一性）。不过为了安全，我们假设它会冲突。
-                # 修正：1字符几乎肯定冲突。应该用随机字符。
-                "value": get_rand(1),
-                "should_save": True,
-                "should_error": False,
-                "description": "最小有效长度（边界值）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "length_normal",
-                "name": "正常长度50字符",
-                "value": (get_rand(8) + "u" * 50)[:50], # 随机前缀
-                "should_save": True,
-                "should_error": False,
-                "description": "正常长度",
-                "expected": "成功保存",
-            },
-            {
-                "type": "length_max",
-                "name": "最大长度256字符",
-                "value": (get_rand(8) + "x" * 256)[:256], # 随机前缀
-                "should_save": True,
-                "should_error": False,
-                "description": "最大允许长度（边界值）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "length_over",
-                "name": "超长257字符",
-                "value": (get_rand(8) + "y" * 300)[:257],
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正
-                "description": "超过最大长度（边界值+1）",
-                "expected": "显示错误提示",
-            },
-            {
-                "type": "length_over",
-                "name": "极长300字符",
-                "value": (get_rand(8) + "z" * 400)[:300],
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正
-                "description": "远超最大长度",
-                "expected": "显示错误提示",
-            },
-            
-            # ========== 4. 必填验证（1个场景） ==========
-            {
-                "type": "required_empty",
-                "name": "空值验证",
-                "value": "",
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正
-                "description": "空值（必填字段）",
-                "expected": "显示必填错误",
-            },
-        ]
-        
-        validation_results = []
-        
-        # ⚡ 优化：测试开始时只reload一次
-        logger.info("")
-        logger.info("=" * 70)
-        logger.info("⚡ 开始批量场景测试（不重复reload，避免资源泄漏）")
-        logger.info("=" * 70)
-        profile_page.page.reload()
-        profile_page.page.wait_for_load_state("domcontentloaded")
-        # wait_for_timeout(2000) removed - networkidle is enough usually, but keeping it small
-        profile_page.page.wait_for_timeout(500)
-        
-        # 执行测试场景
-        for idx, scenario in enumerate(test_scenarios, 1):
-            # Cleanup removed for stability check
-            pass
-            logger.info("")
-            logger.info("=" * 70)
-            logger.info(f"场景 {idx}/{len(test_scenarios)}: {scenario['name']}")
-            logger.info("=" * 70)
-            logger.info(f"  输入值: '{scenario['value'][:50]}{'...' if len(scenario['value']) > 50 else ''}'")
-            logger.info(f"  长度: {len(scenario['value'])} 字符")
-            logger.info(f"  描述: {scenario['description']}")
-            logger.info(f"  预期: {scenario['expected']}")
-            
-            # ⚡ 不再每次都reload，直接清空并输入新值
-            profile_page.fill_input(profile_page.USERNAME_INPUT, "")  # 先清空
-            profile_page.page.wait_for_timeout(300)
-            
-            # 输入测试值
-            profile_page.fill_input(profile_page.USERNAME_INPUT, scenario['value'])
-            
-            # 截图1：输入后
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_name = scenario['name'].replace(' ', '_').replace('/', '_')
-            screenshot_path = f"username_{safe_name}_input_{timestamp}.png"
-            profile_page.take_screenshot(screenshot_path)
-            allure.attach.file(
-                f"screenshots/{screenshot_path}",
-                name=f"{screenshot_idx}-{scenario['name']}_输入后",
-                attachment_type=allure.attachment_type.PNG
-            )
-            screenshot_idx += 1
-            
-            # 点击保存
-            profile_page.click_element(profile_page.SAVE_BUTTON)
-            profile_page.page.wait_for_timeout(500)  # ⚡ 缩短等待，尽早捕捉toast
-            
-            # 检查是否有错误提示（在刷新前检测）
-            has_error = False
-            error_message = ""
-            try:
-                # 检查HTML5验证错误
-                validation_info = profile_page.page.evaluate(f"""
-                    (() => {{
-                        const el = document.querySelector("{profile_page.USERNAME_INPUT}");
-                        return {{
-                            valid: el ? el.validity.valid : null,
-                            message: el ? el.validationMessage : '',
-                            valueMissing: el ? el.validity.valueMissing : null,
-                            patternMismatch: el ? el.validity.patternMismatch : null,
-                            tooLong: el ? el.validity.tooLong : null,
-                        }};
-                    }})()
-                """)
-                
-                if validation_info and not validation_info['valid']:
-                    has_error = True
-                    error_message = validation_info['message']
-                    logger.info(f"  ✓ 检测到HTML5验证错误: {error_message}")
-                
-                # 检查页面错误提示（包括toast）
-                error_selectors = [
-                    ".invalid-feedback", 
-                    ".text-danger", 
-                    "[role='alert'].text-danger",
-                    ".toast-error",
-                    ".Toastify__toast--error",
-                    ".ant-message-error",
-                    ".el-message--error",
-                    "[class*='toast'][class*='error']",
-                    "[class*='Toast'][class*='error']",
-                    "[role='alert']"
-                ]
-                for selector in error_selectors:
-                    if profile_page.is_visible(selector):
-                        error_text = profile_page.get_text(selector)
-                        if error_text and error_text.strip():
-                            has_error = True
-                            if error_message:
-                                error_message += f" | {error_text}"
-                            else:
-                                error_message = error_text
-                            logger.info(f"  ✓ 检测到页面错误提示: {error_text}")
-            except Exception as e:
-                logger.warning(f"  检查错误时出现异常: {e}")
-            
-            # ⚡ 增强错误检测：通过文本内容查找（防止 selector 遗漏）
-            if not has_error:
-                try:
-                    error_texts = ["must be less than", "required", "invalid", "must be between"]
-                    for txt in error_texts:
-                        found_el = profile_page.page.locator(f"text=/{txt}/i").first
-                        if found_el.is_visible():
-                            found_text = found_el.text_content().strip()
-                            if found_text:
-                                has_error = True
-                                error_message = found_text
-                                logger.info(f"  ✓ 通过文本内容检测到错误提示: {found_text}")
-                                break
-                except:
-                    pass
-            
-            # ⚡ 增强错误检测：通过文本内容查找（防止 selector 遗漏）
-            if not has_error:
-                try:
-                    error_texts = ["must be less than", "required", "invalid", "must be between"]
-                    for txt in error_texts:
-                        # 查找包含特定错误文本的可见元素，排除 hidden
-                        found_el = profile_page.page.locator(f"text=/{txt}/i").first
-                        if found_el.is_visible():
-                            found_text = found_el.text_content().strip()
-                            if found_text:
-                                has_error = True
-                                error_message = found_text
-                                logger.info(f"  ✓ 通过文本内容检测到错误提示: {found_text}")
-                                break
-                except:
-                    pass
-
-            # 根据是否有错误决定截图策略和保存状态判断
-            if has_error:
-                # ⚡ 截图前再次清理 Success Toast (防止上个用例的Toast残留污染截图)
-                # Cleanup removed
-                pass
-                # 有HTML5验证错误：直接截图页面原始状态（不注入红色提示）
-                profile_page.page.wait_for_timeout(500)
-                
-                # 📸 截图：保存后（显示页面原始状态）
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"username_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # HTML5验证阻止了提交，数据未保存
-                is_saved = False
-                saved_value = profile_page.page.input_value(profile_page.USERNAME_INPUT)
-            elif scenario['should_save']:
-                # 无HTML5错误且预期成功：快速检测toast（避免toast消失）
-                profile_page.page.wait_for_timeout(500)  # ⚡ 只等500ms让toast完全显示
-                
-                # ⚡ 优先检测成功toast提示（在toast消失前）
-                has_success_toast = check_success_toast(profile_page, logger)
-                
-                # 📸 截图：保存后（显示toast或当前状态）
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"username_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # 🔧 如果没有toast，直接读取输入框值来验证（无需reload）
-                if has_success_toast:
-                    is_saved = True
-                    saved_value = scenario['value']
-                    logger.info("  ✅ 检测到成功toast，判断为保存成功")
-                else:
-                    # 没有toast时，读取输入框当前值判断
-                    current_value = profile_page.page.input_value(profile_page.USERNAME_INPUT)
-                    is_saved = (current_value == scenario['value'])
-                    saved_value = current_value
-                    if is_saved:
-                        logger.info(f"  ✅ 未检测到toast，但输入框值匹配 '{current_value}'，判断为保存成功")
-                    else:
-                        logger.warning(f"  ⚠️ 未检测到toast，且输入框值不匹配 (预期='{scenario['value']}', 实际='{current_value}')，判断为保存失败")
-            else:
-                # 无HTML5错误但预期失败：可能被input限制或后端拒绝
-                try:
-                    profile_page.page.wait_for_load_state("networkidle", timeout=3000)
-                except:
-                    pass
-                profile_page.page.wait_for_timeout(500)
-                
-                # ⭐ 重要：截图前再次检测错误（toast可能延迟显示）
-                try:
-                    for selector in error_selectors:
-                        if profile_page.is_visible(selector):
-                            error_text = profile_page.get_text(selector)
-                            if error_text and error_text.strip():
-                                has_error = True
-                                if error_message:
-                                    error_message += f" | {error_text}"
-                                else:
-                                    error_message = error_text
-                                logger.info(f"  ✓ 延迟检测到错误提示: {error_text}")
-                                break
-                except:
-                    pass
-                
-                # 📸 截图：保存后（显示输入框当前值）
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"username_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # 刷新验证是否真的保存了
-                profile_page.page.reload()
-                profile_page.page.wait_for_load_state("domcontentloaded")
-                profile_page.page.wait_for_timeout(2000)
-                
-                # 获取持久化的值来判断
-                saved_value = profile_page.get_username_value()
-                is_saved = saved_value == scenario['value']
-            
-            # 生成截图描述
-            save_expected_str = "成功" if scenario['should_save'] else "失败"
-            save_actual_str = "成功" if is_saved else "失败"
-            error_expected_str = "有错误" if scenario['should_error'] else "无错误"
-            error_actual_str = "有错误" if has_error else "无错误"
-            
-            screenshot_desc = f"{screenshot_idx}-{scenario['name']}_保存后（预期:{save_expected_str}/{error_expected_str}, 实际:{save_actual_str}/{error_actual_str}）"
-            
-            allure.attach.file(
-                f"screenshots/{screenshot_path}",
-                name=screenshot_desc,
-                attachment_type=allure.attachment_type.PNG
-            )
-            screenshot_idx += 1
-            
-            # 判断结果
-            save_match = is_saved == scenario['should_save']
-            error_match = has_error == scenario['should_error']
-            overall_match = save_match and error_match
-            
-            # 1. 前端体验问题：后端拒绝了(save_match=True)，但前端没提示(error_match=False)
-            is_frontend_bug = scenario['should_error'] and not has_error and save_match
-            
-            # 2. 截断保存问题：后端接受了(actually_saved=True)，预期是拒绝(should_save=False) -> save_match=False
-            # 这种情况通常伴随着 Success Toast (has_success_toast=True)
-            # ⚡ 修正：只要不该保存却保存了，且有Success Toast，就认为是截断/后端宽松策略
-            is_truncation_issue = not save_match and is_saved
-            
-            # 3. ⚡ 状态冲突问题：既有Success Toast又有错误提示（Double State Bug）
-            # 这会导致 is_saved=True 和 has_error=True，如果预期 should_save=False, should_error=True
-            # 则 save_match=False, error_match=True -> overall_match=False
-            is_double_state_bug = is_saved and has_error and not scenario['should_save'] and scenario['should_error']
-
-            # ⚡ 修复逻辑：如果是前端体验问题（Silent Failure），暂不视为测试失败，改为Warning
-            if is_frontend_bug:
-                overall_match = True
-                logger.warning(f"  ⚠️ 前端体验问题：无效输入未显示错误提示，但数据正确未被保存。标记为通过。")
-
-            # ⚡ 修复逻辑：如果是截断保存问题（Silent Truncation），暂不视为测试失败，改为Warning
-            if is_truncation_issue:
-                overall_match = True
-                logger.warning(f"  ⚠️ 后端行为预警：超长输入未被完全拒绝，而是可能被截断保存或部分接受（出现了Success Toast）。标记为通过。")
-
-            # ⚡ 修复逻辑：如果是状态冲突问题（Double State Bug），暂不视为测试失败，改为Warning
-            if is_double_state_bug:
-                overall_match = True
-                logger.warning(f"  ⚠️ 状态冲突预警：同时检测到 Success Toast 和 错误提示。这通常是一个Bug，但在测试中暂且容忍并标记为 Warning。")
-
-            # 记录结果
-            logger.info(f"")
-            logger.info(f"  实际结果:")
-            logger.info(f"    - 保存状态: {'成功保存' if is_saved else '未保存/被修改'}")
-            logger.info(f"    - 保存值: '{saved_value[:50] if saved_value else '(空)'}{'...' if saved_value and len(saved_value) > 50 else ''}'")
-            logger.info(f"    - 错误提示: {'有' if has_error else '无'} {f'({error_message})' if error_message else ''}")
-            logger.info(f"")
-            logger.info(f"  结果判断:")
-            logger.info(f"    - 保存预期: {scenario['should_save']}，实际: {is_saved}，{'✅匹配' if save_match else '❌不匹配'}")
-            logger.info(f"    - 错误预期: {scenario['should_error']}，实际: {has_error}，{'✅匹配' if error_match else '❌不匹配'}")
-            logger.info(f"    - 综合结果: {'✅ 通过' if overall_match else '❌ 失败'}")
-            
-            if is_frontend_bug:
-                logger.error(f"  🐛 前端BUG记录：无效输入未显示错误提示！（后端已拒绝，但前端无反馈）")
-            
-            validation_results.append({
-                "scenario": scenario['name'],
-                "type": scenario['type'],
-                "input": scenario['value'],
-                "input_length": len(scenario['value']),
-                "saved": saved_value if saved_value else "(空)",
-                "saved_length": len(saved_value) if saved_value else 0,
-                "expected_save": scenario['should_save'],
-                "actually_saved": is_saved,
-                "expected_error": scenario['should_error'],
-                "actually_error": has_error,
-                "error_message": error_message,
-                "match": overall_match,
-                "is_frontend_bug": is_frontend_bug,
-                "is_truncation_issue": is_truncation_issue,
-                "is_double_state_bug": is_double_state_bug
-            })
-        
-        # 恢复原始用户名
-        logger.info("")
-        logger.info("=" * 70)
-        logger.info(f"恢复原始Username: '{original_username}'")
-        logger.info("=" * 70)
-        profile_page.page.reload()
-        profile_page.page.wait_for_load_state("domcontentloaded")
-        profile_page.page.wait_for_timeout(2000)
-        profile_page.fill_input(profile_page.USERNAME_INPUT, original_username)
-        profile_page.click_element(profile_page.SAVE_BUTTON)
-        profile_page.page.wait_for_load_state("networkidle")
-        profile_page.page.wait_for_timeout(2000)
-        
-        # 输出测试结果汇总
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info("Username字段验证结果汇总")
-        logger.info("=" * 80)
-        logger.info("| 场景 | 类型 | 长度 | 保存预期 | 保存实际 | 错误预期 | 错误实际 | 结果 |")
-        logger.info("|------|------|------|----------|----------|----------|----------|------|")
-        for r in validation_results:
-            scenario_short = r['scenario'][:15]
-            type_short = r['type'].split('_')[0][:6]
-            save_exp = "✓" if r['expected_save'] else "✗"
-            save_act = "✓" if r['actually_saved'] else "✗"
-            err_exp = "✓" if r['expected_error'] else "✗"
-            err_act = "✓" if r['actually_error'] else "✗"
-            result = "✅" if r['match'] else "❌"
-            logger.info(f"| {scenario_short:15} | {type_short:6} | {r['input_length']:4} | {save_exp:8} | {save_act:8} | {err_exp:8} | {err_act:8} | {result:4} |")
-        
-        # 统计通过率
-        passed = sum(1 for r in validation_results if r['match'])
-        total = len(validation_results)
-        pass_rate = (passed / total * 100) if total > 0 else 0
-        
-        # 统计前端BUG数量
-        frontend_bugs = [r for r in validation_results if r.get('is_frontend_bug', False)]
-        failed_scenarios = [r for r in validation_results if not r['match']]
-        
-        logger.info("")
-        logger.info(f"总体通过率: {passed}/{total} ({pass_rate:.1f}%)")
-        
-        # 输出前端BUG汇总（仅记录，不影响测试通过）
-        if frontend_bugs:
-            logger.warning("")
-            logger.warning(f"⚠️ 检测到 {len(frontend_bugs)} 个前端体验问题（实际结果符合预期，但前端未显示错误提示）:")
-            for bug in frontend_bugs:
-                logger.warning(f"   - {bug['scenario']}: 输入'{bug['input'][:30]}...' 应显示错误但前端无提示")
-            logger.warning(f"   💡 建议：这些场景虽然后端正确拒绝了，但前端应显示错误提示以改善用户体验")
-        
-        logger.info("=" * 80)
-        logger.info("TC-VALID-USERNAME-001执行完成")
-        
-        # ========== 断言：只有实际结果与预期不符的场景才算失败 ==========
-        if failed_scenarios:
-            failure_msgs = [f"❌ {len(failed_scenarios)}个场景实际结果与预期不符"]
-            for scenario in failed_scenarios:
-                failure_msgs.append(f"  - {scenario['scenario']}: 预期保存={scenario['expected_save']}/错误={scenario['expected_error']}, 实际保存={scenario['actually_saved']}/错误={scenario['actually_error']}")
-            
-            assert False, f"Username字段验证测试失败:\n" + "\n".join(failure_msgs)
+        run_field_validation_scenario(logged_in_profile_page, scenario)
     
     @pytest.mark.P1
     @pytest.mark.validation
-    def test_p1_name_field_validation(self, logged_in_profile_page):
-        # ⚡ 预处理：清除页面上残留的 Toast/Alert
-        try:
-            logged_in_profile_page.page.evaluate("document.querySelectorAll('.alert, .toast, .notification, .ant-message').forEach(e => e.remove())")
-        except:
-            pass
-
+    @pytest.mark.parametrize("scenario", field_scenarios("name"))
+    def test_p1_name_field_validation(self, logged_in_profile_page, scenario):
         """
         TC-VALID-NAME-001: Name字段格式与长度验证测试（完整版）
         
@@ -1224,533 +980,14 @@ class TestProfile:
         - 超过64字符应被拒绝或截断
         - 仅空格可能被trim为空值
         """
-        logger.info("开始执行TC-VALID-NAME-001: Name字段格式与长度验证")
-        logger.info("=" * 60)
-        logger.info("校验规则：MaxNameLength=64, 非必填, 几乎无格式限制")
-        logger.info("=" * 60)
-        
-        profile_page = logged_in_profile_page
-        screenshot_idx = 1
-        
-        # 引入随机数生成
-        import uuid
-        def get_rand(length=6): return uuid.uuid4().hex[:length]
-
-        # 获取原始Name和Surname（确保其他字段有效）
-        original_name = profile_page.get_name_value()
-        original_surname = profile_page.get_surname_value() or "TestSurname"
-        
-        logger.info(f"原始Name: '{original_name}'")
-        logger.info(f"原始Surname: '{original_surname}'")
-        
-        # 截图1：初始状态
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        screenshot_path = f"name_validation_init_{timestamp}.png"
-        profile_page.take_screenshot(screenshot_path)
-        allure.attach.file(
-            f"screenshots/{screenshot_path}",
-            name=f"{screenshot_idx}-Name字段初始状态",
-            attachment_type=allure.attachment_type.PNG
-        )
-        screenshot_idx += 1
-        
-        # 定义测试场景（完整覆盖12个场景）
-        test_scenarios = [
-            # ========== 1. 格式验证-有效（5个场景） ==========
-            {
-                "type": "format_valid",
-                "name": "纯英文",
-                "value": "John",
-                "should_save": True,
-                "should_error": False,
-                "description": "纯英文名字（有效）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "纯中文",
-                "value": "张三",
-                "should_save": True,
-                "should_error": False,
-                "description": "纯中文名字（有效）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "混合字符",
-                "value": "Test测试123!@#",
-                "should_save": True,
-                "should_error": False,
-                "description": "混合中英文数字特殊字符（有效）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "带撇号",
-                "value": "O'Brien",
-                "should_save": True,
-                "should_error": False,
-                "description": "包含撇号的名字（有效）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "纯数字",
-                "value": "123456",
-                "should_save": True,
-                "should_error": False,
-                "description": "纯数字（有效）",
-                "expected": "成功保存",
-            },
-            
-            # ========== 2. 长度验证（5个场景） ==========
-            {
-                "type": "length_empty",
-                "name": "空值允许",
-                "value": "",
-                "should_save": True,
-                "should_error": False,
-                "description": "空值（非必填，允许为空）",
-                "expected": "成功保存（空值）",
-            },
-            {
-                "type": "length_min",
-                "name": "最小长度1字符",
-                "value": "A",
-                "should_save": True,
-                "should_error": False,
-                "description": "最小长度（边界值）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "length_normal",
-                "name": "正常长度",
-                "value": "NormalName",
-                "should_save": True,
-                "should_error": False,
-                "description": "正常长度名字",
-                "expected": "成功保存",
-            },
-            {
-                "type": "length_max",
-                "name": "最大长度64字符",
-                "value": (f"N{get_rand(8)}" + "N"*60)[:64],
-                "should_save": True,
-                "should_error": False,
-                "description": "最大允许长度（边界值）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "length_over",
-                "name": "超长65字符",
-                "value": (f"X{get_rand(8)}" + "X"*60)[:65],
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正：实际上会显示 "Name must be less than..." 错误
-                "description": "超过最大长度（边界值+1）",
-                "expected": "显示长度超出错误提示",
-            },
-            
-            # ========== 3. 特殊情况（2个场景） ==========
-            {
-                "type": "special_spaces",
-                "name": "仅空格",
-                "value": "   ",
-                "should_save": True,  # 可能被trim为空，也算成功（非必填）
-                "should_error": False,
-                "description": "仅空格（可能被trim）",
-                "expected": "可能保存或trim为空",
-            },
-            {
-                "type": "special_emoji",
-                "name": "Emoji字符",
-                "value": "😀Test",
-                "should_save": True,  # 如果系统支持
-                "should_error": False,
-                "description": "包含Emoji（看系统支持）",
-                "expected": "如果系统支持则保存",
-            },
-        ]
-        
-        validation_results = []
-        
-        # ⚡ 优化：测试开始时只reload一次
-        logger.info("")
-        logger.info("=" * 70)
-        logger.info("⚡ 开始批量场景测试（不重复reload，避免资源泄漏）")
-        logger.info("=" * 70)
-        profile_page.page.reload()
-        profile_page.page.wait_for_load_state("domcontentloaded")
-        # wait_for_timeout(2000) removed - networkidle is enough usually, but keeping it small
-        profile_page.page.wait_for_timeout(500)
-        
-        # 执行测试场景
-        for idx, scenario in enumerate(test_scenarios, 1):
-            # Cleanup removed for stability check
-            pass
-            logger.info("")
-            logger.info("=" * 70)
-            logger.info(f"场景 {idx}/{len(test_scenarios)}: {scenario['name']}")
-            logger.info("=" * 70)
-            logger.info(f"  输入值: '{scenario['value'][:50]}{'...' if len(scenario['value']) > 50 else ''}'")
-            logger.info(f"  长度: {len(scenario['value'])} 字符")
-            logger.info(f"  描述: {scenario['description']}")
-            logger.info(f"  预期: {scenario['expected']}")
-            
-            # ⚡ 不再每次都reload，直接清空并输入新值
-            profile_page.fill_input(profile_page.NAME_INPUT, "")  # 先清空
-            profile_page.fill_input(profile_page.SURNAME_INPUT, "")  # 先清空
-            profile_page.page.wait_for_timeout(300)
-            
-            # 输入测试值（Name + 确保Surname有效）
-            profile_page.fill_input(profile_page.NAME_INPUT, scenario['value'])
-            profile_page.fill_input(profile_page.SURNAME_INPUT, original_surname)
-            
-            # 截图1：输入后
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_name = scenario['name'].replace(' ', '_').replace('/', '_')
-            screenshot_path = f"name_{safe_name}_input_{timestamp}.png"
-            profile_page.take_screenshot(screenshot_path)
-            allure.attach.file(
-                f"screenshots/{screenshot_path}",
-                name=f"{screenshot_idx}-{scenario['name']}_输入后",
-                attachment_type=allure.attachment_type.PNG
-            )
-            screenshot_idx += 1
-            
-            # 点击保存
-            profile_page.click_element(profile_page.SAVE_BUTTON)
-            profile_page.page.wait_for_timeout(500)  # ⚡ 缩短等待，尽早捕捉toast
-            
-            # 检查是否有错误提示（在刷新前检测）
-            has_error = False
-            error_message = ""
-            try:
-                # 检查HTML5验证错误
-                validation_info = profile_page.page.evaluate(f"""
-                    (() => {{
-                        const el = document.querySelector("{profile_page.NAME_INPUT}");
-                        return {{
-                            valid: el ? el.validity.valid : null,
-                            message: el ? el.validationMessage : '',
-                            tooLong: el ? el.validity.tooLong : null,
-                        }};
-                    }})()
-                """)
-                
-                if validation_info and not validation_info['valid']:
-                    has_error = True
-                    error_message = validation_info['message']
-                    logger.info(f"  ✓ 检测到HTML5验证错误: {error_message}")
-                
-                # 检查页面错误提示（包括toast）
-                error_selectors = [
-                    ".invalid-feedback", 
-                    ".text-danger", 
-                    "[role='alert'].text-danger",
-                    ".toast-error",
-                    ".Toastify__toast--error",
-                    ".ant-message-error",
-                    ".el-message--error",
-                    "[class*='toast'][class*='error']",
-                    "[class*='Toast'][class*='error']",
-                    "[role='alert']"
-                ]
-                for selector in error_selectors:
-                    if profile_page.is_visible(selector):
-                        error_text = profile_page.get_text(selector)
-                        if error_text and error_text.strip():
-                            has_error = True
-                            if error_message:
-                                error_message += f" | {error_text}"
-                            else:
-                                error_message = error_text
-                            logger.info(f"  ✓ 检测到页面错误提示: {error_text}")
-            except Exception as e:
-                logger.warning(f"  检查错误时出现异常: {e}")
-            
-            # ⚡ 增强错误检测：通过文本内容查找（防止 selector 遗漏）
-            if not has_error:
-                try:
-                    error_texts = ["must be less than", "required", "invalid", "must be between"]
-                    for txt in error_texts:
-                        found_el = profile_page.page.locator(f"text=/{txt}/i").first
-                        if found_el.is_visible():
-                            found_text = found_el.text_content().strip()
-                            if found_text:
-                                has_error = True
-                                error_message = found_text
-                                logger.info(f"  ✓ 通过文本内容检测到错误提示: {found_text}")
-                                break
-                except:
-                    pass
-            
-            # ⚡ 增强错误检测：通过文本内容查找（防止 selector 遗漏）
-            if not has_error:
-                try:
-                    error_texts = ["must be less than", "required", "invalid", "must be between"]
-                    for txt in error_texts:
-                        # 查找包含特定错误文本的可见元素，排除 hidden
-                        found_el = profile_page.page.locator(f"text=/{txt}/i").first
-                        if found_el.is_visible():
-                            found_text = found_el.text_content().strip()
-                            if found_text:
-                                has_error = True
-                                error_message = found_text
-                                logger.info(f"  ✓ 通过文本内容检测到错误提示: {found_text}")
-                                break
-                except:
-                    pass
-
-            # 根据是否有错误决定截图策略和保存状态判断
-            if has_error:
-                # ⚡ 截图前再次清理 Success Toast (防止上个用例的Toast残留污染截图)
-                try:
-                    profile_page.page.evaluate("""
-                        document.querySelectorAll('div').forEach(el => {
-                            try {
-                                if (el.innerText && (el.innerText.includes('Success') || el.innerText.includes('successfully'))) {
-                                    el.remove();
-                                }
-                            } catch(e) {}
-                        });
-                    """)
-                except:
-                    pass
-                
-                # 📸 截图：保存后（有错误）
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"name_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # HTML5验证阻止了提交，或者页面显示错误，数据未保存
-                is_saved = False
-                saved_value = profile_page.page.input_value(profile_page.NAME_INPUT)
-            elif scenario['should_save']:
-                # 无HTML5错误且预期成功：快速检测toast（避免toast消失）
-                profile_page.page.wait_for_timeout(500)  # ⚡ 只等500ms让toast完全显示
-                
-                # ⚡ 优先检测成功toast提示（在toast消失前）
-                has_success_toast = check_success_toast(profile_page, logger)
-                
-                # 📸 截图：保存后（显示toast或当前状态）
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"name_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # 🔧 如果没有toast，直接读取输入框值来验证（无需reload）
-                if has_success_toast:
-                    is_saved = True
-                    saved_value = scenario['value']
-                    logger.info("  ✅ 检测到成功toast，判断为保存成功")
-                else:
-                    # 没有toast时，读取输入框当前值判断
-                    current_value = profile_page.page.input_value(profile_page.NAME_INPUT)
-                    is_saved = (current_value == scenario['value'])
-                    saved_value = current_value
-                    if is_saved:
-                        logger.info(f"  ✅ 未检测到toast，但输入框值匹配 '{current_value}'，判断为保存成功")
-                    else:
-                        logger.warning(f"  ⚠️ 未检测到toast，且输入框值不匹配 (预期='{scenario['value']}', 实际='{current_value}')，判断为保存失败")
-            else:
-                # 无HTML5错误但预期失败：可能被input限制或后端拒绝
-                try:
-                    profile_page.page.wait_for_load_state("networkidle", timeout=3000)
-                except:
-                    pass
-                profile_page.page.wait_for_timeout(500)
-                
-                # ⭐ 重要：截图前再次检测错误（toast可能延迟显示）
-                try:
-                    for selector in error_selectors:
-                        if profile_page.is_visible(selector):
-                            error_text = profile_page.get_text(selector)
-                            if error_text and error_text.strip():
-                                has_error = True
-                                if error_message:
-                                    error_message += f" | {error_text}"
-                                else:
-                                    error_message = error_text
-                                logger.info(f"  ✓ 延迟检测到错误提示: {error_text}")
-                                break
-                except:
-                    pass
-                
-                # ⚡ 检查是否意外出现了 Success Toast (Silent Truncation Case)
-                has_success_toast = check_success_toast(profile_page, logger)
-                if has_success_toast:
-                     logger.warning("  ⚠️ 警告：检测到 Success Toast，尽管预期应该是失败。可能是后端执行了截断保存。")
-                     # 如果出现了 Success Toast，即使值不匹配，也标记为“保存行为发生了”
-                     is_saved = True 
-                
-                # ⚡ 截图前再次清理 Success Toast (防止上个用例的Toast残留污染截图)
-                try:
-                    profile_page.page.evaluate("""
-                        document.querySelectorAll('div').forEach(el => {
-                            try {
-                                if (el.innerText && (el.innerText.includes('Success') || el.innerText.includes('successfully'))) {
-                                    el.remove();
-                                }
-                            } catch(e) {}
-                        });
-                    """)
-                except:
-                    pass
-
-                # 📸 截图：保存后
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"name_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # 刷新验证是否真的保存了
-                if not has_success_toast: # 如果已经有了 success toast，就不必通过 reload 来验证 saved 状态了
-                    profile_page.page.reload()
-                    profile_page.page.wait_for_load_state("domcontentloaded")
-                    # profile_page.page.wait_for_timeout(2000) removed
-                    
-                    # 获取持久化的值来判断
-                    saved_value = profile_page.get_name_value()
-                    
-                    if scenario['type'] in ['length_empty', 'special_spaces']:
-                        is_saved = (saved_value == scenario['value']) or (saved_value == '' or saved_value is None)
-                    else:
-                        is_saved = saved_value == scenario['value']
-                else:
-                     # 如果有 Success Toast，is_saved 已被设为 True
-                     pass
-            
-            # 生成截图描述
-            save_expected_str = "成功" if scenario['should_save'] else "失败"
-            save_actual_str = "成功" if is_saved else "失败"
-            error_expected_str = "有错误" if scenario['should_error'] else "无错误"
-            error_actual_str = "有错误" if has_error else "无错误"
-            
-            screenshot_desc = f"{screenshot_idx}-{scenario['name']}_保存后（预期:{save_expected_str}/{error_expected_str}, 实际:{save_actual_str}/{error_actual_str}）"
-            
-            allure.attach.file(
-                f"screenshots/{screenshot_path}",
-                name=screenshot_desc,
-                attachment_type=allure.attachment_type.PNG
-            )
-            screenshot_idx += 1
-            
-            # 判断结果
-            save_match = is_saved == scenario['should_save']
-            error_match = has_error == scenario['should_error']
-            overall_match = save_match and error_match
-            
-            # 1. 前端体验问题：后端拒绝了(save_match=True)，但前端没提示(error_match=False)
-            is_frontend_bug = scenario['should_error'] and not has_error and save_match
-            
-            # 2. 截断保存问题：后端接受了(actually_saved=True)，预期是拒绝(should_save=False) -> save_match=False
-            # 这种情况通常伴随着 Success Toast (has_success_toast=True)
-            # ⚡ 修正：只要不该保存却保存了，且有Success Toast，就认为是截断/后端宽松策略
-            is_truncation_issue = not save_match and is_saved
-
-            # ⚡ 修复逻辑：如果是前端体验问题（Silent Failure），暂不视为测试失败，改为Warning
-            if is_frontend_bug:
-                overall_match = True
-                logger.warning(f"  ⚠️ 前端体验问题：无效输入未显示错误提示，但数据正确未被保存。标记为通过。")
-
-            # ⚡ 修复逻辑：如果是截断保存问题（Silent Truncation），暂不视为测试失败，改为Warning
-            if is_truncation_issue:
-                overall_match = True
-                logger.warning(f"  ⚠️ 后端行为预警：超长输入未被完全拒绝，而是可能被截断保存或部分接受（出现了Success Toast）。标记为通过。")
-
-            logger.info(f"  实际: 保存={is_saved}, 错误={has_error}, 结果={'✅' if overall_match else '❌'}")
-            
-            if is_frontend_bug:
-                logger.error(f"  🐛 前端BUG记录：无效输入未显示错误提示！（后端已拒绝，但前端无反馈）")
-            
-            validation_results.append({
-                "scenario": scenario['name'],
-                "type": scenario['type'],
-                "input": scenario['value'],
-                "input_length": len(scenario['value']),
-                "saved": saved_value if saved_value else "(空)",
-                "saved_length": len(saved_value) if saved_value else 0,
-                "expected_save": scenario['should_save'],
-                "actually_saved": is_saved,
-                "expected_error": scenario['should_error'],
-                "actually_error": has_error,
-                "error_message": error_message,
-                "match": overall_match,
-                "is_frontend_bug": is_frontend_bug,
-                "is_truncation_issue": is_truncation_issue
-            })
-        
-        # 恢复原始Name
-        logger.info("")
-        logger.info("=" * 70)
-        logger.info(f"恢复原始Name: '{original_name if original_name else '(空)'}'")
-        logger.info("=" * 70)
-        profile_page.page.reload()
-        profile_page.page.wait_for_load_state("domcontentloaded")
-        profile_page.page.wait_for_timeout(2000)
-        profile_page.fill_input(profile_page.NAME_INPUT, original_name if original_name else "")
-        profile_page.fill_input(profile_page.SURNAME_INPUT, original_surname)
-        profile_page.click_element(profile_page.SAVE_BUTTON)
-        profile_page.page.wait_for_load_state("networkidle")
-        profile_page.page.wait_for_timeout(2000)
-        
-        # 输出测试结果汇总
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info("Name字段验证结果汇总")
-        logger.info("=" * 80)
-        logger.info("| 场景 | 类型 | 长度 | 保存预期 | 保存实际 | 错误预期 | 错误实际 | 结果 |")
-        logger.info("|------|------|------|----------|----------|----------|----------|------|")
-        for r in validation_results:
-            scenario_short = r['scenario'][:15]
-            type_short = r['type'].split('_')[0][:6]
-            save_exp = "✓" if r['expected_save'] else "✗"
-            save_act = "✓" if r['actually_saved'] else "✗"
-            err_exp = "✓" if r['expected_error'] else "✗"
-            err_act = "✓" if r['actually_error'] else "✗"
-            result = "✅" if r['match'] else "❌"
-            logger.info(f"| {scenario_short:15} | {type_short:6} | {r['input_length']:4} | {save_exp:8} | {save_act:8} | {err_exp:8} | {err_act:8} | {result:4} |")
-        
-        # 统计通过率
-        passed = sum(1 for r in validation_results if r['match'])
-        total = len(validation_results)
-        pass_rate = (passed / total * 100) if total > 0 else 0
-        
-        # 统计前端BUG数量
-        frontend_bugs = [r for r in validation_results if r.get('is_frontend_bug', False)]
-        failed_scenarios = [r for r in validation_results if not r['match']]
-        
-        logger.info("")
-        logger.info(f"总体通过率: {passed}/{total} ({pass_rate:.1f}%)")
-        
-        # 输出前端BUG汇总（仅记录，不影响测试通过）
-        if frontend_bugs:
-            logger.warning("")
-            logger.warning(f"⚠️ 检测到 {len(frontend_bugs)} 个前端体验问题（实际结果符合预期，但前端未显示错误提示）:")
-            for bug in frontend_bugs:
-                logger.warning(f"   - {bug['scenario']}: 输入'{bug['input'][:30]}...' 应显示错误但前端无提示")
-            logger.warning(f"   💡 建议：这些场景虽然后端正确拒绝了，但前端应显示错误提示以改善用户体验")
-        
-        logger.info("=" * 80)
-        logger.info("TC-VALID-NAME-001执行完成")
-        
-        # ========== 断言：只有实际结果与预期不符的场景才算失败 ==========
-        if failed_scenarios:
-            failure_msgs = [f"❌ {len(failed_scenarios)}个场景实际结果与预期不符"]
-            for scenario in failed_scenarios:
-                failure_msgs.append(f"  - {scenario['scenario']}: 预期保存={scenario['expected_save']}/错误={scenario['expected_error']}, 实际保存={scenario['actually_saved']}/错误={scenario['actually_error']}")
-            
-            assert False, f"Name字段验证测试失败:\n" + "\n".join(failure_msgs)
-    
-    @pytest.mark.P1
-    @pytest.mark.validation
-    def test_p1_surname_field_validation(self, logged_in_profile_page):
-        # ⚡ 预处理：清除页面上残留的 Toast/Alert
-        try:
-            logged_in_profile_page.page.evaluate("document.querySelectorAll('.alert, .toast, .notification, .ant-message').forEach(e => e.remove())")
-        except:
-            pass
-
-        """
-        TC-VALID-SURNAME-001: Surname字段格式与长度验证测试（完整版）
+        run_field_validation_scenario(logged_in_profile_page, scenario)
+    
+    @pytest.mark.P1
+    @pytest.mark.validation
+    @pytest.mark.parametrize("scenario", field_scenarios("surname"))
+    def test_p1_surname_field_validation(self, logged_in_profile_page, scenario):
+        """
+        TC-VALID-SURNAME-001: Surname字段格式与长度验证测试（完整版）
         
         测试目标：验证Surname字段的完整验证规则（格式+长度+必填/非必填）
         测试区域：Profile - Personal Settings - Surname Validation
@@ -1805,596 +1042,74 @@ class TestProfile:
         - 空值应被接受（非必填字段）
         - 超过64字符应被拒绝或截断
         """
-        logger.info("开始执行TC-VALID-SURNAME-001: Surname字段格式与长度验证")
-        logger.info("=" * 60)
-        logger.info("校验规则：MaxSurnameLength=64, 非必填, 几乎无格式限制")
-        logger.info("=" * 60)
-        
-        profile_page = logged_in_profile_page
-        screenshot_idx = 1
-        
-        # 引入随机数生成
-        import uuid
-        def get_rand(length=6): return uuid.uuid4().hex[:length]
+        run_field_validation_scenario(logged_in_profile_page, scenario)
 
-        # 获取原始Surname和Name（确保其他字段有效）
-        original_surname = profile_page.get_surname_value()
-        original_name = profile_page.get_name_value() or "TestName"
+    @pytest.mark.P1
+    @pytest.mark.validation
+    @pytest.mark.parametrize("scenario", field_scenarios("email"))
+    def test_p1_email_field_format_validation(self, logged_in_profile_page, scenario):
+        """
+        TC-VALID-EMAIL-001: Email字段格式与长度验证测试（完整版）
         
-        logger.info(f"原始Surname: '{original_surname}'")
-        logger.info(f"原始Name: '{original_name}'")
+        测试目标：验证Email字段的完整验证规则（格式+长度+必填）
+        测试区域：Profile - Personal Settings - Email Validation
         
-        # 截图1：初始状态
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        screenshot_path = f"surname_validation_init_{timestamp}.png"
-        profile_page.take_screenshot(screenshot_path)
-        allure.attach.file(
-            f"screenshots/{screenshot_path}",
-            name=f"{screenshot_idx}-Surname字段初始状态",
-            attachment_type=allure.attachment_type.PNG
-        )
-        screenshot_idx += 1
+        ============================================================================
+        后端校验规则（ABP Framework AbpUserConsts）:
+        ============================================================================
         
-        # 定义测试场景（完整覆盖12个场景）
-        test_scenarios = [
-            # ========== 1. 格式验证-有效（5个场景） ==========
-            {
-                "type": "format_valid",
-                "name": "纯英文",
-                "value": "Smith",
-                "should_save": True,
-                "should_error": False,
-                "description": "纯英文姓氏（有效）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "纯中文",
-                "value": "李",
-                "should_save": True,
-                "should_error": False,
-                "description": "纯中文姓氏（有效）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "带连字符",
-                "value": "Smith-Jones",
-                "should_save": True,
-                "should_error": False,
-                "description": "复合姓氏带连字符（有效）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "带撇号",
-                "value": "O'Brien",
-                "should_save": True,
-                "should_error": False,
-                "description": "包含撇号的姓氏（有效）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "带空格",
-                "value": "Von Neumann",
-                "should_save": True,
-                "should_error": False,
-                "description": "包含空格的复杂姓氏（有效）",
-                "expected": "成功保存",
-            },
-            
-            # ========== 2. 长度验证（5个场景） ==========
-            {
-                "type": "length_empty",
-                "name": "空值允许",
-                "value": "",
-                "should_save": True,
-                "should_error": False,
-                "description": "空值（非必填，允许为空）",
-                "expected": "成功保存（空值）",
-            },
-            {
-                "type": "length_min",
-                "name": "最小长度1字符",
-                "value": "L",
-                "should_save": True,
-                "should_error": False,
-                "description": "最小长度（边界值）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "length_normal",
-                "name": "正常长度",
-                "value": "Johnson",
-                "should_save": True,
-                "should_error": False,
-                "description": "正常长度姓氏",
-                "expected": "成功保存",
-            },
-            {
-                "type": "length_max",
-                "name": "最大长度64字符",
-                "value": (f"S{get_rand(8)}" + "S"*60)[:64],
-                "should_save": True,
-                "should_error": False,
-                "description": "最大允许长度（边界值）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "length_over",
-                "name": "超长65字符",
-                "value": (f"T{get_rand(8)}" + "T"*60)[:65],
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正：实际上会显示错误
-                "description": "超过最大长度（边界值+1）",
-                "expected": "显示长度超出错误提示",
-            },
-            
-            # ========== 3. 特殊情况（2个场景） ==========
-            {
-                "type": "special_spaces",
-                "name": "仅空格",
-                "value": "   ",
-                "should_save": True,
-                "should_error": False,
-                "description": "仅空格（可能被trim）",
-                "expected": "可能保存或trim为空",
-            },
-            {
-                "type": "special_number",
-                "name": "纯数字",
-                "value": "789",
-                "should_save": True,
-                "should_error": False,
-                "description": "纯数字（验证是否允许）",
-                "expected": "成功保存（如果允许）",
-            },
-        ]
+        📋 字段属性
+        ┌──────────────────────────────────────────────────────────────────┐
+        │  字段名：Email                                                    │
+        │  必填状态：✅ 必填（后端强制验证）                               │
+        │  可编辑性：✅ 可编辑                                             │
+        │  长度限制：3-256字符                                             │
+        └──────────────────────────────────────────────────────────────────┘
         
-        validation_results = []
+        🔤 格式规则
+        ┌──────────────────────────────────────────────────────────────────┐
+        │  正则表达式：^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$   │
+        ├──────────────────────────────────────────────────────────────────┤
+        │  ✅ 必须包含：                                                    │
+        │     • @符号（必须有且只有一个）                                  │
+        │     • @前的用户名部分                                            │
+        │     • @后的域名部分                                              │
+        │     • 顶级域名（.com, .org等）                                   │
+        ├──────────────────────────────────────────────────────────────────┤
+        │  ❌ 不允许：                                                      │
+        │     • 缺少@符号                                                   │
+        │     • 缺少用户名                                                  │
+        │     • 缺少域名                                                    │
+        │     • 缺少顶级域名                                                │
+        └──────────────────────────────────────────────────────────────────┘
         
-        # ⚡ 优化：测试开始时只reload一次
-        logger.info("")
-        logger.info("=" * 70)
-        logger.info("⚡ 开始批量场景测试（不重复reload，避免资源泄漏）")
-        logger.info("=" * 70)
-        profile_page.page.reload()
-        profile_page.page.wait_for_load_state("domcontentloaded")
-        # wait_for_timeout(2000) removed - networkidle is enough usually, but keeping it small
-        profile_page.page.wait_for_timeout(500)
-        
-        # 执行测试场景
-        for idx, scenario in enumerate(test_scenarios, 1):
-            # Cleanup removed for stability check
-            pass
-            logger.info("")
-            logger.info("=" * 70)
-            logger.info(f"场景 {idx}/{len(test_scenarios)}: {scenario['name']}")
-            logger.info("=" * 70)
-            logger.info(f"  输入值: '{scenario['value'][:50]}{'...' if len(scenario['value']) > 50 else ''}'")
-            logger.info(f"  长度: {len(scenario['value'])} 字符")
-            logger.info(f"  描述: {scenario['description']}")
-            logger.info(f"  预期: {scenario['expected']}")
-            
-            # ⚡ 不再每次都reload，直接清空并输入新值
-            profile_page.fill_input(profile_page.NAME_INPUT, "")  # 先清空
-            profile_page.fill_input(profile_page.SURNAME_INPUT, "")  # 先清空
-            profile_page.page.wait_for_timeout(300)
-            
-            # 输入测试值（Surname + 确保Name有效）
-            profile_page.fill_input(profile_page.NAME_INPUT, original_name)
-            profile_page.fill_input(profile_page.SURNAME_INPUT, scenario['value'])
-            
-            # 截图1：输入后
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_name = scenario['name'].replace(' ', '_').replace('/', '_')
-            screenshot_path = f"surname_{safe_name}_input_{timestamp}.png"
-            profile_page.take_screenshot(screenshot_path)
-            allure.attach.file(
-                f"screenshots/{screenshot_path}",
-                name=f"{screenshot_idx}-{scenario['name']}_输入后",
-                attachment_type=allure.attachment_type.PNG
-            )
-            screenshot_idx += 1
-            
-            # 点击保存
-            profile_page.click_element(profile_page.SAVE_BUTTON)
-            profile_page.page.wait_for_timeout(500)  # ⚡ 缩短等待，尽早捕捉toast
-            
-            # 检查是否有错误提示（在刷新前检测）
-            has_error = False
-            error_message = ""
-            try:
-                validation_info = profile_page.page.evaluate(f"""
-                    (() => {{
-                        const el = document.querySelector("{profile_page.SURNAME_INPUT}");
-                        return {{
-                            valid: el ? el.validity.valid : null,
-                            message: el ? el.validationMessage : '',
-                            tooLong: el ? el.validity.tooLong : null,
-                        }};
-                    }})()
-                """)
-                
-                if validation_info and not validation_info['valid']:
-                    has_error = True
-                    error_message = validation_info['message']
-                    logger.info(f"  ✓ 检测到HTML5验证错误: {error_message}")
-                
-                # 检查页面错误提示（包括toast）
-                error_selectors = [
-                    ".invalid-feedback", 
-                    ".text-danger", 
-                    "[role='alert'].text-danger",
-                    ".toast-error",
-                    ".Toastify__toast--error",
-                    ".ant-message-error",
-                    ".el-message--error",
-                    "[class*='toast'][class*='error']",
-                    "[class*='Toast'][class*='error']",
-                    "[role='alert']"
-                ]
-                for selector in error_selectors:
-                    if profile_page.is_visible(selector):
-                        error_text = profile_page.get_text(selector)
-                        if error_text and error_text.strip():
-                            has_error = True
-                            if error_message:
-                                error_message += f" | {error_text}"
-                            else:
-                                error_message = error_text
-                            logger.info(f"  ✓ 检测到页面错误提示: {error_text}")
-            except Exception as e:
-                logger.warning(f"  检查错误时出现异常: {e}")
-            
-            # ⚡ 增强错误检测：通过文本内容查找（防止 selector 遗漏）
-            if not has_error:
-                try:
-                    error_texts = ["must be less than", "required", "invalid", "must be between"]
-                    for txt in error_texts:
-                        found_el = profile_page.page.locator(f"text=/{txt}/i").first
-                        if found_el.is_visible():
-                            found_text = found_el.text_content().strip()
-                            if found_text:
-                                has_error = True
-                                error_message = found_text
-                                logger.info(f"  ✓ 通过文本内容检测到错误提示: {found_text}")
-                                break
-                except:
-                    pass
-            
-            # ⚡ 增强错误检测：通过文本内容查找（防止 selector 遗漏）
-            if not has_error:
-                try:
-                    error_texts = ["must be less than", "required", "invalid", "must be between"]
-                    for txt in error_texts:
-                        # 查找包含特定错误文本的可见元素，排除 hidden
-                        found_el = profile_page.page.locator(f"text=/{txt}/i").first
-                        if found_el.is_visible():
-                            found_text = found_el.text_content().strip()
-                            if found_text:
-                                has_error = True
-                                error_message = found_text
-                                logger.info(f"  ✓ 通过文本内容检测到错误提示: {found_text}")
-                                break
-                except:
-                    pass
-
-            # 根据是否有错误决定截图策略和保存状态判断
-            if has_error:
-                # ⚡ 截图前再次清理 Success Toast (防止上个用例的Toast残留污染截图)
-                try:
-                    profile_page.page.evaluate("""
-                        document.querySelectorAll('div').forEach(el => {
-                            try {
-                                if (el.innerText && (el.innerText.includes('Success') || el.innerText.includes('successfully'))) {
-                                    el.remove();
-                                }
-                            } catch(e) {}
-                        });
-                    """)
-                except:
-                    pass
-                
-                # 📸 截图：保存后（有错误）
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"surname_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # HTML5验证阻止了提交，或者页面显示错误，数据未保存
-                is_saved = False
-                saved_value = profile_page.page.input_value(profile_page.SURNAME_INPUT)
-            elif scenario['should_save']:
-                # 无HTML5错误且预期成功：快速检测toast（避免toast消失）
-                profile_page.page.wait_for_timeout(500)  # ⚡ 只等500ms让toast完全显示
-                
-                # ⚡ 优先检测成功toast提示（在toast消失前）
-                has_success_toast = check_success_toast(profile_page, logger)
-                
-                # 📸 截图：保存后（显示toast或当前状态）
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"surname_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # 🔧 如果没有toast，直接读取输入框值来验证（无需reload）
-                if has_success_toast:
-                    is_saved = True
-                    saved_value = scenario['value']
-                    logger.info("  ✅ 检测到成功toast，判断为保存成功")
-                else:
-                    # 没有toast时，读取输入框当前值判断
-                    current_value = profile_page.page.input_value(profile_page.SURNAME_INPUT)
-                    is_saved = (current_value == scenario['value'])
-                    saved_value = current_value
-                    if is_saved:
-                        logger.info(f"  ✅ 未检测到toast，但输入框值匹配 '{current_value}'，判断为保存成功")
-                    else:
-                        logger.warning(f"  ⚠️ 未检测到toast，且输入框值不匹配 (预期='{scenario['value']}', 实际='{current_value}')，判断为保存失败")
-            else:
-                # 无HTML5错误但预期失败：可能被input限制或后端拒绝
-                try:
-                    profile_page.page.wait_for_load_state("networkidle", timeout=3000)
-                except:
-                    pass
-                profile_page.page.wait_for_timeout(500)
-                
-                # ⭐ 重要：截图前再次检测错误（toast可能延迟显示）
-                try:
-                    for selector in error_selectors:
-                        if profile_page.is_visible(selector):
-                            error_text = profile_page.get_text(selector)
-                            if error_text and error_text.strip():
-                                has_error = True
-                                if error_message:
-                                    error_message += f" | {error_text}"
-                                else:
-                                    error_message = error_text
-                                logger.info(f"  ✓ 延迟检测到错误提示: {error_text}")
-                                break
-                except:
-                    pass
-                
-                # ⚡ 检查是否意外出现了 Success Toast (Silent Truncation Case)
-                has_success_toast = check_success_toast(profile_page, logger)
-                if has_success_toast:
-                     logger.warning("  ⚠️ 警告：检测到 Success Toast，尽管预期应该是失败。可能是后端执行了截断保存。")
-                     # 如果出现了 Success Toast，即使值不匹配，也标记为“保存行为发生了”
-                     is_saved = True 
-                
-                # ⚡ 截图前再次清理 Success Toast (防止上个用例的Toast残留污染截图)
-                try:
-                    profile_page.page.evaluate("""
-                        document.querySelectorAll('div').forEach(el => {
-                            try {
-                                if (el.innerText && (el.innerText.includes('Success') || el.innerText.includes('successfully'))) {
-                                    el.remove();
-                                }
-                            } catch(e) {}
-                        });
-                    """)
-                except:
-                    pass
-
-                # 📸 截图：保存后
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"surname_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # 刷新验证是否真的保存了
-                if not has_success_toast: # 如果已经有了 success toast，就不必通过 reload 来验证 saved 状态了
-                    profile_page.page.reload()
-                    profile_page.page.wait_for_load_state("domcontentloaded")
-                    # profile_page.page.wait_for_timeout(2000) removed
-                    
-                    # 获取持久化的值来判断
-                    saved_value = profile_page.get_surname_value()
-                    
-                    if scenario['type'] in ['length_empty', 'special_spaces']:
-                        is_saved = (saved_value == scenario['value']) or (saved_value == '' or saved_value is None)
-                    else:
-                        is_saved = saved_value == scenario['value']
-                else:
-                     # 如果有 Success Toast，is_saved 已被设为 True
-                     pass
-            
-            # 生成截图描述
-            save_expected_str = "成功" if scenario['should_save'] else "失败"
-            save_actual_str = "成功" if is_saved else "失败"
-            error_expected_str = "有错误" if scenario['should_error'] else "无错误"
-            error_actual_str = "有错误" if has_error else "无错误"
-            
-            screenshot_desc = f"{screenshot_idx}-{scenario['name']}_保存后（预期:{save_expected_str}/{error_expected_str}, 实际:{save_actual_str}/{error_actual_str}）"
-            allure.attach.file(f"screenshots/{screenshot_path}", name=screenshot_desc, attachment_type=allure.attachment_type.PNG)
-            screenshot_idx += 1
-            
-            save_match = is_saved == scenario['should_save']
-            error_match = has_error == scenario['should_error']
-            overall_match = save_match and error_match
-            
-            # 1. 前端体验问题：后端拒绝了(save_match=True)，但前端没提示(error_match=False)
-            is_frontend_bug = scenario['should_error'] and not has_error and save_match
-            
-            # 2. 截断保存问题：后端接受了(actually_saved=True)，预期是拒绝(should_save=False) -> save_match=False
-            # 这种情况通常伴随着 Success Toast (has_success_toast=True)
-            # ⚡ 修正：只要不该保存却保存了，且有Success Toast，就认为是截断/后端宽松策略
-            is_truncation_issue = not save_match and is_saved
-            
-            # 3. ⚡ 状态冲突问题：既有Success Toast又有错误提示（Double State Bug）
-            # 这会导致 is_saved=True 和 has_error=True，如果预期 should_save=False, should_error=True
-            # 则 save_match=False, error_match=True -> overall_match=False
-            is_double_state_bug = is_saved and has_error and not scenario['should_save'] and scenario['should_error']
-
-            # ⚡ 修复逻辑：如果是前端体验问题（Silent Failure），暂不视为测试失败，改为Warning
-            if is_frontend_bug:
-                overall_match = True
-                logger.warning(f"  ⚠️ 前端体验问题：无效输入未显示错误提示，但数据正确未被保存。标记为通过。")
-
-            # ⚡ 修复逻辑：如果是截断保存问题（Silent Truncation），暂不视为测试失败，改为Warning
-            if is_truncation_issue:
-                overall_match = True
-                logger.warning(f"  ⚠️ 后端行为预警：超长输入未被完全拒绝，而是可能被截断保存或部分接受（出现了Success Toast）。标记为通过。")
-
-            # ⚡ 修复逻辑：如果是状态冲突问题（Double State Bug），暂不视为测试失败，改为Warning
-            if is_double_state_bug:
-                overall_match = True
-                logger.warning(f"  ⚠️ 状态冲突预警：同时检测到 Success Toast 和 错误提示。这通常是一个Bug，但在测试中暂且容忍并标记为 Warning。")
-
-            logger.info(f"  实际: 保存={is_saved}, 错误={has_error}, 结果={'✅' if overall_match else '❌'}")
-            
-            if is_frontend_bug:
-                logger.error(f"  🐛 前端BUG记录：无效输入未显示错误提示！（后端已拒绝，但前端无反馈）")
-            
-            validation_results.append({
-                "scenario": scenario['name'],
-                "type": scenario['type'],
-                "input": scenario['value'],
-                "input_length": len(scenario['value']),
-                "saved": saved_value if saved_value else "(空)",
-                "saved_length": len(saved_value) if saved_value else 0,
-                "expected_save": scenario['should_save'],
-                "actually_saved": is_saved,
-                "expected_error": scenario['should_error'],
-                "actually_error": has_error,
-                "error_message": error_message,
-                "match": overall_match,
-                "is_frontend_bug": is_frontend_bug,
-                "is_truncation_issue": is_truncation_issue,
-                "is_double_state_bug": is_double_state_bug
-            })
-        
-        # 恢复原始Surname
-        logger.info("")
-        logger.info("=" * 70)
-        logger.info(f"恢复原始Surname: '{original_surname if original_surname else '(空)'}'")
-        logger.info("=" * 70)
-        profile_page.page.reload()
-        profile_page.page.wait_for_load_state("domcontentloaded")
-        profile_page.page.wait_for_timeout(2000)
-        profile_page.fill_input(profile_page.NAME_INPUT, original_name)
-        profile_page.fill_input(profile_page.SURNAME_INPUT, original_surname if original_surname else "")
-        profile_page.click_element(profile_page.SAVE_BUTTON)
-        profile_page.page.wait_for_load_state("networkidle")
-        profile_page.page.wait_for_timeout(2000)
-        
-        # 输出测试结果汇总
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info("Surname字段验证结果汇总")
-        logger.info("=" * 80)
-        logger.info("| 场景 | 类型 | 长度 | 保存预期 | 保存实际 | 错误预期 | 错误实际 | 结果 |")
-        logger.info("|------|------|------|----------|----------|----------|----------|------|")
-        for r in validation_results:
-            scenario_short = r['scenario'][:15]
-            type_short = r['type'].split('_')[0][:6]
-            save_exp = "✓" if r['expected_save'] else "✗"
-            save_act = "✓" if r['actually_saved'] else "✗"
-            err_exp = "✓" if r['expected_error'] else "✗"
-            err_act = "✓" if r['actually_error'] else "✗"
-            result = "✅" if r['match'] else "❌"
-            logger.info(f"| {scenario_short:15} | {type_short:6} | {r['input_length']:4} | {save_exp:8} | {save_act:8} | {err_exp:8} | {err_act:8} | {result:4} |")
-        
-        passed = sum(1 for r in validation_results if r['match'])
-        total = len(validation_results)
-        pass_rate = (passed / total * 100) if total > 0 else 0
-        
-        # 统计前端BUG数量
-        frontend_bugs = [r for r in validation_results if r.get('is_frontend_bug', False)]
-        failed_scenarios = [r for r in validation_results if not r['match']]
-        
-        logger.info("")
-        logger.info(f"总体通过率: {passed}/{total} ({pass_rate:.1f}%)")
-        
-        # 输出前端BUG汇总（仅记录，不影响测试通过）
-        if frontend_bugs:
-            logger.warning("")
-            logger.warning(f"⚠️ 检测到 {len(frontend_bugs)} 个前端体验问题（实际结果符合预期，但前端未显示错误提示）:")
-            for bug in frontend_bugs:
-                logger.warning(f"   - {bug['scenario']}: 输入'{bug['input'][:30]}...' 应显示错误但前端无提示")
-            logger.warning(f"   💡 建议：这些场景虽然后端正确拒绝了，但前端应显示错误提示以改善用户体验")
-        
-        logger.info("=" * 80)
-        logger.info("TC-VALID-SURNAME-001执行完成")
-        
-        # ========== 断言：只有实际结果与预期不符的场景才算失败 ==========
-        if failed_scenarios:
-            failure_msgs = [f"❌ {len(failed_scenarios)}个场景实际结果与预期不符"]
-            for scenario in failed_scenarios:
-                failure_msgs.append(f"  - {scenario['scenario']}: 预期保存={scenario['expected_save']}/错误={scenario['expected_error']}, 实际保存={scenario['actually_saved']}/错误={scenario['actually_error']}")
-            
-            assert False, f"Surname字段验证测试失败:\n" + "\n".join(failure_msgs)
-
-    @pytest.mark.P1
-    @pytest.mark.validation
-    def test_p1_email_field_format_validation(self, logged_in_profile_page):
-        # ⚡ 预处理：清除页面上残留的 Toast/Alert
-        try:
-            logged_in_profile_page.page.evaluate("document.querySelectorAll('.alert, .toast, .notification, .ant-message').forEach(e => e.remove())")
-        except:
-            pass
-
-        """
-        TC-VALID-EMAIL-001: Email字段格式与长度验证测试（完整版）
-        
-        测试目标：验证Email字段的完整验证规则（格式+长度+必填）
-        测试区域：Profile - Personal Settings - Email Validation
-        
-        ============================================================================
-        后端校验规则（ABP Framework AbpUserConsts）:
-        ============================================================================
-        
-        📋 字段属性
-        ┌──────────────────────────────────────────────────────────────────┐
-        │  字段名：Email                                                    │
-        │  必填状态：✅ 必填（后端强制验证）                               │
-        │  可编辑性：✅ 可编辑                                             │
-        │  长度限制：3-256字符                                             │
-        └──────────────────────────────────────────────────────────────────┘
-        
-        🔤 格式规则
-        ┌──────────────────────────────────────────────────────────────────┐
-        │  正则表达式：^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$   │
-        ├──────────────────────────────────────────────────────────────────┤
-        │  ✅ 必须包含：                                                    │
-        │     • @符号（必须有且只有一个）                                  │
-        │     • @前的用户名部分                                            │
-        │     • @后的域名部分                                              │
-        │     • 顶级域名（.com, .org等）                                   │
-        ├──────────────────────────────────────────────────────────────────┤
-        │  ❌ 不允许：                                                      │
-        │     • 缺少@符号                                                   │
-        │     • 缺少用户名                                                  │
-        │     • 缺少域名                                                    │
-        │     • 缺少顶级域名                                                │
-        └──────────────────────────────────────────────────────────────────┘
-        
-        📝 测试场景覆盖（15个场景）
-        ┌──────────────────────────────────────────────────────────────────┐
-        │  1. 格式验证-有效（5个场景）                                      │
-        │     • 标准邮箱：user@example.com                                  │
-        │     • 带点用户名：user.name@example.com                           │
-        │     • 带加号：user+tag@example.com                                │
-        │     • 子域名：test@sub.example.org                                │
-        │     • 带数字：user123@domain456.com                               │
-        ├──────────────────────────────────────────────────────────────────┤
-        │  2. 格式验证-无效（3个场景）                                      │
-        │     • 缺少@：invalidemail.com                                     │
-        │     • 缺少域名：test@                                             │
-        │     • 缺少用户名：@example.com                                    │
-        ├──────────────────────────────────────────────────────────────────┤
-        │  3. 长度验证（5个场景）                                           │
-        │     • 最小长度3字符：a@b                                          │
-        │     • 正常长度：user@example.com                                  │
-        │     • 最大长度256字符：构造的极长邮箱                             │
-        │     • 超长257字符：应被拒绝                                       │
-        │     • 极长300字符：应被拒绝                                       │
-        ├──────────────────────────────────────────────────────────────────┤
-        │  4. 边界情况（1个场景）                                           │
-        │     • 缺少顶级域名：test@example（HTML5可能接受，后端应拒绝）    │
-        ├──────────────────────────────────────────────────────────────────┤
-        │  5. 必填验证（1个场景）                                           │
-        │     • 空值：应触发必填验证错误                                    │
-        └──────────────────────────────────────────────────────────────────┘
+        📝 测试场景覆盖（15个场景）
+        ┌──────────────────────────────────────────────────────────────────┐
+        │  1. 格式验证-有效（5个场景）                                      │
+        │     • 标准邮箱：user@example.com                                  │
+        │     • 带点用户名：user.name@example.com                           │
+        │     • 带加号：user+tag@example.com                                │
+        │     • 子域名：test@sub.example.org                                │
+        │     • 带数字：user123@domain456.com                               │
+        ├──────────────────────────────────────────────────────────────────┤
+        │  2. 格式验证-无效（3个场景）                                      │
+        │     • 缺少@：invalidemail.com                                     │
+        │     • 缺少域名：test@                                             │
+        │     • 缺少用户名：@example.com                                    │
+        ├──────────────────────────────────────────────────────────────────┤
+        │  3. 长度验证（5个场景）                                           │
+        │     • 最小长度3字符：a@b                                          │
+        │     • 正常长度：user@example.com                                  │
+        │     • 最大长度256字符：构造的极长邮箱                             │
+        │     • 超长257字符：应被拒绝                                       │
+        │     • 极长300字符：应被拒绝                                       │
+        ├──────────────────────────────────────────────────────────────────┤
+        │  4. 边界情况（1个场景）                                           │
+        │     • 缺少顶级域名：test@example（HTML5可能接受，后端应拒绝）    │
+        ├──────────────────────────────────────────────────────────────────┤
+        │  5. 必填验证（1个场景）                                           │
+        │     • 空值：应触发必填验证错误                                    │
+        └──────────────────────────────────────────────────────────────────┘
         
         预期结果：
         - 有效格式通过验证，成功保存
@@ -2403,538 +1118,12 @@ class TestProfile:
         - 空值触发必填验证
         - 所有错误场景都有明确的错误提示
         """
-        logger.info("开始执行TC-VALID-EMAIL-001: Email字段格式与长度验证")
-        logger.info("=" * 60)
-        logger.info("校验规则：MinEmailLength=3, MaxEmailLength=256, 必填, 需要有效邮箱格式")
-        logger.info("=" * 60)
-        
-        profile_page = logged_in_profile_page
-        screenshot_idx = 1
-        
-        # 引入随机数生成
-        import uuid
-        def get_rand(length=6): return uuid.uuid4().hex[:length]
-        
-        # 获取原始Email
-        original_email = profile_page.get_email_value()
-        logger.info(f"原始Email: {original_email}")
-        
-        # 截图1：初始状态
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        screenshot_path = f"email_validation_init_{timestamp}.png"
-        profile_page.take_screenshot(screenshot_path)
-        allure.attach.file(
-            f"screenshots/{screenshot_path}",
-            name=f"{screenshot_idx}-Email字段初始状态",
-            attachment_type=allure.attachment_type.PNG
-        )
-        screenshot_idx += 1
-        
-        # 定义测试场景（完整覆盖15个场景）
-        test_scenarios = [
-            # ========== 1. 格式验证-有效（5个场景） ==========
-            {
-                "type": "format_valid",
-                "name": "标准邮箱",
-                "value": f"user{get_rand()}@example.com",
-                "should_save": True,
-                "should_error": False,
-                "description": "标准邮箱格式（有效）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "带点用户名",
-                "value": f"user.name.{get_rand()}@example.com",
-                "should_save": True,
-                "should_error": False,
-                "description": "用户名包含点（有效）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "带加号",
-                "value": f"user+tag{get_rand()}@example.com",
-                "should_save": True,
-                "should_error": False,
-                "description": "用户名包含加号（有效）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "子域名",
-                "value": f"test{get_rand()}@sub.example.org",
-                "should_save": True,
-                "should_error": False,
-                "description": "域名包含子域名（有效）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "format_valid",
-                "name": "带数字",
-                "value": f"user123{get_rand()}@domain456.com",
-                "should_save": True,
-                "should_error": False,
-                "description": "包含数字（有效）",
-                "expected": "成功保存",
-            },
-            
-            # ========== 2. 格式验证-无效（3个场景） ==========
-            {
-                "type": "format_invalid",
-                "name": "缺少@符号",
-                "value": "invalidemail.com",
-                "should_save": False,
-                "should_error": True,
-                "description": "缺少@符号（无效）",
-                "expected": "保存失败，显示错误",
-            },
-            {
-                "type": "format_invalid",
-                "name": "缺少域名",
-                "value": "test@",
-                "should_save": False,
-                "should_error": True,
-                "description": "缺少域名部分（无效）",
-                "expected": "保存失败，显示错误",
-            },
-            {
-                "type": "format_invalid",
-                "name": "缺少用户名",
-                "value": "@example.com",
-                "should_save": False,
-                "should_error": True,
-                "description": "缺少用户名部分（无效）",
-                "expected": "保存失败，显示错误",
-            },
-            
-            # ========== 3. 长度验证（5个场景） ==========
-            {
-                "type": "length_min",
-                "name": "最小长度3字符",
-                "value": "a@b",
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正：实际会报错 "Invalid email address"
-                "description": "格式虽然符合基本正则，但可能被认为无效",
-                "expected": "显示无效错误",
-            },
-            {
-                "type": "length_normal",
-                "name": "正常长度",
-                "value": f"normaluser{get_rand()}@example.com",
-                "should_save": True,
-                "should_error": False,
-                "description": "正常长度邮箱",
-                "expected": "成功保存",
-            },
-            {
-                "type": "length_max",
-                "name": "最大长度254字符",
-                # 构造254字符: Local(11)+@(1)+Domain(242)
-                # Domain分段: 60+1+60+1+60+1+55+4 = 242
-                "value": (f"u{get_rand(10)}@" + "d"*60 + "." + "d"*60 + "." + "d"*60 + "." + "d"*55 + ".com"),
-                "should_save": True,
-                "should_error": False,
-                "description": "最大允许长度（254字符-RFC标准）",
-                "expected": "成功保存",
-            },
-            {
-                "type": "length_over",
-                "name": "超长257字符",
-                # 构造257字符: Local(11)+@(1)+Domain(245)
-                # Domain分段: 60+1+60+1+60+1+58+4 = 245
-                "value": (f"x{get_rand(10)}@" + "d"*60 + "." + "d"*60 + "." + "d"*60 + "." + "d"*58 + ".com"),
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正
-                "description": "超过最大长度（边界值+1）",
-                "expected": "显示错误提示",
-            },
-            {
-                "type": "length_over",
-                "name": "极长300字符",
-                # 构造300字符: Local(11)+@(1)+Domain(288)
-                # Domain分段: 60+1+60+1+60+1+60+1+40+4 = 288
-                "value": (f"z{get_rand(10)}@" + "d"*60 + "." + "d"*60 + "." + "d"*60 + "." + "d"*60 + "." + "d"*40 + ".com"),
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正
-                "description": "远超最大长度",
-                "expected": "显示错误提示",
-            },
-            
-            # ========== 4. 边界情况（1个场景） ==========
-            {
-                "type": "format_boundary",
-                "name": "缺少顶级域名",
-                "value": "test@example",
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正
-                "description": "缺少顶级域名",
-                "expected": "显示错误提示",
-            },
-            
-            # ========== 5. 必填验证（1个场景） ==========
-            {
-                "type": "required_empty",
-                "name": "空值验证",
-                "value": "",
-                "should_save": False,
-                "should_error": True,  # ⚡ 修正
-                "description": "空值（必填字段）",
-                "expected": "显示必填错误",
-            },
-        ]
-        
-        validation_results = []
-        
-        # ⚡ 优化：测试开始时只reload一次
-        logger.info("")
-        logger.info("=" * 70)
-        logger.info("⚡ 开始批量场景测试（不重复reload，避免资源泄漏）")
-        logger.info("=" * 70)
-        profile_page.page.reload()
-        profile_page.page.wait_for_load_state("domcontentloaded")
-        # wait_for_timeout(2000) removed - networkidle is enough usually, but keeping it small
-        profile_page.page.wait_for_timeout(500)
-        
-        # 执行测试场景
-        for idx, scenario in enumerate(test_scenarios, 1):
-            # Cleanup removed for stability check
-            pass
-            logger.info("")
-            logger.info("=" * 70)
-            logger.info(f"场景 {idx}/{len(test_scenarios)}: {scenario['name']}")
-            logger.info("=" * 70)
-            logger.info(f"  输入值: '{scenario['value'][:50]}{'...' if len(scenario['value']) > 50 else ''}'")
-            logger.info(f"  长度: {len(scenario['value'])} 字符")
-            logger.info(f"  描述: {scenario['description']}")
-            logger.info(f"  预期: {scenario['expected']}")
-            
-            # ⚡ 不再每次都reload，直接清空并输入新值
-            profile_page.fill_input(profile_page.EMAIL_INPUT, "")  # 先清空
-            profile_page.page.wait_for_timeout(300)
-            
-            # 输入测试值
-            profile_page.fill_input(profile_page.EMAIL_INPUT, scenario['value'])
-            
-            # 截图1：输入后
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_name = scenario['name'].replace(' ', '_').replace('/', '_').replace('@', 'at')
-            screenshot_path = f"email_{safe_name}_input_{timestamp}.png"
-            profile_page.take_screenshot(screenshot_path)
-            allure.attach.file(
-                f"screenshots/{screenshot_path}",
-                name=f"{screenshot_idx}-{scenario['name']}_输入后",
-                attachment_type=allure.attachment_type.PNG
-            )
-            screenshot_idx += 1
-            
-            # 点击保存
-            profile_page.click_element(profile_page.SAVE_BUTTON)
-            profile_page.page.wait_for_timeout(500)  # ⚡ 缩短等待，尽早捕捉toast
-            
-            # 检查是否有错误提示（在刷新前检测）
-            has_error = False
-            error_message = ""
-            try:
-                # 检查HTML5验证错误
-                validation_info = profile_page.page.evaluate(f"""
-                    (() => {{
-                        const el = document.querySelector("{profile_page.EMAIL_INPUT}");
-                        return {{
-                            valid: el ? el.validity.valid : null,
-                            message: el ? el.validationMessage : '',
-                            valueMissing: el ? el.validity.valueMissing : null,
-                            typeMismatch: el ? el.validity.typeMismatch : null,
-                            tooLong: el ? el.validity.tooLong : null,
-                        }};
-                    }})()
-                """)
-                
-                if validation_info and not validation_info['valid']:
-                    has_error = True
-                    error_message = validation_info['message']
-                    logger.info(f"  ✓ 检测到HTML5验证错误: {error_message}")
-                
-                # 检查页面错误提示（包括toast）
-                error_selectors = [
-                    ".invalid-feedback", 
-                    ".text-danger", 
-                    "[role='alert'].text-danger",
-                    ".toast-error",
-                    ".Toastify__toast--error",
-                    ".ant-message-error",
-                    ".el-message--error",
-                    "[class*='toast'][class*='error']",
-                    "[class*='Toast'][class*='error']",
-                    "[role='alert']"
-                ]
-                for selector in error_selectors:
-                    if profile_page.is_visible(selector):
-                        error_text = profile_page.get_text(selector)
-                        if error_text and error_text.strip():
-                            has_error = True
-                            if error_message:
-                                error_message += f" | {error_text}"
-                            else:
-                                error_message = error_text
-                            logger.info(f"  ✓ 检测到页面错误提示: {error_text}")
-            except Exception as e:
-                logger.warning(f"  检查错误时出现异常: {e}")
-            
-            # ⚡ 增强错误检测：通过文本内容查找（防止 selector 遗漏）
-            if not has_error:
-                try:
-                    error_texts = ["must be less than", "required", "invalid", "must be between"]
-                    for txt in error_texts:
-                        found_el = profile_page.page.locator(f"text=/{txt}/i").first
-                        if found_el.is_visible():
-                            found_text = found_el.text_content().strip()
-                            if found_text:
-                                has_error = True
-                                error_message = found_text
-                                logger.info(f"  ✓ 通过文本内容检测到错误提示: {found_text}")
-                                break
-                except:
-                    pass
-            
-            # ⚡ 增强错误检测：通过文本内容查找（防止 selector 遗漏）
-            if not has_error:
-                try:
-                    error_texts = ["must be less than", "required", "invalid", "must be between"]
-                    for txt in error_texts:
-                        # 查找包含特定错误文本的可见元素，排除 hidden
-                        found_el = profile_page.page.locator(f"text=/{txt}/i").first
-                        if found_el.is_visible():
-                            found_text = found_el.text_content().strip()
-                            if found_text:
-                                has_error = True
-                                error_message = found_text
-                                logger.info(f"  ✓ 通过文本内容检测到错误提示: {found_text}")
-                                break
-                except:
-                    pass
-
-            # 根据是否有错误决定截图策略和保存状态判断
-            if has_error:
-                # ⚡ 截图前再次清理 Success Toast (防止上个用例的Toast残留污染截图)
-                # Cleanup removed
-                pass
-                # 有HTML5验证错误：直接截图页面原始状态（不注入红色提示）
-                profile_page.page.wait_for_timeout(500)
-                
-                # 📸 截图：保存后（显示页面原始状态）
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"email_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # HTML5验证阻止了提交，数据未保存
-                is_saved = False
-                saved_value = profile_page.page.input_value(profile_page.EMAIL_INPUT)
-            elif scenario['should_save']:
-                # 无HTML5错误且预期成功：快速检测toast（避免toast消失）
-                profile_page.page.wait_for_timeout(500)  # ⚡ 只等500ms让toast完全显示
-                
-                # ⚡ 优先检测成功toast提示（在toast消失前）
-                has_success_toast = check_success_toast(profile_page, logger)
-                
-                # 📸 截图：保存后（显示toast或当前状态）
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"email_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # 🔧 如果没有toast，直接读取输入框值来验证（无需reload）
-                if has_success_toast:
-                    is_saved = True
-                    saved_value = scenario['value']
-                    logger.info("  ✅ 检测到成功toast，判断为保存成功")
-                else:
-                    # 没有toast时，读取输入框当前值判断
-                    current_value = profile_page.page.input_value(profile_page.EMAIL_INPUT)
-                    is_saved = (current_value == scenario['value'])
-                    saved_value = current_value
-                    if is_saved:
-                        logger.info(f"  ✅ 未检测到toast，但输入框值匹配 '{current_value}'，判断为保存成功")
-                    else:
-                        logger.warning(f"  ⚠️ 未检测到toast，且输入框值不匹配 (预期='{scenario['value']}', 实际='{current_value}')，判断为保存失败")
-                profile_page.page.wait_for_load_state("domcontentloaded")
-                profile_page.page.wait_for_timeout(1000)
-                
-                # saved_value用于日志，但判断结果已经由toast确定
-                saved_value = scenario['value'] if is_saved else "(未保存)"
-            else:
-                # 无HTML5错误但预期失败：可能被input限制或后端拒绝
-                # 等待一下看是否有网络请求
-                try:
-                    profile_page.page.wait_for_load_state("networkidle", timeout=3000)
-                except:
-                    pass
-                profile_page.page.wait_for_timeout(500)
-                
-                # 📸 截图：保存后（显示输入框当前值）
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"email_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # 刷新验证是否真的保存了
-                profile_page.page.reload()
-                profile_page.page.wait_for_load_state("domcontentloaded")
-                profile_page.page.wait_for_timeout(3000)  # ⚡ 增加到3000ms确保并发环境数据加载完成
-                
-                # 获取持久化的值来判断
-                saved_value = profile_page.get_email_value()
-                is_saved = saved_value == scenario['value']
-            
-            # 生成截图描述
-            save_expected_str = "成功" if scenario['should_save'] else "失败"
-            save_actual_str = "成功" if is_saved else "失败"
-            error_expected_str = "有错误" if scenario['should_error'] else "无错误"
-            error_actual_str = "有错误" if has_error else "无错误"
-            
-            screenshot_desc = f"{screenshot_idx}-{scenario['name']}_保存后（预期:{save_expected_str}/{error_expected_str}, 实际:{save_actual_str}/{error_actual_str}）"
-            
-            allure.attach.file(
-                f"screenshots/{screenshot_path}",
-                name=screenshot_desc,
-                attachment_type=allure.attachment_type.PNG
-            )
-            screenshot_idx += 1
-            
-            # 判断结果
-            save_match = is_saved == scenario['should_save']
-            error_match = has_error == scenario['should_error']
-            overall_match = save_match and error_match
-            
-            # 1. 前端体验问题：后端拒绝了(save_match=True)，但前端没提示(error_match=False)
-            is_frontend_bug = scenario['should_error'] and not has_error and save_match
-            
-            # 2. 截断保存问题：后端接受了(actually_saved=True)，预期是拒绝(should_save=False) -> save_match=False
-            # 这种情况通常伴随着 Success Toast (has_success_toast=True)
-            # ⚡ 修正：只要不该保存却保存了，且有Success Toast，就认为是截断/后端宽松策略
-            is_truncation_issue = not save_match and is_saved
-            
-            # 3. ⚡ 状态冲突问题：既有Success Toast又有错误提示（Double State Bug）
-            # 这会导致 is_saved=True 和 has_error=True，如果预期 should_save=False, should_error=True
-            # 则 save_match=False, error_match=True -> overall_match=False
-            is_double_state_bug = is_saved and has_error and not scenario['should_save'] and scenario['should_error']
-
-            # ⚡ 修复逻辑：如果是前端体验问题（Silent Failure），暂不视为测试失败，改为Warning
-            if is_frontend_bug:
-                overall_match = True
-                logger.warning(f"  ⚠️ 前端体验问题：无效输入未显示错误提示，但数据正确未被保存。标记为通过。")
-
-            # ⚡ 修复逻辑：如果是截断保存问题（Silent Truncation），暂不视为测试失败，改为Warning
-            if is_truncation_issue:
-                overall_match = True
-                logger.warning(f"  ⚠️ 后端行为预警：超长输入未被完全拒绝，而是可能被截断保存或部分接受（出现了Success Toast）。标记为通过。")
-
-            # ⚡ 修复逻辑：如果是状态冲突问题（Double State Bug），暂不视为测试失败，改为Warning
-            if is_double_state_bug:
-                overall_match = True
-                logger.warning(f"  ⚠️ 状态冲突预警：同时检测到 Success Toast 和 错误提示。这通常是一个Bug，但在测试中暂且容忍并标记为 Warning。")
-
-            # 记录结果
-            logger.info(f"")
-            logger.info(f"  实际结果:")
-            logger.info(f"    - 保存状态: {'成功保存' if is_saved else '未保存/被修改'}")
-            logger.info(f"    - 保存值: '{saved_value[:50] if saved_value else '(空)'}{'...' if saved_value and len(saved_value) > 50 else ''}'")
-            logger.info(f"    - 错误提示: {'有' if has_error else '无'} {f'({error_message})' if error_message else ''}")
-            logger.info(f"")
-            logger.info(f"  结果判断:")
-            logger.info(f"    - 保存预期: {scenario['should_save']}，实际: {is_saved}，{'✅匹配' if save_match else '❌不匹配'}")
-            logger.info(f"    - 错误预期: {scenario['should_error']}，实际: {has_error}，{'✅匹配' if error_match else '❌不匹配'}")
-            logger.info(f"    - 综合结果: {'✅ 通过' if overall_match else '❌ 失败'}")
-            
-            if is_frontend_bug:
-                logger.error(f"  🐛 前端BUG记录：无效输入未显示错误提示！（后端已拒绝，但前端无反馈）")
-            
-            validation_results.append({
-                "scenario": scenario['name'],
-                "type": scenario['type'],
-                "input": scenario['value'],
-                "input_length": len(scenario['value']),
-                "saved": saved_value if saved_value else "(空)",
-                "saved_length": len(saved_value) if saved_value else 0,
-                "expected_save": scenario['should_save'],
-                "actually_saved": is_saved,
-                "expected_error": scenario['should_error'],
-                "actually_error": has_error,
-                "error_message": error_message,
-                "match": overall_match,
-                "is_frontend_bug": is_frontend_bug,
-                "is_truncation_issue": is_truncation_issue,
-                "is_double_state_bug": is_double_state_bug
-            })
-        
-        # 恢复原始Email
-        logger.info("")
-        logger.info("=" * 70)
-        logger.info(f"恢复原始Email: '{original_email}'")
-        logger.info("=" * 70)
-        profile_page.page.reload()
-        profile_page.page.wait_for_load_state("domcontentloaded")
-        profile_page.page.wait_for_timeout(2000)
-        profile_page.fill_input(profile_page.EMAIL_INPUT, original_email)
-        profile_page.click_element(profile_page.SAVE_BUTTON)
-        profile_page.page.wait_for_load_state("networkidle")
-        profile_page.page.wait_for_timeout(2000)
-        
-        # 输出测试结果汇总
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info("Email字段验证结果汇总")
-        logger.info("=" * 80)
-        logger.info("| 场景 | 类型 | 长度 | 保存预期 | 保存实际 | 错误预期 | 错误实际 | 结果 |")
-        logger.info("|------|------|------|----------|----------|----------|----------|------|")
-        for r in validation_results:
-            scenario_short = r['scenario'][:15]
-            type_short = r['type'].split('_')[0][:6]
-            save_exp = "✓" if r['expected_save'] else "✗"
-            save_act = "✓" if r['actually_saved'] else "✗"
-            err_exp = "✓" if r['expected_error'] else "✗"
-            err_act = "✓" if r['actually_error'] else "✗"
-            result = "✅" if r['match'] else "❌"
-            logger.info(f"| {scenario_short:15} | {type_short:6} | {r['input_length']:4} | {save_exp:8} | {save_act:8} | {err_exp:8} | {err_act:8} | {result:4} |")
-        
-        # 统计通过率
-        passed = sum(1 for r in validation_results if r['match'])
-        total = len(validation_results)
-        pass_rate = (passed / total * 100) if total > 0 else 0
-        
-        # 统计前端BUG数量
-        frontend_bugs = [r for r in validation_results if r.get('is_frontend_bug', False)]
-        failed_scenarios = [r for r in validation_results if not r['match']]
-        
-        logger.info("")
-        logger.info(f"总体通过率: {passed}/{total} ({pass_rate:.1f}%)")
-        
-        # 输出前端BUG汇总（仅记录，不影响测试通过）
-        if frontend_bugs:
-            logger.warning("")
-            logger.warning(f"⚠️ 检测到 {len(frontend_bugs)} 个前端体验问题（实际结果符合预期，但前端未显示错误提示）:")
-            for bug in frontend_bugs:
-                logger.warning(f"   - {bug['scenario']}: 输入'{bug['input'][:30]}...' 应显示错误但前端无提示")
-            logger.warning(f"   💡 建议：这些场景虽然后端正确拒绝了，但前端应显示错误提示以改善用户体验")
-        
-        logger.info("=" * 80)
-        logger.info("TC-VALID-EMAIL-001执行完成")
-        
-        # ========== 断言：只有实际结果与预期不符的场景才算失败 ==========
-        if failed_scenarios:
-            failure_msgs = [f"❌ {len(failed_scenarios)}个场景实际结果与预期不符"]
-            for scenario in failed_scenarios:
-                failure_msgs.append(f"  - {scenario['scenario']}: 预期保存={scenario['expected_save']}/错误={scenario['expected_error']}, 实际保存={scenario['actually_saved']}/错误={scenario['actually_error']}")
-            
-            assert False, f"Email字段验证测试失败:\n" + "\n".join(failure_msgs)
+        run_field_validation_scenario(logged_in_profile_page, scenario)
     
     @pytest.mark.P1
     @pytest.mark.validation
-    def test_p1_phone_field_format_validation(self, logged_in_profile_page):
-        # ⚡ 预处理：清除页面上残留的 Toast/Alert
-        try:
-            logged_in_profile_page.page.evaluate("document.querySelectorAll('.alert, .toast, .notification, .ant-message').forEach(e => e.remove())")
-        except:
-            pass
-
+    @pytest.mark.parametrize("scenario", field_scenarios("phone"))
+    def test_p1_phone_field_format_validation(self, logged_in_profile_page, scenario):
         """
         TC-VALID-PHONE-001: PhoneNumber字段长度验证测试
         
@@ -2953,420 +1142,7 @@ class TestProfile:
         2. 长度验证（5个）：空值/1字符/11字符/16字符/17字符（只有超长会失败）
         3. 特殊（1个）：仅空格
         """
-        logger.info("开始执行TC-VALID-PHONE-001: PhoneNumber字段长度验证")
-        logger.info("=" * 60)
-        logger.info("校验规则：MaxPhoneNumberLength=16, 非必填, ⚠️无格式验证（后端允许任何字符）")
-        logger.info("=" * 60)
-        
-        profile_page = logged_in_profile_page
-        screenshot_idx = 1
-        
-        # 引入随机数生成
-        import uuid
-        def get_rand(length=6): return uuid.uuid4().hex[:length]
-
-        original_phone = profile_page.get_phone_value()
-        original_name = profile_page.get_name_value() or "TestName"
-        original_surname = profile_page.get_surname_value() or "TestSurname"
-        
-        logger.info(f"原始Phone: '{original_phone}'")
-        
-        # 截图：初始状态
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        screenshot_path = f"phone_validation_init_{timestamp}.png"
-        profile_page.take_screenshot(screenshot_path)
-        allure.attach.file(
-            f"screenshots/{screenshot_path}",
-            name=f"{screenshot_idx}-Phone字段初始状态",
-            attachment_type=allure.attachment_type.PNG
-        )
-        screenshot_idx += 1
-        
-        # 定义测试场景
-        # ⚠️ 重要：后端ABP框架Identity模块对PhoneNumber字段只有长度限制（MaxPhoneNumberLength=16）
-        # 没有格式验证，任何字符都可以保存（包括字母、特殊字符、中文）
-        test_scenarios = [
-            # 格式验证（8个）- 后端无格式限制，都应该成功保存
-            {"type": "format_valid", "name": "纯数字", "value": "13800138000", "should_save": True, "should_error": False, "description": "11位手机号", "expected": "成功保存"},
-            {"type": "format_valid", "name": "国际格式", "value": "+86 138001380", "should_save": True, "should_error": False, "description": "国际格式+86（15字符内）", "expected": "成功保存"},
-            {"type": "format_valid", "name": "括号格式", "value": "(021)12345678", "should_save": True, "should_error": False, "description": "带括号区号", "expected": "成功保存"},
-            {"type": "format_valid", "name": "连字符格式", "value": "138-0013-8000", "should_save": True, "should_error": False, "description": "带连字符", "expected": "成功保存"},
-            {"type": "format_valid", "name": "混合格式", "value": "+86(138)001380", "should_save": True, "should_error": False, "description": "混合符号（15字符内）", "expected": "成功保存"},
-            # ⚠️ 后端无格式限制，以下字符也能保存（这是后端行为，不是BUG）
-            {"type": "format_valid", "name": "包含字母", "value": "138abc00138", "should_save": True, "should_error": False, "description": "包含字母（后端允许）", "expected": "成功保存"},
-            {"type": "format_valid", "name": "特殊字符", "value": "138#00138000", "should_save": True, "should_error": False, "description": "包含#号（后端允许，12字符）", "expected": "成功保存"},
-            {"type": "format_valid", "name": "中文字符", "value": "电话138", "should_save": True, "should_error": False, "description": "包含中文（后端允许）", "expected": "成功保存"},
-            
-            # 长度验证（5个）- 这是后端唯一的验证规则
-            {"type": "length_empty", "name": "空值允许", "value": "", "should_save": True, "should_error": False, "description": "空值（非必填）", "expected": "成功保存"},
-            {"type": "length_min", "name": "最小1字符", "value": "1", "should_save": True, "should_error": False, "description": "最小长度", "expected": "成功保存"},
-            {"type": "length_normal", "name": "正常11字符", "value": "13800138000", "should_save": True, "should_error": False, "description": "正常手机号", "expected": "成功保存"},
-            {"type": "length_max", "name": "最大16字符", "value": get_rand(16), "should_save": True, "should_error": False, "description": "最大长度（边界值）", "expected": "成功保存"},
-            {"type": "length_over", "name": "超长17字符", "value": get_rand(17), "should_save": False, "should_error": True, "description": "超过最大长度（后端拒绝）", "expected": "显示错误提示"},
-            
-            # 特殊（1个）
-            {"type": "special_spaces", "name": "仅空格", "value": "   ", "should_save": True, "should_error": False, "description": "仅空格（可能trim）", "expected": "可能trim为空"},
-        ]
-        
-        validation_results = []
-        
-        # ⚡ 优化：测试开始时只reload一次
-        logger.info("")
-        logger.info("=" * 70)
-        logger.info("⚡ 开始批量场景测试（不重复reload，避免资源泄漏）")
-        logger.info("=" * 70)
-        profile_page.page.reload()
-        profile_page.page.wait_for_load_state("domcontentloaded")
-        # wait_for_timeout(2000) removed - networkidle is enough usually, but keeping it small
-        profile_page.page.wait_for_timeout(500)
-        
-        for idx, scenario in enumerate(test_scenarios, 1):
-            # Cleanup removed for stability check
-            pass
-            logger.info("")
-            logger.info("=" * 70)
-            logger.info(f"场景 {idx}/{len(test_scenarios)}: {scenario['name']}")
-            logger.info("=" * 70)
-            logger.info(f"  输入值: '{scenario['value']}'")
-            logger.info(f"  长度: {len(scenario['value'])} 字符")
-            logger.info(f"  描述: {scenario['description']}")
-            logger.info(f"  预期: {scenario['expected']}")
-            
-            # ⚡ 不再每次都reload，直接清空并输入新值
-            profile_page.fill_input(profile_page.NAME_INPUT, "")  # 先清空
-            profile_page.fill_input(profile_page.SURNAME_INPUT, "")  # 先清空
-            profile_page.fill_input(profile_page.PHONE_INPUT, "")  # 先清空
-            profile_page.page.wait_for_timeout(300)
-            
-            profile_page.fill_input(profile_page.NAME_INPUT, original_name)
-            profile_page.fill_input(profile_page.SURNAME_INPUT, original_surname)
-            profile_page.fill_input(profile_page.PHONE_INPUT, scenario['value'])
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_name = scenario['name'].replace(' ', '_')
-            screenshot_path = f"phone_{safe_name}_input_{timestamp}.png"
-            profile_page.take_screenshot(screenshot_path)
-            allure.attach.file(
-                f"screenshots/{screenshot_path}",
-                name=f"{screenshot_idx}-{scenario['name']}_输入后",
-                attachment_type=allure.attachment_type.PNG
-            )
-            screenshot_idx += 1
-            
-            profile_page.click_element(profile_page.SAVE_BUTTON)
-            profile_page.page.wait_for_timeout(1500)  # ⚡ 缩短到1.5秒，尽早捕捉toast
-            
-            # 检查前端错误提示（在刷新前检测）
-            has_error = False
-            error_message = ""
-            try:
-                # 检查HTML5验证错误
-                validation_info = profile_page.page.evaluate(f"""
-                    (() => {{
-                        const el = document.querySelector("{profile_page.PHONE_INPUT}");
-                        return {{valid: el ? el.validity.valid : null, message: el ? el.validationMessage : ''}};
-                    }})()
-                """)
-                if validation_info and not validation_info['valid']:
-                    has_error = True
-                    error_message = validation_info['message']
-                    logger.info(f"  ✓ 检测到HTML5验证错误: {error_message}")
-                
-                # 检查页面错误提示（包括toast）
-                error_selectors = [
-                    ".invalid-feedback", 
-                    ".text-danger", 
-                    "[role='alert'].text-danger",
-                    ".toast-error",
-                    ".Toastify__toast--error",
-                    ".ant-message-error",
-                    ".el-message--error",
-                    "[class*='toast'][class*='error']",
-                    "[class*='Toast'][class*='error']",
-                    "[role='alert']"
-                ]
-                for selector in error_selectors:
-                    if profile_page.is_visible(selector):
-                        error_text = profile_page.get_text(selector)
-                        if error_text and error_text.strip():
-                            has_error = True
-                            if error_message:
-                                error_message += f" | {error_text}"
-                            else:
-                                error_message = error_text
-                            logger.info(f"  ✓ 检测到页面错误提示: {error_text}")
-            except Exception as e:
-                logger.warning(f"  检查错误时出现异常: {e}")
-            
-            # ⚡ 增强错误检测：通过文本内容查找（防止 selector 遗漏）
-            if not has_error:
-                try:
-                    error_texts = ["must be less than", "required", "invalid", "must be between"]
-                    for txt in error_texts:
-                        found_el = profile_page.page.locator(f"text=/{txt}/i").first
-                        if found_el.is_visible():
-                            found_text = found_el.text_content().strip()
-                            if found_text:
-                                has_error = True
-                                error_message = found_text
-                                logger.info(f"  ✓ 通过文本内容检测到错误提示: {found_text}")
-                                break
-                except:
-                    pass
-            
-            # ⚡ 增强错误检测：通过文本内容查找（防止 selector 遗漏）
-            if not has_error:
-                try:
-                    error_texts = ["must be less than", "required", "invalid", "must be between"]
-                    for txt in error_texts:
-                        # 查找包含特定错误文本的可见元素，排除 hidden
-                        found_el = profile_page.page.locator(f"text=/{txt}/i").first
-                        if found_el.is_visible():
-                            found_text = found_el.text_content().strip()
-                            if found_text:
-                                has_error = True
-                                error_message = found_text
-                                logger.info(f"  ✓ 通过文本内容检测到错误提示: {found_text}")
-                                break
-                except:
-                    pass
-
-            # 根据是否有错误决定截图策略和保存状态判断
-            if has_error:
-                # ⚡ 截图前再次清理 Success Toast (防止上个用例的Toast残留污染截图)
-                # Cleanup removed
-                pass
-                # 有HTML5验证错误：直接截图页面原始状态
-                profile_page.page.wait_for_timeout(500)
-                
-                # ⚡ 截图前再次清理 Success Toast (防止上个用例的Toast残留污染截图)
-                try:
-                    profile_page.page.evaluate("""
-                        document.querySelectorAll('div').forEach(el => {
-                            try {
-                                if (el.innerText && (el.innerText.includes('Success') || el.innerText.includes('successfully'))) {
-                                    el.remove();
-                                }
-                            } catch(e) {}
-                        });
-                    """)
-                except:
-                    pass
-                
-                # 📸 截图：保存后
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"phone_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # HTML5验证阻止了提交，数据未保存
-                is_saved = False
-                saved_value = profile_page.page.input_value(profile_page.PHONE_INPUT)
-            
-            elif scenario['should_save']:
-                # 无HTML5错误且预期成功：快速检测toast（避免toast消失）
-                profile_page.page.wait_for_timeout(500)  # ⚡ 只等500ms让toast完全显示
-                
-                # ⚡ 优先检测成功toast提示（在toast消失前）
-                has_success_toast = check_success_toast(profile_page, logger)
-                
-                # 📸 截图：保存后（显示toast或当前状态）
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"phone_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # 🔧 如果没有toast，直接读取输入框值来验证（无需reload）
-                if has_success_toast:
-                    is_saved = True
-                    saved_value = scenario['value']
-                    logger.info("  ✅ 检测到成功toast，判断为保存成功")
-                else:
-                    # 没有toast时，读取输入框当前值判断
-                    current_value = profile_page.page.input_value(profile_page.PHONE_INPUT)
-                    is_saved = (current_value == scenario['value'])
-                    saved_value = current_value
-                    if is_saved:
-                        logger.info(f"  ✅ 未检测到toast，但输入框值匹配 '{current_value}'，判断为保存成功")
-                    else:
-                        logger.warning(f"  ⚠️ 未检测到toast，且输入框值不匹配 (预期='{scenario['value']}', 实际='{current_value}')，判断为保存失败")
-            else:
-                # 无HTML5错误但预期失败：可能被input限制或后端拒绝
-                try:
-                    profile_page.page.wait_for_load_state("networkidle", timeout=3000)
-                except:
-                    pass
-                profile_page.page.wait_for_timeout(500)
-                
-                # ⭐ 重要：截图前再次检测错误（toast可能延迟显示）
-                try:
-                    for selector in error_selectors:
-                        if profile_page.is_visible(selector):
-                            error_text = profile_page.get_text(selector)
-                            if error_text and error_text.strip():
-                                has_error = True
-                                if error_message:
-                                    error_message += f" | {error_text}"
-                                else:
-                                    error_message = error_text
-                                logger.info(f"  ✓ 延迟检测到错误提示: {error_text}")
-                                break
-                except:
-                    pass
-                
-                # ⚡ 检查是否意外出现了 Success Toast (Silent Truncation Case)
-                has_success_toast = check_success_toast(profile_page, logger)
-                if has_success_toast:
-                     logger.warning("  ⚠️ 警告：检测到 Success Toast，尽管预期应该是失败。可能是后端执行了截断保存。")
-                     # 如果出现了 Success Toast，即使值不匹配，也标记为“保存行为发生了”
-                     is_saved = True 
-                
-                # ⚡ 截图前再次清理 Success Toast (防止上个用例的Toast残留污染截图)
-                try:
-                    profile_page.page.evaluate("""
-                        document.querySelectorAll('div').forEach(el => {
-                            try {
-                                if (el.innerText && (el.innerText.includes('Success') || el.innerText.includes('successfully'))) {
-                                    el.remove();
-                                }
-                            } catch(e) {}
-                        });
-                    """)
-                except:
-                    pass
-
-                # 📸 截图：保存后
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"phone_{safe_name}_after_save_{timestamp}.png"
-                profile_page.take_screenshot(screenshot_path)
-                
-                # 刷新验证是否真的保存了
-                if not has_success_toast: # 如果已经有了 success toast，就不必通过 reload 来验证 saved 状态了，避免 reload 带来的副作用
-                    profile_page.page.reload()
-                    profile_page.page.wait_for_load_state("domcontentloaded")
-                    # profile_page.page.wait_for_timeout(2000) removed
-                    
-                    saved_value = profile_page.get_phone_value()
-                    if scenario['type'] in ['length_empty', 'special_spaces']:
-                        is_saved = (saved_value == scenario['value']) or (saved_value == '' or saved_value is None)
-                    else:
-                        is_saved = saved_value == scenario['value']
-                else:
-                     # 如果有 Success Toast，但预期是失败，我们需要知道到底存了什么
-                     # 但为了避免重载页面导致状态丢失，我们先假设它存了（即使可能是截断的）
-                     # 这种情况下 is_saved = True，但 should_save = False -> save_match = False
-                     pass
-        
-        # 生成截图描述
-        save_expected_str = "成功" if scenario['should_save'] else "失败"
-        save_actual_str = "成功" if is_saved else "失败"
-        error_expected_str = "有错误" if scenario['should_error'] else "无错误"
-        error_actual_str = "有错误" if has_error else "无错误"
-        
-        screenshot_desc = f"{screenshot_idx}-{scenario['name']}_保存后（预期:{save_expected_str}/{error_expected_str}, 实际:{save_actual_str}/{error_actual_str}）"
-        allure.attach.file(f"screenshots/{screenshot_path}", name=screenshot_desc, attachment_type=allure.attachment_type.PNG)
-        screenshot_idx += 1
-        
-        save_match = is_saved == scenario['should_save']
-        error_match = has_error == scenario['should_error']
-        overall_match = save_match and error_match
-        
-        # 1. 前端体验问题：后端拒绝了(save_match=True, actually_saved=False)，但前端没提示(error_match=False, actually_error=False)
-        is_frontend_bug = scenario['should_error'] and not has_error and save_match
-        
-        # 2. 截断保存问题：后端接受了(actually_saved=True)，预期是拒绝(should_save=False) -> save_match=False
-        # 这种情况通常伴随着 Success Toast (has_success_toast=True)
-        # ⚡ 修正：只要不该保存却保存了，且有Success Toast，就认为是截断/后端宽松策略
-        is_truncation_issue = not save_match and is_saved
-        
-        # 3. ⚡ 状态冲突问题：既有Success Toast又有错误提示（Double State Bug）
-        is_double_state_bug = is_saved and has_error and not scenario['should_save'] and scenario['should_error']
-
-        # ⚡ 修复逻辑：如果是前端体验问题（Silent Failure），暂不视为测试失败，改为Warning
-        if is_frontend_bug:
-            overall_match = True
-            logger.warning(f"  ⚠️ 前端体验问题：无效输入未显示错误提示，但数据正确未被保存。标记为通过。")
-
-        # ⚡ 修复逻辑：如果是截断保存问题（Silent Truncation），暂不视为测试失败，改为Warning
-        if is_truncation_issue:
-            overall_match = True
-            logger.warning(f"  ⚠️ 后端行为预警：超长输入未被完全拒绝，而是可能被截断保存或部分接受（出现了Success Toast）。标记为通过。")
-
-        # ⚡ 修复逻辑：如果是状态冲突问题（Double State Bug），暂不视为测试失败，改为Warning
-        if is_double_state_bug:
-            overall_match = True
-            logger.warning(f"  ⚠️ 状态冲突预警：同时检测到 Success Toast 和 错误提示。这通常是一个Bug，但在测试中暂且容忍并标记为 Warning。")
-
-        logger.info(f"  实际: 保存={is_saved}, 错误={has_error}, 结果={'✅' if overall_match else '❌'}")
-        
-        # 如果是无效场景但没有错误提示，标记为前端BUG
-        if is_frontend_bug:
-            logger.error(f"  🐛 前端BUG记录：无效输入未显示错误提示！（后端已拒绝，但前端无反馈）")
-            
-        validation_results.append({
-            "scenario": scenario['name'],
-            "type": scenario['type'],
-            "input": scenario['value'],
-            "input_length": len(scenario['value']),
-            "expected_save": scenario['should_save'],
-            "actually_saved": is_saved,
-            "expected_error": scenario['should_error'],
-            "actually_error": has_error,
-            "match": overall_match,
-            "is_frontend_bug": is_frontend_bug,
-            "is_truncation_issue": is_truncation_issue,
-            "is_double_state_bug": is_double_state_bug
-        })
-        
-        # 恢复原始值
-        logger.info("")
-        logger.info(f"恢复原始Phone: '{original_phone if original_phone else '(空)'}'")
-        profile_page.page.reload()
-        profile_page.page.wait_for_load_state("domcontentloaded")
-        profile_page.page.wait_for_timeout(2000)
-        profile_page.fill_input(profile_page.NAME_INPUT, original_name)
-        profile_page.fill_input(profile_page.SURNAME_INPUT, original_surname)
-        profile_page.fill_input(profile_page.PHONE_INPUT, original_phone if original_phone else "")
-        profile_page.click_element(profile_page.SAVE_BUTTON)
-        profile_page.page.wait_for_load_state("networkidle")
-        profile_page.page.wait_for_timeout(2000)
-        
-        # 输出汇总
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info("PhoneNumber字段验证结果汇总")
-        logger.info("=" * 80)
-        for r in validation_results:
-            result = "✅" if r['match'] else "❌"
-            if not r['match'] and (r.get('is_frontend_bug', False) or r.get('is_truncation_issue', False)):
-                result = "⚠️"
-            logger.info(f"| {r['scenario']:15} | {r['type'].split('_')[0]:6} | {r['input_length']:4} | {result} |")
-        
-        passed = sum(1 for r in validation_results if r['match'])
-        total = len(validation_results)
-        
-        # 统计前端BUG数量
-        frontend_bugs = [r for r in validation_results if r.get('is_frontend_bug', False)]
-        failed_scenarios = [r for r in validation_results if not r['match']]
-        
-        logger.info(f"\n总体通过率: {passed}/{total} ({passed/total*100:.1f}%)")
-        
-        # 输出前端BUG汇总（仅记录，不影响测试通过）
-        if frontend_bugs:
-            logger.warning("")
-            logger.warning(f"⚠️ 检测到 {len(frontend_bugs)} 个前端体验问题（实际结果符合预期，但前端未显示错误提示）:")
-            for bug in frontend_bugs:
-                logger.warning(f"   - {bug['scenario']}: 输入'{bug['input'][:30]}' 应显示错误但前端无提示")
-            logger.warning(f"   💡 建议：这些场景虽然后端正确拒绝了，但前端应显示错误提示以改善用户体验")
-        
-        logger.info("=" * 80)
-        logger.info("TC-VALID-PHONE-001执行完成")
-        
-        # ========== 断言：只有实际结果与预期不符的场景才算失败 ==========
-        if failed_scenarios:
-            failure_msgs = [f"❌ {len(failed_scenarios)}个场景实际结果与预期不符"]
-            for scenario in failed_scenarios:
-                failure_msgs.append(f"  - {scenario['scenario']}: 预期保存={scenario['expected_save']}/错误={scenario['expected_error']}, 实际保存={scenario['actually_saved']}/错误={scenario['actually_error']}")
-            
-            assert False, f"PhoneNumber字段验证测试失败:\n" + "\n".join(failure_msgs)
+        run_field_validation_scenario(logged_in_profile_page, scenario)
 
 
     def test_p1_all_fields_empty_validation(self, logged_in_profile_page):
@@ -15,8 +15,10 @@ import allure
 import hashlib
 import time
 from datetime import datetime
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from tests.aevatar_station.pages.landing_page import LandingPage
 from tests.aevatar_station.pages.register_page import RegisterPage
+from utils.scenario_fanout import report_scenarios
 
 logger = logging.getLogger(__name__)
 
@@ -501,7 +503,12 @@ class TestRegister:
         abp_emails = test_data["register_data"].get("abp_email_validation", [])
         all_email_cases = invalid_emails + abp_emails
         
-        for idx, case in enumerate(all_email_cases, 1):
+        # ⚡ 一次evaluate探测所有邮箱的客户端校验，只有通过客户端校验的用例才提交到服务端
+        # （超过maxlength的值真实输入时会被截断，探测结果不可信，仍走真实提交）
+        register_page.navigate()
+        probes = register_page.probe_emails([case.get("email", "") for case in all_email_cases])
+        
+        for idx, (case, probe) in enumerate(zip(all_email_cases, probes), 1):
             # 处理空邮箱case（不跳过，要测试）
             email_display = case.get("email", "") if case.get("email") else "(空)"
             
@@ -509,6 +516,12 @@ class TestRegister:
                 logger.info(f"\n--- 测试 {idx}: {case['description']} ---")
                 logger.info(f"   邮箱: {email_display}")
                 
+                if not probe["valid"] and not probe["too_long"]:
+                    logger.info(f"   ✓ 客户端校验拦截: {probe['message']}")
+                    allure.attach(probe["message"] or "(无提示文本)", name=f"用例{idx}-客户端校验拦截",
+                                  attachment_type=allure.attachment_type.TEXT)
+                    continue
+                
                 register_page.navigate()
                 
                 # 前置截图
@@ -624,11 +637,25 @@ class TestRegister:
             },
         ]
         
-        for idx, case in enumerate(weak_password_cases, 1):
+        # ⚡ 一次evaluate探测所有密码的客户端校验，只有通过客户端校验的用例才提交到服务端
+        # （超过maxlength的值真实输入时会被截断，探测结果不可信，仍走真实提交）
+        register_page.navigate()
+        probes = register_page.probe_passwords([case["password"] for case in weak_password_cases])
+        
+        for idx, (case, probe) in enumerate(zip(weak_password_cases, probes), 1):
             with allure.step(f"测试用例 {idx}: {case['description']}"):
                 logger.info(f"\n--- 测试 {idx}/{len(weak_password_cases)}: {case['description']} ---")
                 logger.info(f"   测试密码: {case['password']}")
                 
+                if not probe["valid"] and not probe["too_long"]:
+                    allure.attach(probe["message"] or "(无提示文本)", name=f"用例{idx}-客户端校验拦截",
+                                  attachment_type=allure.attachment_type.TEXT)
+                    if any(expected_error in probe["message"] for expected_error in case["expected_errors"]):
+                        logger.info(f"   ✓ 客户端校验拦截，捕获到预期错误关键词: {probe['message']}")
+                    else:
+                        logger.warning(f"   ⚠️ 客户端校验拦截，但未捕获到预期错误关键词: {probe['message']}")
+                    continue
+                
                 # 导航到注册页
                 register_page.navigate()
                 
@@ -690,7 +717,7 @@ class TestRegister:
     @pytest.mark.exception
     @allure.feature("注册功能")
     @allure.story("用户名验证")
-    def test_p2_username_validation(self, page, test_data, worker_id):
+    def test_p2_username_validation(self, page, test_data, worker_id, scenario_fanout):
         """
         TC-EXCEPTION-003: ABP用户名格式验证（包含边界值）
         
@@ -703,14 +730,18 @@ class TestRegister:
         - 不能包含空格
         - 不能包含特殊字符（如 @ # $ % &）
         - 允许字母、数字、下划线、连字符、点号
+        
+        ⚡ 先一次evaluate探测客户端校验；通过客户端校验的用例互不依赖，由 scenario_fanout 分到多个匿名context并行提交
         """
         logger.info("=" * 60)
         logger.info("开始执行TC-EXCEPTION-003: ABP用户名格式验证")
         logger.info("=" * 60)
         
         register_page = RegisterPage(page)
+        register_url = register_page.page_url
         username_cases = test_data["register_data"].get("abp_username_validation", [])
         
+        scenarios = []
         for idx, case in enumerate(username_cases, 1):
             if case.get("expected_result") == "success":
                 continue  # 跳过预期成功的用例
@@ -722,48 +753,52 @@ class TestRegister:
                 test_username = f"{test_username}_{timestamp}"
                 logger.info(f"   短用户名添加随机后缀: {case['username']} -> {test_username}")
             
+            # 使用唯一邮箱
+            _, email = generate_unique_user(worker_id, f"uname{idx}")
+            scenarios.append({"idx": idx, "case": case, "username": test_username, "email": email})
+        
+        async def submit_username(async_page, scenario):
+            case = scenario["case"]
+            await async_page.goto(register_url)
+            await async_page.locator(RegisterPage.USERNAME_INPUT).first.fill(scenario["username"])
+            await async_page.locator(RegisterPage.EMAIL_INPUT).first.fill(scenario["email"])
+            await async_page.locator(RegisterPage.PASSWORD_INPUT).first.fill(case["password"])
+            await async_page.locator(RegisterPage.REGISTER_BUTTON).first.click()
+            try:
+                await async_page.wait_for_load_state("domcontentloaded", timeout=5000)
+            except PlaywrightTimeoutError:
+                pass
+            await async_page.wait_for_timeout(1500)
+            
+            # 验证是否被拦截（停留在注册页或显示错误）
+            current_url = async_page.url
+            if "/Register" in current_url:
+                return "✓ 无效用户名被拦截"
+            if case.get("expected_error") and case["expected_error"] in await async_page.content():
+                return f"✓ 捕获到预期错误: {case['expected_error']}"
+            logger.warning(f"   ⚠️ 用户名 '{case['username']}' 未被拦截，当前URL: {current_url}")
+            return f"⚠️ 未被拦截，当前URL: {current_url}"
+        
+        # ⚡ 一次evaluate探测所有用户名的客户端校验，只有通过客户端校验的用例才提交到服务端
+        # （超过maxlength的值真实输入时会被截断，探测结果不可信，仍走真实提交）
+        register_page.navigate()
+        probes = register_page.probe_usernames([scenario["username"] for scenario in scenarios])
+        server_scenarios = []
+        for scenario, probe in zip(scenarios, probes):
+            if probe["valid"] or probe["too_long"]:
+                server_scenarios.append(scenario)
+                continue
+            case = scenario["case"]
+            logger.info(f"   ✓ 客户端校验拦截 '{case['username']}': {probe['message']}")
             with allure.step(f"测试用户名: {case['username']} ({case['description']})"):
-                logger.info(f"\n--- 测试 {idx}: {case['description']} ---")
-                logger.info(f"   原用户名: {case['username']}")
-                logger.info(f"   测试用户名: {test_username}")
-                
-                register_page.navigate()
-                
-                # 前置截图
-                page.screenshot(path=f"screenshots/reg_exc003_case{idx}_before.png")
-                allure.attach.file(f"screenshots/reg_exc003_case{idx}_before.png", 
-                                 name=f"用例{idx}-前-空表单", attachment_type=allure.attachment_type.PNG)
-                
-                # 使用唯一邮箱
-                _, email = generate_unique_user(worker_id, f"uname{idx}")
-                
-                register_page.fill_username(test_username)
-                register_page.fill_email(email)
-                register_page.fill_password(case["password"])
-                
-                # 填写后截图
-                page.screenshot(path=f"screenshots/reg_exc003_case{idx}_filled.png")
-                allure.attach.file(f"screenshots/reg_exc003_case{idx}_filled.png", 
-                                 name=f"用例{idx}-填写完成", attachment_type=allure.attachment_type.PNG)
-                
-                register_page.click_register_button()
-                page.wait_for_timeout(1500)
-                
-                # 后置截图
-                page.screenshot(path=f"screenshots/reg_exc003_case{idx}_after.png")
-                allure.attach.file(f"screenshots/reg_exc003_case{idx}_after.png", 
-                                 name=f"用例{idx}-后-提交结果", attachment_type=allure.attachment_type.PNG)
-                
-                current_url = page.url
-                page_content = page.content()
-                
-                # 验证是否被拦截（停留在注册页或显示错误）
-                if "/Register" in current_url:
-                    logger.info(f"   ✓ 无效用户名被拦截")
-                elif case.get("expected_error") and case["expected_error"] in page_content:
-                    logger.info(f"   ✓ 捕获到预期错误: {case['expected_error']}")
-                else:
-                    logger.warning(f"   ⚠️ 用户名 '{case['username']}' 未被拦截，当前URL: {current_url}")
+                allure.attach(probe["message"] or "(无提示文本)", name="客户端校验拦截",
+                              attachment_type=allure.attachment_type.TEXT)
+        
+        results = scenario_fanout.run(
+            server_scenarios, submit_username,
+            name=lambda s: f"测试用户名: {s['case']['username']} ({s['case']['description']})"
+        )
+        report_scenarios(results)
         
         logger.info("\n" + "=" * 60)
         logger.info("✅ TC-EXCEPTION-003执行成功")
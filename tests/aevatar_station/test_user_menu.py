@@ -33,6 +33,8 @@ def logged_in_page(page, test_data, request):
             email = valid_data.get("email", f"{username}@test.com")
             request.node._account_info = (username, email, password)
             logger.warning(f"⚠️ 使用降级账号: {username}，可能导致测试冲突")
+            from tests.aevatar_station.conftest import login_with_fallback
+            login_with_fallback(page, username, password)
         except Exception as fallback_error:
             logger.error(f"❌ 降级账号配置失败: {fallback_error}")
             raise Exception(f"登录失败且无法降级: 原始错误={e}, 降级错误={fallback_error}")
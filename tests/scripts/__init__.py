@@ -0,0 +1 @@
+# 脚本测试
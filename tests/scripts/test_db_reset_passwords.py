@@ -0,0 +1,123 @@
+"""
+db_reset_passwords 批量重置测试
+在SQLite替身库（AbpUsers结构）上执行 --bulk 路径，检查恢复结果和每条语句的参数个数
+（SQLite的参数上限远高于SQL Server，超限只能通过计数发现）
+"""
+import importlib.util
+import sqlite3
+from pathlib import Path
+
+import allure
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "db_reset_passwords.py"
+SQL_SERVER_MAX_PARAMS = 2100
+ALL_FIELDS = ["username", "email", "password"]
+
+
+def load_script():
+    spec = importlib.util.spec_from_file_location("db_reset_passwords", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class CountingConnection:
+    """包装sqlite3连接，记录每条语句的参数个数"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.param_counts = []
+
+    def cursor(self):
+        connection = self
+        cursor = self.conn.cursor()
+
+        class CountingCursor:
+            def execute(self, sql, params=()):
+                connection.param_counts.append(len(params))
+                return cursor.execute(sql, params)
+
+            def __getattr__(self, name):
+                return getattr(cursor, name)
+
+        return CountingCursor()
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+
+@pytest.fixture
+def db_reset():
+    return load_script()
+
+
+@pytest.fixture
+def pool_accounts():
+    return [{"username": f"pool_user_{i:03d}", "email": f"pool_user_{i:03d}@test.com"} for i in range(1, 301)]
+
+
+@pytest.fixture
+def stand_in(db_reset, pool_accounts, tmp_path):
+    """按账号池创建替身库，并模拟测试把一部分账号的用户名/邮箱/密码改掉"""
+    path = db_reset.create_sqlite_stand_in(str(tmp_path / "abp.db"), pool_accounts, password_hash="reference-hash")
+    conn = sqlite3.connect(str(path))
+    for i, account in enumerate(pool_accounts):
+        if i % 3 == 0:
+            conn.execute(
+                "UPDATE AbpUsers SET UserName = ?, NormalizedUserName = ?, PasswordHash = 'changed', "
+                "AccessFailedCount = 3, LockoutEnd = '2099-01-01' WHERE Email = ?",
+                (f"renamed_{i}", f"RENAMED_{i}", account["email"]),
+            )
+        elif i % 3 == 1:
+            conn.execute(
+                "UPDATE AbpUsers SET Email = ?, NormalizedEmail = ? WHERE UserName = ?",
+                (f"changed_{i}@test.com", f"CHANGED_{i}@TEST.COM", account["username"]),
+            )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+@allure.feature("脚本")
+@allure.story("数据库批量重置")
+class TestBulkReset:
+
+    @pytest.mark.parametrize("fields", [ALL_FIELDS, ["password"], ["username", "email"]])
+    def test_chunks_stay_under_sql_server_param_limit(self, db_reset, stand_in, pool_accounts, fields):
+        """每条UPDATE的参数个数不超过SQL Server上限（2100）"""
+        conn = CountingConnection(stand_in)
+        db_reset.bulk_reset_accounts(conn, pool_accounts, fields, password_hash="reference-hash")
+
+        assert conn.param_counts, "没有执行任何UPDATE"
+        assert max(conn.param_counts) <= SQL_SERVER_MAX_PARAMS, conn.param_counts
+
+    def test_bulk_reset_restores_pool_accounts(self, db_reset, stand_in, pool_accounts):
+        """在替身库上批量重置后，所有账号恢复为账号池中的原始值"""
+        affected = db_reset.bulk_reset_accounts(stand_in, pool_accounts, ALL_FIELDS, password_hash="reference-hash")
+
+        assert affected == len(pool_accounts)
+        rows = stand_in.execute(
+            "SELECT UserName, NormalizedUserName, Email, NormalizedEmail, PasswordHash, AccessFailedCount, LockoutEnd "
+            "FROM AbpUsers ORDER BY UserName"
+        ).fetchall()
+        expected = sorted(
+            (a["username"], a["username"].upper(), a["email"], a["email"].upper(), "reference-hash", 0, None)
+            for a in pool_accounts
+        )
+        assert rows == expected
+
+    def test_chunk_size_from_param_count(self, db_reset):
+        """全部字段时每个账号14个参数，批大小按参数上限计算"""
+        columns = {name.lower(): name for name in (
+            "UserName", "NormalizedUserName", "Email", "NormalizedEmail", "PasswordHash")}
+        chunk = db_reset.bulk_chunk_size(columns, ALL_FIELDS)
+        accounts = [{"username": f"u{i}", "email": f"u{i}@test.com"} for i in range(chunk)]
+
+        _, params = db_reset.build_bulk_reset_sql("AbpUsers", columns, accounts, ALL_FIELDS, "hash")
+
+        assert len(params) == 14 * chunk + 1
+        assert len(params) <= SQL_SERVER_MAX_PARAMS
@@ -0,0 +1 @@
+# utils/ 模块测试
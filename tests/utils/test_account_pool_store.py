@@ -0,0 +1,103 @@
+"""
+账号池存储（utils/account_pool_store.py）测试
+在临时SQLite文件上检查租约互斥、过期租约回收和JSON导入/导出往返
+"""
+import json
+import time
+
+import allure
+import pytest
+
+from utils.account_pool_store import AccountPoolStore
+
+
+@pytest.fixture
+def pool_accounts():
+    return [
+        {"username": f"pool_user_{i:02d}", "email": f"pool_user_{i:02d}@test.com", "password": "TestPass123!"}
+        for i in range(1, 4)
+    ]
+
+
+@pytest.fixture
+def pool_json(tmp_path, pool_accounts):
+    path = tmp_path / "test_account_pool.json"
+    path.write_text(json.dumps({
+        "test_account_pool": pool_accounts,
+        "pool_config": {"account_prefix": "pool_user_"},
+    }), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def store(tmp_path, pool_json):
+    return AccountPoolStore(db_path=str(tmp_path / "account_pool.db"), json_path=str(pool_json), lease_ttl=600)
+
+
+@allure.feature("账号池")
+@allure.story("SQLite租约存储")
+class TestAccountPoolStore:
+
+    def test_lease_is_exclusive(self, store, pool_accounts):
+        """已租出的账号不会再分配给其他持有者，账号用完后返回None"""
+        leased = [store.lease(owner=f"gw{i}") for i in range(len(pool_accounts))]
+
+        assert sorted(acc["username"] for acc in leased) == sorted(acc["username"] for acc in pool_accounts)
+        assert store.lease(owner="gw_extra") is None
+        assert store.stats()["leased"] == len(pool_accounts)
+
+    def test_release_only_by_owner(self, store):
+        """只有持有者能归还/续租，归还后账号可以再次租用"""
+        account = store.lease(owner="gw0")
+
+        store.release(account["username"], owner="gw1")
+        assert not store.heartbeat(account["username"], owner="gw1")
+        assert store.heartbeat(account["username"], owner="gw0")
+
+        store.release(account["username"], owner="gw0")
+        assert store.stats()["leased"] == 0
+
+    def test_expired_lease_is_reclaimed(self, tmp_path, pool_json, pool_accounts):
+        """崩溃worker的租约过期后，账号可以被重新租用，reclaim_expired 清除过期租约"""
+        store = AccountPoolStore(db_path=str(tmp_path / "account_pool.db"), json_path=str(pool_json), lease_ttl=1)
+        first = [store.lease(owner="crashed") for _ in pool_accounts]
+        assert store.lease(owner="gw1") is None
+
+        time.sleep(1.1)
+
+        reused = store.lease(owner="gw1")
+        assert reused["username"] in {acc["username"] for acc in first}
+        assert store.reclaim_expired() == len(pool_accounts) - 1
+        # 原持有者的租约已失效，不能再续租
+        assert not any(store.heartbeat(acc["username"], owner="crashed") for acc in first)
+        assert store.heartbeat(reused["username"], owner="gw1")
+
+    def test_locked_and_polluted_accounts_are_not_leased(self, store, pool_accounts):
+        """锁定账号和健康检查失败的账号不再分配"""
+        store.mark_locked(pool_accounts[0]["username"], reason="测试锁定")
+        store.record_verification(pool_accounts[1]["username"], healthy=False, error="登录失败")
+
+        assert store.lease(owner="gw0")["username"] == pool_accounts[2]["username"]
+        assert store.lease(owner="gw1") is None
+
+    def test_json_round_trip(self, store, pool_json, pool_accounts, tmp_path):
+        """导出的JSON导入新库后账号、锁定状态和pool_config不变"""
+        store.mark_locked(pool_accounts[1]["username"], reason="测试锁定")
+        store.export_json()
+        exported, pool_config = store.export_accounts()
+
+        copy = AccountPoolStore(db_path=str(tmp_path / "copy.db"), json_path=str(pool_json))
+        reimported, reimported_config = copy.export_accounts()
+
+        assert reimported == exported
+        assert reimported_config == {**pool_config, "pool_size": len(pool_accounts)}
+        assert [acc["username"] for acc in reimported] == [acc["username"] for acc in pool_accounts]
+        assert [acc["is_locked"] for acc in reimported] == [False, True, False]
+        assert reimported[1]["locked_reason"] == "测试锁定"
+        assert pool_config["account_prefix"] == "pool_user_"
+
+    def test_json_import_removes_missing_accounts(self, store, pool_json, pool_accounts):
+        """重新导入时删除JSON中已不存在的账号"""
+        store.import_accounts(pool_accounts[:2])
+
+        assert sorted(store.usernames()) == sorted(acc["username"] for acc in pool_accounts[:2])
@@ -0,0 +1,73 @@
+"""
+用例耗时历史（utils/duration_history.py）测试
+在临时SQLite文件上检查中位数预测、历史裁剪，以及最长优先调度的排序
+"""
+import allure
+import pytest
+
+from utils.duration_history import DurationHistory, make_longest_first_scheduling
+
+
+class FakeLoadScheduling:
+    """只提供排序用到的属性，代替xdist的LoadScheduling"""
+
+    def __init__(self, config, log=None):
+        self.pending = []
+        self.collection = None
+
+
+@pytest.fixture
+def history(tmp_path):
+    return DurationHistory(str(tmp_path / "duration_history.db"), keep=3)
+
+
+def run(nodeid, setup=0.0, call=0.0, teardown=0.0, outcome="passed"):
+    return {"nodeid": nodeid, "setup": setup, "call": call, "teardown": teardown, "outcome": outcome}
+
+
+@allure.feature("调度")
+@allure.story("用例耗时历史")
+class TestDurationHistory:
+
+    def test_missing_db_has_no_predictions(self, history):
+        """没有历史库时不预测"""
+        assert history.expected_durations() == {}
+
+    def test_prediction_is_median_of_total_duration(self, history):
+        """预测值为 setup+call+teardown 总耗时的中位数，个别异常慢的运行不影响预测"""
+        for total_call in (1.0, 2.0, 30.0):
+            history.record([run("test_a", setup=0.5, call=total_call, teardown=0.5), run("test_b", call=4.0)])
+
+        expected = history.expected_durations()
+
+        assert expected["test_a"] == pytest.approx(3.0)
+        assert expected["test_b"] == pytest.approx(4.0)
+
+    def test_keeps_only_recent_runs(self, history):
+        """每个用例只保留最近 keep 次记录，预测只基于最近的运行"""
+        for call in (100.0, 100.0, 1.0, 1.0, 1.0):
+            history.record([run("test_a", call=call)])
+
+        assert history.expected_durations()["test_a"] == pytest.approx(1.0)
+
+    def test_longest_first_orders_pending_by_prediction(self):
+        """待运行队列按预测耗时降序，没有历史的用例按已知平均耗时排在中间"""
+        scheduling_class = make_longest_first_scheduling(FakeLoadScheduling)
+        scheduler = scheduling_class(config=None, expected={"short": 1.0, "long": 9.0, "medium": 4.0})
+        scheduler.collection = ["short", "new", "long", "medium"]
+        scheduler.pending[:] = range(len(scheduler.collection))
+
+        scheduler._sort_pending()
+
+        assert scheduler.default_duration == pytest.approx(14.0 / 3)
+        assert [scheduler.collection[i] for i in scheduler.pending] == ["long", "new", "medium", "short"]
+
+    def test_without_history_keeps_collection_order(self):
+        """没有任何历史时保持收集顺序"""
+        scheduler = make_longest_first_scheduling(FakeLoadScheduling)(config=None)
+        scheduler.collection = ["c", "a", "b"]
+        scheduler.pending[:] = range(3)
+
+        scheduler._sort_pending()
+
+        assert scheduler.pending == [0, 1, 2]
@@ -0,0 +1,93 @@
+"""
+候选选择器胜出记录（utils/selector_resolver.py）测试
+在临时SQLite文件上检查胜出者/从未胜出候选的统计，以及页面键归一化和候选排序
+"""
+import allure
+import pytest
+
+from utils.selector_resolver import SelectorCache, _ordered, page_key
+
+PAGE = "/admin/users"
+KEY = "logout"
+CANDIDATES = ["button:has-text('Logout')", "a:has-text('Sign out')", "[data-testid='logout']"]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "selector_cache.db")
+
+
+@pytest.fixture
+def cache(db_path):
+    return SelectorCache(db_path, enabled=True)
+
+
+@allure.feature("页面对象")
+@allure.story("候选选择器胜出记录")
+class TestSelectorCache:
+
+    def test_winner_persists_across_processes(self, cache, db_path):
+        """胜出记录写库后，新的缓存实例（另一个进程）读到胜出次数最多的候选"""
+        cache.record(PAGE, KEY, CANDIDATES, CANDIDATES[1])
+        cache.record(PAGE, KEY, CANDIDATES, CANDIDATES[2])
+        cache.record(PAGE, KEY, CANDIDATES, CANDIDATES[2])
+        assert cache.winner(PAGE, KEY) == CANDIDATES[2]
+        cache.flush()
+
+        reloaded = SelectorCache(db_path, enabled=True)
+        assert reloaded.winner(PAGE, KEY) == CANDIDATES[2]
+        assert reloaded.winner(PAGE, "other") is None
+
+    def test_dead_candidates(self, cache, db_path):
+        """每个候选每次解析 attempts+1；尝试够多次却从未胜出的候选被列出，未命中的解析不算胜出"""
+        for _ in range(4):
+            cache.record(PAGE, KEY, CANDIDATES, CANDIDATES[1])
+        cache.record(PAGE, KEY, CANDIDATES, None)
+        cache.flush()
+
+        dead = SelectorCache(db_path, enabled=True).dead_candidates(min_attempts=5)
+
+        assert sorted(tuple(row) for row in dead) == sorted(
+            (PAGE, KEY, selector, 5) for selector in (CANDIDATES[0], CANDIDATES[2])
+        )
+        assert SelectorCache(db_path, enabled=True).dead_candidates(min_attempts=6) == []
+
+    def test_flush_accumulates(self, cache, db_path):
+        """多次写库累加而不是覆盖"""
+        cache.record(PAGE, KEY, CANDIDATES[:1], CANDIDATES[0])
+        cache.flush()
+        cache.record(PAGE, KEY, CANDIDATES[:2], None)
+        cache.flush()
+
+        dead = SelectorCache(db_path, enabled=True).dead_candidates(min_attempts=1)
+
+        assert [tuple(row) for row in dead] == [(PAGE, KEY, CANDIDATES[1], 1)]
+
+    def test_disabled_cache_does_not_write(self, db_path):
+        """SELECTOR_CACHE=false 时不读写记录"""
+        cache = SelectorCache(db_path, enabled=False)
+        cache.record(PAGE, KEY, CANDIDATES, CANDIDATES[0])
+        cache.flush()
+
+        assert cache.winner(PAGE, KEY) is None
+        assert SelectorCache(db_path, enabled=True).dead_candidates(min_attempts=1) == []
+
+
+@allure.feature("页面对象")
+@allure.story("候选选择器胜出记录")
+class TestCandidateOrder:
+
+    @pytest.mark.parametrize("url, expected", [
+        ("https://localhost:5173/admin/users?page=2", "/admin/users"),
+        ("https://localhost:5173/workflows/42/edit", "/workflows/:id/edit"),
+        ("https://localhost:5173/workflows/3fa85f64-5717-4562-b3fc-2c963f66afa6", "/workflows/:id"),
+        ("https://localhost:5173", "/"),
+    ])
+    def test_page_key_normalizes_ids(self, url, expected):
+        assert page_key(url) == expected
+
+    def test_previous_winner_goes_first(self):
+        """上次的胜出者排在最前，其余保持原有优先级并去重"""
+        assert _ordered(CANDIDATES + [CANDIDATES[0]], CANDIDATES[2]) == [CANDIDATES[2], CANDIDATES[0], CANDIDATES[1]]
+        assert _ordered(CANDIDATES, "gone") == CANDIDATES
+        assert _ordered(CANDIDATES, None) == CANDIDATES
@@ -0,0 +1,54 @@
+"""
+表格批量读取（utils/table_reader.py）测试
+read_table 返回的是纯数据，这里对该结构检查Python侧的列查找和行查找
+"""
+import allure
+import pytest
+
+from utils.table_reader import column_index, column_values, find_row
+
+
+@pytest.fixture
+def users_table():
+    """read_table 的返回结构：第三行是列数不足的空状态/展开行"""
+    return {
+        "headers": ["User name", "Email", "Roles"],
+        "rows": [
+            {"index": 0, "cells": ["admin", "admin@abp.io", "admin"], "attrs": {"data-row-key": "1"}},
+            {"index": 1, "cells": ["qatest_v3__001", "qatest_v3__001@test.com", ""], "attrs": {"data-row-key": "2"}},
+            {"index": 2, "cells": ["No data"], "attrs": {}},
+            {"index": 3, "cells": ["qatest_v3__0010", "qatest_v3__0010@test.com", ""], "attrs": {"data-row-key": "3"}},
+        ],
+    }
+
+
+@allure.feature("页面对象")
+@allure.story("表格批量读取")
+class TestTableReader:
+
+    def test_column_index_ignores_case_and_whitespace(self, users_table):
+        assert column_index(users_table, " email ") == 1
+        assert column_index(users_table, "ROLES") == 2
+        assert column_index(users_table, "Phone") is None
+
+    def test_column_values_skip_short_rows(self, users_table):
+        """列数不足的行（空状态、展开行）不计入该列"""
+        assert column_values(users_table, 1) == ["admin@abp.io", "qatest_v3__001@test.com", "qatest_v3__0010@test.com"]
+        assert column_values(users_table, 0) == ["admin", "qatest_v3__001", "No data", "qatest_v3__0010"]
+
+    def test_find_row_contains_and_exact(self, users_table):
+        """默认按包含匹配返回第一行；exact=True 时只匹配完全相同的单元格"""
+        assert find_row(users_table, 0, "qatest_v3__001")["index"] == 1
+        assert find_row(users_table, 0, "qatest_v3__0010", exact=True)["attrs"] == {"data-row-key": "3"}
+        assert find_row(users_table, 0, "v3__00", exact=True) is None
+
+    def test_find_row_skips_short_rows(self, users_table):
+        assert find_row(users_table, 2, "admin")["index"] == 0
+        assert find_row(users_table, 2, "No data") is None
+
+    def test_empty_table(self):
+        """读取失败时 read_table 返回空表，查找函数不报错"""
+        empty = {"headers": [], "rows": []}
+        assert column_index(empty, "Email") is None
+        assert column_values(empty, 0) == []
+        assert find_row(empty, 0, "admin") is None
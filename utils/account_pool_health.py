@@ -0,0 +1,199 @@
+"""
+账号池后台健康检查
+替代 pytest_sessionstart 中同步执行的 clean_and_refill_account_pool.py：
+测试立即开始并优先使用已验证健康的账号，验证和补充在后台线程中逐个完成并写入账号池存储。
+验证结果带新鲜期（POOL_VERIFY_TTL），连续运行时新鲜期内的账号不会重复验证
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.account_pool_store import AccountPoolStore
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 与 scripts/clean_and_refill_account_pool.py 保持一致
+DEFAULT_TARGET_SIZE = 20
+DEFAULT_ACCOUNT_PREFIX = "qatest_v3__"
+DEFAULT_PASSWORD = "TestPass123!"
+
+
+def verify_account(account: Dict[str, str]) -> Tuple[bool, str]:
+    """
+    通过HTTP登录验证账号是否可用
+
+    认证服务不可用或登录结果不明确（超时、连接失败、400/429/5xx、302回登录页）时抛出 LoginTransportError，
+    只有登录页明确提示错误（账号被拒绝）才返回False
+    """
+    from utils.http_login import http_login
+
+    can_login, error_msg, session = http_login(account["username"], account["password"],
+                                               raise_transport_errors=True)
+    session.close()
+    return can_login, error_msg
+
+
+def register_account(account: Dict[str, str]) -> Tuple[bool, str]:
+    """通过注册接口创建账号"""
+    from utils.http_register import register_account_api
+
+    return register_account_api(account["username"], account["email"], account["password"])
+
+
+def generate_pool_accounts(store, count: int) -> List[Dict[str, str]]:
+    """按账号前缀顺延编号生成新账号（qatest_v3__021, ...），供后台补充和 scripts/create_accounts_api.py 扩容使用"""
+    pool_config = store.pool_config()
+    prefix = pool_config.get("account_prefix", DEFAULT_ACCOUNT_PREFIX)
+
+    max_num = 0
+    for username in store.usernames():
+        if username.startswith(prefix):
+            try:
+                max_num = max(max_num, int(username[len(prefix):]))
+            except ValueError:
+                pass
+
+    accounts = []
+    for i in range(1, count + 1):
+        username = f"{prefix}{max_num + i:03d}"
+        accounts.append({"username": username, "email": f"{username}@testmail.com", "password": DEFAULT_PASSWORD})
+    return accounts
+
+
+class PoolHealthChecker:
+    """后台线程：验证过期账号 -> 剔除无法登录的账号 -> 补充到目标数量"""
+
+    def __init__(
+        self,
+        store: AccountPoolStore,
+        fresh_window: int = None,
+        target_size: int = None,
+        max_workers: int = None,
+        verify_fn: Callable[[Dict[str, str]], Tuple[bool, str]] = verify_account,
+        register_fn: Callable[[Dict[str, str]], Tuple[bool, str]] = register_account,
+    ):
+        """
+        初始化健康检查
+
+        Args:
+            store: 账号池存储
+            fresh_window: 验证结果新鲜期(秒)，默认读取 POOL_VERIFY_TTL，否则1800
+            target_size: 健康账号目标数量，默认读取 POOL_TARGET_SIZE，否则20
+            max_workers: 并发验证/注册线程数，默认读取 POOL_VERIFY_WORKERS，否则8
+            verify_fn: 验证函数，返回 (can_login, error_message)；服务不可用时应抛出异常（账号保持未验证，下次重试）
+            register_fn: 注册函数，返回 (success, message)
+        """
+        self.store = store
+        self.fresh_window = fresh_window or int(os.environ.get("POOL_VERIFY_TTL", "1800"))
+        self.target_size = target_size or int(os.environ.get("POOL_TARGET_SIZE", str(DEFAULT_TARGET_SIZE)))
+        self.max_workers = max_workers or int(os.environ.get("POOL_VERIFY_WORKERS", "8"))
+        self.verify_fn = verify_fn
+        self.register_fn = register_fn
+        self.summary = {"verified": 0, "healthy": 0, "polluted": 0, "registered": 0}
+        self._summary_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="account-pool-health", daemon=True)
+
+    def start(self) -> "PoolHealthChecker":
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 10):
+        """请求停止并等待后台线程结束（未完成的验证下次运行继续）"""
+        self._stop.set()
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            logger.warning(f"账号池健康检查未在 {timeout}s 内结束，剩余工作留到下次运行")
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def run(self):
+        """同步执行一轮检查：验证 -> 补充 -> 导出JSON"""
+        started = time.time()
+        self.verify_stale()
+        if not self._stop.is_set():
+            self.refill()
+        self.store.export_json()
+        logger.info(f"账号池健康检查完成（{time.time() - started:.1f}s）: {self.summary}，当前 {self.store.stats()}")
+
+    def verify_stale(self):
+        """验证超过新鲜期的账号，结果逐个写入存储"""
+        accounts = self.store.accounts_to_verify(self.fresh_window)
+        if not accounts:
+            logger.info(f"账号池所有账号均在 {self.fresh_window}s 新鲜期内，跳过验证")
+            return
+        logger.info(f"后台验证 {len(accounts)} 个账号...")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._verify_one, acc): acc for acc in accounts}
+            for future in as_completed(futures):
+                if self._stop.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+    def refill(self):
+        """健康（或尚未验证）的账号不足目标数量时注册新账号补充"""
+        stats = self.store.stats()
+        usable = stats["total"] - stats["locked"]
+        needed = self.target_size - usable
+        if needed <= 0:
+            return
+
+        new_accounts = self._generate_accounts(needed)
+        logger.info(f"可用账号 {usable} 个，低于目标 {self.target_size}，后台注册 {needed} 个新账号")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(self._register_one, new_accounts)
+            registered = [acc for acc, ok in zip(new_accounts, results) if ok]
+
+        if registered:
+            self.store.add_accounts(registered, healthy=True)
+            self.summary["registered"] += len(registered)
+
+    def _run(self):
+        try:
+            self.run()
+        except Exception as e:
+            logger.error(f"账号池健康检查异常: {e}")
+
+    def _verify_one(self, account: Dict[str, str]):
+        if self._stop.is_set():
+            return
+        try:
+            can_login, error_msg = self.verify_fn(account)
+        except Exception as e:
+            # 网络异常不代表账号被污染，保持未验证状态
+            logger.warning(f"验证账号 {account['username']} 异常，稍后重试: {e}")
+            return
+
+        self.store.record_verification(account["username"], can_login, error_msg)
+        with self._summary_lock:
+            self.summary["verified"] += 1
+            self.summary["healthy" if can_login else "polluted"] += 1
+        if not can_login:
+            logger.warning(f"账号 {account['username']} 无法登录，已从可用账号中剔除: {error_msg}")
+
+    def _register_one(self, account: Dict[str, str]) -> bool:
+        if self._stop.is_set():
+            return False
+        try:
+            success, msg = self.register_fn(account)
+        except Exception as e:
+            success, msg = False, str(e)
+        if not success:
+            logger.warning(f"注册账号 {account['username']} 失败: {msg}")
+        return success
+
+    def _generate_accounts(self, count: int) -> List[Dict[str, str]]:
+        return generate_pool_accounts(self.store, count)
+
+
+def start_background_health_check(store: Optional[AccountPoolStore] = None) -> PoolHealthChecker:
+    """启动后台健康检查线程"""
+    from utils.account_pool_store import get_account_pool_store
+
+    return PoolHealthChecker(store or get_account_pool_store()).start()
@@ -0,0 +1,499 @@
+"""
+测试账号池存储（SQLite）
+替代每次操作都要flock + 整文件读写的JSON账号池：
+- WAL模式，多个xdist worker可同时读，写操作只在一个短事务内完成
+- 租约（lease）：获取账号即写入持有者和到期时间，到期未续租的账号自动视为可用（回收崩溃worker的租约）
+- 心跳：长时间运行的测试定期续租
+- 健康状态缓存：后台健康检查（utils/account_pool_health.py）写入 health/verified_at，
+  租用时优先分配已验证健康的账号，新鲜期内的账号不重复验证
+- test_account_pool.json 只作为导入/导出格式，供 scripts/ 下的维护脚本读写；
+  JSON的修改时间比上次同步更新时，下次访问账号池会自动重新导入
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+POOL_DIR = Path(__file__).parent.parent / "tests" / "aevatar_station" / "test-data"
+DEFAULT_JSON_PATH = POOL_DIR / "test_account_pool.json"
+DEFAULT_DB_PATH = POOL_DIR / "account_pool.db"
+
+# JSON中由数据库列单独保存的字段，其余字段原样保存在extra中，导出时还原
+_COLUMN_FIELDS = ("username", "email", "password", "is_locked", "locked_reason", "last_used", "in_use", "health", "verified_at")
+
+# 账号健康状态
+HEALTH_UNKNOWN = "unknown"
+HEALTH_HEALTHY = "healthy"
+HEALTH_POLLUTED = "polluted"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    username      TEXT PRIMARY KEY,
+    email         TEXT NOT NULL,
+    password      TEXT NOT NULL,
+    position      INTEGER NOT NULL DEFAULT 0,
+    is_locked     INTEGER NOT NULL DEFAULT 0,
+    locked_reason TEXT,
+    last_used     TEXT,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    health        TEXT NOT NULL DEFAULT 'unknown',
+    verified_at   REAL,
+    extra         TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_accounts_available ON accounts (is_locked, lease_expires);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def default_lease_owner() -> str:
+    """当前进程的租约持有者标识（xdist worker ID + PID）"""
+    return f"{os.environ.get('PYTEST_XDIST_WORKER', 'main')}:{os.getpid()}"
+
+
+class AccountPoolStore:
+    """基于SQLite的账号池，所有写操作都是单个 BEGIN IMMEDIATE 事务"""
+
+    def __init__(self, db_path: Optional[str] = None, json_path: Optional[str] = None, lease_ttl: int = None):
+        """
+        初始化账号池存储
+
+        Args:
+            db_path: 数据库路径，默认读取 ACCOUNT_POOL_DB，否则 test-data/account_pool.db
+            json_path: JSON导入/导出文件路径，默认 test-data/test_account_pool.json
+            lease_ttl: 租约有效期(秒)，默认读取 ACCOUNT_POOL_LEASE_TTL，否则600
+        """
+        self.db_path = Path(db_path or os.environ.get("ACCOUNT_POOL_DB", DEFAULT_DB_PATH))
+        self.json_path = Path(json_path or DEFAULT_JSON_PATH)
+        self.lease_ttl = lease_ttl or int(os.environ.get("ACCOUNT_POOL_LEASE_TTL", "600"))
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+        finally:
+            conn.close()
+        self.sync_from_json()
+
+    # ==================== 连接 ====================
+
+    def _connect(self) -> sqlite3.Connection:
+        """每次操作使用独立连接（可跨线程使用，也避免fork后共享连接）"""
+        conn = sqlite3.connect(str(self.db_path), timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=10000")
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """写事务：BEGIN IMMEDIATE 立即拿到写锁，保证"查询可用账号 + 写入租约"原子执行"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    # ==================== 租约 ====================
+
+    def lease(self, owner: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        租用一个未锁定且未被租用（或租约已过期）的账号
+
+        Args:
+            owner: 租约持有者，默认 default_lease_owner()
+
+        Returns:
+            Optional[Dict]: 账号信息（username/email/password），无可用账号时返回None
+        """
+        self.sync_from_json()
+        owner = owner or default_lease_owner()
+        now = time.time()
+
+        with self._transaction() as conn:
+            # 已验证健康的账号优先，其次是尚未验证的账号（健康检查仍在后台进行）
+            row = conn.execute(
+                """
+                SELECT * FROM accounts
+                WHERE is_locked = 0 AND health != ? AND (lease_owner IS NULL OR lease_expires < ?)
+                ORDER BY health = ? DESC, last_used IS NOT NULL, last_used, position
+                LIMIT 1
+                """,
+                (HEALTH_POLLUTED, now, HEALTH_HEALTHY),
+            ).fetchone()
+            if row is None:
+                return None
+
+            if row["lease_owner"]:
+                logger.warning(f"回收过期租约: {row['username']}（原持有者 {row['lease_owner']}）")
+            conn.execute(
+                "UPDATE accounts SET lease_owner = ?, lease_expires = ?, last_used = ? WHERE username = ?",
+                (owner, now + self.lease_ttl, datetime.now().isoformat(), row["username"]),
+            )
+        return self._row_to_account(row)
+
+    def heartbeat(self, username: str, owner: Optional[str] = None) -> bool:
+        """
+        续租
+
+        Returns:
+            bool: 租约仍属于owner并已续期时返回True（租约已被回收时返回False）
+        """
+        owner = owner or default_lease_owner()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE accounts SET lease_expires = ? WHERE username = ? AND lease_owner = ?",
+                (time.time() + self.lease_ttl, username, owner),
+            )
+            return cursor.rowcount > 0
+
+    def release(self, username: str, owner: Optional[str] = None):
+        """归还账号（只释放owner自己持有的租约）"""
+        owner = owner or default_lease_owner()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE accounts SET lease_owner = NULL, lease_expires = NULL WHERE username = ? AND lease_owner = ?",
+                (username, owner),
+            )
+
+    def mark_locked(self, username: str, reason: Optional[str] = None) -> bool:
+        """
+        标记账号为锁定（同时释放租约），并导出到JSON供维护脚本处理
+
+        Returns:
+            bool: 账号是否存在
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE accounts SET is_locked = 1, locked_reason = ?, lease_owner = NULL, lease_expires = NULL
+                WHERE username = ?
+                """,
+                (reason, username),
+            )
+            found = cursor.rowcount > 0
+        if found:
+            self.export_json()
+        return found
+
+    # ==================== 健康状态 ====================
+
+    def accounts_to_verify(self, fresh_window: int) -> List[Dict[str, Any]]:
+        """
+        需要验证的账号：未锁定、当前未被租用，且从未验证或验证结果已超过新鲜期
+
+        Args:
+            fresh_window: 验证结果新鲜期(秒)
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                """
+                SELECT * FROM accounts
+                WHERE is_locked = 0
+                  AND (lease_owner IS NULL OR lease_expires < ?)
+                  AND (verified_at IS NULL OR verified_at < ?)
+                ORDER BY verified_at IS NOT NULL, verified_at, position
+                """,
+                (now, now - fresh_window),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [self._row_to_account(row) for row in rows]
+
+    def record_verification(self, username: str, healthy: bool, error: Optional[str] = None):
+        """记录验证结果；验证失败的账号同时标记为锁定，不再分配"""
+        with self._transaction() as conn:
+            if healthy:
+                conn.execute(
+                    "UPDATE accounts SET health = ?, verified_at = ? WHERE username = ?",
+                    (HEALTH_HEALTHY, time.time(), username),
+                )
+            else:
+                conn.execute(
+                    """
+                    UPDATE accounts SET health = ?, verified_at = ?, is_locked = 1, locked_reason = ?
+                    WHERE username = ? AND is_locked = 0
+                    """,
+                    (HEALTH_POLLUTED, time.time(), error or "健康检查登录失败", username),
+                )
+
+    def add_accounts(self, accounts: List[Dict[str, Any]], healthy: bool = True):
+        """加入新账号（例如刚注册的补充账号），已存在的用户名跳过"""
+        now = time.time()
+        with self._transaction() as conn:
+            next_position = conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM accounts").fetchone()[0]
+            for offset, acc in enumerate(accounts):
+                extra = {k: v for k, v in acc.items() if k not in _COLUMN_FIELDS}
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO accounts (username, email, password, position, health, verified_at, extra)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        acc["username"], acc["email"], acc["password"], next_position + offset,
+                        HEALTH_HEALTHY if healthy else HEALTH_UNKNOWN, now if healthy else None,
+                        json.dumps(extra, ensure_ascii=False),
+                    ),
+                )
+
+    def usernames(self) -> List[str]:
+        """所有账号用户名（含已锁定）"""
+        conn = self._connect()
+        try:
+            return [row["username"] for row in conn.execute("SELECT username FROM accounts").fetchall()]
+        finally:
+            conn.close()
+
+    def pool_config(self) -> Dict[str, Any]:
+        """JSON中的pool_config"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'pool_config'").fetchone()
+        finally:
+            conn.close()
+        return json.loads(row["value"]) if row else {}
+
+    def reclaim_expired(self) -> int:
+        """清除所有过期租约，返回回收数量"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE accounts SET lease_owner = NULL, lease_expires = NULL WHERE lease_owner IS NOT NULL AND lease_expires < ?",
+                (time.time(),),
+            )
+            reclaimed = cursor.rowcount
+        if reclaimed:
+            logger.info(f"已回收 {reclaimed} 个过期租约")
+        return reclaimed
+
+    def stats(self) -> Dict[str, int]:
+        """账号池统计"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                """
+                SELECT COUNT(*) AS total,
+                       SUM(is_locked) AS locked,
+                       SUM(CASE WHEN is_locked = 0 AND health = 'healthy' THEN 1 ELSE 0 END) AS healthy,
+                       SUM(CASE WHEN is_locked = 0 AND lease_owner IS NOT NULL AND lease_expires >= ? THEN 1 ELSE 0 END) AS leased
+                FROM accounts
+                """,
+                (time.time(),),
+            ).fetchone()
+        finally:
+            conn.close()
+        total, locked, leased = row["total"], row["locked"] or 0, row["leased"] or 0
+        return {
+            "total": total,
+            "locked": locked,
+            "leased": leased,
+            "available": total - locked - leased,
+            "healthy": row["healthy"] or 0,
+        }
+
+    # ==================== JSON导入/导出 ====================
+
+    def sync_from_json(self, force: bool = False) -> bool:
+        """
+        JSON文件比上次同步更新时重新导入
+
+        Returns:
+            bool: 是否执行了导入
+        """
+        if not self.json_path.exists():
+            return False
+        mtime = self.json_path.stat().st_mtime
+
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'json_mtime'").fetchone()
+        finally:
+            conn.close()
+        if not force and row is not None and float(row["value"]) >= mtime:
+            return False
+
+        try:
+            with open(self.json_path, "r", encoding="utf-8") as f:
+                pool_data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            # 维护脚本可能正在写入，下次访问再导入
+            logger.warning(f"读取账号池JSON失败，暂不导入: {e}")
+            return False
+
+        self.import_accounts(pool_data.get("test_account_pool", []), pool_data.get("pool_config", {}), mtime)
+        return True
+
+    def import_accounts(self, accounts: List[Dict[str, Any]], pool_config: Optional[Dict[str, Any]] = None,
+                        json_mtime: Optional[float] = None):
+        """
+        用JSON账号列表替换账号集合：新增/更新账号字段，删除列表中不存在的账号，保留仍存在账号的租约
+        """
+        usernames = [acc["username"] for acc in accounts]
+        with self._transaction() as conn:
+            for position, acc in enumerate(accounts):
+                extra = {k: v for k, v in acc.items() if k not in _COLUMN_FIELDS}
+                conn.execute(
+                    """
+                    INSERT INTO accounts (username, email, password, position, is_locked, locked_reason, last_used,
+                                          health, verified_at, extra)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(username) DO UPDATE SET
+                        email = excluded.email,
+                        password = excluded.password,
+                        position = excluded.position,
+                        is_locked = excluded.is_locked,
+                        locked_reason = excluded.locked_reason,
+                        health = CASE WHEN accounts.password != excluded.password OR accounts.is_locked != excluded.is_locked
+                                      THEN 'unknown' ELSE accounts.health END,
+                        verified_at = CASE WHEN accounts.password != excluded.password OR accounts.is_locked != excluded.is_locked
+                                           THEN NULL ELSE accounts.verified_at END,
+                        last_used = COALESCE(accounts.last_used, excluded.last_used),
+                        extra = excluded.extra
+                    """,
+                    (
+                        acc["username"], acc.get("email", ""), acc.get("password", ""), position,
+                        1 if acc.get("is_locked") else 0, acc.get("locked_reason"), acc.get("last_used"),
+                        acc.get("health", HEALTH_UNKNOWN), acc.get("verified_at"),
+                        json.dumps(extra, ensure_ascii=False),
+                    ),
+                )
+            placeholders = ",".join("?" * len(usernames))
+            if usernames:
+                conn.execute(f"DELETE FROM accounts WHERE username NOT IN ({placeholders})", usernames)
+            else:
+                conn.execute("DELETE FROM accounts")
+            if pool_config is not None:
+                self._set_meta(conn, "pool_config", json.dumps(pool_config, ensure_ascii=False))
+            if json_mtime is not None:
+                self._set_meta(conn, "json_mtime", str(json_mtime))
+        logger.info(f"已从JSON导入账号池: {len(accounts)} 个账号")
+
+    def export_accounts(self) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """导出为JSON格式的 (账号列表, pool_config)"""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT * FROM accounts ORDER BY position, username").fetchall()
+            config_row = conn.execute("SELECT value FROM meta WHERE key = 'pool_config'").fetchone()
+        finally:
+            conn.close()
+
+        now = time.time()
+        accounts = []
+        for row in rows:
+            account = {
+                "username": row["username"],
+                "email": row["email"],
+                "password": row["password"],
+                **json.loads(row["extra"] or "{}"),
+                "is_locked": bool(row["is_locked"]),
+                "in_use": bool(row["lease_owner"]) and (row["lease_expires"] or 0) >= now,
+            }
+            if row["last_used"]:
+                account["last_used"] = row["last_used"]
+            if row["locked_reason"]:
+                account["locked_reason"] = row["locked_reason"]
+            if row["verified_at"]:
+                account["health"] = row["health"]
+                account["verified_at"] = row["verified_at"]
+            accounts.append(account)
+        pool_config = json.loads(config_row["value"]) if config_row else {}
+        return accounts, pool_config
+
+    def export_json(self):
+        """导出到JSON文件（原子替换），并记录为已同步，避免重新导入自己的导出"""
+        accounts, pool_config = self.export_accounts()
+        pool_config = {**pool_config, "pool_size": len(accounts)}
+        tmp_path = self.json_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"test_account_pool": accounts, "pool_config": pool_config}, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.json_path)
+        except OSError as e:
+            logger.warning(f"导出账号池JSON失败: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        with self._transaction() as conn:
+            self._set_meta(conn, "json_mtime", str(self.json_path.stat().st_mtime))
+
+    # ==================== 内部方法 ====================
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """为旧版本数据库补充新增列"""
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(accounts)").fetchall()}
+        if "health" not in columns:
+            conn.execute("ALTER TABLE accounts ADD COLUMN health TEXT NOT NULL DEFAULT 'unknown'")
+        if "verified_at" not in columns:
+            conn.execute("ALTER TABLE accounts ADD COLUMN verified_at REAL")
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: str):
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    @staticmethod
+    def _row_to_account(row: sqlite3.Row) -> Dict[str, Any]:
+        return {"username": row["username"], "email": row["email"], "password": row["password"]}
+
+
+class LeaseHeartbeat:
+    """后台线程定期续租，测试结束时调用 stop()"""
+
+    def __init__(self, store: AccountPoolStore, username: str, owner: Optional[str] = None, interval: float = None):
+        self.store = store
+        self.username = username
+        self.owner = owner or default_lease_owner()
+        self.interval = interval or max(store.lease_ttl / 3, 1)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-heartbeat-{username}", daemon=True)
+
+    def start(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.store.heartbeat(self.username, self.owner):
+                    logger.warning(f"账号 {self.username} 的租约已被回收，停止续租")
+                    return
+            except sqlite3.Error as e:
+                logger.warning(f"续租失败（稍后重试）: {self.username}, 错误: {e}")
+
+
+_store_instance: Optional[AccountPoolStore] = None
+
+
+def get_account_pool_store() -> AccountPoolStore:
+    """获取进程级共享的AccountPoolStore实例"""
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = AccountPoolStore()
+    return _store_instance
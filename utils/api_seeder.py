@@ -0,0 +1,326 @@
+"""
+API数据预置（Seeder）
+管理后台测试的前置数据（用户、角色、权限、邮件设置）直接调用ABP后端HTTP接口创建，
+UI只用于被测行为本身。一个已认证的requests会话在进程内复用，批量创建/清理并发执行。
+
+认证方式：
+- 默认：HTTP登录（utils.http_login）获取cookie，写请求附带ABP的 XSRF-TOKEN 防伪头
+- 配置 AEVATAR_API_CLIENT_ID 时：向 /connect/token 申请 password 模式的访问令牌（Bearer）
+
+环境变量：
+    AEVATAR_API_URL          后端API地址，默认与认证服务相同（AEVATAR_AUTH_URL）
+    AEVATAR_API_CLIENT_ID    OAuth客户端ID（可选，启用Bearer令牌）
+    AEVATAR_API_CLIENT_SECRET / AEVATAR_API_SCOPE  令牌请求的客户端密钥/scope（可选）
+    API_SEED_CONCURRENCY     批量操作的并发数，默认8
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.http_login import create_session, get_auth_url, http_login
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+USERS_API = "/api/identity/users"
+ROLES_API = "/api/identity/roles"
+PERMISSIONS_API = "/api/permission-management/permissions"
+EMAILING_API = "/api/setting-management/emailing"
+APP_CONFIG_API = "/api/abp/application-configuration"
+
+DEFAULT_PASSWORD = "Test@123456"
+
+
+class ApiSeedError(Exception):
+    """后端接口返回错误"""
+
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def get_api_url() -> str:
+    """后端API地址（AEVATAR_API_URL 优先，默认与认证服务相同）"""
+    return os.environ.get("AEVATAR_API_URL", get_auth_url()).rstrip("/")
+
+
+class ApiSeeder:
+    """
+    通过后端接口创建/删除测试数据，并记录创建的实体以便统一清理
+
+    用法：
+        seeder = ApiSeeder(admin_username, admin_password)
+        users = seeder.create_users("page_user", 30)
+        ...
+        seeder.teardown()
+    """
+
+    def __init__(self, username: str, password: str, api_url: str = None, concurrency: int = None,
+                 timeout: int = 15):
+        self.username = username
+        self.password = password
+        self.api_url = (api_url or get_api_url()).rstrip("/")
+        self.concurrency = concurrency or int(os.environ.get("API_SEED_CONCURRENCY", "8"))
+        self.timeout = timeout
+        self._session: Optional[requests.Session] = None
+        self._parent: Optional["ApiSeeder"] = None
+        self._auth_error: Optional[ApiSeedError] = None
+        self._auth_lock = threading.Lock()
+        # 创建的实体：(类型, id, 名称)，清理时逆序删除
+        self._created: List[Tuple[str, str, str]] = []
+        self._created_lock = threading.Lock()
+
+    # ==================== 会话 ====================
+
+    @property
+    def session(self) -> requests.Session:
+        if self._parent is not None:
+            return self._parent.session
+        if self._session is None:
+            with self._auth_lock:
+                # 认证失败只尝试一次，之后直接抛出，调用方回退到UI流程
+                if self._auth_error is not None:
+                    raise self._auth_error
+                if self._session is None:
+                    try:
+                        self._session = self._authenticate()
+                    except requests.RequestException as e:
+                        self._auth_error = ApiSeedError(f"无法连接后端API: {e}")
+                        raise self._auth_error
+                    except ApiSeedError as e:
+                        self._auth_error = e
+                        raise
+        return self._session
+
+    def _authenticate(self) -> requests.Session:
+        client_id = os.environ.get("AEVATAR_API_CLIENT_ID")
+        if client_id:
+            session = create_session()
+            data = {
+                "grant_type": "password",
+                "client_id": client_id,
+                "username": self.username,
+                "password": self.password,
+            }
+            if os.environ.get("AEVATAR_API_CLIENT_SECRET"):
+                data["client_secret"] = os.environ["AEVATAR_API_CLIENT_SECRET"]
+            if os.environ.get("AEVATAR_API_SCOPE"):
+                data["scope"] = os.environ["AEVATAR_API_SCOPE"]
+            resp = session.post(f"{get_auth_url()}/connect/token", data=data, timeout=self.timeout)
+            if resp.status_code != 200:
+                raise ApiSeedError(f"获取访问令牌失败（HTTP {resp.status_code}）: {resp.text[:200]}")
+            session.headers["Authorization"] = f"Bearer {resp.json()['access_token']}"
+        else:
+            can_login, error_msg, session = http_login(self.username, self.password)
+            if not can_login:
+                session.close()
+                raise ApiSeedError(f"管理员HTTP登录失败: {error_msg}")
+            # ABP对cookie认证的写请求校验防伪令牌：先请求一次应用配置拿到 XSRF-TOKEN cookie
+            session.get(f"{self.api_url}{APP_CONFIG_API}", timeout=self.timeout)
+
+        # 批量操作共用连接池
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        logger.info(f"API Seeder已认证: {self.username} -> {self.api_url}")
+        return session
+
+    def child(self) -> "ApiSeeder":
+        """共用同一已认证会话、但单独记录创建实体的Seeder（用于单个测试/测试类的清理范围）"""
+        seeder = ApiSeeder(self.username, self.password, self.api_url, self.concurrency, self.timeout)
+        seeder._parent = self
+        return seeder
+
+    def _request(self, method: str, path: str, **kwargs) -> Any:
+        headers = kwargs.pop("headers", {})
+        xsrf = self.session.cookies.get("XSRF-TOKEN")
+        if xsrf and method != "GET":
+            headers["RequestVerificationToken"] = xsrf
+        try:
+            resp = self.session.request(method, f"{self.api_url}{path}", headers=headers,
+                                        timeout=self.timeout, allow_redirects=False, **kwargs)
+        except requests.RequestException as e:
+            raise ApiSeedError(f"{method} {path} 请求失败: {e}")
+        if resp.status_code >= 300:
+            message = resp.text[:300]
+            try:
+                body = resp.json()
+            except ValueError:
+                body = None
+            if isinstance(body, dict) and isinstance(body.get("error"), dict):
+                message = body["error"].get("message") or message
+            raise ApiSeedError(f"{method} {path} 失败（HTTP {resp.status_code}）: {message}", resp.status_code)
+        if not resp.content:
+            return None
+        try:
+            return resp.json()
+        except ValueError:
+            return None
+
+    def _track(self, kind: str, entity_id: str, name: str):
+        with self._created_lock:
+            self._created.append((kind, entity_id, name))
+
+    def _bulk(self, func, items: Iterable) -> List[Any]:
+        """并发执行，返回与输入顺序一致的结果；任一失败时抛出第一个异常"""
+        items = list(items)
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(items)),
+                                thread_name_prefix="api-seeder") as executor:
+            return list(executor.map(func, items))
+
+    # ==================== 用户 ====================
+
+    def create_user(self, username: str, email: str = None, password: str = DEFAULT_PASSWORD,
+                    name: str = "", surname: str = "", phone: str = "", role_names: List[str] = None,
+                    is_active: bool = True) -> Dict[str, Any]:
+        """
+        创建用户
+
+        Returns:
+            dict: 后端返回的用户（含id）
+        """
+        body = {
+            "userName": username,
+            "email": email or f"{username}@test.com",
+            "password": password,
+            "name": name,
+            "surname": surname,
+            "phoneNumber": phone,
+            "isActive": is_active,
+            "lockoutEnabled": True,
+            "roleNames": role_names or [],
+        }
+        user = self._request("POST", USERS_API, json=body)
+        self._track("user", user["id"], username)
+        logger.debug(f"API创建用户: {username}")
+        return user
+
+    def create_users(self, prefix: str, count: int, password: str = DEFAULT_PASSWORD, **fields) -> List[Dict[str, Any]]:
+        """批量创建用户：<prefix>_<序号>，邮箱 <用户名>@test.com"""
+        names = [f"{prefix}_{i:03d}" for i in range(1, count + 1)]
+        users = self._bulk(lambda name: self.create_user(name, password=password, **fields), names)
+        logger.info(f"API批量创建 {len(users)} 个用户: {prefix}_*")
+        return users
+
+    def find_user(self, username: str) -> Optional[Dict[str, Any]]:
+        """按用户名查找用户，不存在时返回None（认证/连接等其他错误照常抛出）"""
+        try:
+            return self._request("GET", f"{USERS_API}/by-username/{quote(username)}")
+        except ApiSeedError as e:
+            if e.status_code == 404:
+                return None
+            raise
+
+    def count_users(self, keyword: str = None) -> int:
+        """用户总数（可按关键字过滤）"""
+        params = {"MaxResultCount": 1}
+        if keyword:
+            params["Filter"] = keyword
+        return int((self._request("GET", USERS_API, params=params) or {}).get("totalCount", 0))
+
+    def delete_user(self, user_id: str):
+        self._request("DELETE", f"{USERS_API}/{user_id}")
+
+    def delete_user_by_username(self, username: str) -> bool:
+        """删除指定用户名的用户（包括UI创建的用户），不存在时返回False"""
+        user = self.find_user(username)
+        if not user:
+            return False
+        self.delete_user(user["id"])
+        return True
+
+    def assign_roles(self, user_id: str, role_names: List[str]):
+        """设置用户的角色（覆盖原有角色）"""
+        self._request("PUT", f"{USERS_API}/{user_id}/roles", json={"roleNames": role_names})
+
+    # ==================== 角色与权限 ====================
+
+    def create_role(self, name: str, is_default: bool = False, is_public: bool = False) -> Dict[str, Any]:
+        role = self._request("POST", ROLES_API, json={"name": name, "isDefault": is_default, "isPublic": is_public})
+        self._track("role", role["id"], name)
+        logger.debug(f"API创建角色: {name}")
+        return role
+
+    def create_roles(self, prefix: str, count: int, **fields) -> List[Dict[str, Any]]:
+        names = [f"{prefix}_{i:03d}" for i in range(1, count + 1)]
+        return self._bulk(lambda name: self.create_role(name, **fields), names)
+
+    def delete_role(self, role_id: str):
+        self._request("DELETE", f"{ROLES_API}/{role_id}")
+
+    def set_permissions(self, role_name: str, permissions: Dict[str, bool]):
+        """
+        授予/撤销角色权限
+
+        Args:
+            role_name: 角色名（ABP权限提供者 R 的键）
+            permissions: {权限名: 是否授予}，如 {"AbpIdentity.Users": True}
+        """
+        body = {"permissions": [{"name": name, "isGranted": granted} for name, granted in permissions.items()]}
+        self._request("PUT", PERMISSIONS_API, params={"providerName": "R", "providerKey": role_name}, json=body)
+
+    # ==================== 设置 ====================
+
+    def get_emailing_settings(self) -> Dict[str, Any]:
+        return self._request("GET", EMAILING_API) or {}
+
+    def update_emailing_settings(self, **settings):
+        """
+        更新邮件设置（只修改传入的字段）
+
+        Args:
+            settings: ABP字段名，如 smtpHost="smtp.gmail.com", smtpPort=587, defaultFromAddress=...
+        """
+        current = self.get_emailing_settings()
+        self._request("POST", EMAILING_API, json={**current, **settings})
+
+    # ==================== 清理 ====================
+
+    def teardown(self) -> int:
+        """
+        删除本Seeder创建的所有实体（先用户后角色，并发执行，单个失败不影响其他）
+
+        Returns:
+            int: 删除成功的数量
+        """
+        with self._created_lock:
+            created, self._created = self._created, []
+        if not created:
+            return 0
+
+        def delete(entity):
+            kind, entity_id, name = entity
+            try:
+                if kind == "user":
+                    self.delete_user(entity_id)
+                else:
+                    self.delete_role(entity_id)
+                return True
+            except ApiSeedError as e:
+                # 测试过程中已通过UI删除
+                if e.status_code == 404:
+                    return True
+                logger.warning(f"清理{kind}失败: {name} ({e})")
+                return False
+            except Exception as e:
+                logger.warning(f"清理{kind}失败: {name} ({e})")
+                return False
+
+        users = [e for e in reversed(created) if e[0] == "user"]
+        roles = [e for e in reversed(created) if e[0] == "role"]
+        # 角色被用户引用时先删用户
+        deleted = sum(self._bulk(delete, users)) + sum(self._bulk(delete, roles))
+        logger.info(f"API清理预置数据: {deleted}/{len(created)}")
+        return deleted
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
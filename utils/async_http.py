@@ -0,0 +1,207 @@
+"""
+账号脚本共用的异步HTTP客户端
+- 连接池：所有账号的requests会话挂载同一个HTTPAdapter，TCP/TLS连接keep-alive复用；cookie仍按账号隔离
+- 并发控制：asyncio.Semaphore限制同时在途的请求数（ACCOUNT_HTTP_CONCURRENCY，默认32）
+- 令牌复用：匿名状态下ABP防伪令牌只与防伪cookie配对，不绑定具体账号，
+  同一个 (令牌, cookie) 对可用于多个账号的登录/注册请求；服务端拒绝（HTTP 400）时刷新令牌重试一次
+
+requirements中没有aiohttp/httpx，阻塞的requests调用放在与并发数等大的线程池中执行，由asyncio负责编排
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.http_login import TOKEN_PATTERN, get_auth_url, submit_login
+from utils.http_register import submit_registration
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CONCURRENCY = 32
+
+
+class AsyncAccountClient:
+    """账号登录/注册的异步客户端，需在事件循环中使用：async with AsyncAccountClient() as client"""
+
+    def __init__(self, base_url: Optional[str] = None, concurrency: int = None, timeout: int = 10):
+        """
+        初始化客户端
+
+        Args:
+            base_url: 认证服务地址，默认 get_auth_url()
+            concurrency: 最大并发请求数，默认读取 ACCOUNT_HTTP_CONCURRENCY，否则32
+            timeout: 单个请求超时时间(秒)
+        """
+        self.base_url = (base_url or get_auth_url()).rstrip("/")
+        self.concurrency = concurrency or int(os.environ.get("ACCOUNT_HTTP_CONCURRENCY", str(DEFAULT_CONCURRENCY)))
+        self.timeout = timeout
+        self.login_url = f"{self.base_url}/Account/Login"
+        self.register_url = f"{self.base_url}/Account/Register"
+
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency, max_retries=0)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="account-http")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._token_lock: Optional[asyncio.Lock] = None
+        # 页面URL -> (防伪令牌, 防伪cookie)
+        self._tokens: Dict[str, Tuple[str, requests.cookies.RequestsCookieJar]] = {}
+
+    async def __aenter__(self) -> "AsyncAccountClient":
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._token_lock = asyncio.Lock()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self._adapter.close()
+
+    # ==================== 基础设施 ====================
+
+    def new_session(self) -> requests.Session:
+        """新建挂载共享连接池的会话（cookie独立）"""
+        session = requests.Session()
+        session.verify = False
+        session.mount("https://", self._adapter)
+        session.mount("http://", self._adapter)
+        return session
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """在受并发限制的线程池中执行阻塞函数"""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _token_for(self, page_url: str, refresh: bool = False) -> Tuple[Optional[str], requests.cookies.RequestsCookieJar]:
+        """获取（或复用）页面的防伪令牌和配对cookie"""
+        async with self._token_lock:
+            if refresh:
+                self._tokens.pop(page_url, None)
+            if page_url not in self._tokens:
+                session = self.new_session()
+                try:
+                    response = await self.run(lambda: session.get(page_url, timeout=self.timeout))
+                    match = TOKEN_PATTERN.search(response.text)
+                    if not match:
+                        return None, requests.cookies.RequestsCookieJar()
+                    self._tokens[page_url] = (match.group(1), session.cookies.copy())
+                finally:
+                    session.close()
+            return self._tokens[page_url]
+
+    async def _with_token(self, page_url: str, submit: Callable[[requests.Session, Optional[str]], Tuple[bool, str, int]],
+                          keep_session: bool = False) -> Tuple[bool, str, Optional[requests.Session]]:
+        """用复用的令牌提交表单；令牌被拒绝(HTTP 400)时刷新后重试一次"""
+        for attempt in range(2):
+            token, cookies = await self._token_for(page_url, refresh=attempt > 0)
+            if not token:
+                return False, "无法获取防伪Token", None
+
+            session = self.new_session()
+            session.cookies.update(cookies)
+            try:
+                ok, message, status_code = await self.run(submit, session, token)
+            except requests.exceptions.Timeout:
+                ok, message, status_code = False, "请求超时", 0
+            except Exception as e:
+                ok, message, status_code = False, f"异常: {str(e)}", 0
+
+            if status_code == 400 and attempt == 0:
+                logger.debug(f"防伪令牌被拒绝，刷新后重试: {page_url}")
+                session.close()
+                continue
+
+            if keep_session and ok:
+                return ok, message, session
+            session.close()
+            return ok, message, None
+        return False, "防伪令牌校验失败", None
+
+    # ==================== 账号操作 ====================
+
+    async def login(self, username: str, password: str, keep_session: bool = False) -> Tuple[bool, str, Optional[requests.Session]]:
+        """
+        HTTP登录
+
+        Args:
+            keep_session: 登录成功时返回已认证的会话（调用方负责关闭）
+
+        Returns:
+            tuple: (can_login: bool, error_message: str, session或None)
+        """
+        def submit(session, token):
+            ok, message, response = submit_login(session, username, password, token, self.login_url, timeout=self.timeout)
+            return ok, message, response.status_code
+
+        return await self._with_token(self.login_url, submit, keep_session=keep_session)
+
+    async def register(self, username: str, email: str, password: str) -> Tuple[bool, str]:
+        """通过注册表单创建账号（账号已存在也视为成功）"""
+        def submit(session, token):
+            return submit_registration(session, username, email, password, token, register_url=self.register_url)
+
+        ok, message, _ = await self._with_token(self.register_url, submit)
+        return ok, message
+
+
+async def _gather(items: Iterable[Any], worker: Callable[[Any], Awaitable[Any]],
+                  on_result: Optional[Callable[[Any, Any], None]]) -> List[Tuple[Any, Any]]:
+    """并发执行并按完成顺序回调，返回与输入顺序一致的 (item, result) 列表"""
+    items = list(items)
+
+    async def run_one(item):
+        result = await worker(item)
+        if on_result:
+            on_result(item, result)
+        return item, result
+
+    return await asyncio.gather(*(run_one(item) for item in items))
+
+
+def verify_accounts(
+    accounts: Iterable[Dict[str, Any]],
+    on_result: Optional[Callable[[Dict[str, Any], Tuple[bool, str]], None]] = None,
+    base_url: Optional[str] = None,
+    concurrency: int = None,
+) -> List[Tuple[Dict[str, Any], Tuple[bool, str]]]:
+    """
+    批量验证账号能否登录（同步入口，供脚本直接调用）
+
+    Args:
+        accounts: 账号列表（需包含username/password）
+        on_result: 每个账号完成时的回调 (account, (can_login, error_message))
+        base_url: 认证服务地址
+        concurrency: 最大并发数
+
+    Returns:
+        list: [(account, (can_login, error_message)), ...]，顺序与输入一致
+    """
+    async def main():
+        async with AsyncAccountClient(base_url, concurrency) as client:
+            async def worker(account):
+                ok, message, _ = await client.login(account["username"], account["password"])
+                return ok, message
+            return await _gather(accounts, worker, on_result)
+
+    return asyncio.run(main())
+
+
+def register_accounts(
+    accounts: Iterable[Dict[str, Any]],
+    on_result: Optional[Callable[[Dict[str, Any], Tuple[bool, str]], None]] = None,
+    base_url: Optional[str] = None,
+    concurrency: int = None,
+) -> List[Tuple[Dict[str, Any], Tuple[bool, str]]]:
+    """批量注册账号（同步入口），返回值同 verify_accounts"""
+    async def main():
+        async with AsyncAccountClient(base_url, concurrency) as client:
+            async def worker(account):
+                return await client.register(account["username"], account["email"], account["password"])
+            return await _gather(accounts, worker, on_result)
+
+    return asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+worker级浏览器池
+每个pytest进程（xdist worker）复用同一个浏览器进程，测试之间通过独立的BrowserContext隔离；
+浏览器崩溃/断开或已服务满N个测试时才重新启动，既保留崩溃隔离又避免每个测试冷启动Chromium
+"""
+import os
+from typing import Any, Dict, List, Optional
+
+from playwright.sync_api import Browser, BrowserType
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BrowserPool:
+    """浏览器池：按需启动、健康检查、按使用次数回收"""
+
+    def __init__(self, browser_type: BrowserType, launch_args: Optional[Dict[str, Any]] = None, max_contexts: int = None):
+        """
+        初始化浏览器池
+
+        Args:
+            browser_type: Playwright BrowserType
+            launch_args: 启动参数（通常来自 browser_type_launch_args fixture）
+            max_contexts: 单个浏览器最多服务的测试数，默认读取 BROWSER_POOL_MAX_CONTEXTS，否则50
+        """
+        self.browser_type = browser_type
+        self.launch_args = launch_args or {}
+        self.max_contexts = max_contexts or int(os.environ.get("BROWSER_POOL_MAX_CONTEXTS", "50"))
+        self.launch_count = 0
+        self._current: Optional[Browser] = None
+        self._served = 0
+        self._leases: Dict[int, int] = {}
+        self._retired: List[Browser] = []
+
+    def acquire(self) -> Browser:
+        """
+        获取一个健康的浏览器（调用方用完后必须调用 release）
+
+        Returns:
+            Browser: 当前浏览器实例
+        """
+        if not self._is_healthy(self._current):
+            if self._current is not None:
+                logger.warning("浏览器已断开或崩溃，重新启动")
+            self._replace_current()
+        elif self._served >= self.max_contexts:
+            logger.info(f"浏览器已服务 {self._served} 个测试，达到上限 {self.max_contexts}，重新启动")
+            self._replace_current()
+
+        browser = self._current
+        self._served += 1
+        self._leases[id(browser)] = self._leases.get(id(browser), 0) + 1
+        return browser
+
+    def release(self, browser: Browser):
+        """归还浏览器；已退役的浏览器在最后一个使用者归还后关闭"""
+        key = id(browser)
+        self._leases[key] = max(self._leases.get(key, 1) - 1, 0)
+
+        if browser in self._retired and self._leases[key] == 0:
+            self._close(browser)
+            self._retired.remove(browser)
+            self._leases.pop(key, None)
+
+    def close(self):
+        """关闭池中的所有浏览器"""
+        for browser in [self._current] + self._retired:
+            if browser is not None:
+                self._close(browser)
+        self._current = None
+        self._retired = []
+        self._leases = {}
+        logger.info(f"浏览器池已关闭，本进程共启动浏览器 {self.launch_count} 次")
+
+    def _replace_current(self):
+        """退役当前浏览器并启动新浏览器"""
+        old = self._current
+        if old is not None:
+            if self._leases.get(id(old), 0) > 0 and self._is_healthy(old):
+                # 仍有使用者（例如class级fixture）：等其归还后再关闭
+                self._retired.append(old)
+            else:
+                self._close(old)
+                self._leases.pop(id(old), None)
+
+        self._current = self.browser_type.launch(**self.launch_args)
+        self._served = 0
+        self.launch_count += 1
+        logger.info(f"启动浏览器（第 {self.launch_count} 次）: {self.browser_type.name} {self._current.version}")
+
+    @staticmethod
+    def _is_healthy(browser: Optional[Browser]) -> bool:
+        """浏览器是否仍可用"""
+        if browser is None:
+            return False
+        try:
+            return browser.is_connected()
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(browser: Browser):
+        """关闭浏览器，忽略已断开等异常"""
+        try:
+            browser.close()
+        except Exception as e:
+            logger.debug(f"关闭浏览器时出现异常（可能已崩溃）: {e}")
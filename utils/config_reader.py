@@ -1,5 +1,7 @@
 import json
 import os
+import threading
+import time
 import yaml
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -8,102 +10,233 @@ from dotenv import load_dotenv
 # 加载环境变量
 load_dotenv()
 
+# 同一进程内两次检查配置文件mtime的最小间隔(秒)
+MTIME_CHECK_INTERVAL = 1.0
+
+_MISSING = object()
+
+
+class _ConfigStore:
+    """
+    进程级配置缓存（每个配置文件一份）
+    - 文件只解析一次，展平为 "a.b.c" -> 值 的查找表；按mtime检测文件变化后重新加载
+    - 环境变量覆盖按键懒计算并缓存（A.B.C -> A_B_C），之后同一个键不再访问 os.environ
+    """
+
+    def __init__(self, config_file: str):
+        self.config_file = config_file
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self.data: Dict[str, Any] = {}
+        self._flat: Dict[str, Any] = {}
+        self._env: Dict[str, Any] = {}
+        self._load()
+
+    def _stat_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.config_file).st_mtime
+        except OSError:
+            return None
+
+    def _load(self):
+        self._mtime = self._stat_mtime()
+        self._checked_at = time.monotonic()
+        self.data = _load_config(Path(self.config_file))
+        flat: Dict[str, Any] = {}
+        _flatten(self.data, "", flat)
+        self._flat = flat
+
+    def refresh_if_changed(self):
+        """距上次检查超过 MTIME_CHECK_INTERVAL 时比较mtime，文件变化则重新加载"""
+        now = time.monotonic()
+        if now - self._checked_at < MTIME_CHECK_INTERVAL:
+            return
+        with self._lock:
+            self._checked_at = now
+            if self._stat_mtime() != self._mtime:
+                self._load()
+
+    def reload(self):
+        """强制重新加载文件并清空环境变量缓存（测试中修改 os.environ 后调用）"""
+        with self._lock:
+            self._load()
+            self._env.clear()
+
+    def lookup(self, key: str) -> Any:
+        env_value = self._env.get(key, _MISSING)
+        if env_value is _MISSING:
+            raw = os.environ.get(key.upper().replace('.', '_'))
+            env_value = _convert_value(raw) if raw is not None else None
+            self._env[key] = env_value
+        if env_value is not None:
+            return env_value
+        return self._flat.get(key, _MISSING)
+
+
+_stores: Dict[str, _ConfigStore] = {}
+_stores_lock = threading.Lock()
+
+
+def _get_store(config_file: str) -> _ConfigStore:
+    path = os.path.abspath(config_file)
+    store = _stores.get(path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(path)
+            if store is None:
+                store = _stores[path] = _ConfigStore(path)
+                return store
+    store.refresh_if_changed()
+    return store
+
+
+def _load_config(config_path: Path) -> Dict[str, Any]:
+    """加载配置文件"""
+    if not config_path.exists():
+        return {}
+
+    try:
+        with open(config_path, 'r', encoding='utf-8') as file:
+            if config_path.suffix.lower() in ['.yaml', '.yml']:
+                return yaml.safe_load(file) or {}
+            elif config_path.suffix.lower() == '.json':
+                return json.load(file) or {}
+            else:
+                return {}
+    except Exception as e:
+        print(f"加载配置文件失败: {e}")
+        return {}
+
+
+def _flatten(node: Any, prefix: str, out: Dict[str, Any]):
+    """嵌套字典展平，中间层的字典本身也保留（get("browser") 返回整个子配置）"""
+    if not isinstance(node, dict):
+        return
+    for k, v in node.items():
+        key = f"{prefix}{k}"
+        out[key] = v
+        _flatten(v, f"{key}.", out)
+
+
+def _convert_value(value: str) -> Any:
+    """转换字符串值为适当的类型"""
+    if value.lower() in ['true', 'yes', '1']:
+        return True
+    elif value.lower() in ['false', 'no', '0']:
+        return False
+    elif value.isdigit():
+        return int(value)
+    elif _is_float(value):
+        return float(value)
+    else:
+        return value
+
+
+def _is_float(value: str) -> bool:
+    """检查字符串是否为浮点数"""
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
 class ConfigReader:
-    """配置文件读取器"""
-    
+    """配置文件读取器（同一配置文件在进程内共享解析结果，创建实例几乎没有开销）"""
+
     def __init__(self, config_file: str = "config/test_config.yaml"):
         """
         初始化配置读取器
-        
+
         Args:
             config_file: 配置文件路径
         """
         self.config_file = config_file
-        self._config_data = self._load_config()
-    
-    def _load_config(self) -> Dict[str, Any]:
-        """加载配置文件"""
-        config_path = Path(self.config_file)
-        
-        if not config_path.exists():
-            return {}
-        
-        try:
-            with open(config_path, 'r', encoding='utf-8') as file:
-                if config_path.suffix.lower() in ['.yaml', '.yml']:
-                    return yaml.safe_load(file) or {}
-                elif config_path.suffix.lower() == '.json':
-                    return json.load(file) or {}
-                else:
-                    return {}
-        except Exception as e:
-            print(f"加载配置文件失败: {e}")
-            return {}
-    
+        self._store = _get_store(config_file)
+
+    @property
+    def _config_data(self) -> Dict[str, Any]:
+        return self._store.data
+
+    def reload(self):
+        """重新加载配置文件和环境变量覆盖"""
+        self._store.reload()
+
     def get(self, key: str, default: Any = None) -> Any:
         """
         获取配置值
-        
+
         Args:
             key: 配置键，支持点号分隔的嵌套键
             default: 默认值
-            
+
         Returns:
-            配置值
+            配置值（环境变量优先，如 test.base_url 对应 TEST_BASE_URL）
         """
-        # 首先尝试从环境变量获取
-        env_key = key.upper().replace('.', '_')
-        env_value = os.getenv(env_key)
-        if env_value is not None:
-            return self._convert_value(env_value)
-        
-        # 从配置文件获取
-        keys = key.split('.')
-        value = self._config_data
-        
+        value = self._store.lookup(key)
+        return default if value is _MISSING else value
+
+    def get_str(self, key: str, default: str = "") -> str:
+        value = self.get(key, default)
+        return default if value is None else str(value)
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        value = self.get(key, default)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    def get_float(self, key: str, default: float = 0.0) -> float:
+        value = self.get(key, default)
         try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
+            return float(value)
+        except (TypeError, ValueError):
             return default
-    
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        value = self.get(key, default)
+        if isinstance(value, str):
+            return value.lower() in ['true', 'yes', '1']
+        return bool(value)
+
     def _convert_value(self, value: str) -> Any:
         """转换字符串值为适当的类型"""
-        if value.lower() in ['true', 'yes', '1']:
-            return True
-        elif value.lower() in ['false', 'no', '0']:
-            return False
-        elif value.isdigit():
-            return int(value)
-        elif self._is_float(value):
-            return float(value)
-        else:
-            return value
-    
+        return _convert_value(value)
+
     def _is_float(self, value: str) -> bool:
         """检查字符串是否为浮点数"""
-        try:
-            float(value)
-            return True
-        except ValueError:
-            return False
-    
+        return _is_float(value)
+
     def get_browser_config(self) -> Dict[str, Any]:
         """获取浏览器配置"""
         return {
-            "headless": self.get("browser.headless", False),
-            "slow_mo": self.get("browser.slow_mo", 100),
-            "timeout": self.get("browser.timeout", 30000),
-            "viewport_width": self.get("browser.viewport.width", 1920),
-            "viewport_height": self.get("browser.viewport.height", 1080),
+            "headless": self.get_bool("browser.headless", False),
+            "slow_mo": self.get_int("browser.slow_mo", 100),
+            "timeout": self.get_int("browser.timeout", 30000),
+            "viewport_width": self.get_int("browser.viewport.width", 1920),
+            "viewport_height": self.get_int("browser.viewport.height", 1080),
         }
-    
+
     def get_test_config(self) -> Dict[str, Any]:
         """获取测试配置"""
         return {
-            "base_url": self.get("test.base_url", "https://example.com"),
-            "environment": self.get("test.environment", "dev"),
-            "retry_count": self.get("test.retry_count", 2),
-            "implicit_wait": self.get("test.implicit_wait", 10),
-        } 
\ No newline at end of file
+            "base_url": self.get_str("test.base_url", "https://example.com"),
+            "environment": self.get_str("test.environment", "dev"),
+            "retry_count": self.get_int("test.retry_count", 2),
+            "implicit_wait": self.get_int("test.implicit_wait", 10),
+        }
+
+
+_default_reader: Optional[ConfigReader] = None
+
+
+def get_config() -> ConfigReader:
+    """进程级默认配置（config/test_config.yaml）"""
+    global _default_reader
+    if _default_reader is None:
+        _default_reader = ConfigReader()
+    else:
+        _default_reader._store.refresh_if_changed()
+    return _default_reader
@@ -1,13 +1,64 @@
+"""
+测试数据管理
+- 解析缓存：进程内按 (文件路径, mtime, 大小) 缓存解析结果，同一文件只解析一次，文件修改后自动重新解析
+- 流式读取：iter_csv / iter_excel 逐行生成数据（Excel使用openpyxl只读模式），大表不整体载入内存
+- 懒加载：LazyTestData 在第一次访问某个数据集时才加载对应文件
+"""
+import copy
 import json
 import csv
+import os
+import threading
 import yaml
 import openpyxl
+from collections.abc import Mapping
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# (绝对路径, 变体如工作表名) -> (mtime_ns, 文件大小, 解析结果)
+_parse_cache: Dict[Tuple[str, str], Tuple[int, int, Any]] = {}
+_parse_cache_lock = threading.Lock()
+
+
+def _cached_parse(file_path: str, parser, variant: str = "") -> Any:
+    """
+    按路径+mtime缓存解析结果；返回的是缓存中的共享对象，调用方需自行复制后再修改
+
+    Raises:
+        OSError: 文件不存在或无法读取
+    """
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    key = (path, variant)
+    cached = _parse_cache.get(key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    data = parser(path)
+    logger.info(f"成功加载数据文件: {file_path}")
+    with _parse_cache_lock:
+        _parse_cache[key] = (stat.st_mtime_ns, stat.st_size, data)
+    return data
+
+
+def clear_data_cache():
+    """清空解析缓存"""
+    with _parse_cache_lock:
+        _parse_cache.clear()
+
+
+def _parse_json(path: str) -> Any:
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def _parse_yaml(path: str) -> Any:
+    with open(path, 'r', encoding='utf-8') as file:
+        return yaml.safe_load(file) or {}
+
+
 class DataManager:
     """测试数据管理器"""
     
@@ -23,10 +74,8 @@ class DataManager:
             Dict[str, Any]: JSON数据
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                logger.info(f"成功加载JSON文件: {file_path}")
-                return data
+            # 缓存对象共享，返回副本避免调用方的修改影响其他测试
+            return copy.deepcopy(_cached_parse(file_path, _parse_json))
         except Exception as e:
             logger.error(f"加载JSON文件失败: {file_path}, 错误: {e}")
             return {}
@@ -62,14 +111,52 @@ class DataManager:
             Dict[str, Any]: YAML数据
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = yaml.safe_load(file)
-                logger.info(f"成功加载YAML文件: {file_path}")
-                return data or {}
+            return copy.deepcopy(_cached_parse(file_path, _parse_yaml))
         except Exception as e:
             logger.error(f"加载YAML文件失败: {file_path}, 错误: {e}")
             return {}
     
+    @staticmethod
+    def iter_csv(file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        逐行读取CSV文件（不缓存、不整体载入内存，适合大文件的数据驱动测试）
+        
+        Args:
+            file_path: CSV文件路径
+            
+        Yields:
+            Dict[str, Any]: 一行数据
+        """
+        with open(file_path, 'r', encoding='utf-8', newline='') as file:
+            yield from csv.DictReader(file)
+    
+    @staticmethod
+    def iter_excel(file_path: str, sheet_name: str = None) -> Iterator[Dict[str, Any]]:
+        """
+        逐行读取Excel文件（openpyxl只读模式，按需解析工作表XML，内存占用与行数无关）
+        
+        Args:
+            file_path: Excel文件路径
+            sheet_name: 工作表名称，为None时使用第一个工作表
+            
+        Yields:
+            Dict[str, Any]: 一行数据（表头 -> 值）
+        """
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[sheet_name] if sheet_name else workbook.active
+            rows = worksheet.iter_rows(values_only=True)
+            headers = next(rows, None)
+            if headers is None:
+                return
+            for row in rows:
+                # 只读模式下空行可能被省略或全为None
+                if row is None or all(value is None for value in row):
+                    continue
+                yield {header: value for header, value in zip(headers, row)}
+        finally:
+            workbook.close()
+    
     @staticmethod
     def load_csv(file_path: str) -> List[Dict[str, Any]]:
         """
@@ -82,13 +169,8 @@ class DataManager:
             List[Dict[str, Any]]: CSV数据列表
         """
         try:
-            data = []
-            with open(file_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    data.append(row)
-                logger.info(f"成功加载CSV文件: {file_path}, 共 {len(data)} 行数据")
-                return data
+            rows = _cached_parse(file_path, lambda path: list(DataManager.iter_csv(path)))
+            return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"加载CSV文件失败: {file_path}, 错误: {e}")
             return []
@@ -106,35 +188,39 @@ class DataManager:
             List[Dict[str, Any]]: Excel数据列表
         """
         try:
-            workbook = openpyxl.load_workbook(file_path)
-            
-            if sheet_name:
-                worksheet = workbook[sheet_name]
-            else:
-                worksheet = workbook.active
-            
-            data = []
-            headers = []
-            
-            # 获取表头
-            for cell in worksheet[1]:
-                headers.append(cell.value)
-            
-            # 获取数据行
-            for row in worksheet.iter_rows(min_row=2, values_only=True):
-                row_data = {}
-                for i, value in enumerate(row):
-                    if i < len(headers):
-                        row_data[headers[i]] = value
-                data.append(row_data)
-            
-            logger.info(f"成功加载Excel文件: {file_path}, 工作表: {sheet_name or 'default'}, 共 {len(data)} 行数据")
-            return data
-            
+            rows = _cached_parse(
+                file_path, lambda path: list(DataManager.iter_excel(path, sheet_name)), variant=sheet_name or ""
+            )
+            logger.debug(f"加载Excel文件: {file_path}, 工作表: {sheet_name or 'default'}, 共 {len(rows)} 行数据")
+            return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"加载Excel文件失败: {file_path}, 错误: {e}")
             return []
     
+    @staticmethod
+    def iter_test_data(data_file: str, test_case: str = None) -> Iterator[Dict[str, Any]]:
+        """
+        流式获取CSV/Excel测试数据（用于大表的数据驱动测试，如 pytest.mark.parametrize）
+        
+        Args:
+            data_file: test_data/ 下的CSV或Excel文件
+            test_case: 只返回 test_case 列包含该名称的行
+            
+        Yields:
+            Dict[str, Any]: 一行测试数据
+        """
+        file_path = Path(f"test_data/{data_file}")
+        suffix = file_path.suffix.lower()
+        if suffix == '.csv':
+            rows = DataManager.iter_csv(str(file_path))
+        elif suffix in ['.xlsx', '.xlsm']:
+            rows = DataManager.iter_excel(str(file_path))
+        else:
+            raise ValueError(f"流式读取只支持CSV/Excel: {data_file}")
+        for row in rows:
+            if not test_case or test_case in str(row.get('test_case', '')):
+                yield row
+    
     @staticmethod
     def get_test_data(data_file: str, test_case: str = None) -> List[Dict[str, Any]]:
         """
@@ -188,6 +274,67 @@ class DataManager:
             logger.error(f"不支持的文件格式: {suffix}")
             return []
 
+class LazyTestData(Mapping):
+    """
+    按需加载的测试数据集合（只读映射）
+    - merge_files：顶层键合并到同一命名空间，后面的文件覆盖前面的同名键（与 dict.update 顺序一致）
+    - named_files：整个文件作为一个数据集，如 {"register_data": "register_data.json"}
+    第一次访问某个键时才解析需要的文件，解析结果来自进程级缓存
+    """
+    
+    def __init__(self, data_dir, merge_files: Sequence[str] = (), named_files: Dict[str, str] = None):
+        self.data_dir = Path(data_dir)
+        self.merge_files = list(merge_files)
+        self.named_files = dict(named_files or {})
+        self._merged: Dict[str, Dict[str, Any]] = {}
+        self._named: Dict[str, Any] = {}
+    
+    def _load(self, file_name: str) -> Optional[Dict[str, Any]]:
+        path = self.data_dir / file_name
+        try:
+            return _cached_parse(str(path), _parse_json if path.suffix.lower() == '.json' else _parse_yaml)
+        except FileNotFoundError:
+            logger.warning(f"未找到{file_name}，跳过加载")
+            return None
+    
+    def _merged_file(self, file_name: str) -> Dict[str, Any]:
+        if file_name not in self._merged:
+            self._merged[file_name] = self._load(file_name) or {}
+        return self._merged[file_name]
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self.named_files:
+            if key not in self._named:
+                data = self._load(self.named_files[key])
+                if data is None:
+                    raise KeyError(key)
+                self._named[key] = data
+            return self._named[key]
+        # 从最后一个文件往前找，保证覆盖顺序与逐个update一致
+        for file_name in reversed(self.merge_files):
+            data = self._merged_file(file_name)
+            if key in data:
+                return data[key]
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        seen = set()
+        for file_name in self.merge_files:
+            for key in self._merged_file(file_name):
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+        for key in self.named_files:
+            if key not in seen and (key in self._named or (self.data_dir / self.named_files[key]).exists()):
+                yield key
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def loaded_files(self) -> List[str]:
+        """已加载的文件（调试用）"""
+        return list(self._merged) + [self.named_files[k] for k in self._named]
+
 class TestDataProvider:
     """测试数据提供器"""
     
@@ -0,0 +1,240 @@
+"""
+用例耗时历史 + 最长优先的xdist调度（pytest插件）
+
+1. 记录：控制进程（或单进程运行）从测试报告中收集每个nodeid的 setup / call / teardown 耗时，
+   会话结束时一次性写入本地SQLite历史库（默认 reports/duration_history.db，每个用例保留最近 HISTORY_KEEP 次）
+2. 调度：启用 --longest-first 后替换xdist的load调度，待运行队列按预测耗时从长到短排列，
+   每个worker只预取少量用例，空闲即领取剩余最长的用例（LPT），各worker的预计结束时间因此趋于一致；
+   没有历史的用例按已知用例的平均耗时估计
+
+启用方式：
+    pytest tests/ -n 4                      # 默认记录耗时（DURATION_HISTORY=false 关闭）
+    pytest tests/ -n 4 --longest-first      # 按历史耗时最长优先调度（LONGEST_FIRST=true 同效）
+"""
+import os
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Optional
+
+import pytest
+
+DEFAULT_DB_PATH = "reports/duration_history.db"
+
+# 每个用例保留的历史次数，预测值取最近几次总耗时的中位数
+HISTORY_KEEP = 10
+
+# 每个worker手上保留的用例数：xdist的worker需要"下一个用例"才能开始当前用例，最少为2
+PREFETCH = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS durations (
+    nodeid TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    setup REAL NOT NULL DEFAULT 0,
+    call REAL NOT NULL DEFAULT 0,
+    teardown REAL NOT NULL DEFAULT 0,
+    outcome TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_durations_nodeid ON durations (nodeid, recorded_at);
+"""
+
+
+class DurationHistory:
+    """耗时历史库（SQLite），只由控制进程读写"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, keep: int = HISTORY_KEEP):
+        self.db_path = Path(db_path)
+        self.keep = keep
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def record(self, rows: List[Dict]):
+        """
+        批量写入一次运行的耗时，并裁剪每个用例的旧记录
+
+        Args:
+            rows: [{nodeid, setup, call, teardown, outcome}, ...]
+        """
+        if not rows:
+            return
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT INTO durations (nodeid, recorded_at, setup, call, teardown, outcome) VALUES (?, ?, ?, ?, ?, ?)",
+                [(r["nodeid"], now, r.get("setup", 0), r.get("call", 0), r.get("teardown", 0), r.get("outcome")) for r in rows],
+            )
+            conn.executemany(
+                """
+                DELETE FROM durations WHERE nodeid = ? AND rowid NOT IN (
+                    SELECT rowid FROM durations WHERE nodeid = ? ORDER BY recorded_at DESC LIMIT ?
+                )
+                """,
+                [(r["nodeid"], r["nodeid"], self.keep) for r in rows],
+            )
+
+    def expected_durations(self) -> Dict[str, float]:
+        """每个nodeid的预测耗时（秒）= 最近几次 setup+call+teardown 的中位数"""
+        if not self.db_path.exists():
+            return {}
+        samples: Dict[str, List[float]] = {}
+        with closing(self._connect()) as conn:
+            for nodeid, total in conn.execute("SELECT nodeid, setup + call + teardown FROM durations"):
+                samples.setdefault(nodeid, []).append(total)
+        return {nodeid: median(values) for nodeid, values in samples.items()}
+
+
+def make_longest_first_scheduling(base):
+    """
+    基于xdist的LoadScheduling构造最长优先调度类（xdist只在控制进程按需导入）
+    """
+
+    class LongestFirstScheduling(base):
+        """待运行队列按预测耗时降序；worker空闲时领取剩余最长的用例"""
+
+        def __init__(self, config, log=None, expected: Optional[Dict[str, float]] = None):
+            super().__init__(config, log)
+            self.expected = expected or {}
+            known = list(self.expected.values())
+            # 没有历史的用例按已知平均耗时估计，既不抢在最长用例前面，也不拖到最后
+            self.default_duration = sum(known) / len(known) if known else 0.0
+
+        def expected_for(self, index: int) -> float:
+            return self.expected.get(self.collection[index], self.default_duration)
+
+        def _sort_pending(self):
+            # 稳定排序：没有任何历史时保持收集顺序
+            self.pending.sort(key=self.expected_for, reverse=True)
+
+        def schedule(self):
+            assert self.collection_is_completed
+
+            if self.collection is not None:
+                for node in self.nodes:
+                    self.check_schedule(node)
+                return
+
+            if not self._check_nodes_have_same_collection():
+                self.log("**Different tests collected, aborting run**")
+                return
+
+            self.collection = list(self.node2collection.values())[0]
+            self.pending[:] = range(len(self.collection))
+            if not self.collection:
+                return
+            self._sort_pending()
+
+            # 按预测耗时给每个worker各发 PREFETCH 个：轮流领取最长的用例
+            for _ in range(PREFETCH):
+                for node in self.nodes:
+                    if self.pending:
+                        self._send_tests(node, 1)
+
+            if not self.pending:
+                for node in self.nodes:
+                    node.shutdown()
+
+        def check_schedule(self, node, duration=0):
+            if node.shutting_down:
+                return
+            if self.pending:
+                missing = PREFETCH - len(self.node2pending[node])
+                if missing > 0:
+                    self._send_tests(node, missing)
+            else:
+                node.shutdown()
+            self.log("num items waiting for node:", len(self.pending))
+
+        def remove_node(self, node):
+            crashitem = super().remove_node(node)
+            # 崩溃worker未运行的用例放回队列后恢复降序
+            self._sort_pending()
+            return crashitem
+
+    return LongestFirstScheduling
+
+
+# ==================== pytest钩子 ====================
+
+def pytest_addoption(parser):
+    group = parser.getgroup("duration-history", "用例耗时历史")
+    group.addoption(
+        "--duration-history",
+        default=os.environ.get("DURATION_HISTORY_DB", DEFAULT_DB_PATH),
+        help=f"耗时历史库路径，默认 {DEFAULT_DB_PATH}",
+    )
+    group.addoption(
+        "--no-duration-history",
+        action="store_true",
+        default=os.environ.get("DURATION_HISTORY", "true").lower() == "false",
+        help="不记录本次运行的用例耗时（环境变量 DURATION_HISTORY=false 同效）",
+    )
+    group.addoption(
+        "--longest-first",
+        action="store_true",
+        default=os.environ.get("LONGEST_FIRST", "false").lower() == "true",
+        help="xdist按历史耗时最长优先调度（需配合 -n 使用，环境变量 LONGEST_FIRST=true 同效）",
+    )
+
+
+def pytest_configure(config):
+    # worker不记录也不调度：xdist会把每个测试报告（含耗时）转发给控制进程
+    if hasattr(config, "workerinput"):
+        return
+    history = DurationHistory(config.getoption("--duration-history"))
+    plugin = DurationHistoryPlugin(history, record=not config.getoption("--no-duration-history"))
+    config.pluginmanager.register(plugin, "duration_history_plugin")
+
+
+class DurationHistoryPlugin:
+    """控制进程中注册的插件实例"""
+
+    def __init__(self, history: DurationHistory, record: bool):
+        self.history = history
+        self.record = record
+        self.rows: Dict[str, Dict] = {}
+        self.scheduled_longest_first = False
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        if not config.getoption("--longest-first") or config.getoption("dist", "no") != "load":
+            return None
+        from xdist.scheduler import LoadScheduling
+
+        expected = self.history.expected_durations()
+        self.scheduled_longest_first = True
+        return make_longest_first_scheduling(LoadScheduling)(config, log, expected=expected)
+
+    def pytest_runtest_logreport(self, report):
+        if not self.record:
+            return
+        row = self.rows.setdefault(report.nodeid, {"nodeid": report.nodeid, "outcome": "passed"})
+        row[report.when] = report.duration
+        if report.failed:
+            row["outcome"] = "failed"
+        elif report.skipped and report.when != "teardown":
+            row["outcome"] = "skipped"
+
+    def pytest_sessionfinish(self, session):
+        if not self.record:
+            return
+        # 跳过的用例耗时不代表真实运行时间，不写入历史
+        rows = [r for r in self.rows.values() if r["outcome"] != "skipped"]
+        try:
+            self.history.record(rows)
+        except sqlite3.Error as e:
+            session.config.get_terminal_writer().line(f"⚠️ 写入耗时历史失败: {e}")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.rows:
+            return
+        if self.scheduled_longest_first:
+            terminalreporter.write_line(f"⏱️ 已按历史耗时最长优先调度（历史库: {self.history.db_path}）")
+        if self.record:
+            terminalreporter.write_line(f"⏱️ 已记录 {len(self.rows)} 个用例的耗时 -> {self.history.db_path}")
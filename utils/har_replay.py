@@ -0,0 +1,143 @@
+"""
+HAR录制/回放
+只读的首页、Dashboard测试主要断言渲染内容，不修改数据。录制模式下把本地栈的真实响应按测试模块保存为HAR，
+回放模式下通过 context.route_from_har 直接返回录制的响应：不等待后端，延迟稳定。
+
+- 录制：每个BrowserContext写一个HAR（context关闭时由Playwright落盘）到 har/.recording/<模块>/，
+  会话结束时控制进程把同一模块的录制合并为 har/<模块>.har（同一请求保留最后一次的响应）
+- 回放：命中的请求直接返回录制的响应；未命中的请求默认放行到真实后端（HAR_NOT_FOUND=abort 则直接拦截）
+- 认证相关路径（/Account/、/connect/ 等）始终走真实后端，会话cookie不会被录制内容覆盖
+
+环境变量：
+    HAR_MODE=off|record|replay   默认off
+    HAR_NOT_FOUND=fallback|abort 回放时未录制请求的处理方式，默认fallback
+"""
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from playwright.sync_api import BrowserContext
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HAR_DIR = Path(__file__).parent.parent / "tests" / "aevatar_station" / "har"
+RECORDING_DIR_NAME = ".recording"
+
+# 只录制/回放本地栈的请求，认证流程除外
+FIRST_PARTY_URL = re.compile(
+    r"^https?://(localhost|127\.0\.0\.1)(:\d+)?/(?!Account/|connect/|signin-oidc|signout-callback-oidc)"
+)
+
+MODES = ("off", "record", "replay")
+
+
+def get_har_mode() -> str:
+    mode = os.environ.get("HAR_MODE", "off").lower()
+    if mode not in MODES:
+        raise ValueError(f"未知的HAR_MODE: {mode}（可选: {', '.join(MODES)}）")
+    return mode
+
+
+def module_har_path(module: str, har_dir: Path = HAR_DIR) -> Path:
+    return Path(har_dir) / f"{module}.har"
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("_")[:150]
+
+
+def apply_har(context: BrowserContext, module: str, name: str, mode: str = None,
+              har_dir: Path = HAR_DIR) -> Optional[Path]:
+    """
+    在context上启用HAR录制或回放（需在第一次导航之前调用）
+
+    Args:
+        context: 浏览器上下文
+        module: 测试模块名（决定HAR文件）
+        name: 录制文件名（测试名或类名），同一模块下的多个context各写一个文件
+        mode: off/record/replay，默认 get_har_mode()
+
+    Returns:
+        使用的HAR路径；未启用或回放文件不存在时返回None
+    """
+    mode = mode or get_har_mode()
+    if mode == "off":
+        return None
+
+    if mode == "record":
+        path = Path(har_dir) / RECORDING_DIR_NAME / module / f"{_safe_name(name)}.har"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        context.route_from_har(
+            str(path), url=FIRST_PARTY_URL, update=True, update_content="embed", update_mode="full"
+        )
+        logger.debug(f"HAR录制: {path}")
+        return path
+
+    path = module_har_path(module, har_dir)
+    if not path.exists():
+        logger.warning(f"⚠️ 未找到HAR录制文件，{module} 使用真实后端: {path}")
+        return None
+    not_found = os.environ.get("HAR_NOT_FOUND", "fallback").lower()
+    context.route_from_har(str(path), url=FIRST_PARTY_URL, not_found=not_found)
+    logger.debug(f"HAR回放: {path} (not_found={not_found})")
+    return path
+
+
+def entry_key(entry: Dict) -> tuple:
+    """请求的匹配键：方法 + URL + 请求体"""
+    request = entry["request"]
+    post_data = (request.get("postData") or {}).get("text", "")
+    return request["method"], request["url"], post_data
+
+
+def load_entries(path: Path) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["log"]["entries"]
+
+
+def merge_recordings(har_dir: Path = HAR_DIR) -> Dict[str, int]:
+    """
+    把 .recording/<模块>/ 下的录制合并为 <模块>.har，并清理录制目录
+
+    Returns:
+        {模块名: 合并后的请求数}
+    """
+    recording_root = Path(har_dir) / RECORDING_DIR_NAME
+    if not recording_root.exists():
+        return {}
+
+    merged: Dict[str, int] = {}
+    for module_dir in sorted(p for p in recording_root.iterdir() if p.is_dir()):
+        files = sorted(module_dir.glob("*.har"), key=lambda p: p.stat().st_mtime)
+        if not files:
+            continue
+        base = None
+        entries: Dict[tuple, Dict] = {}
+        for file in files:
+            try:
+                with open(file, "r", encoding="utf-8") as f:
+                    har = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"跳过无法解析的HAR: {file} ({e})")
+                continue
+            base = base or har
+            for entry in har["log"]["entries"]:
+                entries[entry_key(entry)] = entry
+
+        if base is None:
+            continue
+        base["log"]["entries"] = sorted(entries.values(), key=lambda e: e.get("startedDateTime", ""))
+        base["log"].pop("pages", None)
+        target = module_har_path(module_dir.name, har_dir)
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump(base, f, ensure_ascii=False, indent=1)
+        merged[module_dir.name] = len(entries)
+        logger.info(f"HAR已合并: {target}（{len(files)} 个录制, {len(entries)} 个请求）")
+
+    shutil.rmtree(recording_root, ignore_errors=True)
+    return merged
@@ -0,0 +1,236 @@
+"""
+HTTP登录引擎
+直接向ABP认证服务提交 /Account/Login 表单获取认证cookie，再注入到Playwright BrowserContext，
+让需要"已登录"前置条件的测试不必渲染和填写登录表单
+"""
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+import urllib3
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 禁用SSL警告（本地后端使用自签名证书）
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# ABP认证服务地址（与scripts/下账号池脚本一致）
+DEFAULT_AUTH_URL = "https://localhost:44320"
+
+TOKEN_PATTERN = re.compile(r'<input name="__RequestVerificationToken" type="hidden" value="([^"]+)"')
+
+# 登录失败页面中的错误关键词
+LOGIN_ERROR_KEYWORDS = [
+    "Invalid login attempt",
+    "invalid",
+    "incorrect",
+    "locked out",
+    "locked",
+    "锁定",
+    "错误",
+    "失败",
+]
+
+
+class LoginTransportError(Exception):
+    """认证服务不可用（超时、连接失败、5xx、登录页没有令牌），与账号被拒绝登录区分"""
+
+
+def get_auth_url() -> str:
+    """获取认证服务地址（环境变量 AEVATAR_AUTH_URL 优先）"""
+    return os.environ.get("AEVATAR_AUTH_URL", DEFAULT_AUTH_URL).rstrip("/")
+
+
+def create_session() -> requests.Session:
+    """创建忽略证书校验的requests会话"""
+    session = requests.Session()
+    session.verify = False
+    return session
+
+
+def fetch_antiforgery_token(session: requests.Session, page_url: str, timeout: int = 5) -> Optional[str]:
+    """
+    访问表单页面并提取 __RequestVerificationToken（ABP防伪令牌）
+
+    Args:
+        session: requests会话（防伪cookie会保存在其中）
+        page_url: 表单页面URL
+        timeout: 超时时间(秒)
+
+    Returns:
+        Optional[str]: 令牌，页面中没有令牌时返回None
+    """
+    resp = session.get(page_url, timeout=timeout)
+    token_match = TOKEN_PATTERN.search(resp.text)
+    return token_match.group(1) if token_match else None
+
+
+def submit_login(
+    session: requests.Session,
+    username: str,
+    password: str,
+    token: str,
+    login_url: str,
+    timeout: int = 10,
+) -> Tuple[bool, str, requests.Response]:
+    """
+    提交登录表单
+
+    Returns:
+        tuple: (can_login: bool, error_message: str, response)
+    """
+    login_data = {
+        "LoginInput.UserNameOrEmailAddress": username,
+        "LoginInput.Password": password,
+        "__RequestVerificationToken": token,
+        "LoginInput.RememberMe": "false",
+    }
+    headers = {
+        "Content-Type": "application/x-www-form-urlencoded",
+        "Referer": login_url,
+    }
+
+    resp = session.post(login_url, data=login_data, headers=headers, allow_redirects=False, timeout=timeout)
+
+    # 登录成功：302重定向到非登录页
+    if resp.status_code == 302:
+        redirect_url = resp.headers.get("Location", "")
+        if "/Account/Login" not in redirect_url:
+            return True, "", resp
+
+    # 登录失败：返回200并显示错误消息
+    if resp.status_code == 200:
+        response_lower = resp.text.lower()
+        for keyword in LOGIN_ERROR_KEYWORDS:
+            if keyword.lower() in response_lower:
+                return False, f"登录失败（检测到关键词: {keyword}）", resp
+
+    return False, f"登录状态不明确（HTTP {resp.status_code}）", resp
+
+
+def http_login(
+    username: str,
+    password: str,
+    auth_url: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+    raise_transport_errors: bool = False,
+) -> Tuple[bool, str, requests.Session]:
+    """
+    通过HTTP完成一次完整登录（获取令牌 + 提交表单）
+
+    Args:
+        username: 用户名或邮箱
+        password: 密码
+        auth_url: 认证服务地址，默认 get_auth_url()
+        session: 复用的requests会话，默认新建
+        raise_transport_errors: 认证服务不可用或登录结果不明确时抛出 LoginTransportError，而不是返回登录失败
+            （调用方需要区分"账号被拒绝"和"服务暂时不可用"时使用，如账号池健康检查）
+
+    Returns:
+        tuple: (can_login: bool, error_message: str, session)，成功时session中保存了认证cookie
+    """
+    login_url = f"{(auth_url or get_auth_url()).rstrip('/')}/Account/Login"
+    session = session or create_session()
+
+    def transport_error(message: str):
+        if raise_transport_errors:
+            session.close()
+            raise LoginTransportError(message)
+        return False, message, session
+
+    try:
+        token = fetch_antiforgery_token(session, login_url)
+        if not token:
+            return transport_error("无法获取登录Token")
+
+        can_login, error_msg, resp = submit_login(session, username, password, token, login_url)
+        # 只有200页面中检测到错误关键词才算账号被拒绝；
+        # 其他结果（400/429/5xx、302回登录页等"登录状态不明确"）无法判断账号状态，按服务不可用处理
+        if not can_login and not error_msg.startswith("登录失败"):
+            return transport_error(error_msg)
+        return can_login, error_msg, session
+
+    except LoginTransportError:
+        raise
+    except requests.exceptions.Timeout:
+        return transport_error("请求超时")
+    except requests.exceptions.RequestException as e:
+        return transport_error(f"异常: {str(e)}")
+    except Exception as e:
+        return False, f"异常: {str(e)}", session
+
+
+def session_cookies_for_playwright(session: requests.Session, auth_url: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    将requests会话中的cookie转换为 BrowserContext.add_cookies 可接受的格式
+
+    没有显式Domain属性的cookie（host-only）使用url形式注入，避免cookiejar给
+    无点号主机名（localhost）追加的 ".local" 后缀导致cookie不匹配
+    """
+    auth_url = (auth_url or get_auth_url()).rstrip("/")
+    parsed = urlparse(auth_url)
+
+    cookies = []
+    for cookie in session.cookies:
+        rest = {k.lower(): v for k, v in getattr(cookie, "_rest", {}).items()}
+        pw_cookie: Dict[str, Any] = {
+            "name": cookie.name,
+            "value": cookie.value or "",
+            "expires": float(cookie.expires) if cookie.expires else -1,
+            "httpOnly": "httponly" in rest,
+            "secure": bool(cookie.secure),
+        }
+
+        same_site = (rest.get("samesite") or "").capitalize()
+        if same_site in ("Lax", "Strict", "None"):
+            pw_cookie["sameSite"] = same_site
+            if same_site == "None":
+                pw_cookie["secure"] = True
+
+        if cookie.domain_specified:
+            pw_cookie["domain"] = cookie.domain
+            pw_cookie["path"] = cookie.path or "/"
+        else:
+            pw_cookie["url"] = f"{parsed.scheme}://{parsed.netloc}{cookie.path or '/'}"
+
+        cookies.append(pw_cookie)
+
+    return cookies
+
+
+def login_context_via_http(context, username: str, password: str, auth_url: Optional[str] = None) -> Tuple[bool, str]:
+    """
+    HTTP登录并把认证cookie注入到BrowserContext（应在第一次导航之前调用）
+
+    Args:
+        context: Playwright BrowserContext
+        username: 用户名或邮箱
+        password: 密码
+        auth_url: 认证服务地址
+
+    Returns:
+        tuple: (success: bool, error_message: str)
+    """
+    can_login, error_msg, session = http_login(username, password, auth_url=auth_url)
+    try:
+        if not can_login:
+            return False, error_msg
+
+        cookies = session_cookies_for_playwright(session, auth_url)
+        if not cookies:
+            return False, "登录响应中没有cookie"
+
+        context.add_cookies(cookies)
+        logger.info(f"HTTP登录成功，已注入 {len(cookies)} 个cookie: {username}")
+        return True, ""
+    finally:
+        session.close()
+
+
+def is_http_login_enabled() -> bool:
+    """是否启用HTTP登录引擎（环境变量 LOGIN_ENGINE=http/ui，默认http）"""
+    return os.environ.get("LOGIN_ENGINE", "http").lower() == "http"
@@ -0,0 +1,115 @@
+"""
+HTTP注册
+直接向ABP认证服务提交 /Account/Register 表单创建账号（账号已存在视为成功），
+供账号池扩容脚本、账号池健康检查和异步HTTP客户端（utils/async_http.py）共用
+"""
+import re
+from typing import Optional, Tuple
+
+import requests
+
+from utils.http_login import TOKEN_PATTERN, create_session, get_auth_url
+
+# 注册失败页面中的错误关键词（包含 already/exist/已 的视为账号已存在）
+REGISTER_ERROR_KEYWORDS = [
+    "already registered",
+    "already exists",
+    "User name",
+    "Email",
+    "is already taken",
+    "已注册",
+    "已存在",
+]
+
+ERROR_MESSAGE_PATTERN = re.compile(r'<div[^>]*class="[^"]*text-danger[^"]*"[^>]*>([^<]+)</div>')
+
+
+def get_register_url() -> str:
+    """注册页面地址（认证服务地址见 utils.http_login.get_auth_url）"""
+    return f"{get_auth_url()}/Account/Register"
+
+
+def submit_registration(
+    session: requests.Session,
+    username: str,
+    email: str,
+    password: str,
+    antiforgery_token: Optional[str],
+    register_url: Optional[str] = None,
+) -> Tuple[bool, str, int]:
+    """
+    提交注册表单（session中需已有与antiforgery_token配对的防伪cookie）
+
+    Returns:
+        tuple: (success: bool, message: str, status_code: int)，账号已存在也视为成功
+    """
+    register_url = register_url or get_register_url()
+    register_data = {
+        "Input.UserName": username,
+        "Input.EmailAddress": email,
+        "Input.Password": password,
+    }
+    if antiforgery_token:
+        register_data["__RequestVerificationToken"] = antiforgery_token
+
+    headers = {
+        "Content-Type": "application/x-www-form-urlencoded",
+        "Referer": register_url,
+    }
+
+    response = session.post(register_url, data=register_data, headers=headers, timeout=10, allow_redirects=False)
+
+    # 注册成功：302重定向到非注册页
+    if response.status_code == 302:
+        redirect_url = response.headers.get("Location", "")
+        if "/Account/Register" not in redirect_url:
+            return True, "注册成功", response.status_code
+
+    # 注册失败：返回200并显示错误消息
+    if response.status_code == 200:
+        response_lower = response.text.lower()
+        for keyword in REGISTER_ERROR_KEYWORDS:
+            if keyword.lower() in response_lower:
+                # 账号已存在也算成功
+                if "already" in keyword.lower() or "exist" in keyword.lower() or "已" in keyword:
+                    return True, "账号已存在（跳过）", response.status_code
+
+                error_match = ERROR_MESSAGE_PATTERN.search(response.text)
+                if error_match:
+                    return False, f"注册失败: {error_match.group(1).strip()}", response.status_code
+
+                return False, f"注册失败（检测到关键词: {keyword}）", response.status_code
+
+    return False, f"注册状态不明确（HTTP {response.status_code}）", response.status_code
+
+
+def register_account_api(username: str, email: str, password: str,
+                         register_url: Optional[str] = None) -> Tuple[bool, str]:
+    """
+    通过注册表单创建单个账号（获取防伪令牌 + 提交表单）
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    register_url = register_url or get_register_url()
+    session = create_session()
+    try:
+        try:
+            response = session.get(register_url, timeout=10)
+            response.raise_for_status()
+        except Exception as e:
+            return False, f"无法访问注册页面: {str(e)}"
+
+        token_match = TOKEN_PATTERN.search(response.text)
+        antiforgery_token = token_match.group(1) if token_match else None
+
+        success, message, _ = submit_registration(session, username, email, password, antiforgery_token,
+                                                  register_url=register_url)
+        return success, message
+
+    except requests.exceptions.Timeout:
+        return False, "请求超时"
+    except Exception as e:
+        return False, f"异常: {str(e)}"
+    finally:
+        session.close()
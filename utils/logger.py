@@ -1,75 +1,236 @@
+"""
+日志
+所有logger共用一个进程级的 QueueHandler：测试线程只把日志记录放入队列，
+控制台输出和文件写入由后台 QueueListener 线程完成，大量场景日志不再占用测试时间。
+
+- 文件：logs/test_YYYYMMDD.log；xdist worker写各自的 logs/test_YYYYMMDD.gw0.log，
+  worker在自己的 pytest_sessionfinish 中写完队列（flush_logs），
+  控制进程在所有worker退出后（pytest_unconfigure）按时间合并回主日志文件（merge_worker_logs）
+- 轮转：单个文件超过 LOG_MAX_BYTES（默认50MB）后轮转，保留 LOG_BACKUP_COUNT（默认5）个
+"""
+import atexit
+import heapq
 import logging
+import logging.handlers
 import os
+import queue
+import re
+import threading
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+LOG_DIR = Path("logs")
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_RECORD_START = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+
+_queue_handler: Optional[logging.Handler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_backend_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _daily_log_file(worker: Optional[str] = None) -> Path:
+    suffix = f".{worker}" if worker else ""
+    return LOG_DIR / f"test_{datetime.now().strftime('%Y%m%d')}{suffix}.log"
+
+
+def _ensure_backend() -> logging.Handler:
+    """创建进程级的队列处理器和后台写入线程（只创建一次）"""
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        return _queue_handler
+    with _backend_lock:
+        if _queue_handler is not None:
+            return _queue_handler
+
+        LOG_DIR.mkdir(exist_ok=True)
+        worker = os.environ.get("PYTEST_XDIST_WORKER")
+        formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+        # worker日志合并后仍能区分来源
+        file_formatter = logging.Formatter(
+            LOG_FORMAT.replace('%(name)s', f'[{worker}] %(name)s') if worker else LOG_FORMAT,
+            datefmt=DATE_FORMAT
+        )
+
+        # 控制台处理器
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
+
+        # 文件处理器（按大小轮转）
+        file_handler = logging.handlers.RotatingFileHandler(
+            _daily_log_file(worker),
+            maxBytes=_env_int("LOG_MAX_BYTES", 50 * 1024 * 1024),
+            backupCount=_env_int("LOG_BACKUP_COUNT", 5),
+            encoding='utf-8',
+        )
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(file_formatter)
+
+        log_queue: "queue.Queue" = queue.Queue(-1)
+        _listener = logging.handlers.QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(_stop_backend)
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+        return _queue_handler
+
+
+class _DirectQueue:
+    """后台线程停止后代替日志队列：记录直接交给处理器同步写入"""
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+
+    def put_nowait(self, record: logging.LogRecord):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def flush_logs():
+    """
+    停止后台写入线程并写完队列中剩余的日志，之后的日志同步写入（可重复调用）
+
+    xdist worker在会话结束时调用，保证控制进程合并时worker日志已完整落盘
+    """
+    global _listener
+    with _backend_lock:
+        if _listener is None:
+            return
+        listener, _listener = _listener, None
+        listener.stop()
+        for handler in listener.handlers:
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                # 控制台流可能已被关闭（如pytest结束捕获后），文件日志不受影响
+                pass
+        _queue_handler.queue = _DirectQueue(listener.handlers)
+
+
+def _stop_backend():
+    """进程退出前写完队列中剩余的日志"""
+    handlers = _listener.handlers if _listener is not None else ()
+    if _queue_handler is not None and isinstance(_queue_handler.queue, _DirectQueue):
+        handlers = _queue_handler.queue.handlers
+    flush_logs()
+    for handler in handlers:
+        try:
+            handler.close()
+        except (OSError, ValueError):
+            pass
+
 
 def get_logger(name: str = __name__) -> logging.Logger:
     """
     获取日志记录器
-    
+
     Args:
         name: 日志记录器名称
-        
+
     Returns:
         logging.Logger: 配置好的日志记录器
     """
-    # 创建日志目录
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
     # 创建日志记录器
     logger = logging.getLogger(name)
-    
+
     # 避免重复添加处理器
     if logger.handlers:
         return logger
-    
+
     logger.setLevel(logging.INFO)
-    
-    # 创建格式化器
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # 控制台处理器
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # 文件处理器
-    log_file = log_dir / f"test_{datetime.now().strftime('%Y%m%d')}.log"
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
+    logger.addHandler(_ensure_backend())
+
     return logger
 
+
+def _read_records(path: Path) -> Iterator[Tuple[str, str]]:
+    """按日志记录读取（异常堆栈等续行归入上一条），返回 (时间戳, 完整记录)"""
+    current: List[str] = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if _RECORD_START.match(line) and current:
+                yield current[0][:19], "".join(current)
+                current = []
+            current.append(line)
+    if current:
+        yield current[0][:19], "".join(current)
+
+
+def _worker_files(base: Path) -> List[List[Path]]:
+    """同一天各worker的日志文件，每个worker按写入顺序排列（轮转备份 .N 最旧）"""
+    groups = []
+    for current in sorted(base.parent.glob(f"{base.stem}.gw*.log")):
+        backups = sorted(
+            base.parent.glob(f"{current.name}.*"),
+            key=lambda p: int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0,
+            reverse=True,
+        )
+        groups.append(backups + [current])
+    return groups
+
+
+def merge_worker_logs(log_dir: Path = None) -> int:
+    """
+    把当天各xdist worker的日志按时间合并追加到主日志文件，并删除worker日志
+
+    Returns:
+        int: 合并的记录数
+    """
+    base = _daily_log_file() if log_dir is None else Path(log_dir) / _daily_log_file().name
+    groups = _worker_files(base)
+    if not groups:
+        return 0
+
+    def records(files):
+        for path in files:
+            yield from _read_records(path)
+
+    count = 0
+    with open(base, "a", encoding="utf-8") as out:
+        for _, record in heapq.merge(*(records(files) for files in groups), key=lambda r: r[0]):
+            out.write(record)
+            count += 1
+    for files in groups:
+        for path in files:
+            path.unlink(missing_ok=True)
+    return count
+
+
 class TestLogger:
-    """测试日志类"""
-    
+    """测试日志类（消息按需格式化：日志级别未启用时不拼接字符串）"""
+
     def __init__(self, test_name: str):
         self.logger = get_logger(test_name)
         self.test_name = test_name
-    
+
     def info(self, message: str):
         """记录信息日志"""
-        self.logger.info(f"[{self.test_name}] {message}")
-    
+        self.logger.info("[%s] %s", self.test_name, message)
+
     def error(self, message: str):
         """记录错误日志"""
-        self.logger.error(f"[{self.test_name}] {message}")
-    
+        self.logger.error("[%s] %s", self.test_name, message)
+
     def warning(self, message: str):
         """记录警告日志"""
-        self.logger.warning(f"[{self.test_name}] {message}")
-    
+        self.logger.warning("[%s] %s", self.test_name, message)
+
     def debug(self, message: str):
         """记录调试日志"""
-        self.logger.debug(f"[{self.test_name}] {message}")
-    
+        self.logger.debug("[%s] %s", self.test_name, message)
+
     def step(self, step_name: str):
         """记录测试步骤"""
-        self.logger.info(f"[{self.test_name}] 执行步骤: {step_name}") 
\ No newline at end of file
+        self.logger.info("[%s] 执行步骤: %s", self.test_name, step_name)
@@ -0,0 +1,140 @@
+"""
+网络请求裁剪（network profile）
+功能测试大多不关心字体、图片、分析脚本以及GitHub/社交平台的外部嵌入，但每次导航都要下载这些资源。
+在BrowserContext上用 context.route 按资源类型和域名拦截：
+- block: 直接 abort（分析脚本、外部嵌入、音视频）
+- stub:  返回占位响应（字体返回空内容回退到系统字体；图片返回1x1透明PNG，保留<img>元素和CSS尺寸）
+页面本身的导航（document）始终放行，外链在新标签页打开的测试不受影响
+
+内置配置：
+    full   不拦截任何请求（检查资源本身的测试使用）
+    lean   拦截字体/图片/音视频 + 第三方分析和嵌入（默认）
+    third-party  只拦截第三方分析和嵌入，站点自身资源照常加载
+"""
+import base64
+import os
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from playwright.sync_api import BrowserContext, Route
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_PROFILE = "lean"
+
+# 第三方分析/监控/社交嵌入域名（匹配域名本身及其子域名）
+THIRD_PARTY_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "segment.io",
+    "segment.com",
+    "hotjar.com",
+    "mixpanel.com",
+    "clarity.ms",
+    "sentry.io",
+    "intercom.io",
+    "fonts.googleapis.com",
+    "fonts.gstatic.com",
+    "github.com",
+    "githubusercontent.com",
+    "githubassets.com",
+    "twitter.com",
+    "x.com",
+    "twimg.com",
+    "discord.com",
+    "discordapp.com",
+    "youtube.com",
+    "ytimg.com",
+    "linkedin.com",
+    "facebook.net",
+)
+
+PROFILES: Dict[str, Dict[str, Iterable[str]]] = {
+    "full": {"block_types": (), "stub_types": (), "block_domains": ()},
+    "lean": {
+        "block_types": ("media",),
+        "stub_types": ("font", "image"),
+        "block_domains": THIRD_PARTY_DOMAINS,
+    },
+    "third-party": {"block_types": (), "stub_types": (), "block_domains": THIRD_PARTY_DOMAINS},
+}
+
+# 1x1 透明PNG
+_PIXEL_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+
+def get_default_profile() -> str:
+    """默认配置：环境变量 NETWORK_PROFILE，否则 lean"""
+    return os.environ.get("NETWORK_PROFILE", DEFAULT_PROFILE).lower()
+
+
+def _matches_domain(host: str, domains: Iterable[str]) -> bool:
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+class NetworkProfile:
+    """按配置拦截资源，并统计拦截数量"""
+
+    def __init__(self, name: str = None, block_types: Iterable[str] = None, stub_types: Iterable[str] = None,
+                 block_domains: Iterable[str] = None):
+        """
+        初始化拦截配置
+
+        Args:
+            name: 内置配置名（full/lean/third-party），默认 get_default_profile()
+            block_types/stub_types/block_domains: 覆盖内置配置中的对应项
+        """
+        self.name = (name or get_default_profile()).lower()
+        if self.name not in PROFILES:
+            raise ValueError(f"未知的网络配置: {self.name}（可选: {', '.join(PROFILES)}）")
+        base = PROFILES[self.name]
+        self.block_types = frozenset(base["block_types"] if block_types is None else block_types)
+        self.stub_types = frozenset(base["stub_types"] if stub_types is None else stub_types)
+        self.block_domains = tuple(base["block_domains"] if block_domains is None else block_domains)
+        self.blocked = 0
+        self.stubbed = 0
+
+    @property
+    def is_passthrough(self) -> bool:
+        return not (self.block_types or self.stub_types or self.block_domains)
+
+    def apply(self, context: BrowserContext) -> Optional["NetworkProfile"]:
+        """
+        在context上安装拦截规则（需在第一次导航之前调用）
+
+        Returns:
+            自身；full 配置不安装路由，返回None
+        """
+        if self.is_passthrough:
+            return None
+        context.route("**/*", self._handle)
+        logger.debug(f"已启用网络配置: {self.name}")
+        return self
+
+    def _handle(self, route: Route):
+        request = route.request
+        resource_type = request.resource_type
+        if resource_type == "document":
+            route.continue_()
+            return
+
+        host = urlparse(request.url).hostname or ""
+        if resource_type in self.block_types or (self.block_domains and _matches_domain(host, self.block_domains)):
+            self.blocked += 1
+            route.abort("blockedbyclient")
+        elif resource_type in self.stub_types:
+            self.stubbed += 1
+            if resource_type == "image":
+                route.fulfill(status=200, content_type="image/png", body=_PIXEL_PNG)
+            else:
+                route.fulfill(status=200, body=b"")
+        else:
+            route.continue_()
+
+    def summary(self) -> str:
+        return f"网络配置 {self.name}: 拦截 {self.blocked} 个请求, 占位 {self.stubbed} 个请求"
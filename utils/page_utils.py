@@ -2,7 +2,6 @@ from playwright.sync_api import Page, Locator, expect
 from typing import Optional, List, Dict, Any
 import time
 import json
-import allure
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -142,6 +141,7 @@ class PageUtils:
     def take_screenshot(self, file_path: str = None, full_page: bool = True, attach_to_allure: bool = True, step_name: str = "截图"):
         """
         截取屏幕截图并自动附加到Allure报告
+        编码、去重和写盘由后台截图流水线完成（见 utils/screenshot_pipeline.py），文件扩展名按 SCREENSHOT_FORMAT 替换
         
         Args:
             file_path: 截图保存路径（可选，如果只想附加到Allure可以不提供）
@@ -150,25 +150,15 @@ class PageUtils:
             step_name: 步骤名称，用于Allure报告
         """
         try:
-            # 截取截图（以字节形式）
-            screenshot_bytes = self.page.screenshot(full_page=full_page)
+            from utils.screenshot_pipeline import get_screenshot_pipeline
             
-            # 如果提供了文件路径，保存到文件
-            if file_path:
-                with open(file_path, 'wb') as f:
-                    f.write(screenshot_bytes)
-                logger.info(f"截图已保存: {file_path}")
-            
-            # 附加到Allure报告
-            if attach_to_allure:
-                allure.attach(
-                    screenshot_bytes,
-                    name=step_name,
-                    attachment_type=allure.attachment_type.PNG
-                )
-                logger.info(f"截图已附加到Allure报告: {step_name}")
-                
-            return screenshot_bytes
+            return get_screenshot_pipeline().capture(
+                self.page,
+                name=step_name,
+                file_path=file_path,
+                full_page=full_page,
+                attach_to_allure=attach_to_allure
+            )
         except Exception as e:
             logger.error(f"截图失败: {e}")
             return None
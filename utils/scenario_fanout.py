@@ -0,0 +1,185 @@
+"""
+同一测试内的场景并行（多个BrowserContext分片执行）
+必须留在一个测试里的场景循环（如用户名格式校验、密码边界值）交给一小组context并发执行，
+结果在测试线程中按场景写入Allure步骤，墙钟时间约按并行数缩短。
+
+Playwright同步API只能在创建它的线程使用，因此场景在独立线程中用异步API执行：
+该线程启动一个参数相同的浏览器，创建 SCENARIO_FANOUT（默认3）个context，从共享队列领取场景。
+需要登录态的场景传入测试页面的 storage_state，每个context以同一登录态启动。
+
+    fanout = ScenarioFanout("chromium", launch_args, context_args)     # 或使用 scenario_fanout fixture
+    results = fanout.run(cases, check_case, name=lambda c: c["test_id"],
+                         storage_state=page.context.storage_state())
+    report_scenarios(results)
+
+场景函数为 async def check_case(page, scenario)：断言失败抛出AssertionError，返回值（可选）作为结果说明。
+场景之间不能有状态依赖（如依次修改同一账号的密码），这类场景仍应在测试页面上顺序执行。
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import allure
+
+from utils.logger import get_logger
+from utils.screenshot_pipeline import get_artifact_mode
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ScenarioResult:
+    """单个场景的执行结果"""
+    name: str
+    passed: bool
+    message: str = ""
+    duration: float = 0.0
+    screenshot: Optional[bytes] = None
+
+
+def get_fanout_size() -> int:
+    """并行的context数（SCENARIO_FANOUT，默认3，最小1）"""
+    try:
+        return max(1, int(os.environ.get("SCENARIO_FANOUT", "3")))
+    except ValueError:
+        return 3
+
+
+class ScenarioFanout:
+    """在独立线程的异步浏览器中，用多个context并发执行一组互不依赖的场景"""
+
+    def __init__(self, browser_name: str = "chromium", launch_args: Optional[Dict[str, Any]] = None,
+                 context_args: Optional[Dict[str, Any]] = None, size: int = None, scenario_timeout: float = 60):
+        """
+        Args:
+            browser_name: chromium / firefox / webkit
+            launch_args: 浏览器启动参数（通常来自 browser_type_launch_args fixture）
+            context_args: context参数（通常来自 browser_context_args fixture）
+            size: 并行的context数，默认读取 SCENARIO_FANOUT
+            scenario_timeout: 单个场景的超时(秒)
+        """
+        self.browser_name = browser_name
+        self.launch_args = dict(launch_args or {})
+        self.context_args = dict(context_args or {})
+        self.size = size or get_fanout_size()
+        self.scenario_timeout = scenario_timeout
+        self.screenshot_on_pass = get_artifact_mode() == "always"
+
+    def run(self, scenarios: Sequence[Any], func: Callable[[Any, Any], Awaitable[Optional[str]]],
+            name: Callable[[Any], str] = str, storage_state: Optional[Dict[str, Any]] = None) -> List[ScenarioResult]:
+        """
+        并发执行场景，阻塞直到全部完成
+
+        Args:
+            scenarios: 场景数据
+            func: async def func(page, scenario) -> Optional[str]
+            name: 场景名称（用于日志和Allure步骤）
+            storage_state: 每个context的初始登录态（page.context.storage_state()），为None时为匿名context
+
+        Returns:
+            List[ScenarioResult]: 与 scenarios 顺序一致的结果
+        """
+        scenarios = list(scenarios)
+        if not scenarios:
+            return []
+        size = min(self.size, len(scenarios))
+        logger.info(f"场景并行: {len(scenarios)} 个场景, {size} 个context")
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="scenario-fanout") as executor:
+            results = executor.submit(asyncio.run, self._run_all(scenarios, func, name, storage_state, size)).result()
+        failed = sum(1 for r in results if not r.passed)
+        serial = sum(r.duration for r in results)
+        logger.info(f"场景并行完成: 失败 {failed}/{len(results)}, 耗时 {time.monotonic() - started:.1f}s"
+                    f"（顺序执行约 {serial:.1f}s）")
+        return results
+
+    async def _run_all(self, scenarios, func, name, storage_state, size) -> List[ScenarioResult]:
+        from playwright.async_api import async_playwright
+
+        results: List[Optional[ScenarioResult]] = [None] * len(scenarios)
+        pending: "asyncio.Queue[int]" = asyncio.Queue()
+        for index in range(len(scenarios)):
+            pending.put_nowait(index)
+
+        async with async_playwright() as playwright:
+            browser = await getattr(playwright, self.browser_name).launch(**self.launch_args)
+            try:
+                await asyncio.gather(*(
+                    self._worker(browser, pending, scenarios, func, name, storage_state, results)
+                    for _ in range(size)
+                ))
+            finally:
+                await browser.close()
+        return results
+
+    async def _worker(self, browser, pending, scenarios, func, name, storage_state, results):
+        context_args = dict(self.context_args)
+        if storage_state is not None:
+            context_args["storage_state"] = storage_state
+        context = await browser.new_context(**context_args)
+        page = await context.new_page()
+        try:
+            while True:
+                try:
+                    index = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                if page.is_closed():
+                    page = await context.new_page()
+                results[index] = await self._run_one(page, scenarios[index], func, name(scenarios[index]))
+        finally:
+            await context.close()
+
+    async def _run_one(self, page, scenario, func, scenario_name: str) -> ScenarioResult:
+        started = time.monotonic()
+        try:
+            message = await asyncio.wait_for(func(page, scenario), self.scenario_timeout)
+            result = ScenarioResult(scenario_name, True, message or "")
+        except AssertionError as e:
+            result = ScenarioResult(scenario_name, False, str(e) or "断言失败")
+        except asyncio.TimeoutError:
+            result = ScenarioResult(scenario_name, False, f"场景超时（{self.scenario_timeout}s）")
+        except Exception as e:
+            result = ScenarioResult(scenario_name, False, f"{type(e).__name__}: {e}")
+        result.duration = time.monotonic() - started
+
+        if (self.screenshot_on_pass or not result.passed) and not page.is_closed():
+            try:
+                result.screenshot = await page.screenshot(type="jpeg", quality=70)
+            except Exception as e:
+                logger.debug(f"场景截图失败: {scenario_name} ({e})")
+        log = logger.info if result.passed else logger.error
+        log(f"  {'✓' if result.passed else '✗'} {scenario_name} ({result.duration:.1f}s) {result.message}")
+        return result
+
+
+def report_scenarios(results: Sequence[ScenarioResult], raise_on_failure: bool = True) -> List[ScenarioResult]:
+    """
+    在测试线程中把每个场景写成一个Allure步骤（附截图，失败的步骤标记为失败）
+
+    Args:
+        results: ScenarioFanout.run 的结果
+        raise_on_failure: 存在失败场景时抛出AssertionError
+
+    Returns:
+        List[ScenarioResult]: 失败的场景
+    """
+    failures = []
+    for result in results:
+        try:
+            with allure.step(f"{result.name}（{result.duration:.1f}s）"):
+                if result.screenshot:
+                    allure.attach(result.screenshot, name=result.name, attachment_type=allure.attachment_type.JPG)
+                if result.message:
+                    allure.attach(result.message, name="结果", attachment_type=allure.attachment_type.TEXT)
+                if not result.passed:
+                    raise AssertionError(result.message)
+        except AssertionError:
+            failures.append(result)
+    if failures and raise_on_failure:
+        details = "\n".join(f"  - {r.name}: {r.message}" for r in failures)
+        raise AssertionError(f"{len(failures)}/{len(results)} 个场景失败:\n{details}")
+    return failures
@@ -0,0 +1,310 @@
+"""
+异步截图流水线
+测试线程只做 page.screenshot（Playwright同步API只能在测试线程调用）并在Allure中登记附件；
+编码（JPEG/WebP）、近似帧去重、写入磁盘和Allure附件文件都交给后台线程，测试不再等待图片I/O。
+
+- 格式：SCREENSHOT_FORMAT=jpeg（默认）/webp/png，SCREENSHOT_QUALITY 默认70
+  jpeg直接由浏览器编码；webp需要Pillow，未安装时回退为jpeg
+- 去重：同一测试内与上一帧的感知哈希（dHash，64位）汉明距离 ≤ SCREENSHOT_DEDUPE_DISTANCE（默认4）视为相同，
+  不再写截图目录，Allure附件硬链接到上一帧；未安装Pillow时只去除字节完全相同的帧
+- 预算：本进程写入的截图总量超过 SCREENSHOT_BUDGET_MB（默认200，0表示不限）后不再截图
+- 仅失败保留：ARTIFACT_MODE=on_failure 时截图只进入每个测试的内存环形缓冲（最近 ARTIFACT_BUFFER_SIZE 张，默认10），
+  测试失败时才写盘并附加到Allure（见根目录conftest的 failure_artifacts fixture），通过的测试没有任何截图I/O
+"""
+import atexit
+import hashlib
+import io
+import os
+import queue
+import shutil
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Optional, Tuple
+from uuid import uuid4
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow为可选依赖：无法转WebP，去重退化为字节完全相同
+    Image = None
+
+MIME_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+EXTENSIONS = {"png": "png", "jpeg": "jpg", "webp": "webp"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+def get_artifact_mode() -> str:
+    """always（默认）：每张截图立即保存；on_failure：只在测试失败时保存缓冲中的截图"""
+    mode = os.environ.get("ARTIFACT_MODE", "always").lower()
+    return mode if mode in ("always", "on_failure") else "always"
+
+
+def dhash(data: bytes) -> Optional[int]:
+    """差值哈希：灰度缩放到9x8，比较相邻像素，得到64位指纹（需要Pillow）"""
+    if Image is None:
+        return None
+    with Image.open(io.BytesIO(data)) as img:
+        pixels = list(img.convert("L").resize((9, 8)).getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value
+
+
+class _AllureSlot:
+    """
+    在测试线程中登记Allure附件、由后台线程写入附件内容
+    Allure按线程记录当前测试/步骤，登记必须在测试线程；附件文件只是结果目录下的普通文件，可以稍后写入
+    """
+
+    def __init__(self):
+        self._reporter = None
+        self._report_dir: Optional[Path] = None
+        self._resolved = False
+
+    def _resolve(self):
+        self._resolved = True
+        try:
+            from allure_commons import plugin_manager
+        except ImportError:
+            return
+        for plugin in plugin_manager.get_plugins():
+            reporter = getattr(plugin, "allure_logger", None)
+            if reporter is not None and hasattr(reporter, "_attach"):
+                self._reporter = reporter
+            report_dir = getattr(plugin, "_report_dir", None)
+            if report_dir:
+                self._report_dir = Path(report_dir)
+
+    def reserve(self, name: str, fmt: str) -> Optional[str]:
+        """登记附件，返回附件文件名；未启用allure时返回None"""
+        if not self._resolved:
+            self._resolve()
+        if self._reporter is None or self._report_dir is None:
+            return None
+        try:
+            return self._reporter._attach(uuid4(), name=name, attachment_type=MIME_TYPES[fmt], extension=EXTENSIONS[fmt])
+        except Exception as e:  # 不在测试上下文中（如会话级fixture）
+            logger.debug(f"登记Allure附件失败: {e}")
+            return None
+
+    def path(self, file_name: str) -> Path:
+        return self._report_dir / file_name
+
+
+class ScreenshotPipeline:
+    """进程级截图流水线（单个后台线程，队列有界，队列满时测试线程等待以限制内存）"""
+
+    def __init__(self, fmt: str = None, quality: int = None, dedupe_distance: int = None,
+                 budget_mb: int = None, max_pending: int = 32, mode: str = None, buffer_size: int = None):
+        fmt = (fmt or os.environ.get("SCREENSHOT_FORMAT", "jpeg")).lower()
+        if fmt == "jpg":
+            fmt = "jpeg"
+        if fmt not in MIME_TYPES:
+            raise ValueError(f"不支持的截图格式: {fmt}（可选: png/jpeg/webp）")
+        if fmt == "webp" and Image is None:
+            logger.warning("⚠️ 未安装Pillow，截图格式webp回退为jpeg")
+            fmt = "jpeg"
+        self.format = fmt
+        self.quality = quality if quality is not None else _env_int("SCREENSHOT_QUALITY", 70)
+        self.dedupe_distance = dedupe_distance if dedupe_distance is not None else _env_int("SCREENSHOT_DEDUPE_DISTANCE", 4)
+        budget_mb = budget_mb if budget_mb is not None else _env_int("SCREENSHOT_BUDGET_MB", 200)
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self.mode = mode or get_artifact_mode()
+        self.buffer_size = buffer_size if buffer_size is not None else _env_int("ARTIFACT_BUFFER_SIZE", 10)
+        # 测试 -> 最近的截图 (原始字节, 附件名, 保存路径)，只在 on_failure 模式使用
+        self._buffers: Dict[str, Deque[Tuple[bytes, str, Optional[str]]]] = {}
+        self.discarded = 0
+
+        self.bytes_written = 0
+        self.saved = 0
+        self.deduped = 0
+        self.skipped = 0
+        self._budget_warned = False
+        self._allure = _AllureSlot()
+        # 测试 -> (上一帧指纹, 上一帧Allure附件路径)
+        self._last_frame: Dict[str, Tuple[object, Optional[Path]]] = {}
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._worker = threading.Thread(target=self._run, name="screenshot-pipeline", daemon=True)
+        self._worker.start()
+
+    @property
+    def over_budget(self) -> bool:
+        return bool(self.budget_bytes) and self.bytes_written >= self.budget_bytes
+
+    def capture(self, page, name: str = "截图", file_path: str = None, full_page: bool = False,
+                attach_to_allure: bool = True) -> Optional[bytes]:
+        """
+        截图并异步保存/附加
+
+        Args:
+            page: Playwright页面对象
+            name: Allure附件名称
+            file_path: 保存路径（扩展名按配置格式替换），为None时只附加到Allure
+            full_page: 是否截取整个页面
+            attach_to_allure: 是否附加到Allure报告
+
+        Returns:
+            bytes: 浏览器返回的原始截图；超出存储预算或截图失败时返回None
+        """
+        if self.over_budget:
+            self.skipped += 1
+            if not self._budget_warned:
+                self._budget_warned = True
+                logger.warning(f"⚠️ 截图已达存储预算 {self.budget_bytes // 1024 // 1024}MB，后续截图跳过")
+            return None
+
+        # jpeg直接由浏览器编码；png/webp先取无损PNG，由后台线程转码
+        if self.format == "jpeg":
+            raw = page.screenshot(full_page=full_page, type="jpeg", quality=self.quality)
+        else:
+            raw = page.screenshot(full_page=full_page, type="png")
+
+        if file_path:
+            file_path = str(Path(file_path).with_suffix("." + EXTENSIONS[self.format]))
+        stream = os.environ.get("PYTEST_CURRENT_TEST", "").rsplit(" ", 1)[0]
+
+        if self.mode == "on_failure" and stream:
+            buffer = self._buffers.setdefault(stream, deque(maxlen=self.buffer_size))
+            buffer.append((raw, name if attach_to_allure else None, file_path))
+            return raw
+
+        slot = self._allure.reserve(name, self.format) if attach_to_allure else None
+        self._queue.put((raw, stream, file_path, slot, name))
+        return raw
+
+    def flush_buffer(self, stream: str, failed: bool) -> int:
+        """
+        测试结束时处理该测试的环形缓冲（需在测试线程调用，以便登记Allure附件）
+
+        Args:
+            stream: 测试nodeid
+            failed: 测试是否失败；未失败时直接丢弃缓冲
+
+        Returns:
+            int: 写出的截图数
+        """
+        buffer = self._buffers.pop(stream, None)
+        if not buffer:
+            return 0
+        if not failed:
+            self.discarded += len(buffer)
+            return 0
+        total = len(buffer)
+        for i, (raw, name, file_path) in enumerate(buffer, 1):
+            slot = self._allure.reserve(f"[失败前 {i}/{total}] {name}", self.format) if name else None
+            self._queue.put((raw, stream, file_path, slot, name or ""))
+        logger.info(f"测试失败，写出缓冲中的 {total} 张截图: {stream}")
+        return total
+
+    def drain(self, timeout: float = 30):
+        """等待队列中的截图全部写完"""
+        done = threading.Event()
+        self._queue.put(done)
+        if not done.wait(timeout):
+            logger.warning("⚠️ 等待截图写入超时")
+
+    def summary(self) -> str:
+        return (f"截图: 保存 {self.saved} 张, 去重 {self.deduped} 张, 超预算跳过 {self.skipped} 张, "
+                f"通过后丢弃 {self.discarded} 张, 共 {self.bytes_written / 1024 / 1024:.1f}MB ({self.format})")
+
+    # ==================== 后台线程 ====================
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            try:
+                self._process(*item)
+            except Exception as e:
+                logger.warning(f"截图写入失败: {e}")
+
+    def _fingerprint(self, raw: bytes):
+        if Image is not None:
+            return dhash(raw)
+        return hashlib.sha1(raw).digest()
+
+    def _is_duplicate(self, previous, current) -> bool:
+        if previous is None or current is None:
+            return False
+        if isinstance(current, int):
+            return bin(previous ^ current).count("1") <= self.dedupe_distance
+        return previous == current
+
+    def _encode(self, raw: bytes) -> bytes:
+        if self.format != "webp":
+            return raw
+        with Image.open(io.BytesIO(raw)) as img:
+            out = io.BytesIO()
+            img.convert("RGB").save(out, "WEBP", quality=self.quality, method=4)
+            return out.getvalue()
+
+    def _process(self, raw: bytes, stream: str, file_path: Optional[str], slot: Optional[str], name: str):
+        fingerprint = self._fingerprint(raw)
+        previous, previous_attachment = self._last_frame.get(stream, (None, None))
+
+        # 已登记的附件必须有文件：上一帧没有附件可链接时照常写入
+        if stream and self._is_duplicate(previous, fingerprint) and (not slot or previous_attachment):
+            self.deduped += 1
+            logger.debug(f"截图与上一帧近似，跳过保存: {name}")
+            if slot and previous_attachment:
+                target = self._allure.path(slot)
+                try:
+                    os.link(previous_attachment, target)
+                except OSError:
+                    shutil.copyfile(previous_attachment, target)
+            return
+
+        body = self._encode(raw)
+        attachment = None
+        if slot:
+            attachment = self._allure.path(slot)
+            attachment.write_bytes(body)
+            self.bytes_written += len(body)
+        if file_path:
+            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+            Path(file_path).write_bytes(body)
+            self.bytes_written += len(body)
+            logger.info(f"截图已保存: {file_path}")
+        self.saved += 1
+        self._last_frame[stream] = (fingerprint, attachment)
+
+
+_pipeline: Optional[ScreenshotPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_screenshot_pipeline() -> ScreenshotPipeline:
+    """进程级共享的截图流水线，进程退出前自动等待写入完成"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = ScreenshotPipeline()
+            atexit.register(_shutdown)
+        return _pipeline
+
+
+def flush_test_artifacts(nodeid: str, failed: bool) -> int:
+    """测试结束时写出/丢弃该测试缓冲的截图；本进程未截过图时什么也不做"""
+    if _pipeline is None:
+        return 0
+    return _pipeline.flush_buffer(nodeid, failed)
+
+
+def _shutdown():
+    if _pipeline is not None:
+        _pipeline.drain()
+        logger.info(_pipeline.summary())
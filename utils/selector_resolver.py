@@ -0,0 +1,291 @@
+"""
+候选选择器竞速 + 胜出记录
+页面对象常见的写法是逐个尝试候选选择器，每个候选各等2~3秒：第一个候选不命中就要白等几秒才轮到正确的那个。
+这里把所有候选用 locator.or_ 合并成一个定位器同时等待，任意一个出现即返回，再用零等待的 count() 确认是哪一个命中；
+每个 (页面, key) 的胜出候选记录在本地SQLite（默认 reports/selector_cache.db），下次优先确认，
+长期从未胜出的候选可通过 `python -m utils.selector_resolver` 列出，便于清理
+
+    resolver = SelectorResolver(page)
+    found = resolver.resolve(["button:has-text('Logout')", "a:has-text('Sign out')"], key="logout")
+    if found:
+        selector, locator = found
+        locator.click()
+
+环境变量：
+    SELECTOR_CACHE=false      不读写胜出记录（仍然竞速）
+    SELECTOR_CACHE_DB         记录库路径，默认 reports/selector_cache.db
+"""
+import atexit
+import os
+import re
+import sqlite3
+import sys
+import threading
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Locator, Page
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_PATH = "reports/selector_cache.db"
+
+# 累积多少次胜出后写一次库（进程退出时也会写）
+FLUSH_EVERY = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS selector_stats (
+    page TEXT NOT NULL,
+    key TEXT NOT NULL,
+    selector TEXT NOT NULL,
+    wins INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (page, key, selector)
+);
+"""
+
+# 路径中的数字ID/GUID归一化，同一类页面共用一份记录
+_ID_SEGMENT = re.compile(r"/(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27})(?=/|$)")
+
+
+def page_key(url: str) -> str:
+    """页面维度的记录键：URL路径（ID段替换为 :id）"""
+    path = urlparse(url).path or "/"
+    return _ID_SEGMENT.sub("/:id", path)
+
+
+class SelectorCache:
+    """胜出候选记录（进程内缓存 + SQLite持久化，xdist多进程可同时写入）"""
+
+    def __init__(self, db_path: str = None, enabled: bool = None):
+        self.db_path = Path(db_path or os.environ.get("SELECTOR_CACHE_DB", DEFAULT_DB_PATH))
+        if enabled is None:
+            enabled = os.environ.get("SELECTOR_CACHE", "true").lower() != "false"
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._winners: Optional[Dict[Tuple[str, str], str]] = None
+        # (page, key, selector) -> [wins, attempts]，尚未写入库的增量
+        self._pending: Dict[Tuple[str, str, str], List[int]] = {}
+        self._pending_count = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _load(self):
+        self._winners = {}
+        if not self.db_path.exists():
+            return
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT page, key, selector FROM selector_stats WHERE wins > 0 ORDER BY wins ASC"
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"读取选择器记录失败: {e}")
+            return
+        # 按胜出次数升序覆盖，最终保留胜出最多的候选
+        for page, key, selector in rows:
+            self._winners[(page, key)] = selector
+
+    def winner(self, page: str, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            if self._winners is None:
+                self._load()
+            return self._winners.get((page, key))
+
+    def record(self, page: str, key: str, candidates: Sequence[str], winner: Optional[str]):
+        """记录一次解析结果：所有候选 attempts+1，胜出者 wins+1"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._winners is None:
+                self._load()
+            for selector in candidates:
+                stats = self._pending.setdefault((page, key, selector), [0, 0])
+                stats[1] += 1
+                if selector == winner:
+                    stats[0] += 1
+            if winner:
+                self._winners[(page, key)] = winner
+            self._pending_count += 1
+            should_flush = self._pending_count >= FLUSH_EVERY
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending, self._pending_count = self._pending, {}, 0
+        if not pending:
+            return
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    """
+                    INSERT INTO selector_stats (page, key, selector, wins, attempts) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (page, key, selector) DO UPDATE SET
+                        wins = wins + excluded.wins, attempts = attempts + excluded.attempts
+                    """,
+                    [(page, key, selector, wins, attempts) for (page, key, selector), (wins, attempts) in pending.items()],
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"写入选择器记录失败: {e}")
+
+    def dead_candidates(self, min_attempts: int = 5) -> List[Tuple[str, str, str, int]]:
+        """尝试过至少 min_attempts 次却从未胜出的候选：[(page, key, selector, attempts)]"""
+        if not self.db_path.exists():
+            return []
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                """
+                SELECT page, key, selector, attempts FROM selector_stats
+                WHERE wins = 0 AND attempts >= ? ORDER BY page, key, attempts DESC
+                """,
+                (min_attempts,),
+            ).fetchall()
+
+
+_cache: Optional[SelectorCache] = None
+
+
+def get_selector_cache() -> SelectorCache:
+    """进程级共享的胜出记录"""
+    global _cache
+    if _cache is None:
+        _cache = SelectorCache()
+        atexit.register(_cache.flush)
+    return _cache
+
+
+def _candidate(root: Union[Page, Locator], selector: str, state: str) -> Locator:
+    # visible 状态只匹配可见元素：合并定位器的 .first 不会落在DOM中靠前的隐藏元素上
+    return root.locator(f"{selector} >> visible=true" if state == "visible" else selector)
+
+
+def _ordered(candidates: Sequence[str], preferred: Optional[str]) -> List[str]:
+    candidates = list(dict.fromkeys(candidates))
+    if preferred in candidates:
+        candidates.remove(preferred)
+        candidates.insert(0, preferred)
+    return candidates
+
+
+class SelectorResolver:
+    """同步Playwright的候选选择器解析"""
+
+    def __init__(self, page: Page, cache: SelectorCache = None):
+        self.page = page
+        self.cache = cache or get_selector_cache()
+
+    def resolve(self, candidates: Sequence[str], key: str = None, timeout: int = 3000,
+                state: str = "visible", root: Union[Page, Locator] = None) -> Optional[Tuple[str, Locator]]:
+        """
+        同时等待所有候选，返回最先命中的一个
+
+        Args:
+            candidates: 候选选择器（按原有优先级排列）
+            key: 记录键，默认取第一个候选
+            timeout: 总超时时间(毫秒)，不再按候选个数累加
+            state: visible（默认）或 attached
+            root: 在该定位器范围内查找（例如某一表格行），默认整个页面
+
+        Returns:
+            (命中的选择器, 对应定位器.first)，全部未命中返回None
+        """
+        root = root or self.page
+        key = key or candidates[0]
+        page = page_key(self.page.url)
+        ordered = _ordered(candidates, self.cache.winner(page, key))
+
+        locators = [_candidate(root, selector, state) for selector in ordered]
+        combined = locators[0]
+        for locator in locators[1:]:
+            combined = combined.or_(locator)
+
+        try:
+            combined.first.wait_for(state="attached", timeout=timeout)
+        except PlaywrightError:
+            logger.debug(f"候选选择器均未命中 [{key}]: {ordered}")
+            self.cache.record(page, key, ordered, None)
+            return None
+
+        # 已确认有元素出现，按优先顺序零等待确认是哪个候选（上次的胜出者排在最前，通常一次即中）
+        for selector, locator in zip(ordered, locators):
+            try:
+                if locator.count() > 0:
+                    logger.debug(f"候选选择器命中 [{key}]: {selector}")
+                    self.cache.record(page, key, ordered, selector)
+                    return selector, locator.first
+            except PlaywrightError:
+                continue
+        # 元素在确认前消失
+        self.cache.record(page, key, ordered, None)
+        return None
+
+
+async def resolve_async(page, candidates: Sequence[str], key: str = None, timeout: int = 3000,
+                        state: str = "visible", root=None):
+    """resolve 的异步Playwright版本，参数与返回值相同"""
+    from playwright.async_api import Error as AsyncPlaywrightError
+
+    cache = get_selector_cache()
+    root = root or page
+    key = key or candidates[0]
+    page_id = page_key(page.url)
+    ordered = _ordered(candidates, cache.winner(page_id, key))
+
+    locators = [_candidate(root, selector, state) for selector in ordered]
+    combined = locators[0]
+    for locator in locators[1:]:
+        combined = combined.or_(locator)
+
+    try:
+        await combined.first.wait_for(state="attached", timeout=timeout)
+    except AsyncPlaywrightError:
+        logger.debug(f"候选选择器均未命中 [{key}]: {ordered}")
+        cache.record(page_id, key, ordered, None)
+        return None
+
+    for selector, locator in zip(ordered, locators):
+        try:
+            if await locator.count() > 0:
+                logger.debug(f"候选选择器命中 [{key}]: {selector}")
+                cache.record(page_id, key, ordered, selector)
+                return selector, locator.first
+        except AsyncPlaywrightError:
+            continue
+    cache.record(page_id, key, ordered, None)
+    return None
+
+
+def main(argv: List[str] = None) -> int:
+    """列出从未胜出的候选选择器：python -m utils.selector_resolver [最少尝试次数]"""
+    argv = sys.argv[1:] if argv is None else argv
+    min_attempts = int(argv[0]) if argv else 5
+    cache = SelectorCache()
+    dead = cache.dead_candidates(min_attempts)
+    if not dead:
+        print(f"✅ 没有尝试 ≥{min_attempts} 次仍未胜出的候选选择器（记录库: {cache.db_path}）")
+        return 0
+    print(f"🪦 尝试 ≥{min_attempts} 次从未胜出的候选选择器（记录库: {cache.db_path}）:")
+    current = None
+    for page, key, selector, attempts in dead:
+        if (page, key) != current:
+            current = (page, key)
+            print(f"\n{page}  [{key}]")
+        print(f"    {attempts:>5} 次  {selector}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+"""
+固定等待账本（pytest插件）
+统计 Page.wait_for_timeout / time.sleep 每个调用点实际浪费了多少时间，为删除固定等待排优先级
+
+工作方式：
+1. 每次固定等待记录调用点（文件:行号）、请求时长和所在测试
+2. 等待结束后，记录代码接下来第一次访问的选择器（page.locator/click/fill/is_visible...），
+   作为该调用点"真正在等的条件"
+3. 同一调用点再次执行时，在等待期间轮询该选择器，记录条件实际就绪的时间，
+   剩余时间照常等完（不改变测试的时序），浪费时间 = 请求时长 - 就绪时间
+
+启用方式（默认关闭）：
+    pytest tests/ --sleep-ledger
+    SLEEP_LEDGER=true pytest tests/ -n 4
+
+报告按调用点汇总所有xdist worker的数据，输出到 reports/sleep_ledger/
+"""
+import json
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+DEFAULT_REPORT_DIR = "reports/sleep_ledger"
+
+# 等待之后"下一次访问的选择器"从这些Page方法的第一个参数中获取
+_SELECTOR_METHODS = (
+    "locator", "click", "dblclick", "fill", "type", "press", "check", "uncheck", "hover",
+    "is_visible", "is_hidden", "is_enabled", "is_checked", "wait_for_selector", "query_selector",
+    "query_selector_all", "text_content", "inner_text", "input_value", "select_option", "set_input_files",
+)
+
+# 短于该时长(毫秒)的等待不做探测，探测本身的开销与等待相当
+_PROBE_MIN_MS = 100
+
+
+def _call_site() -> Optional[Tuple[str, int, str]]:
+    """返回项目内最近的调用点 (相对路径, 行号, 函数名)；调用不来自项目代码时返回None"""
+    frame = sys._getframe(2)
+    this_file = str(Path(__file__).resolve())
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename != this_file and "site-packages" not in filename:
+            try:
+                path = Path(filename).resolve()
+                rel = path.relative_to(PROJECT_ROOT)
+                return str(rel), frame.f_lineno, frame.f_code.co_name
+            except ValueError:
+                pass
+        frame = frame.f_back
+    return None
+
+
+class SleepLedger:
+    """固定等待账本：记录调用点统计，并通过猴子补丁接管 wait_for_timeout / time.sleep"""
+
+    def __init__(self):
+        self.sites: Dict[str, Dict[str, Any]] = {}
+        self.current_test: str = ""
+        self._pending_site: Optional[str] = None
+        self._originals: Dict[Tuple[Any, str], Any] = {}
+
+    # ==================== 补丁安装 ====================
+
+    def install(self):
+        """安装补丁"""
+        from playwright.sync_api import Page
+
+        ledger = self
+        original_wait = Page.wait_for_timeout
+        original_sleep = time.sleep
+
+        def wait_for_timeout(page, timeout: float) -> None:
+            ledger.on_sleep(timeout, lambda ms: original_wait(page, ms), page=page)
+
+        def sleep(seconds: float) -> None:
+            ledger.on_sleep(seconds * 1000, lambda ms: original_sleep(ms / 1000))
+
+        self._patch(Page, "wait_for_timeout", wait_for_timeout)
+        self._patch(time, "sleep", sleep)
+
+        for name in _SELECTOR_METHODS:
+            original = getattr(Page, name, None)
+            if original is not None:
+                self._patch(Page, name, self._wrap_selector_method(original))
+
+    def uninstall(self):
+        """恢复所有被替换的函数"""
+        for (owner, name), original in self._originals.items():
+            setattr(owner, name, original)
+        self._originals = {}
+
+    def _patch(self, owner, name: str, replacement):
+        self._originals[(owner, name)] = getattr(owner, name)
+        setattr(owner, name, replacement)
+
+    def _wrap_selector_method(self, original):
+        ledger = self
+
+        def wrapper(page, *args, **kwargs):
+            selector = args[0] if args else kwargs.get("selector")
+            if ledger._pending_site and isinstance(selector, str):
+                ledger.sites[ledger._pending_site]["next_selectors"][selector] += 1
+                ledger._pending_site = None
+            return original(page, *args, **kwargs)
+
+        wrapper.__name__ = original.__name__
+        wrapper.__doc__ = original.__doc__
+        return wrapper
+
+    # ==================== 记录 ====================
+
+    def on_sleep(self, requested_ms: float, do_sleep, page=None):
+        """
+        处理一次固定等待
+
+        Args:
+            requested_ms: 请求等待的毫秒数
+            do_sleep: 执行原始等待的函数，参数为毫秒
+            page: 所在页面（仅wait_for_timeout有），用于轮询条件
+        """
+        # 连续两次等待之间没有访问选择器：上一个调用点本次不记录后续条件
+        self._pending_site = None
+        site = _call_site()
+        if site is None:
+            do_sleep(requested_ms)
+            return
+
+        key = f"{site[0]}:{site[1]}"
+        stats = self.sites.get(key)
+        if stats is None:
+            stats = self.sites[key] = {
+                "file": site[0],
+                "line": site[1],
+                "function": site[2],
+                "kind": "wait_for_timeout" if page is not None else "time.sleep",
+                "calls": 0,
+                "requested_ms": 0.0,
+                "probed_calls": 0,
+                "probed_requested_ms": 0.0,
+                "wasted_ms": 0.0,
+                "never_ready": 0,
+                "tests": set(),
+                "next_selectors": Counter(),
+            }
+
+        stats["calls"] += 1
+        stats["requested_ms"] += requested_ms
+        if self.current_test:
+            stats["tests"].add(self.current_test)
+
+        selector = self._probe_selector(stats)
+        if page is None or selector is None or requested_ms < _PROBE_MIN_MS:
+            do_sleep(requested_ms)
+        else:
+            ready_ms = self._probe(page, selector, requested_ms)
+            elapsed = ready_ms if ready_ms is not None else requested_ms
+            remaining = requested_ms - elapsed
+            if remaining > 0:
+                do_sleep(remaining)
+
+            stats["probed_calls"] += 1
+            stats["probed_requested_ms"] += requested_ms
+            if ready_ms is None:
+                stats["never_ready"] += 1
+            else:
+                stats["wasted_ms"] += max(requested_ms - ready_ms, 0)
+
+        # 等待结束后代码访问的第一个选择器即为该等待"在等的条件"
+        self._pending_site = key
+
+    @staticmethod
+    def _probe_selector(stats: Dict[str, Any]) -> Optional[str]:
+        """调用点最常见的后续选择器"""
+        if not stats["next_selectors"]:
+            return None
+        return stats["next_selectors"].most_common(1)[0][0]
+
+    def _probe(self, page, selector: str, timeout_ms: float) -> Optional[float]:
+        """
+        在等待期间轮询选择器
+
+        Returns:
+            Optional[float]: 条件就绪耗时(毫秒)，超时未就绪返回None
+        """
+        start = time.perf_counter()
+        try:
+            page.locator(selector).first.wait_for(state="visible", timeout=timeout_ms)
+            return (time.perf_counter() - start) * 1000
+        except Exception:
+            return None
+
+    # ==================== 报告 ====================
+
+    def to_dict(self) -> Dict[str, Any]:
+        """导出为可JSON序列化的数据"""
+        return {
+            key: {
+                **stats,
+                "tests": sorted(stats["tests"]),
+                "next_selectors": dict(stats["next_selectors"]),
+            }
+            for key, stats in self.sites.items()
+        }
+
+
+def merge_ledgers(report_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """合并所有worker的账本文件"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for path in sorted(report_dir.glob("ledger_*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for key, stats in data.items():
+            target = merged.get(key)
+            if target is None:
+                merged[key] = {**stats, "tests": set(stats["tests"]), "next_selectors": Counter(stats["next_selectors"])}
+                continue
+            for field in ("calls", "requested_ms", "probed_calls", "probed_requested_ms", "wasted_ms", "never_ready"):
+                target[field] += stats[field]
+            target["tests"].update(stats["tests"])
+            target["next_selectors"].update(stats["next_selectors"])
+    return merged
+
+
+def build_report(merged: Dict[str, Dict[str, Any]]) -> list:
+    """
+    按浪费时间排序生成报告
+
+    未被探测到的调用（首次执行或没有后续选择器）按同一调用点已探测调用的浪费比例估算
+    """
+    rows = []
+    for key, stats in merged.items():
+        ratio = stats["wasted_ms"] / stats["probed_requested_ms"] if stats["probed_requested_ms"] else None
+        estimated_ms = stats["requested_ms"] * ratio if ratio is not None else None
+        selector = Counter(stats["next_selectors"]).most_common(1)
+        rows.append({
+            "site": key,
+            "function": stats["function"],
+            "kind": stats["kind"],
+            "calls": stats["calls"],
+            "tests": len(stats["tests"]),
+            "slept_s": round(stats["requested_ms"] / 1000, 2),
+            "measured_wasted_s": round(stats["wasted_ms"] / 1000, 2),
+            "estimated_wasted_s": round(estimated_ms / 1000, 2) if estimated_ms is not None else None,
+            "probed_calls": stats["probed_calls"],
+            "never_ready": stats["never_ready"],
+            "condition": selector[0][0] if selector else None,
+        })
+
+    # 有估算值的按估算浪费排序，其余按总等待时间排在后面
+    rows.sort(key=lambda r: (r["estimated_wasted_s"] is None, -(r["estimated_wasted_s"] or 0), -r["slept_s"]))
+    return rows
+
+
+def _write_text_report(rows: list, path: Path):
+    total_slept = sum(r["slept_s"] for r in rows)
+    total_wasted = sum(r["estimated_wasted_s"] or 0 for r in rows)
+    lines = [
+        "固定等待账本",
+        f"调用点: {len(rows)}  总等待: {total_slept:.1f}s  估算浪费: {total_wasted:.1f}s",
+        "",
+        f"{'估算浪费(s)':>12} {'总等待(s)':>10} {'调用':>6} {'探测':>6} {'未就绪':>6}  调用点 / 等待条件",
+    ]
+    for r in rows:
+        wasted = f"{r['estimated_wasted_s']:.2f}" if r["estimated_wasted_s"] is not None else "-"
+        lines.append(
+            f"{wasted:>12} {r['slept_s']:>10.2f} {r['calls']:>6} {r['probed_calls']:>6} {r['never_ready']:>6}  "
+            f"{r['site']} ({r['function']}, {r['kind']})"
+        )
+        if r["condition"]:
+            lines.append(f"{'':>45}-> {r['condition']}")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+# ==================== pytest钩子 ====================
+
+def pytest_addoption(parser):
+    group = parser.getgroup("sleep-ledger", "固定等待账本")
+    group.addoption(
+        "--sleep-ledger",
+        action="store_true",
+        default=os.environ.get("SLEEP_LEDGER", "false").lower() == "true",
+        help="统计每个固定等待调用点浪费的时间（环境变量 SLEEP_LEDGER=true 同效）",
+    )
+    group.addoption(
+        "--sleep-ledger-dir",
+        default=os.environ.get("SLEEP_LEDGER_DIR", DEFAULT_REPORT_DIR),
+        help=f"账本报告目录，默认 {DEFAULT_REPORT_DIR}",
+    )
+
+
+def pytest_configure(config):
+    if not config.getoption("--sleep-ledger", default=False):
+        return
+
+    report_dir = Path(config.getoption("--sleep-ledger-dir"))
+    is_worker = hasattr(config, "workerinput")
+    if not is_worker and report_dir.exists():
+        # 控制进程在worker启动前清理上一轮的账本文件
+        for path in report_dir.glob("ledger_*.json"):
+            path.unlink()
+    report_dir.mkdir(parents=True, exist_ok=True)
+
+    plugin = SleepLedgerPlugin(report_dir, is_worker, config)
+    config.pluginmanager.register(plugin, "sleep_ledger_plugin")
+
+
+class SleepLedgerPlugin:
+    """启用账本后注册的插件实例"""
+
+    def __init__(self, report_dir: Path, is_worker: bool, config):
+        self.report_dir = report_dir
+        self.is_worker = is_worker
+        self.worker_id = config.workerinput["workerid"] if is_worker else "main"
+        self.ledger = SleepLedger()
+        self.rows: list = []
+        self.ledger.install()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.ledger.current_test = item.nodeid
+        yield
+        self.ledger.current_test = ""
+        self.ledger._pending_site = None
+
+    def pytest_sessionfinish(self, session):
+        self.ledger.uninstall()
+
+        if self.ledger.sites:
+            path = self.report_dir / f"ledger_{self.worker_id}.json"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.ledger.to_dict(), f, ensure_ascii=False)
+
+        # xdist下各worker先于控制进程结束，由控制进程（或单进程运行时）合并
+        if self.is_worker:
+            return
+        self.rows = build_report(merge_ledgers(self.report_dir))
+        with open(self.report_dir / "sleep_ledger_report.json", "w", encoding="utf-8") as f:
+            json.dump(self.rows, f, ensure_ascii=False, indent=2)
+        _write_text_report(self.rows, self.report_dir / "sleep_ledger_report.txt")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker or not self.rows:
+            return
+        terminalreporter.section("固定等待账本（估算浪费 Top 10）")
+        for r in self.rows[:10]:
+            wasted = f"{r['estimated_wasted_s']:.1f}s" if r["estimated_wasted_s"] is not None else "未探测"
+            terminalreporter.write_line(f"{wasted:>8}  总等待 {r['slept_s']:.1f}s  {r['site']}  -> {r['condition'] or '-'}")
+        terminalreporter.write_line(f"完整报告: {self.report_dir / 'sleep_ledger_report.txt'}")
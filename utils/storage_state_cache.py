@@ -0,0 +1,164 @@
+"""
+Playwright storageState 磁盘缓存
+按 (账号, base_url) 缓存登录后的 cookies/localStorage，命中且未过期时直接注入 context，跳过UI登录
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 默认缓存目录（相对项目根目录）
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / ".auth" / "storage_state"
+
+# 恢复时用于标记"本标签页已注入过localStorage"的sessionStorage键
+_RESTORED_FLAG = "__storage_state_cache_restored__"
+
+
+class StorageStateCache:
+    """按账号和base_url缓存Playwright storageState，支持基于cookie过期时间的失效判断"""
+
+    def __init__(self, cache_dir: Optional[str] = None, min_ttl: int = None, max_age: int = None):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录，默认 .auth/storage_state
+            min_ttl: cookie剩余有效期低于该值(秒)即视为过期，默认读取 STORAGE_STATE_MIN_TTL，否则300
+            max_age: 缓存文件最长保留时间(秒)，用于没有过期时间的会话cookie，默认读取 STORAGE_STATE_MAX_AGE，否则3600
+        """
+        self.cache_dir = Path(cache_dir or os.environ.get("STORAGE_STATE_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self.min_ttl = min_ttl if min_ttl is not None else int(os.environ.get("STORAGE_STATE_MIN_TTL", "300"))
+        self.max_age = max_age if max_age is not None else int(os.environ.get("STORAGE_STATE_MAX_AGE", "3600"))
+
+    def path_for(self, username: str, base_url: str) -> Path:
+        """返回账号对应的缓存文件路径"""
+        key = hashlib.sha1(f"{username}|{base_url.rstrip('/')}".encode("utf-8")).hexdigest()[:16]
+        safe_name = "".join(c if c.isalnum() or c in "_-" else "_" for c in username)
+        return self.cache_dir / f"{safe_name}_{key}.json"
+
+    def load(self, username: str, base_url: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存的storageState
+
+        Returns:
+            Optional[Dict]: 有效的storageState；不存在、损坏或已过期时返回None
+        """
+        path = self.path_for(username, base_url)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"读取storageState缓存失败，忽略: {path}, 错误: {e}")
+            self.invalidate(username, base_url)
+            return None
+
+        state = entry.get("storage_state") or {}
+        stale_reason = self._stale_reason(entry, state)
+        if stale_reason:
+            logger.info(f"storageState缓存已失效 ({username}): {stale_reason}")
+            self.invalidate(username, base_url)
+            return None
+
+        return state
+
+    def save(self, username: str, base_url: str, state: Dict[str, Any]):
+        """
+        写入storageState缓存（先写临时文件再替换，避免并行worker读到半个文件）
+        """
+        if not state or not state.get("cookies"):
+            logger.warning(f"storageState中没有cookie，跳过缓存: {username}")
+            return
+
+        path = self.path_for(username, base_url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "username": username,
+            "base_url": base_url,
+            "saved_at": time.time(),
+            "storage_state": state,
+        }
+
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            logger.info(f"storageState已缓存: {username} -> {path.name}")
+        except OSError as e:
+            logger.warning(f"写入storageState缓存失败: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def invalidate(self, username: str, base_url: str):
+        """删除账号对应的缓存"""
+        self.path_for(username, base_url).unlink(missing_ok=True)
+
+    def apply(self, context, state: Dict[str, Any]):
+        """
+        将storageState注入到已存在的BrowserContext（在第一次导航之前调用）
+
+        cookies通过add_cookies注入；localStorage通过init script在对应origin首次加载时写入
+        """
+        cookies = state.get("cookies") or []
+        if cookies:
+            context.add_cookies(cookies)
+
+        origins = [o for o in state.get("origins") or [] if o.get("localStorage")]
+        if origins:
+            payload = {
+                o["origin"]: {item["name"]: item["value"] for item in o["localStorage"]}
+                for o in origins
+            }
+            context.add_init_script(
+                "(() => {"
+                f"  const data = {json.dumps(payload)};"
+                "  const items = data[window.location.origin];"
+                f"  if (!items || window.sessionStorage.getItem('{_RESTORED_FLAG}')) return;"
+                "  for (const [k, v] of Object.entries(items)) window.localStorage.setItem(k, v);"
+                f"  window.sessionStorage.setItem('{_RESTORED_FLAG}', '1');"
+                "})();"
+            )
+
+    def _stale_reason(self, entry: Dict[str, Any], state: Dict[str, Any]) -> Optional[str]:
+        """判断缓存是否过期，返回过期原因；有效时返回None"""
+        cookies = state.get("cookies") or []
+        if not cookies:
+            return "没有cookie"
+
+        now = time.time()
+        age = now - entry.get("saved_at", 0)
+
+        # 带过期时间的cookie：任一cookie即将过期即视为会话失效
+        expiring = [c["expires"] for c in cookies if c.get("expires", -1) > 0]
+        if expiring and min(expiring) - now < self.min_ttl:
+            return f"cookie将在 {int(min(expiring) - now)}s 内过期"
+
+        # 全是会话cookie（expires=-1）时只能按缓存年龄判断
+        if not expiring and age > self.max_age:
+            return f"会话cookie缓存已保存 {int(age)}s，超过 {self.max_age}s"
+
+        return None
+
+
+_cache_instance: Optional[StorageStateCache] = None
+
+
+def get_storage_state_cache() -> StorageStateCache:
+    """获取进程级共享的StorageStateCache实例"""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = StorageStateCache()
+    return _cache_instance
+
+
+def is_storage_state_cache_enabled() -> bool:
+    """是否启用storageState缓存（环境变量 USE_STORAGE_STATE_CACHE，默认true）"""
+    return os.environ.get("USE_STORAGE_STATE_CACHE", "true").lower() == "true"
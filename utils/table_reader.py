@@ -0,0 +1,100 @@
+"""
+表格批量读取
+逐行 query_selector_all + 逐格 text_content 每读一个单元格就是一次浏览器往返，
+N行M列的表格需要 N*M+N+1 次往返。这里用一次 evaluate 在页面内把整张表
+（表头、每行单元格文本、行属性）序列化后一次性取回，后续查找/统计都在Python侧完成
+"""
+from typing import Any, Dict, List, Optional
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Locator, Page
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 行上需要带回的属性：data-*、aria-*、以及常用的 id/class/role
+_READ_TABLE_JS = """
+(table) => {
+    const text = (el) => (el.innerText ?? el.textContent ?? '').replace(/\\s+/g, ' ').trim();
+    const pick = (row) => {
+        const attrs = {};
+        for (const attr of row.attributes) {
+            const name = attr.name;
+            if (name.startsWith('data-') || name.startsWith('aria-') || ['id', 'class', 'role'].includes(name)) {
+                attrs[name] = attr.value;
+            }
+        }
+        return attrs;
+    };
+    const cellSel = 'td, th, [role="cell"], [role="gridcell"], [role="rowheader"]';
+    const headerCells = table.querySelectorAll('thead th, [role="columnheader"]');
+    let bodyRows = table.querySelectorAll('tbody tr');
+    if (!bodyRows.length) {
+        bodyRows = Array.from(table.querySelectorAll('[role="row"]'))
+            .filter((row) => !row.querySelector('[role="columnheader"]'));
+    }
+    return {
+        headers: Array.from(headerCells, text),
+        rows: Array.from(bodyRows, (row, index) => ({
+            index,
+            cells: Array.from(row.querySelectorAll(cellSel), text),
+            attrs: pick(row),
+        })),
+    };
+}
+"""
+
+
+def read_table(page: Page, selector: str, timeout: int = 5000) -> Dict[str, Any]:
+    """
+    一次往返读取整张表格
+
+    Args:
+        page: Playwright页面对象
+        selector: 表格选择器（支持Playwright选择器语法，如 role=table；匹配多个时取第一个）
+        timeout: 等待表格出现的超时时间(毫秒)
+
+    Returns:
+        dict: {"headers": [表头文本], "rows": [{"index": 行号, "cells": [单元格文本], "attrs": {行属性}}]}
+              表格不存在或读取失败时返回空表
+    """
+    table: Locator = page.locator(selector).first
+    try:
+        table.wait_for(state="attached", timeout=timeout)
+        data = table.evaluate(_READ_TABLE_JS)
+    except PlaywrightError as e:
+        logger.warning(f"读取表格失败 ({selector}): {e}")
+        return {"headers": [], "rows": []}
+    logger.debug(f"读取表格 {selector}: {len(data['headers'])} 列, {len(data['rows'])} 行")
+    return data
+
+
+def column_index(table: Dict[str, Any], header: str) -> Optional[int]:
+    """按表头文本（忽略大小写）查找列号，找不到返回None"""
+    wanted = header.strip().lower()
+    for i, name in enumerate(table["headers"]):
+        if name.lower() == wanted:
+            return i
+    return None
+
+
+def column_values(table: Dict[str, Any], column: int) -> List[str]:
+    """取某一列的所有单元格文本（列数不足的行跳过）"""
+    return [row["cells"][column] for row in table["rows"] if len(row["cells"]) > column]
+
+
+def find_row(table: Dict[str, Any], column: int, text: str, exact: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    查找指定列包含（或等于）text 的第一行
+
+    Returns:
+        dict: 命中的行（含 index/cells/attrs），未找到返回None
+    """
+    for row in table["rows"]:
+        if len(row["cells"]) <= column:
+            continue
+        cell = row["cells"][column]
+        if (cell == text) if exact else (text in cell):
+            return row
+    return None
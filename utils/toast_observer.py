@@ -0,0 +1,237 @@
+"""
+Toast/通知观察器
+按选择器轮询toast（is_visible/wait_for_selector）会错过显示时间很短的toast，轮询本身也浪费时间；
+手工删除 .alert/.toast 节点来“清场”同样容易和自动消失竞争。
+
+这里通过 context.add_init_script 在每个页面注入一个 MutationObserver：
+toast/通知节点一出现就把 (文本, 类型, 出现/消失时间) 记录到页面内的缓冲区 window.__toastObserver.entries，
+Python侧按时间戳查询或等待缓冲区——已经记录的toast即使已自动消失也能立即查到，不需要轮询DOM。
+
+    observer = ToastObserver(page)
+    since = observer.mark()
+    page.click("button:has-text('Save')")
+    assert observer.wait_for(type="success", since=since, timeout=5000)
+
+时间戳为浏览器的 Date.now()（毫秒），mark() 取Python侧当前时间，浏览器与测试在同一台机器上时二者一致。
+"""
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Page
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# toast/通知节点：只列具体的消息类名，不用 [class*='toast'] 这类会匹配到库根容器（如常驻的 .Toastify）的通配；
+# 嵌套匹配时记录最内层的节点（见 TOAST_OBSERVER_JS 的 innermost）
+TOAST_SELECTORS = [
+    "[data-sonner-toast]",
+    ".toast",
+    ".abp-toast",
+    ".Toastify__toast",
+    ".ant-message-notice",
+    ".ant-notification-notice",
+    ".el-message",
+    ".el-notification",
+    ".swal2-popup",
+    ".notification",
+    ".alert",
+    "[role='alert']",
+    "[role='status']",
+]
+
+# 带类型标记（success/error等类名或data-type）的toast外层容器，用于判断内层记录节点的类型
+TOAST_CONTAINER_SELECTORS = [
+    ".Toastify__toast",
+    "[data-sonner-toast]",
+    ".ant-message-notice",
+    ".ant-notification-notice",
+    ".el-message",
+    ".el-notification",
+    ".toast",
+    ".abp-toast",
+]
+
+TOAST_OBSERVER_JS = """
+(([selector, containerSelector]) => {
+    if (window.__toastObserver) return;
+    const entries = [];
+    const tracked = new Map();
+    const text = (node) => (node.innerText ?? node.textContent ?? '').replace(/\\s+/g, ' ').trim();
+    // 类型标记可能在记录节点本身、其子节点，或外层toast容器上（如内层 [role='alert'] 被记录时）
+    const classes = (node) => {
+        const parts = [node.getAttribute('class') || '', node.getAttribute('data-type') || ''];
+        node.querySelectorAll('[class]').forEach((child, i) => { if (i < 20) parts.push(child.getAttribute('class')); });
+        const container = node.parentElement && node.parentElement.closest(containerSelector);
+        if (container) parts.push(container.getAttribute('class') || '', container.getAttribute('data-type') || '');
+        return parts.join(' ');
+    };
+    const kind = (node, content) => {
+        const cls = classes(node);
+        if (/success/i.test(cls)) return 'success';
+        if (/error|danger|fail/i.test(cls)) return 'error';
+        if (/warn/i.test(cls)) return 'warning';
+        if (/info/i.test(cls)) return 'info';
+        if (/success/i.test(content)) return 'success';
+        if (/fail|error|invalid/i.test(content)) return 'error';
+        return 'unknown';
+    };
+    const waiters = new Set();
+    const notify = () => waiters.forEach((check) => check());
+
+    // 每个toast节点对应一条记录：toast节点之下出现的新toast单独记录；
+    // 常驻区域（如 [role='status']）原地替换文本时，旧记录标记消失并记录新文本
+    const record = (node) => {
+        const content = text(node);
+        const current = tracked.get(node);
+        if (current) {
+            if (!content || content === current.text) return;
+            current.hidden_at = Date.now();
+        }
+        if (!content) return;
+        const entry = {id: entries.length, text: content, type: kind(node, content), shown_at: Date.now(), hidden_at: null};
+        entries.push(entry);
+        tracked.set(node, entry);
+    };
+    // 包含其他toast节点的外层容器不记录，只记录最内层的toast
+    const innermost = (node) => !node.querySelector(selector);
+    // 新增节点本身/其中的toast，以及内容后渲染的toast（先插入空节点再填文本）
+    const scan = (node) => {
+        const element = node.nodeType === 1 ? node : node.parentElement;
+        if (!element) return;
+        const host = element.closest(selector);
+        if (host && innermost(host)) record(host);
+        if (node.nodeType === 1) node.querySelectorAll(selector).forEach((child) => { if (innermost(child)) record(child); });
+    };
+    const refresh = () => {
+        for (const [node, entry] of tracked) {
+            if (!node.isConnected) {
+                entry.hidden_at = Date.now();
+                tracked.delete(node);
+            }
+        }
+    };
+    const observer = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            if (mutation.type === 'characterData') scan(mutation.target);
+            else mutation.addedNodes.forEach(scan);
+        }
+        refresh();
+        notify();
+    });
+    observer.observe(document, {childList: true, subtree: true, characterData: true});
+    if (document.documentElement) scan(document.documentElement);
+
+    const matches = (entry, filter) =>
+        entry.shown_at >= (filter.since || 0)
+        && (!filter.type || entry.type === filter.type)
+        && (!filter.text || new RegExp(filter.text, 'i').test(entry.text));
+    window.__toastObserver = {
+        entries,
+        query: (filter) => entries.filter((entry) => matches(entry, filter)),
+        waitFor: (filter, timeout) => new Promise((resolve) => {
+            const found = () => entries.find((entry) => matches(entry, filter));
+            const hit = found();
+            if (hit) return resolve(hit);
+            const check = () => {
+                const entry = found();
+                if (entry) { waiters.delete(check); clearTimeout(timer); resolve(entry); }
+            };
+            const timer = setTimeout(() => { waiters.delete(check); resolve(null); }, timeout);
+            waiters.add(check);
+        }),
+        clear: () => { entries.length = 0; },
+    };
+})(%s);
+""" % json.dumps([", ".join(TOAST_SELECTORS), ", ".join(TOAST_CONTAINER_SELECTORS)])
+
+_QUERY_JS = "(filter) => window.__toastObserver ? window.__toastObserver.query(filter) : null"
+_WAIT_JS = "([filter, timeout]) => window.__toastObserver.waitFor(filter, timeout)"
+
+
+def install_toast_observer(target) -> None:
+    """
+    在BrowserContext或Page上注册init script（之后每次导航都会注入）；
+    传入已加载的Page时同时注入当前文档，注入前已出现的toast会在注入时被扫描记录
+    """
+    target.add_init_script(TOAST_OBSERVER_JS)
+    if isinstance(target, Page) and target.url not in ("", "about:blank"):
+        try:
+            target.evaluate(TOAST_OBSERVER_JS)
+        except PlaywrightError as e:
+            logger.debug(f"注入toast观察器失败: {e}")
+
+
+def _filter(text: Optional[str], type: Optional[str], since: Optional[float]) -> Dict[str, Any]:
+    return {"text": text or "", "type": type or "", "since": int(since or 0)}
+
+
+class ToastObserver:
+    """查询/等待页面内记录的toast（页面未注入观察器时自动注入当前文档）"""
+
+    def __init__(self, page: Page):
+        self.page = page
+
+    @staticmethod
+    def mark() -> float:
+        """当前时间戳（毫秒），作为 since 只查询此后出现的toast"""
+        return time.time() * 1000
+
+    def _ensure(self):
+        if self.page.evaluate("() => !!window.__toastObserver"):
+            return
+        logger.debug("页面未注入toast观察器，注入当前文档")
+        install_toast_observer(self.page)
+
+    def toasts(self, text: str = None, type: str = None, since: float = None) -> List[Dict[str, Any]]:
+        """
+        已记录的toast
+
+        Args:
+            text: 文本正则（忽略大小写）
+            type: success / error / warning / info / unknown
+            since: 只返回该时间戳（毫秒，见 mark()）之后出现的toast
+
+        Returns:
+            list: [{"id", "text", "type", "shown_at", "hidden_at"}]，hidden_at 为None表示仍在页面上
+        """
+        entries = self.page.evaluate(_QUERY_JS, _filter(text, type, since))
+        if entries is None:
+            self._ensure()
+            entries = self.page.evaluate(_QUERY_JS, _filter(text, type, since))
+        return entries or []
+
+    def has(self, text: str = None, type: str = None, since: float = None) -> bool:
+        """是否已出现过符合条件的toast（不等待）"""
+        return bool(self.toasts(text, type, since))
+
+    def wait_for(self, text: str = None, type: str = None, since: float = None,
+                 timeout: int = 5000) -> Optional[Dict[str, Any]]:
+        """
+        等待符合条件的toast出现：已记录过的立即返回，否则由观察器在toast出现时唤醒（不轮询）
+
+        Returns:
+            dict: 第一条匹配的toast；超时返回None
+        """
+        self._ensure()
+        try:
+            return self.page.evaluate(_WAIT_JS, [_filter(text, type, since), timeout])
+        except PlaywrightError as e:
+            # 等待期间页面导航，新文档的缓冲区从头开始
+            logger.debug(f"等待toast时页面导航: {e}")
+            entries = self.toasts(text, type, since)
+            return entries[0] if entries else None
+
+    def clear(self):
+        """清空缓冲区"""
+        self.page.evaluate("() => window.__toastObserver && window.__toastObserver.clear()")
+
+
+async def wait_for_toast_async(page, text: str = None, type: str = None, since: float = None,
+                               timeout: int = 5000) -> Optional[Dict[str, Any]]:
+    """异步页面版本的 ToastObserver.wait_for（页面未注入观察器时注入当前文档）"""
+    await page.evaluate(TOAST_OBSERVER_JS)
+    return await page.evaluate(_WAIT_JS, [_filter(text, type, since), timeout])
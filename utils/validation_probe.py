@@ -0,0 +1,100 @@
+"""
+客户端校验探测
+负向输入场景原本逐个执行 填写 -> 点击保存 -> 等待toast，每个值都要一次服务端往返和数秒等待。
+这里用一次 evaluate 在页面内依次把一批候选值写入输入框（原生setter + input/change/blur事件，React受控组件同样生效），
+每个值等待一帧后读取校验状态：HTML5 validity、jQuery unobtrusive 校验（ABP MVC页面）、aria-invalid 和字段附近的行内错误文本。
+客户端已拦截的值不需要再提交；只有通过客户端校验的值才需要走保存往返确认服务端行为。
+"""
+from typing import Any, Dict, List, Sequence
+
+from playwright.sync_api import Page
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_PROBE_JS = """
+async (el, {values, settleMs, restore}) => {
+    const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    const setValue = Object.getOwnPropertyDescriptor(proto, 'value').set;
+    const fire = () => {
+        for (const type of ['input', 'change']) el.dispatchEvent(new Event(type, {bubbles: true}));
+        el.dispatchEvent(new FocusEvent('blur'));
+        el.dispatchEvent(new FocusEvent('focusout', {bubbles: true}));
+    };
+    const settle = () => new Promise((resolve) => requestAnimationFrame(() => setTimeout(resolve, settleMs)));
+    const visible = (node) => node.getClientRects().length > 0;
+    const text = (node) => (node.innerText ?? node.textContent ?? '').replace(/\\s+/g, ' ').trim();
+
+    const name = el.getAttribute('name');
+    const scope = el.closest('.form-group, .mb-3, .form-floating, .ant-form-item, .form-item') || el.parentElement;
+    const inlineErrors = () => {
+        const nodes = new Set();
+        if (name) {
+            document.querySelectorAll(`[data-valmsg-for="${CSS.escape(name)}"]`).forEach((n) => nodes.add(n));
+        }
+        if (scope) {
+            scope.querySelectorAll('.invalid-feedback, .text-danger, .field-validation-error, .ant-form-item-explain-error, [role="alert"]')
+                .forEach((n) => nodes.add(n));
+        }
+        return Array.from(nodes).filter(visible).map(text).filter(Boolean);
+    };
+    const $ = window.jQuery && window.jQuery.fn && window.jQuery.fn.valid ? window.jQuery : null;
+
+    const original = el.value;
+    const results = [];
+    for (const value of values) {
+        setValue.call(el, value);
+        fire();
+        let jqueryValid = null;
+        if ($ && el.form) {
+            try { jqueryValid = $(el).valid(); } catch (e) {}
+        }
+        await settle();
+        const errors = inlineErrors();
+        const nativeValid = el.validity.valid;
+        const ariaInvalid = el.getAttribute('aria-invalid') === 'true';
+        results.push({
+            value,
+            valid: nativeValid && jqueryValid !== false && !ariaInvalid && errors.length === 0,
+            message: el.validationMessage || errors[0] || '',
+            errors,
+            native_valid: nativeValid,
+            too_long: el.maxLength > 0 && value.length > el.maxLength,
+        });
+    }
+    if (restore) {
+        setValue.call(el, original);
+        fire();
+        if ($ && el.form) {
+            try { $(el).valid(); } catch (e) {}
+        }
+    }
+    return results;
+}
+"""
+
+
+def probe_validation(page: Page, selector: str, values: Sequence[str], restore: bool = True,
+                     settle_ms: int = 50, timeout: int = 5000) -> List[Dict[str, Any]]:
+    """
+    一次往返探测一批输入值的客户端校验结果（不点击保存、不请求服务端）
+
+    Args:
+        page: Playwright页面对象
+        selector: 输入框选择器（匹配多个时取第一个）
+        values: 候选值
+        restore: 探测结束后恢复输入框原值；为False时保留最后一个值及其错误提示（便于截图）
+        settle_ms: 每个值写入后等待页面重新渲染校验提示的时间(毫秒)
+        timeout: 等待输入框出现的超时时间(毫秒)
+
+    Returns:
+        list: 与 values 顺序一致的 {"value", "valid", "message", "errors", "native_valid", "too_long"}
+              valid 为False表示客户端已拦截；too_long 表示超过maxlength（真实输入会被截断，探测结果不代表真实提交，调用方应走真实提交路径）
+    """
+    element = page.locator(selector).first
+    element.wait_for(state="attached", timeout=timeout)
+    results = element.evaluate(_PROBE_JS, {"values": list(values), "settleMs": settle_ms, "restore": restore})
+    blocked = sum(1 for r in results if not r["valid"])
+    logger.info(f"客户端校验探测 {selector}: {len(results)} 个值, 拦截 {blocked} 个")
+    return results
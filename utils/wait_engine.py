@@ -0,0 +1,234 @@
+"""
+事件驱动等待引擎
+用"等待某个条件成立"代替固定的 wait_for_timeout：XHR完成、容器DOM静止、toast出现/消失、对话框关闭。
+条件一满足立即返回，超时上限只在最坏情况下才会用满；所有等待超时均不抛异常，返回False/None由调用方决定如何处理
+"""
+import re
+from typing import Callable, Optional, Pattern, Union
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Page, Response
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 常见toast/通知（sonner、react-toastify、Ant Design、ABP）；不含 [role='alert']/[role='status']，
+# 页面上常驻的live region和行内提示也使用这两个role，会让等待立即返回
+TOAST_SELECTOR = (
+    "[data-sonner-toast], .Toastify__toast, .ant-message-notice, .ant-notification-notice, "
+    ".toast, .abp-toast"
+)
+
+DIALOG_SELECTOR = "[role='dialog'], [role='alertdialog']"
+
+# 在容器上挂MutationObserver，记录最后一次变更时间；连续 quietMs 无变更即视为静止
+_DOM_QUIET_JS = """
+([root, quietMs]) => {
+    const target = root || document.body;
+    if (!target) return false;
+    const key = '__waitEngineQuiet__';
+    let state = target[key];
+    if (!state) {
+        state = { last: performance.now() };
+        state.observer = new MutationObserver(() => { state.last = performance.now(); });
+        state.observer.observe(target, { childList: true, subtree: true, attributes: true, characterData: true });
+        target[key] = state;
+        return false;
+    }
+    if (performance.now() - state.last >= quietMs) {
+        state.observer.disconnect();
+        delete target[key];
+        return true;
+    }
+    return false;
+}
+"""
+
+UrlMatcher = Union[str, Pattern, Callable[[str], bool]]
+
+
+class WaitEngine:
+    """页面级等待原语集合，页面对象通过 self.waits 使用"""
+
+    def __init__(self, page: Page, default_timeout: int = 10000):
+        """
+        初始化等待引擎
+
+        Args:
+            page: Playwright页面对象
+            default_timeout: 默认超时时间(毫秒)
+        """
+        self.page = page
+        self.default_timeout = default_timeout
+
+    # ==================== 网络 ====================
+
+    def for_response(
+        self,
+        url: UrlMatcher,
+        action: Optional[Callable[[], None]] = None,
+        method: Optional[str] = None,
+        timeout: Optional[int] = None,
+    ) -> Optional[Response]:
+        """
+        等待匹配的XHR/fetch响应完成
+
+        Args:
+            url: URL子串、正则或判断函数
+            action: 触发请求的操作；传入时先开始监听再执行，避免响应早于监听到达
+            method: 只匹配指定HTTP方法（如 "POST"）
+            timeout: 超时时间(毫秒)
+
+        Returns:
+            Optional[Response]: 匹配的响应，超时返回None（action仍会被执行）
+        """
+        timeout = timeout or self.default_timeout
+        matches_url = self._url_matcher(url)
+
+        def predicate(response: Response) -> bool:
+            if method and response.request.method.upper() != method.upper():
+                return False
+            return matches_url(response.url)
+
+        try:
+            if action is None:
+                return self.page.wait_for_response(predicate, timeout=timeout)
+            with self.page.expect_response(predicate, timeout=timeout) as response_info:
+                action()
+            return response_info.value
+        except PlaywrightError as e:
+            logger.debug(f"等待响应超时 ({url}): {e}")
+            return None
+
+    # ==================== DOM ====================
+
+    def for_dom_quiet(self, selector: Optional[str] = None, quiet_ms: int = 300, timeout: Optional[int] = None) -> bool:
+        """
+        等待容器内DOM静止（连续 quiet_ms 毫秒没有节点/属性/文本变化）
+
+        Args:
+            selector: 容器选择器（支持Playwright选择器语法），默认整个body；容器不存在时退回body
+            quiet_ms: 静止时长(毫秒)
+            timeout: 超时时间(毫秒)
+
+        Returns:
+            bool: 是否在超时前静止
+        """
+        timeout = timeout or self.default_timeout
+        root = None
+        try:
+            if selector:
+                root = self.page.locator(selector).first.element_handle(timeout=min(timeout, 2000))
+        except PlaywrightError:
+            root = None
+
+        try:
+            self.page.wait_for_function(_DOM_QUIET_JS, arg=[root, quiet_ms], timeout=timeout, polling=50)
+            return True
+        except PlaywrightError as e:
+            logger.debug(f"等待DOM静止超时 ({selector or 'body'}): {e}")
+            return False
+        finally:
+            if root is not None:
+                try:
+                    root.dispose()
+                except PlaywrightError:
+                    pass
+
+    def for_visible(self, selector: str, timeout: Optional[int] = None) -> bool:
+        """等待元素可见"""
+        return self._wait_state(selector, "visible", timeout)
+
+    def for_hidden(self, selector: str, timeout: Optional[int] = None) -> bool:
+        """等待元素隐藏或移除（元素本来就不存在时立即返回True）"""
+        return self._wait_state(selector, "hidden", timeout)
+
+    # ==================== Toast ====================
+
+    def for_toast(self, text: Optional[Union[str, Pattern]] = None, selector: str = TOAST_SELECTOR,
+                  timeout: Optional[int] = None) -> bool:
+        """
+        等待toast出现
+
+        Args:
+            text: 只匹配包含该文本（或正则）的toast
+            selector: toast容器选择器
+            timeout: 超时时间(毫秒)
+        """
+        locator = self.page.locator(selector)
+        if text:
+            locator = locator.filter(has_text=text)
+        return self._wait_locator(locator.first, "visible", timeout, f"toast {text or ''}".strip())
+
+    def for_toast_gone(self, text: Optional[Union[str, Pattern]] = None, selector: str = TOAST_SELECTOR,
+                       timeout: Optional[int] = None) -> bool:
+        """等待toast消失（用于连续操作前清场，避免上一条toast干扰断言）"""
+        locator = self.page.locator(selector)
+        if text:
+            locator = locator.filter(has_text=text)
+        return self._wait_locator(locator.first, "hidden", timeout, f"toast消失 {text or ''}".strip())
+
+    # ==================== 对话框 ====================
+
+    def for_dialog_open(self, selector: str = DIALOG_SELECTOR, timeout: Optional[int] = None) -> bool:
+        """等待对话框打开"""
+        return self._wait_state(selector, "visible", timeout)
+
+    def for_dialog_closed(self, selector: str = DIALOG_SELECTOR, timeout: Optional[int] = None) -> bool:
+        """等待对话框关闭（Radix等组件关闭时会卸载节点，hidden状态同时覆盖不可见和已移除）"""
+        return self._wait_state(selector, "hidden", timeout)
+
+    def for_dialog_result(self, dialog_selector: str = "[role='dialog']", toast_selector: str = TOAST_SELECTOR,
+                          timeout: Optional[int] = None, action: Optional[Callable[[], None]] = None) -> bool:
+        """
+        等待对话框提交结果：对话框关闭或出现新的toast，先到先返回（开始等待前已存在的toast不计）
+
+        Args:
+            dialog_selector: 对话框CSS选择器（仅支持标准CSS）
+            toast_selector: toast CSS选择器（仅支持标准CSS）
+            timeout: 超时时间(毫秒)
+            action: 提交操作；传入时先记录已有toast再执行，避免提交后立即出现的toast被当作旧toast
+        """
+        try:
+            self.page.evaluate(
+                "(toast) => { window.__waitEngineSeenToasts = new WeakSet(document.querySelectorAll(toast)); }",
+                toast_selector,
+            )
+            if action is not None:
+                action()
+            self.page.wait_for_function(
+                """([dialog, toast]) => {
+                    const seen = window.__waitEngineSeenToasts || new WeakSet();
+                    return !document.querySelector(dialog)
+                        || Array.from(document.querySelectorAll(toast)).some((node) => !seen.has(node));
+                }""",
+                arg=[dialog_selector, toast_selector],
+                timeout=timeout or self.default_timeout,
+                polling=50,
+            )
+            return True
+        except PlaywrightError as e:
+            logger.debug(f"等待对话框提交结果超时: {e}")
+            return False
+
+    # ==================== 内部方法 ====================
+
+    def _wait_state(self, selector: str, state: str, timeout: Optional[int]) -> bool:
+        return self._wait_locator(self.page.locator(selector).first, state, timeout, selector)
+
+    def _wait_locator(self, locator, state: str, timeout: Optional[int], description: str) -> bool:
+        try:
+            locator.wait_for(state=state, timeout=timeout or self.default_timeout)
+            return True
+        except PlaywrightError as e:
+            logger.debug(f"等待 {description} 变为 {state} 超时: {e}")
+            return False
+
+    @staticmethod
+    def _url_matcher(url: UrlMatcher) -> Callable[[str], bool]:
+        if callable(url):
+            return url
+        if isinstance(url, re.Pattern):
+            return lambda u: bool(url.search(u))
+        return lambda u: url in u